@@ -0,0 +1,43 @@
+-- CreateTable
+CREATE TABLE "MonthlyRollup" (
+    "userId" TEXT NOT NULL,
+    "year" INTEGER NOT NULL,
+    "month" INTEGER NOT NULL,
+    "category" TEXT NOT NULL,
+    "monthId" TEXT NOT NULL,
+    "amount" DECIMAL(14,2) NOT NULL DEFAULT 0,
+    "itemCount" INTEGER NOT NULL DEFAULT 0,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "MonthlyRollup_pkey" PRIMARY KEY ("userId","year","month","category")
+);
+
+-- CreateIndex
+CREATE INDEX "MonthlyRollup_monthId_idx" ON "MonthlyRollup"("monthId");
+
+-- CreateIndex
+CREATE INDEX "MonthlyRollup_year_month_idx" ON "MonthlyRollup"("year", "month");
+
+-- AddForeignKey
+ALTER TABLE "MonthlyRollup" ADD CONSTRAINT "MonthlyRollup_monthId_fkey" FOREIGN KEY ("monthId") REFERENCES "Month"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- Backfill from the existing items (same query as rebuildRollups in src/lib/finance-rollups.ts)
+INSERT INTO "MonthlyRollup" ("userId", "year", "month", "category", "monthId", "amount", "itemCount", "updatedAt")
+SELECT m."userId", m."year", m."month", s.category, m."id", s.amount, s.item_count, NOW()
+FROM "Month" m
+CROSS JOIN LATERAL (
+    SELECT 'INCOME' AS category, COALESCE(SUM(i."amount"), 0) AS amount, COUNT(*)::int AS item_count
+    FROM "Income" i WHERE i."monthId" = m."id"
+    UNION ALL
+    SELECT 'EXPENSE_' || e."type"::text, SUM(e."totalAmount"), COUNT(*)::int
+    FROM "Expense" e WHERE e."monthId" = m."id" GROUP BY e."type"
+    UNION ALL
+    SELECT 'INVESTMENT', COALESCE(SUM(v."amount"), 0), COUNT(*)::int
+    FROM "Investment" v WHERE v."monthId" = m."id"
+    UNION ALL
+    SELECT 'MISC', COALESCE(SUM(x."amount"), 0), COUNT(*)::int
+    FROM "MiscExpense" x WHERE x."monthId" = m."id"
+    UNION ALL
+    SELECT 'TITHE_PAID', m."tithePaidAmount", CASE WHEN m."isTithePaid" THEN 1 ELSE 0 END
+) s
+WHERE s.item_count > 0 OR s.amount <> 0;
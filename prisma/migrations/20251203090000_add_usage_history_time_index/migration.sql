@@ -0,0 +1,2 @@
+-- CreateIndex
+CREATE INDEX "UsageHistory_createdAt_operation_idx" ON "UsageHistory"("createdAt", "operation");
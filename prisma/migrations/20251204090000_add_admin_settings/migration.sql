@@ -0,0 +1,11 @@
+-- CreateTable
+CREATE TABLE "AdminSetting" (
+    "key" TEXT NOT NULL,
+    "version" INTEGER NOT NULL DEFAULT 1,
+    "data" JSONB NOT NULL,
+    "updatedBy" TEXT,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "AdminSetting_pkey" PRIMARY KEY ("key")
+);
@@ -0,0 +1,5 @@
+-- DropIndex
+DROP INDEX "public"."StorageObject_clerkUserId_idx";
+
+-- CreateIndex
+CREATE INDEX "StorageObject_clerkUserId_createdAt_id_idx" ON "StorageObject"("clerkUserId", "createdAt", "id");
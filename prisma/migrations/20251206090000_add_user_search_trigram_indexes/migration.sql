@@ -0,0 +1,9 @@
+-- Admin user search matches ILIKE '%term%' on email and name; only trigram
+-- indexes can serve that, a btree cannot.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- CreateIndex
+CREATE INDEX "User_email_trgm_idx" ON "User" USING GIN ("email" gin_trgm_ops);
+
+-- CreateIndex
+CREATE INDEX "User_name_trgm_idx" ON "User" USING GIN ("name" gin_trgm_ops);
@@ -0,0 +1,61 @@
+import { prisma } from "@/lib/db";
+import { checkRollups, rebuildRollups, type RollupScope } from "@/lib/finance-rollups";
+
+/**
+ * Manutenção da tabela MonthlyRollup
+ *
+ *   npx tsx scripts/rollups.ts rebuild [--user <userId>]   recalcula a partir dos itens
+ *   npx tsx scripts/rollups.ts check [--user <userId>]     lista divergências (exit 1 se houver)
+ */
+function parseScope(args: string[]): RollupScope {
+    const userIndex = args.indexOf("--user");
+    return userIndex >= 0 && args[userIndex + 1] ? { userId: args[userIndex + 1] } : {};
+}
+
+async function main() {
+    const [command, ...args] = process.argv.slice(2);
+    const scope = parseScope(args);
+    const label = scope.userId ? `usuário ${scope.userId}` : "todos os usuários";
+
+    if (command === "rebuild") {
+        console.log(`Recalculando rollups (${label})...`);
+        const startedAt = Date.now();
+        const rows = await rebuildRollups(scope);
+        console.log(`✅ ${rows} linhas de rollup gravadas em ${Date.now() - startedAt} ms.`);
+        return 0;
+    }
+
+    if (command === "check") {
+        console.log(`Verificando rollups (${label})...`);
+        const mismatches = await checkRollups(scope);
+        if (mismatches.length === 0) {
+            console.log("✅ Rollups consistentes com os lançamentos.");
+            return 0;
+        }
+        console.log(`❌ ${mismatches.length} divergências encontradas:`);
+        for (const m of mismatches.slice(0, 50)) {
+            console.log(
+                `  - ${m.userId} ${m.month}/${m.year} ${m.category}: ` +
+                `esperado ${m.expectedAmount} (${m.expectedCount} itens), ` +
+                `atual ${m.actualAmount} (${m.actualCount} itens)`
+            );
+        }
+        if (mismatches.length > 50) console.log(`  ... e mais ${mismatches.length - 50}.`);
+        console.log('\nExecute "npm run db:rollups:rebuild" para corrigir.');
+        return 1;
+    }
+
+    console.error("Uso: npx tsx scripts/rollups.ts <rebuild|check> [--user <userId>]");
+    return 2;
+}
+
+main()
+    .then(async (code) => {
+        await prisma.$disconnect();
+        process.exit(code);
+    })
+    .catch(async (error) => {
+        console.error("❌ Erro ao processar rollups:", error);
+        await prisma.$disconnect();
+        process.exit(1);
+    });
@@ -0,0 +1,303 @@
+import type { Prisma } from "@prisma/client";
+import { prisma } from "@/lib/db";
+
+/**
+ * Gerador determinístico de dados sintéticos para benchmarks
+ *
+ *   npx tsx scripts/synthetic-data.ts --users 10000 [--months 24] [--density 1]
+ *       [--seed 42] [--prefix synth] [--anchor 2025-12] [--batch 5000]
+ *   npx tsx scripts/synthetic-data.ts --purge [--prefix synth]
+ *
+ * Cada usuário i recebe os mesmos meses e lançamentos para a mesma combinação
+ * de seed/prefix/anchor, com ids derivados de (prefix, i). As inserções usam
+ * createMany em lotes com skipDuplicates, então rodar de novo com mais
+ * usuários só acrescenta os que faltam (10k depois de 1k insere 9k). Os
+ * rollups (MonthlyRollup) são calculados aqui mesmo, sem reler os itens;
+ * `npm run db:rollups:check` confirma a consistência.
+ */
+
+type Options = {
+    users: number;
+    months: number;
+    density: number;
+    seed: number;
+    prefix: string;
+    anchor: { year: number; month: number };
+    batch: number;
+    purge: boolean;
+};
+
+const USERS_PER_CHUNK = 250;
+
+const FIRST_NAMES = ["Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Henrique", "Isabela", "João", "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael", "Sofia", "Thiago", "Vitória", "William"];
+const LAST_NAMES = ["Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes", "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida"];
+const INCOMES = ["Salário", "Freelance", "Aluguel recebido", "Vendas", "Comissão", "Restituição"];
+const EXPENSES = ["Aluguel", "Condomínio", "Energia", "Água", "Internet", "Celular", "Supermercado", "Combustível", "Plano de saúde", "Escola", "Academia", "Cartão de crédito", "Streaming", "Farmácia"];
+const INVESTMENTS = ["Tesouro Direto", "CDB", "Previdência", "Ações", "Reserva de emergência"];
+const MISC = ["Padaria", "Lanche", "Estacionamento", "Presente", "Uber", "Cinema", "Feira"];
+
+/** mulberry32: pequeno, rápido e reproduzível em qualquer runtime. */
+function createRng(seed: number) {
+    let state = seed >>> 0;
+    const next = () => {
+        state = (state + 0x6d2b79f5) >>> 0;
+        let t = state;
+        t = Math.imul(t ^ (t >>> 15), t | 1);
+        t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+    return {
+        next,
+        int: (min: number, max: number) => min + Math.floor(next() * (max - min + 1)),
+        chance: (p: number) => next() < p,
+        pick: <T>(items: readonly T[]) => items[Math.floor(next() * items.length)],
+        /** Quantidade com média `mean`, variando ±50%. */
+        count: (mean: number) => Math.max(0, Math.round(mean * (0.5 + next()))),
+    };
+}
+
+const cents = (value: number) => (value / 100).toFixed(2);
+
+function parseOptions(args: string[]): Options {
+    const value = (name: string) => {
+        const index = args.indexOf(`--${name}`);
+        return index >= 0 ? args[index + 1] : undefined;
+    };
+    const now = new Date();
+    const anchorMatch = value("anchor")?.match(/^(\d{4})-(\d{1,2})$/);
+
+    return {
+        users: Number(value("users") ?? 1000),
+        months: Number(value("months") ?? 24),
+        density: Number(value("density") ?? 1),
+        seed: Number(value("seed") ?? 42),
+        prefix: value("prefix") ?? "synth",
+        anchor: anchorMatch
+            ? { year: Number(anchorMatch[1]), month: Number(anchorMatch[2]) }
+            : { year: now.getFullYear(), month: now.getMonth() + 1 },
+        batch: Number(value("batch") ?? 5000),
+        purge: args.includes("--purge"),
+    };
+}
+
+type Rows = {
+    users: Prisma.UserCreateManyInput[];
+    months: Prisma.MonthCreateManyInput[];
+    incomes: Prisma.IncomeCreateManyInput[];
+    expenses: Prisma.ExpenseCreateManyInput[];
+    investments: Prisma.InvestmentCreateManyInput[];
+    miscExpenses: Prisma.MiscExpenseCreateManyInput[];
+    rollups: Prisma.MonthlyRollupCreateManyInput[];
+};
+
+function emptyRows(): Rows {
+    return { users: [], months: [], incomes: [], expenses: [], investments: [], miscExpenses: [], rollups: [] };
+}
+
+/** Gera o usuário `index` com todos os meses e lançamentos. */
+function generateUser(options: Options, index: number, rows: Rows) {
+    // Seed própria por usuário: o resultado não depende do tamanho do lote.
+    const rng = createRng(options.seed * 1_000_003 + index);
+    const { prefix, anchor, density } = options;
+    const userId = `${prefix}_u${index}`;
+    const first = rng.pick(FIRST_NAMES);
+    const last = rng.pick(LAST_NAMES);
+
+    // Cadastros espalhados pelos 3 anos anteriores ao mês âncora.
+    const anchorTime = Date.UTC(anchor.year, anchor.month - 1, 1);
+    const createdAt = new Date(anchorTime - rng.int(0, 3 * 365 * 24 * 60) * 60_000);
+
+    rows.users.push({
+        id: userId,
+        clerkId: `${prefix}_clerk_${index}`,
+        email: `${prefix}.${first}.${last}.${index}@example.test`.toLowerCase(),
+        name: `${first} ${last}`,
+        isActive: rng.chance(0.92),
+        isTitheEnabled: rng.chance(0.85),
+        createdAt,
+    });
+
+    const salary = rng.int(1_800, 18_000) * 100;
+    const monthCount = Math.max(1, Math.min(options.months, rng.int(Math.ceil(options.months / 3), options.months)));
+
+    for (let offset = monthCount - 1; offset >= 0; offset--) {
+        const period = anchor.year * 12 + (anchor.month - 1) - offset;
+        const year = Math.floor(period / 12);
+        const month = (period % 12) + 1;
+        const isPast = offset > 0;
+        const monthId = `${prefix}_m${index}_${year}${String(month).padStart(2, "0")}`;
+        const itemId = (kind: string, n: number) => `${monthId}_${kind}${n}`;
+
+        let incomeTotal = 0;
+        const incomeCount = Math.max(1, rng.count(2 * density));
+        for (let n = 0; n < incomeCount; n++) {
+            const amount = n === 0 ? salary : rng.int(100, 4_000) * 100;
+            incomeTotal += amount;
+            rows.incomes.push({
+                id: itemId("i", n),
+                monthId,
+                description: n === 0 ? "Salário" : rng.pick(INCOMES),
+                amount: cents(amount),
+                dayOfMonth: rng.int(1, 28),
+                order: n,
+                isReceived: isPast || rng.chance(0.4),
+                isTithePaid: isPast && rng.chance(0.6),
+            });
+        }
+
+        let expenseTotal = 0;
+        const expenseCount = rng.count(8 * density);
+        for (let n = 0; n < expenseCount; n++) {
+            const total = rng.int(30, Math.max(31, Math.round(salary / 100 / 4))) * 100;
+            const isPaid = isPast ? rng.chance(0.95) : rng.chance(0.3);
+            expenseTotal += total;
+            rows.expenses.push({
+                id: itemId("e", n),
+                monthId,
+                description: rng.pick(EXPENSES),
+                totalAmount: cents(total),
+                paidAmount: cents(isPaid ? total : 0),
+                dayOfMonth: rng.int(1, 28),
+                order: n,
+                isPaid,
+            });
+        }
+
+        let investmentTotal = 0;
+        const investmentCount = rng.count(1 * density);
+        for (let n = 0; n < investmentCount; n++) {
+            const amount = rng.int(50, 2_000) * 100;
+            investmentTotal += amount;
+            rows.investments.push({
+                id: itemId("v", n),
+                monthId,
+                description: rng.pick(INVESTMENTS),
+                amount: cents(amount),
+                dayOfMonth: rng.int(1, 28),
+                order: n,
+                isPaid: isPast || rng.chance(0.3),
+            });
+        }
+
+        let miscTotal = 0;
+        const miscCount = rng.count(2 * density);
+        for (let n = 0; n < miscCount; n++) {
+            const amount = rng.int(5, 300) * 100;
+            miscTotal += amount;
+            rows.miscExpenses.push({
+                id: itemId("x", n),
+                monthId,
+                description: rng.pick(MISC),
+                amount: cents(amount),
+                dayOfMonth: rng.int(1, 28),
+                order: n,
+                isPaid: isPast || rng.chance(0.5),
+            });
+        }
+
+        const isTithePaid = isPast && rng.chance(0.6);
+        const tithePaid = isTithePaid ? Math.round(incomeTotal * 0.1) : 0;
+        rows.months.push({
+            id: monthId,
+            userId,
+            year,
+            month,
+            isOpen: !isPast,
+            isTithePaid,
+            tithePaidAmount: cents(tithePaid),
+        });
+
+        // Mesmas regras de rebuildRollups: só categorias com itens ou valor.
+        const rollup = (category: string, amount: number, itemCount: number) => {
+            if (itemCount > 0 || amount !== 0) {
+                rows.rollups.push({ userId, year, month, category, monthId, amount: cents(amount), itemCount });
+            }
+        };
+        rollup("INCOME", incomeTotal, incomeCount);
+        rollup("EXPENSE_STANDARD", expenseTotal, expenseCount);
+        rollup("INVESTMENT", investmentTotal, investmentCount);
+        rollup("MISC", miscTotal, miscCount);
+        rollup("TITHE_PAID", tithePaid, isTithePaid ? 1 : 0);
+    }
+}
+
+async function insertInBatches<T>(rows: T[], batch: number, write: (data: T[]) => Promise<{ count: number }>) {
+    let inserted = 0;
+    for (let start = 0; start < rows.length; start += batch) {
+        inserted += (await write(rows.slice(start, start + batch))).count;
+    }
+    return inserted;
+}
+
+async function writeChunk(rows: Rows, batch: number) {
+    // Ordem respeita as chaves estrangeiras: usuários, meses, itens, rollups.
+    const skipDuplicates = true;
+    return {
+        users: await insertInBatches(rows.users, batch, (data) => prisma.user.createMany({ data, skipDuplicates })),
+        months: await insertInBatches(rows.months, batch, (data) => prisma.month.createMany({ data, skipDuplicates })),
+        incomes: await insertInBatches(rows.incomes, batch, (data) => prisma.income.createMany({ data, skipDuplicates })),
+        expenses: await insertInBatches(rows.expenses, batch, (data) => prisma.expense.createMany({ data, skipDuplicates })),
+        investments: await insertInBatches(rows.investments, batch, (data) => prisma.investment.createMany({ data, skipDuplicates })),
+        miscExpenses: await insertInBatches(rows.miscExpenses, batch, (data) => prisma.miscExpense.createMany({ data, skipDuplicates })),
+        rollups: await insertInBatches(rows.rollups, batch, (data) => prisma.monthlyRollup.createMany({ data, skipDuplicates })),
+    };
+}
+
+async function generate(options: Options) {
+    const totals: Record<string, number> = {};
+    const startedAt = Date.now();
+
+    for (let first = 0; first < options.users; first += USERS_PER_CHUNK) {
+        const rows = emptyRows();
+        const last = Math.min(options.users, first + USERS_PER_CHUNK);
+        for (let index = first; index < last; index++) generateUser(options, index, rows);
+
+        const inserted = await writeChunk(rows, options.batch);
+        for (const [table, count] of Object.entries(inserted)) totals[table] = (totals[table] ?? 0) + count;
+
+        const seconds = (Date.now() - startedAt) / 1000;
+        console.log(`  ${last}/${options.users} usuários (${Math.round(last / Math.max(seconds, 0.001))}/s)`);
+    }
+
+    return totals;
+}
+
+async function main() {
+    const options = parseOptions(process.argv.slice(2));
+
+    if (options.purge) {
+        console.log(`Removendo dados sintéticos com prefixo "${options.prefix}_"...`);
+        // Meses, itens e rollups saem em cascata.
+        const { count } = await prisma.user.deleteMany({ where: { clerkId: { startsWith: `${options.prefix}_clerk_` } } });
+        console.log(`✅ ${count} usuários removidos.`);
+        return 0;
+    }
+
+    if (!Number.isInteger(options.users) || options.users < 1 || !Number.isInteger(options.months) || options.months < 1) {
+        console.error("--users e --months devem ser inteiros positivos");
+        return 2;
+    }
+
+    const anchor = `${options.anchor.year}-${String(options.anchor.month).padStart(2, "0")}`;
+    console.log(
+        `Gerando ${options.users} usuários × até ${options.months} meses ` +
+        `(seed ${options.seed}, prefixo "${options.prefix}", até ${anchor}, densidade ${options.density})...`
+    );
+    const startedAt = Date.now();
+    const totals = await generate(options);
+
+    console.log(`✅ Concluído em ${((Date.now() - startedAt) / 1000).toFixed(1)} s. Linhas novas:`);
+    for (const [table, count] of Object.entries(totals)) console.log(`  ${table}: ${count}`);
+    return 0;
+}
+
+main()
+    .then(async (code) => {
+        await prisma.$disconnect();
+        process.exit(code);
+    })
+    .catch(async (error) => {
+        console.error("❌ Erro ao gerar dados sintéticos:", error);
+        await prisma.$disconnect();
+        process.exit(1);
+    });
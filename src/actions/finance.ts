@@ -2,7 +2,11 @@
 
 import { prisma } from "@/lib/db";
 import { revalidatePath } from "next/cache";
-import { ExpenseType } from "@prisma/client";
+import { invalidateAdminDashboardStats } from "@/lib/queries/admin-dashboard";
+import { invalidateMonthCache, invalidateUserMonthsCache } from "@/lib/queries/finance";
+import { applyRollupDeltas, expenseCategory, ROLLUP_CATEGORY } from "@/lib/finance-rollups";
+import { rolloverMonths } from "@/lib/month-rollover";
+import { ExpenseType, Prisma } from "@prisma/client";
 import { z } from "zod";
 
 // Schemas for validation
@@ -46,16 +50,23 @@ export async function createIncome(formData: FormData) {
 
     const validated = IncomeSchema.parse(rawData);
 
-    await prisma.income.create({
-        data: {
-            monthId: validated.monthId,
-            description: validated.description,
-            amount: validated.amount,
-            dayOfMonth: validated.dayOfMonth,
-        },
+    await prisma.$transaction(async (tx) => {
+        await tx.income.create({
+            data: {
+                monthId: validated.monthId,
+                description: validated.description,
+                amount: validated.amount,
+                dayOfMonth: validated.dayOfMonth,
+            },
+        });
+        await applyRollupDeltas(tx, validated.monthId, [
+            { category: ROLLUP_CATEGORY.INCOME, amount: validated.amount, count: 1 },
+        ]);
     });
 
     revalidatePath("/dashboard");
+    invalidateMonthCache(validated.monthId);
+    invalidateAdminDashboardStats();
 }
 
 export async function createExpense(formData: FormData) {
@@ -70,18 +81,25 @@ export async function createExpense(formData: FormData) {
 
     const validated = ExpenseSchema.parse(rawData);
 
-    await prisma.expense.create({
-        data: {
-            monthId: validated.monthId,
-            description: validated.description,
-            totalAmount: validated.totalAmount,
-            paidAmount: validated.paidAmount,
-            dayOfMonth: validated.dayOfMonth,
-            type: validated.type,
-        },
+    await prisma.$transaction(async (tx) => {
+        await tx.expense.create({
+            data: {
+                monthId: validated.monthId,
+                description: validated.description,
+                totalAmount: validated.totalAmount,
+                paidAmount: validated.paidAmount,
+                dayOfMonth: validated.dayOfMonth,
+                type: validated.type,
+            },
+        });
+        await applyRollupDeltas(tx, validated.monthId, [
+            { category: expenseCategory(validated.type), amount: validated.totalAmount, count: 1 },
+        ]);
     });
 
     revalidatePath("/dashboard");
+    invalidateMonthCache(validated.monthId);
+    invalidateAdminDashboardStats();
 }
 
 export async function createInvestment(formData: FormData) {
@@ -94,16 +112,22 @@ export async function createInvestment(formData: FormData) {
 
     const validated = InvestmentSchema.parse(rawData);
 
-    await prisma.investment.create({
-        data: {
-            monthId: validated.monthId,
-            description: validated.description,
-            amount: validated.amount,
-            dayOfMonth: validated.dayOfMonth,
-        },
+    await prisma.$transaction(async (tx) => {
+        await tx.investment.create({
+            data: {
+                monthId: validated.monthId,
+                description: validated.description,
+                amount: validated.amount,
+                dayOfMonth: validated.dayOfMonth,
+            },
+        });
+        await applyRollupDeltas(tx, validated.monthId, [
+            { category: ROLLUP_CATEGORY.INVESTMENT, amount: validated.amount, count: 1 },
+        ]);
     });
 
     revalidatePath("/dashboard");
+    invalidateMonthCache(validated.monthId);
 }
 
 export async function createMiscExpense(formData: FormData) {
@@ -116,34 +140,61 @@ export async function createMiscExpense(formData: FormData) {
 
     const validated = MiscExpenseSchema.parse(rawData);
 
-    await prisma.miscExpense.create({
-        data: {
-            monthId: validated.monthId,
-            description: validated.description,
-            amount: validated.amount,
-            dayOfMonth: validated.dayOfMonth,
-        },
+    await prisma.$transaction(async (tx) => {
+        await tx.miscExpense.create({
+            data: {
+                monthId: validated.monthId,
+                description: validated.description,
+                amount: validated.amount,
+                dayOfMonth: validated.dayOfMonth,
+            },
+        });
+        await applyRollupDeltas(tx, validated.monthId, [
+            { category: ROLLUP_CATEGORY.MISC, amount: validated.amount, count: 1 },
+        ]);
     });
 
     revalidatePath("/dashboard");
+    invalidateMonthCache(validated.monthId);
 }
 
 export async function deleteItem(id: string, type: 'income' | 'expense' | 'investment' | 'misc') {
-    switch (type) {
-        case 'income':
-            await prisma.income.delete({ where: { id } });
-            break;
-        case 'expense':
-            await prisma.expense.delete({ where: { id } });
-            break;
-        case 'investment':
-            await prisma.investment.delete({ where: { id } });
-            break;
-        case 'misc':
-            await prisma.miscExpense.delete({ where: { id } });
-            break;
-    }
+    const monthId = await prisma.$transaction(async (tx) => {
+        // delete() returns the removed row, which is all the rollup delta needs.
+        switch (type) {
+            case 'income': {
+                const income = await tx.income.delete({ where: { id } });
+                await applyRollupDeltas(tx, income.monthId, [
+                    { category: ROLLUP_CATEGORY.INCOME, amount: income.amount.negated(), count: -1 },
+                ]);
+                return income.monthId;
+            }
+            case 'expense': {
+                const expense = await tx.expense.delete({ where: { id } });
+                await applyRollupDeltas(tx, expense.monthId, [
+                    { category: expenseCategory(expense.type), amount: expense.totalAmount.negated(), count: -1 },
+                ]);
+                return expense.monthId;
+            }
+            case 'investment': {
+                const investment = await tx.investment.delete({ where: { id } });
+                await applyRollupDeltas(tx, investment.monthId, [
+                    { category: ROLLUP_CATEGORY.INVESTMENT, amount: investment.amount.negated(), count: -1 },
+                ]);
+                return investment.monthId;
+            }
+            case 'misc': {
+                const misc = await tx.miscExpense.delete({ where: { id } });
+                await applyRollupDeltas(tx, misc.monthId, [
+                    { category: ROLLUP_CATEGORY.MISC, amount: misc.amount.negated(), count: -1 },
+                ]);
+                return misc.monthId;
+            }
+        }
+    });
     revalidatePath("/dashboard");
+    invalidateMonthCache(monthId);
+    invalidateAdminDashboardStats();
 }
 
 export async function updateItemOrder(
@@ -175,8 +226,12 @@ export async function updateItemOrder(
         }
     });
 
-    await prisma.$transaction(updates);
+    const updated = await prisma.$transaction(updates);
     revalidatePath("/dashboard");
+    for (const monthId of new Set(updated.map((item) => item.monthId))) {
+        invalidateMonthCache(monthId);
+    }
+    invalidateAdminDashboardStats();
 }
 
 // Update schemas (without monthId since we're updating existing items)
@@ -205,6 +260,21 @@ const UpdateMiscExpenseSchema = z.object({
     dayOfMonth: z.coerce.number().min(1).max(31).optional(),
 });
 
+/**
+ * Locks a row until the transaction ends. Update paths read the old amount
+ * after taking the lock, so concurrent edits of the same row apply their
+ * rollup deltas one after the other instead of both starting from the same
+ * old value.
+ */
+async function lockRow(
+    tx: Prisma.TransactionClient,
+    table: "Income" | "Expense" | "Investment" | "MiscExpense" | "Month",
+    id: string,
+) {
+    // The table name comes from the union above, never from input.
+    await tx.$queryRaw`SELECT 1 FROM ${Prisma.raw(`"${table}"`)} WHERE "id" = ${id} FOR UPDATE`;
+}
+
 // Update actions
 export async function updateIncome(id: string, formData: FormData) {
     const rawData = {
@@ -215,12 +285,25 @@ export async function updateIncome(id: string, formData: FormData) {
 
     const validated = UpdateIncomeSchema.parse(rawData);
 
-    await prisma.income.update({
-        where: { id },
-        data: validated,
+    const monthId = await prisma.$transaction(async (tx) => {
+        await lockRow(tx, "Income", id);
+        const previous = await tx.income.findUniqueOrThrow({
+            where: { id },
+            select: { monthId: true, amount: true },
+        });
+        await tx.income.update({
+            where: { id },
+            data: validated,
+        });
+        await applyRollupDeltas(tx, previous.monthId, [
+            { category: ROLLUP_CATEGORY.INCOME, amount: previous.amount.negated().plus(validated.amount) },
+        ]);
+        return previous.monthId;
     });
 
     revalidatePath("/dashboard");
+    invalidateMonthCache(monthId);
+    invalidateAdminDashboardStats();
 }
 
 export async function updateExpense(id: string, formData: FormData) {
@@ -233,12 +316,25 @@ export async function updateExpense(id: string, formData: FormData) {
 
     const validated = UpdateExpenseSchema.parse(rawData);
 
-    await prisma.expense.update({
-        where: { id },
-        data: validated,
+    const monthId = await prisma.$transaction(async (tx) => {
+        await lockRow(tx, "Expense", id);
+        const previous = await tx.expense.findUniqueOrThrow({
+            where: { id },
+            select: { monthId: true, totalAmount: true, type: true },
+        });
+        await tx.expense.update({
+            where: { id },
+            data: validated,
+        });
+        await applyRollupDeltas(tx, previous.monthId, [
+            { category: expenseCategory(previous.type), amount: previous.totalAmount.negated().plus(validated.totalAmount) },
+        ]);
+        return previous.monthId;
     });
 
     revalidatePath("/dashboard");
+    invalidateMonthCache(monthId);
+    invalidateAdminDashboardStats();
 }
 
 export async function updateInvestment(id: string, formData: FormData) {
@@ -250,12 +346,24 @@ export async function updateInvestment(id: string, formData: FormData) {
 
     const validated = UpdateInvestmentSchema.parse(rawData);
 
-    await prisma.investment.update({
-        where: { id },
-        data: validated,
+    const monthId = await prisma.$transaction(async (tx) => {
+        await lockRow(tx, "Investment", id);
+        const previous = await tx.investment.findUniqueOrThrow({
+            where: { id },
+            select: { monthId: true, amount: true },
+        });
+        await tx.investment.update({
+            where: { id },
+            data: validated,
+        });
+        await applyRollupDeltas(tx, previous.monthId, [
+            { category: ROLLUP_CATEGORY.INVESTMENT, amount: previous.amount.negated().plus(validated.amount) },
+        ]);
+        return previous.monthId;
     });
 
     revalidatePath("/dashboard");
+    invalidateMonthCache(monthId);
 }
 
 export async function updateMiscExpense(id: string, formData: FormData) {
@@ -267,12 +375,24 @@ export async function updateMiscExpense(id: string, formData: FormData) {
 
     const validated = UpdateMiscExpenseSchema.parse(rawData);
 
-    await prisma.miscExpense.update({
-        where: { id },
-        data: validated,
+    const monthId = await prisma.$transaction(async (tx) => {
+        await lockRow(tx, "MiscExpense", id);
+        const previous = await tx.miscExpense.findUniqueOrThrow({
+            where: { id },
+            select: { monthId: true, amount: true },
+        });
+        await tx.miscExpense.update({
+            where: { id },
+            data: validated,
+        });
+        await applyRollupDeltas(tx, previous.monthId, [
+            { category: ROLLUP_CATEGORY.MISC, amount: previous.amount.negated().plus(validated.amount) },
+        ]);
+        return previous.monthId;
     });
 
     revalidatePath("/dashboard");
+    invalidateMonthCache(monthId);
 }
 
 const DuplicateMonthSchema = z.object({
@@ -290,80 +410,19 @@ export async function duplicateMonth(formData: FormData) {
 
     const validated = DuplicateMonthSchema.parse(rawData);
 
-    // Calculate next month
-    const nextMonth = validated.sourceMonth === 12 ? 1 : validated.sourceMonth + 1;
-    const nextYear = validated.sourceMonth === 12 ? validated.sourceYear + 1 : validated.sourceYear;
-
-    // Check if next month already exists
-    const existingMonth = await prisma.month.findUnique({
-        where: {
-            userId_month_year: {
-                userId: validated.userId,
-                month: nextMonth,
-                year: nextYear,
-            },
-        },
-    });
-
-    if (existingMonth) {
-        throw new Error("O próximo mês já foi criado!");
-    }
-
-    // Get source month with all data
-    const sourceMonthData = await prisma.month.findUnique({
-        where: {
-            userId_month_year: {
-                userId: validated.userId,
-                month: validated.sourceMonth,
-                year: validated.sourceYear,
-            },
-        },
-        include: {
-            incomes: true,
-            expenses: { where: { type: ExpenseType.STANDARD } }, // Only copy standard expenses
-            investments: true,
-            miscExpenses: false, // Don't copy misc expenses
-        },
-    });
+    // Bulk copy in one transaction; see src/lib/month-rollover.ts.
+    const result = await rolloverMonths(
+        { year: validated.sourceYear, month: validated.sourceMonth },
+        [validated.userId],
+    );
+    const [entry] = result.targets;
 
-    if (!sourceMonthData) {
+    if (!entry) {
         throw new Error("Mês de origem não encontrado!");
     }
-
-    // Create new month with duplicated data
-    await prisma.month.create({
-        data: {
-            userId: validated.userId,
-            month: nextMonth,
-            year: nextYear,
-            incomes: {
-                create: sourceMonthData.incomes.map((income) => ({
-                    description: income.description,
-                    amount: income.amount,
-                    dayOfMonth: income.dayOfMonth,
-                    order: income.order,
-                })),
-            },
-            expenses: {
-                create: sourceMonthData.expenses.map((expense) => ({
-                    description: expense.description,
-                    totalAmount: expense.totalAmount,
-                    paidAmount: 0, // Reset paid amount
-                    dayOfMonth: expense.dayOfMonth,
-                    type: expense.type,
-                    order: expense.order,
-                })),
-            },
-            investments: {
-                create: sourceMonthData.investments.map((investment) => ({
-                    description: investment.description,
-                    amount: investment.amount,
-                    dayOfMonth: investment.dayOfMonth,
-                    order: investment.order,
-                })),
-            },
-        },
-    });
+    if (!entry.created && Object.values(result.copied).every((count) => count === 0)) {
+        throw new Error("O próximo mês já foi criado!");
+    }
 
     revalidatePath("/dashboard");
 }
@@ -371,11 +430,13 @@ export async function duplicateMonth(formData: FormData) {
 
 // Toggle status actions
 export async function toggleIncomeReceived(id: string, isReceived: boolean) {
-    await prisma.income.update({
+    const item = await prisma.income.update({
         where: { id },
         data: { isReceived },
     });
     revalidatePath("/dashboard");
+    invalidateMonthCache(item.monthId);
+    invalidateAdminDashboardStats();
 }
 
 export async function toggleExpensePaid(id: string, isPaid: boolean) {
@@ -391,7 +452,7 @@ export async function toggleExpensePaid(id: string, isPaid: boolean) {
 
     // When marking as paid, set paidAmount to totalAmount
     // When unmarking, set paidAmount to 0
-    await prisma.expense.update({
+    const item = await prisma.expense.update({
         where: { id },
         data: {
             isPaid,
@@ -399,53 +460,74 @@ export async function toggleExpensePaid(id: string, isPaid: boolean) {
         },
     });
     revalidatePath("/dashboard");
+    invalidateMonthCache(item.monthId);
+    invalidateAdminDashboardStats();
 }
 
 export async function toggleTithePaid(monthId: string, isPaid: boolean) {
-    const month = await prisma.month.findUnique({
-        where: { id: monthId },
-        include: { incomes: true }
-    });
-
-    if (!month) throw new Error("Mês não encontrado");
+    await prisma.$transaction(async (tx) => {
+        // Both deltas are computed from the locked row, so a concurrent toggle
+        // (another tab) waits here and then sees this one's result.
+        await lockRow(tx, "Month", monthId);
+        const month = await tx.month.findUnique({
+            where: { id: monthId },
+            select: { isTithePaid: true, tithePaidAmount: true },
+        });
 
-    const totalIncome = month.incomes.reduce((sum, i) => sum + Number(i.amount), 0);
-    const titheAmount = totalIncome * 0.1;
+        if (!month) throw new Error("Mês não encontrado");
 
-    await prisma.month.update({
-        where: { id: monthId },
-        data: {
-            isTithePaid: isPaid,
-            tithePaidAmount: isPaid ? titheAmount : 0
-        }
+        const { _sum } = await tx.income.aggregate({
+            where: { monthId },
+            _sum: { amount: true },
+        });
+        const titheAmount = (_sum.amount ?? new Prisma.Decimal(0)).times(0.1);
+
+        const updated = await tx.month.update({
+            where: { id: monthId },
+            data: {
+                isTithePaid: isPaid,
+                tithePaidAmount: isPaid ? titheAmount : 0
+            }
+        });
+        await applyRollupDeltas(tx, monthId, [{
+            category: ROLLUP_CATEGORY.TITHE_PAID,
+            amount: updated.tithePaidAmount.minus(month.tithePaidAmount),
+            count: Number(updated.isTithePaid) - Number(month.isTithePaid),
+        }]);
     });
 
     revalidatePath("/dashboard");
+    invalidateMonthCache(monthId);
+    invalidateAdminDashboardStats();
 }
 
 export async function toggleInvestmentPaid(id: string, isPaid: boolean) {
-    await prisma.investment.update({
+    const item = await prisma.investment.update({
         where: { id },
         data: { isPaid },
     });
     revalidatePath("/dashboard");
+    invalidateMonthCache(item.monthId);
 }
 
 export async function toggleMiscExpensePaid(id: string, isPaid: boolean) {
-    await prisma.miscExpense.update({
+    const item = await prisma.miscExpense.update({
         where: { id },
         data: { isPaid },
     });
     revalidatePath("/dashboard");
+    invalidateMonthCache(item.monthId);
 }
 
 
 export async function toggleIncomeTithePaid(incomeId: string, isTithePaid: boolean) {
-    await prisma.income.update({
+    const item = await prisma.income.update({
         where: { id: incomeId },
         data: { isTithePaid },
     });
     revalidatePath("/dashboard");
+    invalidateMonthCache(item.monthId);
+    invalidateAdminDashboardStats();
 }
 
 export async function deleteMonth(formData: FormData) {
@@ -469,6 +551,8 @@ export async function deleteMonth(formData: FormData) {
         });
 
         revalidatePath("/dashboard");
+        invalidateUserMonthsCache(userId);
+        invalidateAdminDashboardStats();
     } catch (error) {
         console.error("Error deleting month:", error);
         throw new Error("Failed to delete month");
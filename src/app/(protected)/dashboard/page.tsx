@@ -1,6 +1,6 @@
 import { currentUser } from "@clerk/nextjs/server";
 import { redirect } from "next/navigation";
-import { getMonthByDate, getUserMonths } from "@/lib/queries/finance";
+import { ensureMonth, getMonthByDate, getUserMonths } from "@/lib/queries/finance";
 import { calculateTotals } from "@/lib/finance-utils";
 import { getUserFromClerkId } from "@/lib/auth-utils";
 import { MonthNavigationHeader } from "@/components/dashboard/month-navigation-header";
@@ -16,6 +16,9 @@ import { ExpenseType } from "@prisma/client";
 
 import { Metadata } from "next";
 import { prisma } from "@/lib/db";
+import { invalidateAdminDashboardStats } from "@/lib/queries/admin-dashboard";
+import { rebuildRollups } from "@/lib/finance-rollups";
+import { isUniqueViolation } from "@/lib/db-errors";
 
 export const dynamic = 'force-dynamic';
 
@@ -64,13 +67,7 @@ export default async function DashboardPage({ searchParams }: DashboardPageProps
     const currentMonthNow = now.getMonth() + 1;
     const currentYearNow = now.getFullYear();
 
-    await prisma.month.create({
-      data: {
-        userId: dbUser.id,
-        month: currentMonthNow,
-        year: currentYearNow,
-      },
-    });
+    await ensureMonth(dbUser.id, currentMonthNow, currentYearNow);
 
     // Redirect to current month
     redirect(`/dashboard?month=${currentMonthNow}&year=${currentYearNow}`);
@@ -109,54 +106,57 @@ export default async function DashboardPage({ searchParams }: DashboardPageProps
 
       if (prevMonth) {
         console.log('[Dashboard] Previous month found. Duplicating...');
-        // Duplicate previous month
-        await prisma.month.create({
-          data: {
-            userId: dbUser.id,
-            month: month,
-            year: year,
-            incomes: {
-              create: prevMonth.incomes.map((income) => ({
-                description: income.description,
-                amount: income.amount,
-                dayOfMonth: income.dayOfMonth,
-                order: income.order,
-                isReceived: false, // Reset status
-                isTithePaid: false, // Reset status
-              })),
-            },
-            expenses: {
-              create: prevMonth.expenses.map((expense) => ({
-                description: expense.description,
-                totalAmount: expense.totalAmount,
-                paidAmount: 0, // Reset paid amount
-                dayOfMonth: expense.dayOfMonth,
-                type: expense.type,
-                order: expense.order,
-                isPaid: false, // Reset status
-              })),
-            },
-            investments: {
-              create: prevMonth.investments.map((investment) => ({
-                description: investment.description,
-                amount: investment.amount,
-                dayOfMonth: investment.dayOfMonth,
-                order: investment.order,
-                isPaid: false, // Reset status
-              })),
+        // Duplicate previous month. A concurrent render may have created it
+        // already; the unique constraint rolls this copy back and we reload.
+        const duplicated = await prisma.$transaction(async (tx) => {
+          const newMonth = await tx.month.create({
+            data: {
+              userId: dbUser.id,
+              month: month,
+              year: year,
+              incomes: {
+                create: prevMonth.incomes.map((income) => ({
+                  description: income.description,
+                  amount: income.amount,
+                  dayOfMonth: income.dayOfMonth,
+                  order: income.order,
+                  isReceived: false, // Reset status
+                  isTithePaid: false, // Reset status
+                })),
+              },
+              expenses: {
+                create: prevMonth.expenses.map((expense) => ({
+                  description: expense.description,
+                  totalAmount: expense.totalAmount,
+                  paidAmount: 0, // Reset paid amount
+                  dayOfMonth: expense.dayOfMonth,
+                  type: expense.type,
+                  order: expense.order,
+                  isPaid: false, // Reset status
+                })),
+              },
+              investments: {
+                create: prevMonth.investments.map((investment) => ({
+                  description: investment.description,
+                  amount: investment.amount,
+                  dayOfMonth: investment.dayOfMonth,
+                  order: investment.order,
+                  isPaid: false, // Reset status
+                })),
+              },
             },
-          },
+          });
+          await rebuildRollups({ monthId: newMonth.id }, tx);
+          return true;
+        }).catch((error) => {
+          if (isUniqueViolation(error)) return false;
+          throw error;
         });
+        if (duplicated) invalidateAdminDashboardStats();
       } else {
         console.log('[Dashboard] Previous month not found. Creating empty month...');
         // Create empty month
-        await prisma.month.create({
-          data: {
-            userId: dbUser.id,
-            month: month,
-            year: year,
-          },
-        });
+        await ensureMonth(dbUser.id, month, year);
       }
 
       // Redirect to self to load the new data
@@ -7,6 +7,7 @@ import { Button } from "@/components/ui/button";
 import { Label } from "@/components/ui/label";
 import { useToast } from "@/hooks/use-toast";
 import { useAdminSettings, useUpdateAdminSettings } from "@/hooks/use-admin-settings";
+import { ApiError } from "@/lib/api-client";
 
 type FeatureCosts = Record<string, number>
 
@@ -39,13 +40,23 @@ export default function FeatureCostsPage() {
   }
 
   const onSave = async () => {
+    if (!settings) return
     try {
       await updateSettingsMutation.mutateAsync({
         featureCosts,
-        planCredits: settings?.planCredits || {}
+        planCredits: settings.planCredits,
+        version: settings.version
       })
       toast({ title: 'Configurações salvas' })
     } catch (err) {
+      if (err instanceof ApiError && err.status === 412) {
+        toast({
+          title: 'Configurações alteradas por outro administrador',
+          description: 'Os valores atuais foram recarregados. Revise e salve novamente.',
+          variant: 'destructive'
+        })
+        return
+      }
       toast({
         title: 'Falha ao salvar',
         description: err instanceof Error ? err.message : 'Erro desconhecido',
@@ -29,6 +29,7 @@ export default function AdminStoragePage() {
 
   const items = storageData?.items || []
   const nextCursor = storageData?.nextCursor || null
+  const totals = storageData?.stats?.totals
 
   useEffect(() => {
     setSearchParams({ q, type: typeFilter, userId: userFilter })
@@ -41,7 +42,7 @@ export default function AdminStoragePage() {
 
   const uniqueTypes = Array.from(new Set(items.map(i => i.contentType).filter(Boolean))) as string[]
   const uniqueUsers = Array.from(new Set(items.map(i => i.user?.id).filter(Boolean))) as string[]
-  const userOptions = uniqueUsers.map(id => items.find(i => i.user?.id === id)!.user)
+  const userOptions = uniqueUsers.map(id => items.find(i => i.user?.id === id)!.user as StorageItem['user'] & { id: string })
 
   const onDelete = async (id: string) => {
     if (!confirm('Excluir este objeto? Isso removerá o acesso público e o marcará como excluído.')) return
@@ -176,7 +177,12 @@ export default function AdminStoragePage() {
         countLabel="arquivos"
         emptyMessage="Nenhum arquivo encontrado"
         headerContent={
-          <div className="flex justify-center">
+          <div className="flex flex-col items-center gap-1">
+            {totals ? (
+              <span className="text-xs text-muted-foreground">
+                {totals.objects} arquivos de {totals.users} usuários · {formatSize(totals.bytes)} no total
+              </span>
+            ) : null}
             {nextCursor ? (
               <span className="text-xs text-muted-foreground">Mais resultados disponíveis - ajuste os filtros para refinar</span>
             ) : (
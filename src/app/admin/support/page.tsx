@@ -1,6 +1,6 @@
 import { db } from "@/lib/db";
 import { currentUser } from "@clerk/nextjs/server";
-import { isAdmin } from "@/lib/admin-utils";
+import { isAdminUser } from "@/lib/admin-utils";
 import { redirect } from "next/navigation";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Badge } from "@/components/ui/badge";
@@ -8,7 +8,7 @@ import { Badge } from "@/components/ui/badge";
 export default async function AdminSupportPage() {
     const user = await currentUser();
 
-    if (!user || !(await isAdmin(user.id))) {
+    if (!user || !isAdminUser(user)) {
         redirect("/dashboard");
     }
 
@@ -39,21 +39,26 @@ export default function UsagePage() {
   const [filterType, setFilterType] = useState("all");
   const [searchTerm, setSearchTerm] = useState("");
   const [dateRange, setDateRange] = useState("7days");
-  const [page, setPage] = useState(1);
+  // Cursors of the pages visited so far; the last one is the current page.
+  const [cursors, setCursors] = useState<(string | null)[]>([null]);
   const [pageSize, setPageSize] = useState(25);
+  const page = cursors.length;
+  const resetPages = () => setCursors([null]);
 
   // Use TanStack Query hook for usage history data
   const { data, isLoading, error } = useUsageHistory({
     type: filterType !== "all" ? filterType : undefined,
     range: dateRange,
     q: searchTerm,
-    page,
+    cursor: cursors[cursors.length - 1],
     pageSize,
   });
 
-  // Extract usage history and total from the hook response
+  // Rows are one page; totals come from the server-side aggregates
   const usageHistory = data?.data || [];
   const total = data?.total || 0;
+  const nextCursor = data?.pageInfo.nextCursor ?? null;
+  const totalCreditsUsed = data?.analytics.totalCredits || 0;
 
   const exportToCSV = () => {
     const headers = ["Data", "Usuário", "Email", "Operação", "Créditos"];
@@ -101,11 +106,6 @@ export default function UsagePage() {
     }
   };
 
-  const totalCreditsUsed = usageHistory.reduce(
-    (sum, record) => sum + record.creditsUsed,
-    0
-  );
-
   if (isLoading) {
     return (
       <div className="flex items-center justify-center min-h-[400px]">
@@ -171,10 +171,10 @@ export default function UsagePage() {
         <Card className="p-6">
           <div className="flex items-center justify-between">
             <div>
-              <p className="text-muted-foreground text-sm">Média de Créditos/Operação (página)</p>
+              <p className="text-muted-foreground text-sm">Média de Créditos/Operação</p>
               <p className="text-2xl font-bold text-foreground mt-1">
-                {usageHistory.length > 0 
-                  ? Math.round(totalCreditsUsed / usageHistory.length)
+                {total > 0
+                  ? Math.round(totalCreditsUsed / total)
                   : 0}
               </p>
             </div>
@@ -192,11 +192,11 @@ export default function UsagePage() {
               placeholder="Pesquisar por usuário..."
               className="pl-10"
               value={searchTerm}
-              onChange={(e) => { setPage(1); setSearchTerm(e.target.value) }}
+              onChange={(e) => { resetPages(); setSearchTerm(e.target.value) }}
             />
           </div>
 
-          <Select value={filterType} onValueChange={(v) => { setPage(1); setFilterType(v) }}>
+          <Select value={filterType} onValueChange={(v) => { resetPages(); setFilterType(v) }}>
             <SelectTrigger className="w-[180px]">
               <Filter className="h-4 w-4 mr-2" />
               <SelectValue placeholder="Filtrar por tipo" />
@@ -208,7 +208,7 @@ export default function UsagePage() {
             </SelectContent>
           </Select>
 
-          <Select value={dateRange} onValueChange={(v) => { setPage(1); setDateRange(v) }}>
+          <Select value={dateRange} onValueChange={(v) => { resetPages(); setDateRange(v) }}>
             <SelectTrigger className="w-[150px]">
               <Calendar className="h-4 w-4 mr-2" />
               <SelectValue placeholder="Período" />
@@ -304,14 +304,14 @@ export default function UsagePage() {
               {total > 0 ? (
                 <span>
                   Mostrando {Math.min((page - 1) * pageSize + 1, total)}–
-                  {Math.min(page * pageSize, total)} de {total}
+                  {Math.min((page - 1) * pageSize + usageHistory.length, total)} de {total}
                 </span>
               ) : (
                 <span>0 resultados</span>
               )}
             </div>
             <div className="flex items-center gap-2">
-              <Select value={String(pageSize)} onValueChange={(v) => { setPage(1); setPageSize(Number(v)) }}>
+              <Select value={String(pageSize)} onValueChange={(v) => { resetPages(); setPageSize(Number(v)) }}>
                 <SelectTrigger className="w-[120px]">
                   <SelectValue placeholder="Linhas" />
                 </SelectTrigger>
@@ -322,10 +322,10 @@ export default function UsagePage() {
                 </SelectContent>
               </Select>
               <div className="flex items-center gap-2">
-                <Button variant="outline" disabled={page <= 1} onClick={() => setPage((p) => Math.max(1, p - 1))}>
+                <Button variant="outline" disabled={page <= 1} onClick={() => setCursors((c) => c.slice(0, -1))}>
                   Anterior
                 </Button>
-                <Button variant="outline" disabled={page * pageSize >= total} onClick={() => setPage((p) => p + 1)}>
+                <Button variant="outline" disabled={!nextCursor} onClick={() => setCursors((c) => [...c, nextCursor])}>
                   Próximo
                 </Button>
               </div>
@@ -78,11 +78,15 @@ export default function UsersPage() {
   const [confirmOpen, setConfirmOpen] = useState(false)
 
   // TanStack Query hooks
-  const { data: usersData, isLoading: usersLoading } = useAdminUsers({
-    page: 1,
-    pageSize: 1000,
-    search: searchTerm || undefined,
-    includeUsageCount: true
+  const {
+    data: usersData,
+    isLoading: usersLoading,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage
+  } = useAdminUsers({
+    pageSize: 100,
+    search: searchTerm || undefined
   });
 
   const { data: invitationsData, isLoading: invitationsLoading } = useAdminInvitations();
@@ -96,7 +100,7 @@ export default function UsersPage() {
   const resendInvitationMutation = useResendInvitation();
   const revokeInvitationMutation = useRevokeInvitation();
 
-  const users = usersData?.users || [];
+  const users = usersData?.pages.flatMap((page) => page.users) || [];
   const pendingInvites = invitationsData?.invitations || [];
   const loading = usersLoading;
   const invLoading = invitationsLoading;
@@ -458,7 +462,7 @@ export default function UsersPage() {
               },
             ]}
             searchable={true}
-            searchPlaceholder="Pesquisar usuários..."
+            searchPlaceholder="Pesquisar por nome ou email..."
             searchKeys={["name", "email"]}
             searchTerm={searchTerm}
             onSearch={setSearchTerm}
@@ -466,6 +470,17 @@ export default function UsersPage() {
             countLabel="usuários"
             emptyMessage="Nenhum usuário encontrado"
           />
+          {hasNextPage && (
+            <div className="flex justify-center mt-4">
+              <Button
+                variant="outline"
+                onClick={() => fetchNextPage()}
+                disabled={isFetchingNextPage}
+              >
+                {isFetchingNextPage ? "Carregando..." : "Carregar mais"}
+              </Button>
+            </div>
+          )}
         </TabsContent>
 
         <TabsContent value="invites">
@@ -1,19 +1,11 @@
 import { NextResponse } from "next/server";
-import { currentUser } from "@clerk/nextjs/server";
-import { createClerkClient } from "@clerk/backend";
-import { isAdmin } from "@/lib/admin-utils";
+import { requireAdmin } from "@/lib/admin-utils";
+import { withApiLogging } from "@/lib/logging/api";
 
-const clerkClient = createClerkClient({
-    secretKey: process.env.CLERK_SECRET_KEY,
-});
-
-export async function GET() {
+async function handleGet() {
     try {
-        const user = await currentUser();
-
-        if (!user || !(await isAdmin(user.id))) {
-            return new NextResponse("Unauthorized", { status: 401 });
-        }
+        const { response } = await requireAdmin();
+        if (response) return response;
 
         // Note: subscriptionPlans API is not available in current Clerk SDK
         // Returning empty array - implement custom plan management instead
@@ -27,3 +19,5 @@ export async function GET() {
         );
     }
 }
+
+export const GET = withApiLogging(handleGet, { route: "/api/admin/clerk/plans" });
@@ -1,71 +1,28 @@
 import { NextResponse } from "next/server";
-import { currentUser } from "@clerk/nextjs/server";
-import { isAdmin } from "@/lib/admin-utils";
-import { prisma } from "@/lib/db";
+import { requireAdmin } from "@/lib/admin-utils";
+import { getAdminDashboardStats } from "@/lib/queries/admin-dashboard";
+import { withApiLogging } from "@/lib/logging/api";
 
-export async function GET() {
+async function handleGet() {
     try {
-        const user = await currentUser();
+        const { response } = await requireAdmin();
+        if (response) return response;
 
-        if (!user || !(await isAdmin(user.id))) {
-            return new NextResponse("Unauthorized", { status: 401 });
-        }
-
-        // Get basic stats
-        const totalUsers = await prisma.user.count();
-        const activeUsers = await prisma.user.count({
-            where: { isActive: true },
-        });
-
-        // BI Metrics - User Growth
-        const now = new Date();
-        const firstDayOfMonth = new Date(now.getFullYear(), now.getMonth(), 1);
-        const newUsersThisMonth = await prisma.user.count({
-            where: {
-                createdAt: {
-                    gte: firstDayOfMonth
-                }
-            }
-        });
-
-        // BI Metrics - Financial
-        const allIncomes = await prisma.income.aggregate({
-            _sum: { amount: true }
-        });
-        const totalTTV = Number(allIncomes._sum.amount || 0);
-
-        const allMonths = await prisma.month.aggregate({
-            _sum: { tithePaidAmount: true }
-        });
-        const totalTitheVolume = Number(allMonths._sum.tithePaidAmount || 0);
-
-        // BI Metrics - Expense Distribution
-        const expenseDistribution = await prisma.expense.groupBy({
-            by: ['type'],
-            _sum: {
-                totalAmount: true
-            }
-        });
-        const distribution = expenseDistribution.map(d => ({
-            name: d.type,
-            value: Number(d._sum.totalAmount || 0)
-        }));
-
-        // BI Metrics - Recent Feedbacks
-        const recentFeedbacks = await prisma.feedback.findMany({
-            take: 5,
-            orderBy: { createdAt: 'desc' },
-            include: {
-                user: {
-                    select: {
-                        name: true,
-                        email: true
-                    }
-                }
-            }
-        });
+        const {
+            totalUsers,
+            activeUsers,
+            newUsersThisMonth,
+            totalTTV,
+            totalTitheVolume,
+            totalCredits,
+            usedCredits,
+            expenseDistribution: distribution,
+            recentFeedbacks,
+            ttvSeries,
+            titheSeries,
+        } = await getAdminDashboardStats();
 
-        // Mock data for revenue charts (replace with real data when available)
+        // Mock data for subscription revenue charts (replace with billing data when available)
         const mrrSeries = [
             { label: "Jan", value: 1200 },
             { label: "Fev", value: 1500 },
@@ -101,11 +58,13 @@ export async function GET() {
             totalTitheVolume,
             expenseDistribution: distribution,
             recentFeedbacks,
-            totalCredits: 0, // Placeholder
-            usedCredits: 0, // Placeholder
+            totalCredits,
+            usedCredits,
             mrrSeries,
             arrSeries,
             churnSeries,
+            ttvSeries,
+            titheSeries,
             recentActivity: [], // Placeholder
         };
 
@@ -115,3 +74,5 @@ export async function GET() {
         return new NextResponse("Internal Error", { status: 500 });
     }
 }
+
+export const GET = withApiLogging(handleGet, { route: "/api/admin/dashboard" });
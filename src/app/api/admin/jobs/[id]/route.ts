@@ -0,0 +1,31 @@
+import { NextRequest, NextResponse } from "next/server";
+import { requireAdmin } from "@/lib/admin-utils";
+import { prisma } from "@/lib/db";
+import { serializeJob } from "@/lib/jobs/background-jobs";
+import { withApiLogging } from "@/lib/logging/api";
+
+async function handleGet(
+    req: NextRequest,
+    { params }: { params: { id: string } }
+) {
+    try {
+        const { response } = await requireAdmin();
+        if (response) return response;
+
+        const { id } = params;
+        const job = await prisma.backgroundJob.findUnique({ where: { id } });
+
+        if (!job) {
+            return new NextResponse("Job not found", { status: 404 });
+        }
+
+        return NextResponse.json(serializeJob(job), {
+            headers: { "Cache-Control": "no-store" },
+        });
+    } catch (error) {
+        console.error("[ADMIN_JOB_GET]", error);
+        return new NextResponse("Internal Error", { status: 500 });
+    }
+}
+
+export const GET = withApiLogging(handleGet, { route: "/api/admin/jobs/[id]" });
@@ -0,0 +1,40 @@
+import { NextResponse } from "next/server";
+import { requireAdmin } from "@/lib/admin-utils";
+import { cache } from "@/lib/cache";
+import { metricsSnapshot, resetMetrics } from "@/lib/logging/metrics";
+import { clerkUserQueue } from "@/lib/webhooks/clerk-queue";
+
+// Not wrapped in withApiLogging so that polling this endpoint does not show
+// up in the numbers it reports.
+
+export async function GET() {
+    try {
+        const { response } = await requireAdmin();
+        if (response) return response;
+
+        return NextResponse.json(
+            {
+                ...metricsSnapshot(),
+                cache: cache.stats(),
+                clerkWebhookQueue: clerkUserQueue.stats(),
+            },
+            { headers: { "Cache-Control": "no-store" } },
+        );
+    } catch (error) {
+        console.error("[ADMIN_METRICS_GET]", error);
+        return new NextResponse("Internal Error", { status: 500 });
+    }
+}
+
+export async function DELETE() {
+    try {
+        const { response } = await requireAdmin();
+        if (response) return response;
+
+        resetMetrics();
+        return new NextResponse(null, { status: 204 });
+    } catch (error) {
+        console.error("[ADMIN_METRICS_DELETE]", error);
+        return new NextResponse("Internal Error", { status: 500 });
+    }
+}
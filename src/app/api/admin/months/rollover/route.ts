@@ -0,0 +1,183 @@
+import { after, NextResponse } from "next/server";
+import crypto from "node:crypto";
+import type { BackgroundJob } from "@prisma/client";
+import { z } from "zod";
+import { requireAdmin } from "@/lib/admin-utils";
+import { prisma } from "@/lib/db";
+import { enqueueJob, runJob, serializeJob } from "@/lib/jobs/background-jobs";
+import {
+    DEFAULT_ROLLOVER_CATEGORIES,
+    ROLLOVER_CATEGORIES,
+    rolloverAllUsers,
+    type RolloverCategory,
+    type YearMonth,
+} from "@/lib/month-rollover";
+import { withApiLogging } from "@/lib/logging/api";
+
+const batchSchema = z.object({
+    year: z.number().int().min(2000).max(2100).optional(),
+    month: z.number().int().min(1).max(12).optional(),
+    categories: z.array(z.enum(ROLLOVER_CATEGORIES)).min(1).optional(),
+    batchSize: z.number().int().min(1).max(1000).optional(),
+    cursor: z.string().nullable().optional(),
+});
+
+// The rollover runs in after() of the invocation that started it. It stops
+// taking new batches once the budget is spent, well inside maxDuration, and
+// the next run resumes from its cursor: the cron re-fires every 15 minutes
+// during the first week of the month and is a no-op once the month is done.
+export const maxDuration = 60;
+const TIME_BUDGET_MS = 45_000;
+
+type BatchParams = {
+    source: YearMonth;
+    categories: RolloverCategory[];
+    batchSize: number;
+    /** undefined resumes the last unfinished run; null starts over. */
+    cursor?: string | null;
+};
+
+/** The month before `now`, i.e. the one to roll into the current month. */
+function previousMonth(now = new Date()): YearMonth {
+    const date = new Date(now.getFullYear(), now.getMonth() - 1, 1);
+    return { year: date.getFullYear(), month: date.getMonth() + 1 };
+}
+
+/** Vercel Cron sends `Authorization: Bearer $CRON_SECRET`. */
+function isCronRequest(req: Request) {
+    const secret = process.env.CRON_SECRET;
+    const authorization = req.headers.get("authorization");
+    if (!secret || !authorization) return false;
+    const expected = Buffer.from(`Bearer ${secret}`);
+    const received = Buffer.from(authorization);
+    return expected.length === received.length && crypto.timingSafeEqual(expected, received);
+}
+
+const categoriesKey = (categories: RolloverCategory[]) => [...categories].sort().join(",");
+
+function isFinished(job: BackgroundJob) {
+    return job.status === "succeeded" && (job.result as { done?: boolean } | null)?.done === true;
+}
+
+/** The latest run for the same month and categories, to resume or skip. */
+async function findLastRun({ source, categories }: BatchParams) {
+    const runs = await prisma.backgroundJob.findMany({
+        where: {
+            type: "months.rollover",
+            AND: [
+                { params: { path: ["source", "year"], equals: source.year } },
+                { params: { path: ["source", "month"], equals: source.month } },
+            ],
+        },
+        orderBy: { createdAt: "desc" },
+        take: 10,
+    });
+    const key = categoriesKey(categories);
+    return runs.find((run) => {
+        const categories = (run.params as { categories?: RolloverCategory[] } | null)?.categories ?? [];
+        return categoriesKey(categories) === key;
+    }) ?? null;
+}
+
+async function startRollover(request: BatchParams, requestedBy?: string, { skipIfFinished = false } = {}) {
+    const lastRun = await findLastRun(request);
+    if (skipIfFinished && lastRun && isFinished(lastRun)) {
+        return NextResponse.json({ status: "done", jobId: lastRun.id, job: serializeJob(lastRun) });
+    }
+
+    const params = {
+        ...request,
+        cursor: request.cursor !== undefined
+            ? request.cursor
+            : (lastRun && !isFinished(lastRun) ? lastRun.cursor : null),
+    };
+    const { job, conflict, resumeFrom } = await enqueueJob("months.rollover", params, requestedBy);
+
+    if (conflict) {
+        return NextResponse.json(
+            { error: "A month rollover is already running", jobId: job.id, job: serializeJob(job) },
+            { status: 409 },
+        );
+    }
+
+    // Runs after the 202 is sent; progress is readable at /api/admin/jobs/[id].
+    after(() => runJob(job.id, async ({ progress }) => {
+        const totals = await rolloverAllUsers(params.source, {
+            categories: params.categories,
+            batchSize: params.batchSize,
+            cursor: params.cursor ?? resumeFrom,
+            deadline: Date.now() + TIME_BUDGET_MS,
+            onBatch: (result, cursor) => progress({
+                processed: result.targets.length,
+                created: result.createdMonths,
+                cursor,
+            }),
+        });
+        return { ...totals, categories: params.categories };
+    }));
+
+    return NextResponse.json(
+        { jobId: job.id, status: job.status, statusUrl: `/api/admin/jobs/${job.id}`, ...params },
+        { status: 202 },
+    );
+}
+
+/**
+ * Rolls a month over into the next one for every user, in batches, as a
+ * background job. Defaults to last month, so calling it at the start of a
+ * month prepares the current one. Without a `cursor` it continues the last
+ * unfinished run for the same month; repeat the call while the job result
+ * says `done: false`.
+ */
+async function handlePost(req: Request) {
+    try {
+        const { user, response } = await requireAdmin();
+        if (response) return response;
+
+        const parsed = batchSchema.safeParse(await req.json().catch(() => ({})));
+        if (!parsed.success) {
+            return NextResponse.json({ error: "Invalid rollover options", issues: parsed.error.issues }, { status: 400 });
+        }
+        const body = parsed.data;
+        if ((body.year === undefined) !== (body.month === undefined)) {
+            return NextResponse.json({ error: "year and month must be given together" }, { status: 400 });
+        }
+
+        return await startRollover({
+            source: body.year !== undefined && body.month !== undefined
+                ? { year: body.year, month: body.month }
+                : previousMonth(),
+            categories: body.categories ?? DEFAULT_ROLLOVER_CATEGORIES,
+            batchSize: body.batchSize ?? 200,
+            cursor: body.cursor,
+        }, user.id);
+    } catch (error) {
+        console.error("[ADMIN_MONTHS_ROLLOVER_POST]", error);
+        return new NextResponse("Internal Error", { status: 500 });
+    }
+}
+
+/**
+ * Scheduled entry point (see vercel.json): last month, default categories.
+ * Each call continues where the previous one stopped and does nothing once
+ * the month has been rolled over completely.
+ */
+async function handleGet(req: Request) {
+    try {
+        if (!isCronRequest(req)) {
+            return new NextResponse("Unauthorized", { status: 401 });
+        }
+
+        return await startRollover({
+            source: previousMonth(),
+            categories: DEFAULT_ROLLOVER_CATEGORIES,
+            batchSize: 200,
+        }, "cron", { skipIfFinished: true });
+    } catch (error) {
+        console.error("[ADMIN_MONTHS_ROLLOVER_CRON]", error);
+        return new NextResponse("Internal Error", { status: 500 });
+    }
+}
+
+export const GET = withApiLogging(handleGet, { route: "/api/admin/months/rollover" });
+export const POST = withApiLogging(handlePost, { route: "/api/admin/months/rollover" });
@@ -1,18 +1,16 @@
 import { NextRequest, NextResponse } from "next/server";
-import { currentUser } from "@clerk/nextjs/server";
-import { isAdmin } from "@/lib/admin-utils";
+import { requireAdmin } from "@/lib/admin-utils";
 import { prisma } from "@/lib/db";
+import { invalidatePlansCache } from "@/lib/queries/plans";
+import { withApiLogging } from "@/lib/logging/api";
 
-export async function PUT(
+async function handlePut(
     req: NextRequest,
     context: { params: { id: string } }
 ) {
     try {
-        const user = await currentUser();
-
-        if (!user || !(await isAdmin(user.id))) {
-            return new NextResponse("Unauthorized", { status: 401 });
-        }
+        const { response } = await requireAdmin();
+        if (response) return response;
 
         const { id } = context.params;
         const body = await req.json();
@@ -39,6 +37,8 @@ export async function PUT(
             },
         });
 
+        invalidatePlansCache();
+
         return NextResponse.json(updatedPlan);
     } catch (error) {
         console.error("[ADMIN_PLAN_PUT]", error);
@@ -46,16 +46,13 @@ export async function PUT(
     }
 }
 
-export async function DELETE(
+async function handleDelete(
     req: NextRequest,
     context: { params: { id: string } }
 ) {
     try {
-        const user = await currentUser();
-
-        if (!user || !(await isAdmin(user.id))) {
-            return new NextResponse("Unauthorized", { status: 401 });
-        }
+        const { response } = await requireAdmin();
+        if (response) return response;
 
         const { id } = context.params;
 
@@ -63,6 +60,7 @@ export async function DELETE(
         await prisma.plan.delete({
             where: { id },
         });
+        invalidatePlansCache();
 
         return NextResponse.json({ success: true });
     } catch (error) {
@@ -70,3 +68,6 @@ export async function DELETE(
         return new NextResponse("Internal Error", { status: 500 });
     }
 }
+
+export const PUT = withApiLogging(handlePut, { route: "/api/admin/plans/[id]" });
+export const DELETE = withApiLogging(handleDelete, { route: "/api/admin/plans/[id]" });
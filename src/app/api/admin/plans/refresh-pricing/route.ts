@@ -1,65 +1,81 @@
-import { NextResponse } from "next/server";
-import { currentUser } from "@clerk/nextjs/server";
-import { createClerkClient } from "@clerk/backend";
-import { isAdmin } from "@/lib/admin-utils";
+import { after, NextResponse } from "next/server";
+import { requireAdmin } from "@/lib/admin-utils";
 import { prisma } from "@/lib/db";
+import { invalidatePlansCache } from "@/lib/queries/plans";
+import { enqueueJob, runJob, serializeJob, type JobContext } from "@/lib/jobs/background-jobs";
+import { withApiLogging } from "@/lib/logging/api";
 
-const clerkClient = createClerkClient({
-    secretKey: process.env.CLERK_SECRET_KEY,
-});
+async function refreshPricing({ progress }: JobContext) {
+    // Note: subscriptionPlans API is not available in current Clerk SDK
+    // Skipping Clerk plan fetch - plans should be managed in database
+    const clerkPlans: any[] = [];
 
-export async function POST() {
-    try {
-        const user = await currentUser();
-
-        if (!user || !(await isAdmin(user.id))) {
-            return new NextResponse("Unauthorized", { status: 401 });
-        }
+    let updated = 0;
+    let missingInDb = 0;
 
-        // Note: subscriptionPlans API is not available in current Clerk SDK
-        // Skipping Clerk plan fetch - plans should be managed in database
-        const clerkPlans: any[] = [];
+    // Update pricing for existing plans
+    for (const clerkPlan of clerkPlans) {
+        const existingPlan = await prisma.plan.findUnique({
+            where: { clerkId: clerkPlan.id },
+        });
 
-        let updated = 0;
-        let missingInDb = 0;
+        if (existingPlan) {
+            // Extract pricing from Clerk plan
+            const monthlyPrice = clerkPlan.prices?.find(
+                (p: any) => p.recurring?.interval === 'month' && p.recurring?.interval_count === 1
+            );
+            const yearlyPrice = clerkPlan.prices?.find(
+                (p: any) => p.recurring?.interval === 'year' && p.recurring?.interval_count === 1
+            );
 
-        // Update pricing for existing plans
-        for (const clerkPlan of clerkPlans) {
-            const existingPlan = await prisma.plan.findUnique({
+            await prisma.plan.update({
                 where: { clerkId: clerkPlan.id },
+                data: {
+                    priceMonthlyCents: monthlyPrice?.unit_amount ?? null,
+                    priceYearlyCents: yearlyPrice?.unit_amount ?? null,
+                    currency: monthlyPrice?.currency || yearlyPrice?.currency || 'brl',
+                    clerkName: clerkPlan.name || existingPlan.clerkName,
+                },
             });
 
-            if (existingPlan) {
-                // Extract pricing from Clerk plan
-                const monthlyPrice = clerkPlan.prices?.find(
-                    (p: any) => p.recurring?.interval === 'month' && p.recurring?.interval_count === 1
-                );
-                const yearlyPrice = clerkPlan.prices?.find(
-                    (p: any) => p.recurring?.interval === 'year' && p.recurring?.interval_count === 1
-                );
+            updated++;
+            await progress({ processed: 1, updated: 1 });
+        } else {
+            missingInDb++;
+            await progress({ processed: 1 });
+        }
+    }
 
-                await prisma.plan.update({
-                    where: { clerkId: clerkPlan.id },
-                    data: {
-                        priceMonthlyCents: monthlyPrice?.unit_amount ?? null,
-                        priceYearlyCents: yearlyPrice?.unit_amount ?? null,
-                        currency: monthlyPrice?.currency || yearlyPrice?.currency || 'brl',
-                        clerkName: clerkPlan.name || existingPlan.clerkName,
-                    },
-                });
+    if (updated > 0) invalidatePlansCache();
+
+    return {
+        success: true,
+        updated,
+        missingInDb,
+        message: `Preços atualizados: ${updated} planos. ${missingInDb} planos do Clerk não encontrados no DB.`,
+    };
+}
 
-                updated++;
-            } else {
-                missingInDb++;
-            }
+async function handlePost() {
+    try {
+        const { user, response } = await requireAdmin();
+        if (response) return response;
+
+        const { job, conflict } = await enqueueJob("plans.refresh-pricing", {}, user.id);
+
+        if (conflict) {
+            return NextResponse.json(
+                { error: "A pricing refresh is already running", jobId: job.id, job: serializeJob(job) },
+                { status: 409 },
+            );
         }
 
-        return NextResponse.json({
-            success: true,
-            updated,
-            missingInDb,
-            message: `Preços atualizados: ${updated} planos. ${missingInDb} planos do Clerk não encontrados no DB.`,
-        });
+        after(() => runJob(job.id, refreshPricing));
+
+        return NextResponse.json(
+            { success: true, jobId: job.id, status: job.status, statusUrl: `/api/admin/jobs/${job.id}` },
+            { status: 202 },
+        );
     } catch (error) {
         console.error("[ADMIN_REFRESH_PRICING_POST]", error);
         return new NextResponse(
@@ -68,3 +84,5 @@ export async function POST() {
         );
     }
 }
+
+export const POST = withApiLogging(handlePost, { route: "/api/admin/plans/refresh-pricing" });
@@ -1,15 +1,13 @@
 import { NextResponse } from "next/server";
-import { currentUser } from "@clerk/nextjs/server";
-import { isAdmin } from "@/lib/admin-utils";
+import { requireAdmin } from "@/lib/admin-utils";
 import { prisma } from "@/lib/db";
+import { invalidatePlansCache } from "@/lib/queries/plans";
+import { withApiLogging } from "@/lib/logging/api";
 
-export async function GET() {
+async function handleGet() {
     try {
-        const user = await currentUser();
-
-        if (!user || !(await isAdmin(user.id))) {
-            return new NextResponse("Unauthorized", { status: 401 });
-        }
+        const { response } = await requireAdmin();
+        if (response) return response;
 
         const plans = await prisma.plan.findMany({
             orderBy: { createdAt: 'desc' },
@@ -28,13 +26,10 @@ export async function GET() {
     }
 }
 
-export async function POST(req: Request) {
+async function handlePost(req: Request) {
     try {
-        const user = await currentUser();
-
-        if (!user || !(await isAdmin(user.id))) {
-            return new NextResponse("Unauthorized", { status: 401 });
-        }
+        const { response } = await requireAdmin();
+        if (response) return response;
 
         const body = await req.json();
 
@@ -58,9 +53,14 @@ export async function POST(req: Request) {
             },
         });
 
+        invalidatePlansCache();
+
         return NextResponse.json(plan);
     } catch (error) {
         console.error("[ADMIN_PLANS_POST]", error);
         return new NextResponse("Internal Error", { status: 500 });
     }
 }
+
+export const GET = withApiLogging(handleGet, { route: "/api/admin/plans" });
+export const POST = withApiLogging(handlePost, { route: "/api/admin/plans" });
@@ -1,24 +1,74 @@
 import { NextResponse } from "next/server";
-import { currentUser } from "@clerk/nextjs/server";
-import { isAdmin } from "@/lib/admin-utils";
+import { requireAdmin } from "@/lib/admin-utils";
+import {
+    creditSettingsSchema,
+    getCreditSettings,
+    updateCreditSettings,
+    type VersionedCreditSettings,
+} from "@/lib/credits/settings";
+import { withApiLogging } from "@/lib/logging/api";
 
-export async function GET() {
+function settingsResponse({ version, settings, updatedAt }: VersionedCreditSettings, status = 200) {
+    return NextResponse.json(
+        { ...settings, version, updatedAt },
+        { status, headers: { ETag: `"${version}"`, "Cache-Control": "no-store" } },
+    );
+}
+
+/** The version in `If-Match: "<version>"`; `*` means whatever is stored now. */
+function parseIfMatch(header: string | null, current: number): number | null {
+    const value = header?.trim();
+    if (!value) return null;
+    if (value === "*") return current;
+    const match = value.match(/^"(\d+)"$/);
+    return match ? Number(match[1]) : NaN;
+}
+
+async function handleGet() {
     try {
-        const user = await currentUser();
+        const { response } = await requireAdmin();
+        if (response) return response;
 
-        if (!user || !(await isAdmin(user.id))) {
-            return new NextResponse("Unauthorized", { status: 401 });
+        return settingsResponse(await getCreditSettings({ fresh: true }));
+    } catch (error) {
+        console.error("[ADMIN_SETTINGS_GET]", error);
+        return new NextResponse("Internal Error", { status: 500 });
+    }
+}
+
+async function handlePut(req: Request) {
+    try {
+        const { user, response } = await requireAdmin();
+        if (response) return response;
+
+        const current = await getCreditSettings({ fresh: true });
+        const expectedVersion = parseIfMatch(req.headers.get("if-match"), current.version);
+        if (expectedVersion === null) {
+            return NextResponse.json(
+                { error: "If-Match header with the settings version is required" },
+                { status: 428 },
+            );
+        }
+        if (Number.isNaN(expectedVersion)) {
+            return settingsResponse(current, 412);
         }
 
-        // Placeholder: Return default settings
-        return NextResponse.json({
-            featureCosts: {
-                ai_text_chat: 1,
-                ai_image_generation: 5,
-            },
-        });
+        const parsed = creditSettingsSchema.safeParse(await req.json());
+        if (!parsed.success) {
+            return NextResponse.json(
+                { error: "Invalid settings", issues: parsed.error.issues },
+                { status: 400 },
+            );
+        }
+
+        const result = await updateCreditSettings(parsed.data, expectedVersion, user.id);
+        // 412 carries the current settings and ETag so the client can rebase.
+        return settingsResponse(result.settings, result.conflict ? 412 : 200);
     } catch (error) {
-        console.error("[ADMIN_SETTINGS_GET]", error);
+        console.error("[ADMIN_SETTINGS_PUT]", error);
         return new NextResponse("Internal Error", { status: 500 });
     }
 }
+
+export const GET = withApiLogging(handleGet, { route: "/api/admin/settings" });
+export const PUT = withApiLogging(handlePut, { route: "/api/admin/settings" });
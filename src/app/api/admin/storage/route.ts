@@ -1,19 +1,103 @@
 import { NextResponse } from "next/server";
-import { currentUser } from "@clerk/nextjs/server";
-import { isAdmin } from "@/lib/admin-utils";
+import { requireAdmin } from "@/lib/admin-utils";
+import { decodeCursor, parsePageSize } from "@/lib/pagination";
+import { getStorageStats, listStorage, parseStorageFilters, streamStorage } from "@/lib/queries/storage";
+import { withApiLogging } from "@/lib/logging/api";
 
-export async function GET() {
+const NDJSON = "application/x-ndjson";
+// An export stops here and hands back a cursor; the client resumes from it.
+const MAX_STREAM_LIMIT = 100_000;
+
+function wantsNdjson(req: Request, searchParams: URLSearchParams) {
+    return searchParams.get("format") === "ndjson" || (req.headers.get("accept") ?? "").includes(NDJSON);
+}
+
+/**
+ * Lists stored objects newest first, filtered in the database. JSON pages by
+ * default; with `format=ndjson` (or `Accept: application/x-ndjson`) the
+ * matching objects are streamed one per line, read in keyset batches, so an
+ * export never holds more than one batch in memory. The first page also
+ * carries totals for the whole filtered set.
+ */
+async function handleGet(req: Request) {
     try {
-        const user = await currentUser();
+        const { response } = await requireAdmin();
+        if (response) return response;
+
+        const { searchParams } = new URL(req.url);
 
-        if (!user || !(await isAdmin(user.id))) {
-            return new NextResponse("Unauthorized", { status: 401 });
+        const filters = parseStorageFilters(searchParams);
+        if (!filters) {
+            return new NextResponse("Invalid startDate or endDate", { status: 400 });
         }
 
-        // Placeholder: Return empty list
-        return NextResponse.json([]);
+        const rawCursor = searchParams.get("cursor");
+        const cursor = decodeCursor(rawCursor);
+        if (rawCursor && !cursor) {
+            return new NextResponse("Invalid cursor", { status: 400 });
+        }
+
+        // Totals describe the filter, not the page, so continuation requests skip them.
+        const withStats = !cursor && searchParams.get("stats") !== "0";
+        const rawLimit = searchParams.get("limit") ?? searchParams.get("pageSize");
+
+        if (wantsNdjson(req, searchParams)) {
+            const limit = parsePageSize(rawLimit, MAX_STREAM_LIMIT, MAX_STREAM_LIMIT);
+            const stats = withStats ? await getStorageStats(filters) : null;
+            const batches = streamStorage(filters, cursor, limit);
+            const encoder = new TextEncoder();
+            let count = 0;
+
+            const body = new ReadableStream<Uint8Array>({
+                start(controller) {
+                    if (stats) controller.enqueue(encoder.encode(`${JSON.stringify({ type: "stats", ...stats })}\n`));
+                },
+                // Pulled on demand, so a slow reader throttles the queries.
+                async pull(controller) {
+                    try {
+                        const { value, done } = await batches.next();
+                        if (done) {
+                            controller.close();
+                            return;
+                        }
+                        count += value.items.length;
+                        const lines = value.items.map((item) => JSON.stringify({ type: "item", ...item }));
+                        if (value.pageInfo) {
+                            lines.push(JSON.stringify({ type: "end", count, ...value.pageInfo }));
+                        }
+                        if (lines.length) controller.enqueue(encoder.encode(`${lines.join("\n")}\n`));
+                    } catch (error) {
+                        console.error("[ADMIN_STORAGE_STREAM]", error);
+                        controller.error(error);
+                    }
+                },
+                async cancel() {
+                    await batches.return(undefined);
+                },
+            });
+
+            return new Response(body, {
+                headers: { "Content-Type": `${NDJSON}; charset=utf-8`, "Cache-Control": "no-store" },
+            });
+        }
+
+        const pageSize = parsePageSize(rawLimit, 50);
+        const [page, stats] = await Promise.all([
+            listStorage(filters, cursor, pageSize),
+            withStats ? getStorageStats(filters) : null,
+        ]);
+
+        return NextResponse.json({
+            items: page.items,
+            pageInfo: page.pageInfo,
+            nextCursor: page.pageInfo.nextCursor,
+            pageSize,
+            ...(stats ? { stats } : {}),
+        });
     } catch (error) {
         console.error("[ADMIN_STORAGE_GET]", error);
         return new NextResponse("Internal Error", { status: 500 });
     }
 }
+
+export const GET = withApiLogging(handleGet, { route: "/api/admin/storage" });
@@ -1,36 +1,57 @@
 import { NextResponse } from "next/server";
-import { currentUser } from "@clerk/nextjs/server";
-import { isAdmin } from "@/lib/admin-utils";
+import { requireAdmin } from "@/lib/admin-utils";
+import { decodeCursor, parsePageSize } from "@/lib/pagination";
+import {
+    defaultBucket,
+    getUsageAnalytics,
+    listUsage,
+    parseUsageFilters,
+    type UsageBucket,
+} from "@/lib/queries/usage";
+import { withApiLogging } from "@/lib/logging/api";
 
-export async function GET(req: Request) {
+async function handleGet(req: Request) {
     try {
-        const user = await currentUser();
+        const { response } = await requireAdmin();
+        if (response) return response;
 
-        if (!user || !(await isAdmin(user.id))) {
-            return new NextResponse("Unauthorized", { status: 401 });
+        const { searchParams } = new URL(req.url);
+
+        const filters = parseUsageFilters(searchParams);
+        if (!filters) {
+            return new NextResponse("Invalid startDate or endDate", { status: 400 });
+        }
+
+        const rawCursor = searchParams.get("cursor");
+        const cursor = decodeCursor(rawCursor);
+        if (rawCursor && !cursor) {
+            return new NextResponse("Invalid cursor", { status: 400 });
         }
 
-        // Mock data for usage history
-        const mockData = Array.from({ length: 20 }).map((_, i) => ({
-            id: `usage-${i}`,
-            user: {
-                name: `User ${i + 1}`,
-                email: `user${i + 1}@example.com`
-            },
-            operationType: i % 2 === 0 ? "AI_TEXT_CHAT" : "AI_IMAGE_GENERATION",
-            creditsUsed: Math.floor(Math.random() * 10) + 1,
-            details: { model: "gpt-4", tokens: 150 },
-            timestamp: new Date(Date.now() - i * 3600000).toISOString()
-        }));
+        const bucketParam = searchParams.get("bucket");
+        if (bucketParam && bucketParam !== "hour" && bucketParam !== "day") {
+            return new NextResponse("bucket must be 'hour' or 'day'", { status: 400 });
+        }
+        const bucket = (bucketParam as UsageBucket | null) ?? defaultBucket(filters);
+        const pageSize = parsePageSize(searchParams.get("pageSize"), 25);
+
+        const [page, analytics] = await Promise.all([
+            listUsage(filters, cursor, pageSize),
+            getUsageAnalytics(filters, bucket),
+        ]);
 
         return NextResponse.json({
-            data: mockData,
-            total: 20,
-            page: 1,
-            pageSize: 25
+            data: page.data,
+            pageInfo: page.pageInfo,
+            nextCursor: page.pageInfo.nextCursor,
+            total: analytics.totalOperations,
+            pageSize,
+            analytics,
         });
     } catch (error) {
         console.error("[ADMIN_USAGE_GET]", error);
         return new NextResponse("Internal Error", { status: 500 });
     }
 }
+
+export const GET = withApiLogging(handleGet, { route: "/api/admin/usage" });
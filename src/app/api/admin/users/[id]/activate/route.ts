@@ -1,18 +1,15 @@
 import { NextRequest, NextResponse } from "next/server";
-import { currentUser } from "@clerk/nextjs/server";
-import { isAdmin } from "@/lib/admin-utils";
+import { requireAdmin } from "@/lib/admin-utils";
 import { prisma } from "@/lib/db";
+import { withApiLogging } from "@/lib/logging/api";
 
-export async function POST(
+async function handlePost(
     req: NextRequest,
     { params }: { params: { id: string } }
 ) {
     try {
-        const user = await currentUser();
-
-        if (!user || !(await isAdmin(user.id))) {
-            return new NextResponse("Unauthorized", { status: 401 });
-        }
+        const { response } = await requireAdmin();
+        if (response) return response;
 
         const { id } = params;
 
@@ -28,3 +25,5 @@ export async function POST(
         return new NextResponse("Internal Error", { status: 500 });
     }
 }
+
+export const POST = withApiLogging(handlePost, { route: "/api/admin/users/[id]/activate" });
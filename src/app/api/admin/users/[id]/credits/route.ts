@@ -0,0 +1,197 @@
+import { NextRequest, NextResponse } from "next/server";
+import { z } from "zod";
+import { requireAdmin } from "@/lib/admin-utils";
+import { prisma } from "@/lib/db";
+import { debitCreditsBatch, refundCredits, setCredits, type DebitResult } from "@/lib/credits/ledger";
+import { withApiLogging } from "@/lib/logging/api";
+
+const ADMIN_ADJUSTMENT = "admin_adjustment";
+
+const setSchema = z.object({
+    creditsRemaining: z.number().int().nonnegative(),
+});
+
+const chargeSchema = z.object({
+    operation: z.string().min(1).max(64),
+    amount: z.number().int().nonnegative(),
+    details: z.record(z.string(), z.json()).optional(),
+});
+
+// Either a signed adjustment or a batch of charges to debit together.
+const adjustSchema = z.union([
+    z.object({ adjustment: z.number().int(), reason: z.string().max(200).optional() }),
+    z.object({ charges: z.array(chargeSchema).min(1).max(500) }),
+]);
+
+// Charges made by credits_stress.py; the only usage rows that may be deleted.
+const STRESS_TEST = "stress_test";
+
+const purgeSchema = z.object({
+    operation: z.literal(STRESS_TEST),
+    since: z.coerce.date().optional(),
+});
+
+function debitResponse(userId: string, result: DebitResult) {
+    if (result.creditsRemaining === null) {
+        return NextResponse.json({ error: "User has no credit balance" }, { status: 404 });
+    }
+    if (result.insufficient) {
+        return NextResponse.json(
+            { error: "Insufficient credits", userId, creditsRemaining: result.creditsRemaining },
+            { status: 409 },
+        );
+    }
+    return NextResponse.json({ userId, creditsRemaining: result.creditsRemaining });
+}
+
+async function handleGet(
+    req: NextRequest,
+    { params }: { params: { id: string } }
+) {
+    try {
+        const { response } = await requireAdmin();
+        if (response) return response;
+
+        const balance = await prisma.creditBalance.findUnique({
+            where: { userId: params.id },
+            select: { creditsRemaining: true, lastSyncedAt: true, updatedAt: true },
+        });
+        if (!balance) {
+            return NextResponse.json({ error: "User has no credit balance" }, { status: 404 });
+        }
+
+        return NextResponse.json({ userId: params.id, ...balance });
+    } catch (error) {
+        console.error("[ADMIN_USER_CREDITS_GET]", error);
+        return new NextResponse("Internal Error", { status: 500 });
+    }
+}
+
+async function handlePut(
+    req: NextRequest,
+    { params }: { params: { id: string } }
+) {
+    try {
+        const { response } = await requireAdmin();
+        if (response) return response;
+
+        const parsed = setSchema.safeParse(await req.json());
+        if (!parsed.success) {
+            return NextResponse.json({ error: "creditsRemaining must be a non-negative integer" }, { status: 400 });
+        }
+
+        const creditsRemaining = await setCredits(params.id, parsed.data.creditsRemaining);
+        if (creditsRemaining === null) {
+            return NextResponse.json({ error: "User not found" }, { status: 404 });
+        }
+
+        return NextResponse.json({ userId: params.id, creditsRemaining });
+    } catch (error) {
+        console.error("[ADMIN_USER_CREDITS_PUT]", error);
+        return new NextResponse("Internal Error", { status: 500 });
+    }
+}
+
+async function handlePost(
+    req: NextRequest,
+    { params }: { params: { id: string } }
+) {
+    try {
+        const { user, response } = await requireAdmin();
+        if (response) return response;
+
+        const parsed = adjustSchema.safeParse(await req.json());
+        if (!parsed.success) {
+            return NextResponse.json({ error: "Expected { adjustment } or { charges }", issues: parsed.error.issues }, { status: 400 });
+        }
+        const body = parsed.data;
+
+        if ("charges" in body) {
+            return debitResponse(params.id, await debitCreditsBatch(params.id, body.charges));
+        }
+
+        const charge = {
+            operation: ADMIN_ADJUSTMENT,
+            amount: Math.abs(body.adjustment),
+            details: { adminId: user.id, ...(body.reason ? { reason: body.reason } : {}) },
+        };
+
+        if (body.adjustment < 0) {
+            return debitResponse(params.id, await debitCreditsBatch(params.id, [charge]));
+        }
+
+        const creditsRemaining = await refundCredits(params.id, charge);
+        if (creditsRemaining === null) {
+            return NextResponse.json({ error: "User not found" }, { status: 404 });
+        }
+        return NextResponse.json({ userId: params.id, creditsRemaining });
+    } catch (error) {
+        console.error("[ADMIN_USER_CREDITS_POST]", error);
+        return new NextResponse("Internal Error", { status: 500 });
+    }
+}
+
+/**
+ * Deletes the user's `stress_test` usage rows, optionally only those created
+ * at or after `since`, so a load test can remove the charges it made. The
+ * balance is left as is. The purge itself is recorded as a zero-credit
+ * admin adjustment.
+ */
+async function handleDelete(
+    req: NextRequest,
+    { params }: { params: { id: string } }
+) {
+    try {
+        const { user, response } = await requireAdmin();
+        if (response) return response;
+
+        const { searchParams } = new URL(req.url);
+        const parsed = purgeSchema.safeParse({
+            operation: searchParams.get("operation") ?? undefined,
+            since: searchParams.get("since") ?? undefined,
+        });
+        if (!parsed.success) {
+            return NextResponse.json(
+                { error: `Expected ?operation=${STRESS_TEST}[&since=<ISO date>]`, issues: parsed.error.issues },
+                { status: 400 },
+            );
+        }
+        const { operation, since } = parsed.data;
+
+        const deleted = await prisma.$transaction(async (tx) => {
+            const target = await tx.user.findUnique({ where: { id: params.id }, select: { clerkId: true } });
+            if (!target) return null;
+
+            const { count } = await tx.usageHistory.deleteMany({
+                where: { userId: params.id, operation, ...(since ? { createdAt: { gte: since } } : {}) },
+            });
+            await tx.usageHistory.create({
+                data: {
+                    userId: params.id,
+                    clerkUserId: target.clerkId,
+                    operation: ADMIN_ADJUSTMENT,
+                    creditsUsed: 0,
+                    details: {
+                        adminId: user.id,
+                        reason: `purged ${count} ${operation} usage rows`,
+                        purged: { operation, deleted: count, ...(since ? { since: since.toISOString() } : {}) },
+                    },
+                },
+            });
+            return count;
+        });
+        if (deleted === null) {
+            return NextResponse.json({ error: "User not found" }, { status: 404 });
+        }
+
+        return NextResponse.json({ userId: params.id, operation, deleted });
+    } catch (error) {
+        console.error("[ADMIN_USER_CREDITS_DELETE]", error);
+        return new NextResponse("Internal Error", { status: 500 });
+    }
+}
+
+export const GET = withApiLogging(handleGet, { route: "/api/admin/users/[id]/credits" });
+export const PUT = withApiLogging(handlePut, { route: "/api/admin/users/[id]/credits" });
+export const POST = withApiLogging(handlePost, { route: "/api/admin/users/[id]/credits" });
+export const DELETE = withApiLogging(handleDelete, { route: "/api/admin/users/[id]/credits" });
@@ -1,18 +1,15 @@
 import { NextRequest, NextResponse } from "next/server";
-import { currentUser } from "@clerk/nextjs/server";
-import { isAdmin } from "@/lib/admin-utils";
+import { requireAdmin } from "@/lib/admin-utils";
 import { prisma } from "@/lib/db";
+import { withApiLogging } from "@/lib/logging/api";
 
-export async function PUT(
+async function handlePut(
     req: NextRequest,
     { params }: { params: { id: string } }
 ) {
     try {
-        const user = await currentUser();
-
-        if (!user || !(await isAdmin(user.id))) {
-            return new NextResponse("Unauthorized", { status: 401 });
-        }
+        const { response } = await requireAdmin();
+        if (response) return response;
 
         const { id } = params;
         const body = await req.json();
@@ -34,16 +31,13 @@ export async function PUT(
     }
 }
 
-export async function DELETE(
+async function handleDelete(
     req: NextRequest,
     { params }: { params: { id: string } }
 ) {
     try {
-        const user = await currentUser();
-
-        if (!user || !(await isAdmin(user.id))) {
-            return new NextResponse("Unauthorized", { status: 401 });
-        }
+        const { response } = await requireAdmin();
+        if (response) return response;
 
         const { id } = params;
 
@@ -59,3 +53,6 @@ export async function DELETE(
         return new NextResponse("Internal Error", { status: 500 });
     }
 }
+
+export const PUT = withApiLogging(handlePut, { route: "/api/admin/users/[id]" });
+export const DELETE = withApiLogging(handleDelete, { route: "/api/admin/users/[id]" });
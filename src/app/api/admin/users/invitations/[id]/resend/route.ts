@@ -1,22 +1,15 @@
 import { NextRequest, NextResponse } from "next/server";
-import { currentUser } from "@clerk/nextjs/server";
-import { createClerkClient } from "@clerk/backend";
-import { isAdmin } from "@/lib/admin-utils";
+import { clerkClient } from "@/lib/clerk/client";
+import { requireAdmin } from "@/lib/admin-utils";
+import { withApiLogging } from "@/lib/logging/api";
 
-const clerkClient = createClerkClient({
-    secretKey: process.env.CLERK_SECRET_KEY,
-});
-
-export async function POST(
+async function handlePost(
     req: NextRequest,
     { params }: { params: { id: string } }
 ) {
     try {
-        const user = await currentUser();
-
-        if (!user || !(await isAdmin(user.id))) {
-            return new NextResponse("Unauthorized", { status: 401 });
-        }
+        const { response } = await requireAdmin();
+        if (response) return response;
 
         const { id } = params;
 
@@ -56,3 +49,5 @@ export async function POST(
         );
     }
 }
+
+export const POST = withApiLogging(handlePost, { route: "/api/admin/users/invitations/[id]/resend" });
@@ -1,19 +1,12 @@
 import { NextRequest, NextResponse } from "next/server";
-import { currentUser } from "@clerk/nextjs/server";
-import { createClerkClient } from "@clerk/backend";
-import { isAdmin } from "@/lib/admin-utils";
+import { clerkClient } from "@/lib/clerk/client";
+import { requireAdmin } from "@/lib/admin-utils";
+import { withApiLogging } from "@/lib/logging/api";
 
-const clerkClient = createClerkClient({
-    secretKey: process.env.CLERK_SECRET_KEY,
-});
-
-export async function GET(req: NextRequest) {
+async function handleGet(req: NextRequest) {
     try {
-        const user = await currentUser();
-
-        if (!user || !(await isAdmin(user.id))) {
-            return new NextResponse("Unauthorized", { status: 401 });
-        }
+        const { response } = await requireAdmin();
+        if (response) return response;
 
         // Get pending invitations from Clerk
         const invitations = await clerkClient.invitations.getInvitationList({
@@ -37,3 +30,5 @@ export async function GET(req: NextRequest) {
         );
     }
 }
+
+export const GET = withApiLogging(handleGet, { route: "/api/admin/users/invitations" });
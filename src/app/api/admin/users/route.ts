@@ -1,32 +1,82 @@
 import { NextResponse } from "next/server";
-import { currentUser } from "@clerk/nextjs/server";
-import { isAdmin } from "@/lib/admin-utils";
+import type { Prisma } from "@prisma/client";
+import { requireAdmin } from "@/lib/admin-utils";
 import { prisma } from "@/lib/db";
+import { decodeCursor, keysetWhere, paginate, parsePageSize } from "@/lib/pagination";
+import { withApiLogging } from "@/lib/logging/api";
 
-export async function GET() {
+function buildFilters(searchParams: URLSearchParams): Prisma.UserWhereInput {
+    const where: Prisma.UserWhereInput = {};
+
+    // Case-insensitive substring match (ILIKE '%term%'), served by the
+    // pg_trgm GIN indexes on email and name; a btree index cannot serve it.
+    const search = searchParams.get("search")?.trim();
+    if (search) {
+        where.OR = [
+            { email: { contains: search, mode: "insensitive" } },
+            { name: { contains: search, mode: "insensitive" } },
+        ];
+    }
+
+    const isActive = searchParams.get("isActive");
+    if (isActive === "true" || isActive === "false") {
+        where.isActive = isActive === "true";
+    }
+
+    return where;
+}
+
+async function estimateUserCount(): Promise<number> {
+    // Planner statistics instead of COUNT(*); refreshed by autovacuum/ANALYZE.
+    // reltuples is -1 until the table has been analyzed for the first time.
+    const [row] = await prisma.$queryRaw<{ estimate: number }[]>`
+        SELECT reltuples::int AS "estimate" FROM pg_class WHERE oid = '"User"'::regclass
+    `;
+    if (!row || row.estimate < 0) return prisma.user.count();
+    return row.estimate;
+}
+
+async function handleGet(req: Request) {
     try {
-        const user = await currentUser();
+        const { response } = await requireAdmin();
+        if (response) return response;
+
+        const { searchParams } = new URL(req.url);
+        const pageSize = parsePageSize(searchParams.get("pageSize"));
+        const rawCursor = searchParams.get("cursor");
+        const cursor = decodeCursor(rawCursor);
 
-        if (!user || !(await isAdmin(user.id))) {
-            return new NextResponse("Unauthorized", { status: 401 });
+        if (rawCursor && !cursor) {
+            return new NextResponse("Invalid cursor", { status: 400 });
         }
 
-        // Get all users with their month count
-        const users = await prisma.user.findMany({
-            include: {
-                _count: {
-                    select: {
-                        months: true,
+        const filters = buildFilters(searchParams);
+        const filtered = Object.keys(filters).length > 0;
+
+        const [users, total] = await Promise.all([
+            prisma.user.findMany({
+                where: { AND: [filters, keysetWhere(cursor)] },
+                include: {
+                    _count: {
+                        select: {
+                            months: true,
+                        },
                     },
                 },
-            },
-            orderBy: {
-                createdAt: "desc",
-            },
-        });
+                orderBy: [{ createdAt: "desc" }, { id: "desc" }],
+                take: pageSize + 1,
+            }),
+            // Filtered lists are counted exactly once, on the first page; the
+            // unfiltered total comes from table statistics.
+            filtered
+                ? (cursor ? Promise.resolve(null) : prisma.user.count({ where: filters }))
+                : estimateUserCount(),
+        ]);
+
+        const { items, pageInfo } = paginate(users, pageSize);
 
         // Format response
-        const formattedUsers = users.map((u) => ({
+        const formattedUsers = items.map((u) => ({
             id: u.id,
             clerkId: u.clerkId,
             email: u.email,
@@ -37,9 +87,16 @@ export async function GET() {
             monthsCount: u._count.months,
         }));
 
-        return NextResponse.json({ users: formattedUsers });
+        return NextResponse.json({
+            users: formattedUsers,
+            pageInfo,
+            totalEstimate: total,
+            totalExact: filtered && total !== null,
+        });
     } catch (error) {
         console.error("[ADMIN_USERS_GET]", error);
         return new NextResponse("Internal Error", { status: 500 });
     }
 }
+
+export const GET = withApiLogging(handleGet, { route: "/api/admin/users" });
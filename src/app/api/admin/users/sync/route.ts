@@ -1,109 +1,72 @@
-import { NextResponse } from "next/server";
-import { currentUser } from "@clerk/nextjs/server";
-import { createClerkClient } from "@clerk/backend";
-import { isAdmin } from "@/lib/admin-utils";
-import { prisma } from "@/lib/db";
+import { after, NextResponse } from "next/server";
+import { syncClerkUsers } from "@/lib/clerk/user-sync";
+import { enqueueJob, runJob, serializeJob } from "@/lib/jobs/background-jobs";
+import { requireAdmin } from "@/lib/admin-utils";
+import { withApiLogging } from "@/lib/logging/api";
 
-const clerkClient = createClerkClient({
-    secretKey: process.env.CLERK_SECRET_KEY,
-});
-
-export async function POST(req: Request) {
+async function handlePost(req: Request) {
     try {
-        const user = await currentUser();
-
-        if (!user || !(await isAdmin(user.id))) {
-            return new NextResponse("Unauthorized", { status: 401 });
-        }
+        const { user, response } = await requireAdmin();
+        if (response) return response;
 
-        const body = await req.json();
+        // The admin UI and TC005 post without a body; fall back to the defaults.
+        const body = await req.json().catch(() => ({}));
         const {
             syncUsers = true,
-            syncPlans = false,
-            setCredits = false,
-            overrideCredits,
             pageSize = 100,
             maxPages = 50,
+            cursor = null,
             debug = false,
         } = body;
 
-        let processed = 0;
-        let createdUsers = 0;
-        let updatedUsers = 0;
-        let pagesProcessed = 0;
-        let hasMore = true;
-        let lastUserId: string | undefined;
-
-        // Sync users from Clerk
-        if (syncUsers) {
-            while (hasMore && pagesProcessed < maxPages) {
-                const response = await clerkClient.users.getUserList({
-                    limit: pageSize,
-                    ...(lastUserId && { offset: pagesProcessed * pageSize }),
-                });
-
-                const users = response.data;
-
-                for (const clerkUser of users) {
-                    try {
-                        const existingUser = await prisma.user.findUnique({
-                            where: { clerkId: clerkUser.id },
-                        });
-
-                        const userData = {
-                            email: clerkUser.emailAddresses[0]?.emailAddress || null,
-                            name: clerkUser.firstName && clerkUser.lastName
-                                ? `${clerkUser.firstName} ${clerkUser.lastName}`.trim()
-                                : clerkUser.firstName || clerkUser.lastName || null,
-                            isActive: true,
-                        };
-
-                        if (existingUser) {
-                            await prisma.user.update({
-                                where: { clerkId: clerkUser.id },
-                                data: userData,
-                            });
-                            updatedUsers++;
-                        } else {
-                            await prisma.user.create({
-                                data: {
-                                    clerkId: clerkUser.id,
-                                    ...userData,
-                                },
-                            });
-                            createdUsers++;
-                        }
-
-                        processed++;
-                    } catch (error) {
-                        console.error(`Error syncing user ${clerkUser.id}:`, error);
-                    }
-                }
+        if (!syncUsers) {
+            return NextResponse.json({ processed: 0, createdUsers: 0, updatedUsers: 0, jobId: null });
+        }
 
-                hasMore = users.length === pageSize;
-                pagesProcessed++;
+        const { job, conflict, resumeFrom } = await enqueueJob(
+            "users.sync",
+            { pageSize, maxPages, cursor },
+            user.id,
+        );
 
-                if (users.length > 0) {
-                    lastUserId = users[users.length - 1].id;
-                }
-            }
+        if (conflict) {
+            return NextResponse.json(
+                { error: "A user sync is already running", jobId: job.id, job: serializeJob(job) },
+                { status: 409 },
+            );
         }
 
-        const result: any = {
-            processed,
-            createdUsers,
-            updatedUsers,
-        };
-
-        if (debug) {
-            result.debug = {
-                pagesProcessed,
+        // Runs after the 202 is sent; progress is readable at /api/admin/jobs/[id].
+        after(() => runJob(job.id, async ({ progress }) => {
+            const sync = await syncClerkUsers({
                 pageSize,
                 maxPages,
+                cursor: cursor ?? resumeFrom,
+                onPage: (page, totals) => progress({
+                    processed: page.created + page.updated,
+                    created: page.created,
+                    updated: page.updated,
+                    failed: page.failed,
+                    cursor: totals.nextCursor,
+                }),
+            });
+
+            return {
+                processed: sync.processed,
+                createdUsers: sync.createdUsers,
+                updatedUsers: sync.updatedUsers,
+                failedUsers: sync.failedUsers,
+                nextCursor: sync.nextCursor,
+                durationMs: sync.durationMs,
+                pages: sync.pages,
+                ...(debug && { debug: { pagesProcessed: sync.pagesProcessed, pageSize, maxPages, cursor } }),
             };
-        }
+        }));
 
-        return NextResponse.json(result);
+        return NextResponse.json(
+            { jobId: job.id, status: job.status, statusUrl: `/api/admin/jobs/${job.id}` },
+            { status: 202 },
+        );
     } catch (error) {
         console.error("[ADMIN_USERS_SYNC_POST]", error);
         return new NextResponse(
@@ -112,3 +75,5 @@ export async function POST(req: Request) {
         );
     }
 }
+
+export const POST = withApiLogging(handlePost, { route: "/api/admin/users/sync" });
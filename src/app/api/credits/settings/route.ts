@@ -0,0 +1,20 @@
+import { NextResponse } from "next/server";
+import { getCreditSettings } from "@/lib/credits/settings";
+import { withApiLogging } from "@/lib/logging/api";
+
+async function handleGet() {
+    try {
+        // Served from the instance snapshot; no database round trip on the hot path.
+        const { version, settings } = await getCreditSettings();
+
+        return NextResponse.json(
+            { featureCosts: settings.featureCosts, planCredits: settings.planCredits },
+            { headers: { ETag: `"${version}"`, "Cache-Control": "public, max-age=60" } },
+        );
+    } catch (error) {
+        console.error("[CREDIT_SETTINGS_GET]", error);
+        return new NextResponse("Internal Error", { status: 500 });
+    }
+}
+
+export const GET = withApiLogging(handleGet, { route: "/api/credits/settings" });
@@ -1,8 +1,10 @@
 import { NextRequest, NextResponse } from "next/server";
 import { prisma } from "@/lib/db";
-import { currentUser } from "@clerk/nextjs/server";
+import { currentUser } from "@/lib/clerk/session";
+import { isUniqueViolation } from "@/lib/db-errors";
+import { withApiLogging } from "@/lib/logging/api";
 
-export async function POST(req: NextRequest) {
+async function handlePost(req: NextRequest) {
     try {
         const clerkUser = await currentUser();
         if (!clerkUser) {
@@ -16,33 +18,29 @@ export async function POST(req: NextRequest) {
             return NextResponse.json({ error: "Forbidden" }, { status: 403 });
         }
 
-        // Check if month already exists
-        const existingMonth = await prisma.month.findUnique({
-            where: {
-                userId_month_year: {
+        // Create empty month; the unique (userId, month, year) constraint
+        // decides between concurrent requests instead of a separate lookup.
+        let newMonth;
+        try {
+            newMonth = await prisma.month.create({
+                data: {
                     userId,
                     month,
                     year,
                 },
-            },
-        });
-
-        if (existingMonth) {
-            return NextResponse.json({ error: "Month already exists" }, { status: 400 });
+            });
+        } catch (error) {
+            if (isUniqueViolation(error)) {
+                return NextResponse.json({ error: "Month already exists" }, { status: 400 });
+            }
+            throw error;
         }
 
-        // Create empty month
-        const newMonth = await prisma.month.create({
-            data: {
-                userId,
-                month,
-                year,
-            },
-        });
-
         return NextResponse.json({ success: true, month: newMonth });
     } catch (error) {
         console.error("Error creating empty month:", error);
         return NextResponse.json({ error: "Internal server error" }, { status: 500 });
     }
 }
+
+export const POST = withApiLogging(handlePost, { route: "/api/months/create-empty" });
@@ -0,0 +1,65 @@
+import { NextRequest, NextResponse } from "next/server";
+import { z } from "zod";
+import { prisma } from "@/lib/db";
+import { currentUser } from "@/lib/clerk/session";
+import { DEFAULT_ROLLOVER_CATEGORIES, ROLLOVER_CATEGORIES, rolloverMonths } from "@/lib/month-rollover";
+import { withApiLogging } from "@/lib/logging/api";
+
+const rolloverSchema = z.object({
+    year: z.number().int().min(2000).max(2100),
+    month: z.number().int().min(1).max(12),
+    categories: z.array(z.enum(ROLLOVER_CATEGORIES)).min(1).optional(),
+});
+
+/**
+ * Copies the given month's items into the following month, creating it if
+ * needed. Safe to repeat: categories already present in the target month are
+ * left alone.
+ */
+async function handlePost(req: NextRequest) {
+    try {
+        const clerkUser = await currentUser();
+        if (!clerkUser) {
+            return NextResponse.json({ error: "Unauthorized" }, { status: 401 });
+        }
+
+        const parsed = rolloverSchema.safeParse(await req.json().catch(() => null));
+        if (!parsed.success) {
+            return NextResponse.json(
+                { error: `Expected { year, month, categories? } with categories from ${ROLLOVER_CATEGORIES.join(", ")}` },
+                { status: 400 },
+            );
+        }
+        const { year, month, categories = DEFAULT_ROLLOVER_CATEGORIES } = parsed.data;
+
+        const dbUser = await prisma.user.findUnique({
+            where: { clerkId: clerkUser.id },
+            select: { id: true },
+        });
+        if (!dbUser) {
+            return NextResponse.json({ error: "Source month not found" }, { status: 404 });
+        }
+
+        const result = await rolloverMonths({ year, month }, [dbUser.id], categories);
+        const [entry] = result.targets;
+        if (!entry) {
+            return NextResponse.json({ error: "Source month not found" }, { status: 404 });
+        }
+
+        return NextResponse.json(
+            {
+                source: result.source,
+                target: { ...result.target, id: entry.targetId },
+                created: entry.created,
+                categories,
+                copied: result.copied,
+            },
+            { status: entry.created ? 201 : 200 },
+        );
+    } catch (error) {
+        console.error("Error rolling over month:", error);
+        return NextResponse.json({ error: "Internal server error" }, { status: 500 });
+    }
+}
+
+export const POST = withApiLogging(handlePost, { route: "/api/months/rollover" });
@@ -0,0 +1,81 @@
+import { NextRequest, NextResponse } from "next/server";
+import { prisma } from "@/lib/db";
+import { currentUser } from "@/lib/clerk/session";
+import { emptySummaryTotals, getMonthSummaries } from "@/lib/queries/finance";
+import { withApiLogging } from "@/lib/logging/api";
+
+const MAX_RANGE_MONTHS = 120;
+
+type YearMonth = { year: number; month: number };
+
+function parseYearMonth(value: string | null): YearMonth | null {
+    const match = value?.match(/^(\d{4})-(\d{1,2})$/);
+    if (!match) return null;
+    const year = Number(match[1]);
+    const month = Number(match[2]);
+    return month >= 1 && month <= 12 ? { year, month } : null;
+}
+
+const toIndex = ({ year, month }: YearMonth) => year * 12 + (month - 1);
+const fromIndex = (index: number): YearMonth => ({ year: Math.floor(index / 12), month: (index % 12) + 1 });
+
+/**
+ * Resolves `?year=2025`, `?from=2024-01&to=2025-06` or `?months=24` (the last
+ * N months up to the current one, the default being 12).
+ */
+function parseRange(searchParams: URLSearchParams, now = new Date()): { from: YearMonth; to: YearMonth } | string {
+    const year = searchParams.get("year");
+    if (year) {
+        if (!/^\d{4}$/.test(year)) return "year must be YYYY";
+        return { from: { year: Number(year), month: 1 }, to: { year: Number(year), month: 12 } };
+    }
+
+    if (searchParams.has("from") || searchParams.has("to")) {
+        const from = parseYearMonth(searchParams.get("from"));
+        const to = parseYearMonth(searchParams.get("to"));
+        if (!from || !to) return "from and to must both be YYYY-MM";
+        if (toIndex(from) > toIndex(to)) return "from must not be after to";
+        return { from, to };
+    }
+
+    const months = Number(searchParams.get("months") ?? 12);
+    if (!Number.isInteger(months) || months < 1) return "months must be a positive integer";
+    const current = toIndex({ year: now.getFullYear(), month: now.getMonth() + 1 });
+    return { from: fromIndex(current - months + 1), to: fromIndex(current) };
+}
+
+async function handleGet(req: NextRequest) {
+    try {
+        const clerkUser = await currentUser();
+        if (!clerkUser) {
+            return NextResponse.json({ error: "Unauthorized" }, { status: 401 });
+        }
+
+        const range = parseRange(req.nextUrl.searchParams);
+        if (typeof range === "string") {
+            return NextResponse.json({ error: range }, { status: 400 });
+        }
+        if (toIndex(range.to) - toIndex(range.from) + 1 > MAX_RANGE_MONTHS) {
+            return NextResponse.json({ error: `Range is limited to ${MAX_RANGE_MONTHS} months` }, { status: 400 });
+        }
+
+        const dbUser = await prisma.user.findUnique({
+            where: { clerkId: clerkUser.id },
+            select: { id: true },
+        });
+        // A user not synced to the database yet simply has no months.
+        const summary = dbUser
+            ? await getMonthSummaries(dbUser.id, range.from, range.to)
+            : { months: [], totals: emptySummaryTotals() };
+
+        return NextResponse.json(
+            { from: range.from, to: range.to, ...summary },
+            { headers: { "Cache-Control": "private, no-cache" } },
+        );
+    } catch (error) {
+        console.error("Error loading month summary:", error);
+        return NextResponse.json({ error: "Internal server error" }, { status: 500 });
+    }
+}
+
+export const GET = withApiLogging(handleGet, { route: "/api/months/summary" });
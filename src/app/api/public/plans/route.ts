@@ -1,17 +1,41 @@
 import { NextResponse } from "next/server";
-import { db } from "@/lib/db";
+import { getPublicPlansSnapshot } from "@/lib/queries/plans";
+import { withApiLogging } from "@/lib/logging/api";
 
 export const dynamic = 'force-dynamic';
 
-export async function GET() {
+// Browsers may reuse the payload briefly, then revalidate with If-None-Match.
+const CACHE_CONTROL = 'public, max-age=60, stale-while-revalidate=300';
+
+function matchesEtag(ifNoneMatch: string | null, etag: string) {
+  if (!ifNoneMatch) return false;
+  if (ifNoneMatch.trim() === '*') return true;
+  // If-None-Match uses weak comparison, so W/"x" matches "x".
+  return ifNoneMatch
+    .split(',')
+    .some(candidate => candidate.trim().replace(/^W\//, '') === etag);
+}
+
+async function handleGet(req: Request) {
   try {
-    const plans = await db.plan.findMany({
-      where: { active: true },
-      orderBy: { priceMonthlyCents: 'asc' },
+    const snapshot = await getPublicPlansSnapshot();
+    const headers = {
+      'ETag': snapshot.etag,
+      'Cache-Control': CACHE_CONTROL,
+    };
+
+    if (matchesEtag(req.headers.get('if-none-match'), snapshot.etag)) {
+      return new NextResponse(null, { status: 304, headers });
+    }
+
+    return new NextResponse(snapshot.body, {
+      status: 200,
+      headers: { ...headers, 'Content-Type': 'application/json' },
     });
-    return NextResponse.json(plans);
   } catch (error) {
     console.error("[PLANS_GET]", error);
     return NextResponse.json({ error: "Failed to fetch plans" }, { status: 500 });
   }
 }
+
+export const GET = withApiLogging(handleGet, { route: "/api/public/plans" });
@@ -1,8 +1,33 @@
 import { Webhook } from 'svix';
 import { headers } from 'next/headers';
 import { WebhookEvent } from '@clerk/nextjs/server';
-import { db } from "@/lib/db";
 import { withApiLogging } from '@/lib/logging/api';
+import { clerkUserQueue, processDeliveryOnce, type ClerkUserChange } from '@/lib/webhooks/clerk-queue';
+
+function toUserChange(evt: WebhookEvent, receivedAt: number): ClerkUserChange | null {
+  // Svix payloads carry the event time in ms; fall back to arrival order.
+  const occurredAt = typeof (evt as { timestamp?: unknown }).timestamp === 'number'
+    ? (evt as { timestamp: number }).timestamp
+    : receivedAt;
+
+  if (evt.type === 'user.created' || evt.type === 'user.updated') {
+    const { id, email_addresses, primary_email_address_id, first_name, last_name } = evt.data;
+    const primaryEmail = email_addresses?.find(email => email.id === primary_email_address_id);
+    return {
+      kind: 'upsert',
+      clerkId: id,
+      email: primaryEmail?.email_address || null,
+      name: `${first_name || ''} ${last_name || ''}`.trim() || null,
+      occurredAt,
+    };
+  }
+
+  if (evt.type === 'user.deleted' && evt.data.id) {
+    return { kind: 'delete', clerkId: evt.data.id, occurredAt };
+  }
+
+  return null;
+}
 
 async function handleClerkWebhook(req: Request) {
   const WEBHOOK_SECRET = process.env.CLERK_WEBHOOK_SECRET || process.env.WEBHOOK_SECRET;
@@ -22,8 +47,9 @@ async function handleClerkWebhook(req: Request) {
     });
   }
 
-  const payload = await req.json();
-  const body = JSON.stringify(payload);
+  // The signature covers the exact bytes Clerk sent, so verify those rather
+  // than a re-serialized copy of the parsed JSON.
+  const body = await req.text();
 
   const wh = new Webhook(WEBHOOK_SECRET);
 
@@ -42,66 +68,19 @@ async function handleClerkWebhook(req: Request) {
     });
   }
 
-  const { id } = evt.data;
-  const eventType = evt.type;
-
-  console.log(`Webhook with and ID of ${id} and type of ${eventType}`);
-
-  if (eventType === 'user.created') {
-    const { id, email_addresses, first_name, last_name } = evt.data;
-
-    try {
-      const primaryEmail = email_addresses.find(email => email.id === evt.data.primary_email_address_id);
-
-      // Create user in database
-      await db.user.create({
-        data: {
-          clerkId: id,
-          email: primaryEmail?.email_address || null,
-          name: `${first_name || ''} ${last_name || ''}`.trim() || null,
-        },
-      });
-
-      console.log('User created successfully');
-    } catch (error) {
-      console.error('Error creating user:', error);
-      return new Response('Error creating user', { status: 500 });
-    }
-  }
-
-  if (eventType === 'user.updated') {
-    const { id, email_addresses, first_name, last_name } = evt.data;
-
-    try {
-      const primaryEmail = email_addresses.find(email => email.id === evt.data.primary_email_address_id);
-
-      await db.user.update({
-        where: { clerkId: id },
-        data: {
-          email: primaryEmail?.email_address || null,
-          name: `${first_name || ''} ${last_name || ''}`.trim() || null,
-        },
-      });
-
-      console.log('User updated successfully');
-    } catch (error) {
-      console.error('Error updating user:', error);
-    }
+  const change = toUserChange(evt, Date.now());
+  if (!change) {
+    return Response.json({ received: true, ignored: evt.type });
   }
 
-  if (eventType === 'user.deleted') {
-    try {
-      await db.user.delete({
-        where: { clerkId: evt.data.id! },
-      });
-
-      console.log('User deleted successfully');
-    } catch (error) {
-      console.error('Error deleting user:', error);
-    }
+  try {
+    // Writes are batched with other deliveries; this resolves once ours is committed.
+    const { duplicate } = await processDeliveryOnce(svix_id, () => clerkUserQueue.push(change));
+    return Response.json({ received: true, duplicate });
+  } catch (error) {
+    console.error(`Error processing webhook ${svix_id} (${evt.type}):`, error);
+    return new Response('Error processing webhook', { status: 500 });
   }
-
-  return new Response('', { status: 200 });
 }
 
 export const POST = withApiLogging(handleClerkWebhook, {
@@ -1,8 +1,9 @@
 "use client";
 
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import { useInfiniteQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import { useToast } from "@/hooks/use-toast";
 import { api } from "@/lib/api-client";
+import { waitForBackgroundJob, type EnqueuedJob } from "@/hooks/admin/use-background-job";
 
 export interface User {
   id: string;
@@ -21,37 +22,44 @@ export interface User {
 
 export interface UsersResponse {
   users: User[];
-  pagination: {
-    page: number;
+  pageInfo: {
     pageSize: number;
-    total: number;
-    pages: number;
+    nextCursor: string | null;
+    hasMore: boolean;
   };
+  /** Exact for filtered lists (first page only), a table estimate otherwise. */
+  totalEstimate: number | null;
+  totalExact: boolean;
 }
 
 export interface UsersParams {
-  page?: number;
   pageSize?: number;
   search?: string;
-  includeUsageCount?: boolean;
+  isActive?: boolean;
 }
 
 export function useAdminUsers(params: UsersParams = {}) {
-  return useQuery<UsersResponse>({
+  return useInfiniteQuery({
     queryKey: ['admin', 'users', params],
-    queryFn: () => {
+    queryFn: ({ pageParam }) => {
       const searchParams = new URLSearchParams({
-        page: String(params.page || 1),
         pageSize: String(params.pageSize || 50),
-        includeUsageCount: String(params.includeUsageCount || true),
       });
 
+      if (pageParam) {
+        searchParams.set('cursor', pageParam);
+      }
       if (params.search?.trim()) {
         searchParams.set('search', params.search.trim());
       }
+      if (typeof params.isActive === 'boolean') {
+        searchParams.set('isActive', String(params.isActive));
+      }
 
       return api.get<UsersResponse>(`/api/admin/users?${searchParams}`);
     },
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.pageInfo.nextCursor,
     staleTime: 30_000, // 30 seconds
     gcTime: 5 * 60_000, // 5 minutes
   });
@@ -157,12 +165,19 @@ export function useSyncFromClerk() {
   const { toast } = useToast();
 
   return useMutation({
-    mutationFn: (options: {
+    mutationFn: async (options: {
       syncUsers?: boolean;
       syncPlans?: boolean;
       setCredits?: boolean;
       overrideCredits?: number;
-    }) => api.post('/api/admin/users/sync', options),
+      pageSize?: number;
+      maxPages?: number;
+      cursor?: string | null;
+    }) => {
+      // The sync runs as a background job; resolve once it settles.
+      const { jobId } = await api.post<EnqueuedJob>('/api/admin/users/sync', options);
+      return waitForBackgroundJob(jobId);
+    },
     onSuccess: (data) => {
       const syncData = data as {
         processed?: number;
@@ -0,0 +1,62 @@
+"use client";
+
+import { useQuery } from "@tanstack/react-query";
+import { api } from "@/lib/api-client";
+
+export type BackgroundJobStatus = "queued" | "running" | "succeeded" | "failed";
+
+export interface BackgroundJob<TResult = unknown> {
+  id: string;
+  type: string;
+  status: BackgroundJobStatus;
+  processed: number;
+  created: number;
+  updated: number;
+  failed: number;
+  cursor: string | null;
+  elapsedMs: number;
+  throughputPerSecond: number;
+  result: TResult | null;
+  error: string | null;
+  createdAt: string;
+  startedAt: string | null;
+  finishedAt: string | null;
+}
+
+export interface EnqueuedJob {
+  jobId: string;
+  status: BackgroundJobStatus;
+  statusUrl: string;
+}
+
+const isFinished = (job?: BackgroundJob) =>
+  job?.status === "succeeded" || job?.status === "failed";
+
+export function useBackgroundJob(jobId: string | null, intervalMs = 1000) {
+  return useQuery<BackgroundJob>({
+    queryKey: ["admin", "jobs", jobId],
+    queryFn: () => api.get(`/api/admin/jobs/${jobId}`),
+    enabled: !!jobId,
+    refetchInterval: (query) => (isFinished(query.state.data) ? false : intervalMs),
+  });
+}
+
+/**
+ * Polls a queued admin job until it settles and resolves with its result.
+ * Rejects with the job error when it fails.
+ */
+export async function waitForBackgroundJob<TResult = unknown>(
+  jobId: string,
+  { intervalMs = 1000, timeoutMs = 10 * 60 * 1000 } = {}
+): Promise<TResult> {
+  const deadline = Date.now() + timeoutMs;
+
+  while (Date.now() < deadline) {
+    const job = await api.get<BackgroundJob<TResult>>(`/api/admin/jobs/${jobId}`);
+    if (job.status === "succeeded") return job.result as TResult;
+    if (job.status === "failed") throw new Error(job.error || "Job failed");
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+
+  throw new Error("Timed out waiting for the job to finish");
+}
@@ -2,6 +2,7 @@
 
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { api } from '@/lib/api-client';
+import { waitForBackgroundJob, type EnqueuedJob } from '@/hooks/admin/use-background-job';
 import type { ClerkPlanNormalized } from '@/lib/clerk/commerce-plan-types';
 
 export interface Plan {
@@ -133,7 +134,10 @@ export function useRefreshPlanPricing() {
   const queryClient = useQueryClient();
 
   return useMutation({
-    mutationFn: () => api.post('/api/admin/plans/refresh-pricing', {}),
+    mutationFn: async () => {
+      const { jobId } = await api.post<EnqueuedJob>('/api/admin/plans/refresh-pricing', {});
+      return waitForBackgroundJob(jobId);
+    },
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['admin-plans'] });
     },
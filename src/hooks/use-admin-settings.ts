@@ -6,6 +6,8 @@ import { api } from '@/lib/api-client';
 export interface AdminSettings {
   featureCosts: Record<string, number>;
   planCredits: Record<string, number>;
+  // Sent back as If-Match; a save based on an outdated version fails with 412.
+  version: number;
 }
 
 export function useAdminSettings() {
@@ -21,11 +23,17 @@ export function useUpdateAdminSettings() {
   const queryClient = useQueryClient();
 
   return useMutation({
-    mutationFn: (settings: AdminSettings) =>
-      api.put('/api/admin/settings', settings),
-    onSuccess: () => {
-      queryClient.invalidateQueries({ queryKey: ['admin-settings'] });
+    mutationFn: ({ version, ...settings }: AdminSettings) =>
+      api.put<AdminSettings>('/api/admin/settings', settings, {
+        headers: { 'Content-Type': 'application/json', 'If-Match': `"${version}"` },
+      }),
+    onSuccess: (saved) => {
+      queryClient.setQueryData(['admin-settings'], saved);
       queryClient.invalidateQueries({ queryKey: ['credit-settings'] });
     },
+    onError: () => {
+      // Most likely a 412: someone else saved first, so reload their version.
+      queryClient.invalidateQueries({ queryKey: ['admin-settings'] });
+    },
   });
 }
\ No newline at end of file
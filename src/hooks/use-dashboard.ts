@@ -26,6 +26,8 @@ export interface DashboardStats {
   mrrSeries: { label: string; value: number }[];
   arrSeries: { label: string; value: number }[];
   churnSeries: { label: string; value: number }[];
+  ttvSeries: { label: string; value: number }[];
+  titheSeries: { label: string; value: number }[];
   recentActivity: Array<{
     id: string;
     type: string;
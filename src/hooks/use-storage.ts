@@ -11,20 +11,38 @@ export interface StorageItem {
   url: string;
   pathname: string;
   createdAt: string;
-  user: { id: string; clerkId: string; email: string | null; name: string | null };
+  user: { id: string | null; clerkId: string; email: string | null; name: string | null };
 }
 
 export interface StorageParams {
   q?: string;
   type?: string;
   userId?: string;
+  startDate?: string;
+  endDate?: string;
   cursor?: string;
   limit?: number;
 }
 
+export interface StorageStats {
+  totals: { objects: number; bytes: number; users: number };
+  byUser: {
+    userId: string | null;
+    clerkUserId: string;
+    name: string | null;
+    email: string | null;
+    objects: number;
+    bytes: number;
+  }[];
+}
+
 export interface StorageResponse {
   items: StorageItem[];
   nextCursor: string | null;
+  pageInfo: { pageSize: number; nextCursor: string | null; hasMore: boolean };
+  pageSize: number;
+  /** Totals for the whole filtered set; only on the first page. */
+  stats?: StorageStats;
 }
 
 export function useStorage(params: StorageParams = {}) {
@@ -33,6 +51,8 @@ export function useStorage(params: StorageParams = {}) {
   if (params.q) searchParams.set('q', params.q);
   if (params.type) searchParams.set('type', params.type);
   if (params.userId) searchParams.set('userId', params.userId);
+  if (params.startDate) searchParams.set('startDate', params.startDate);
+  if (params.endDate) searchParams.set('endDate', params.endDate);
   if (params.cursor) searchParams.set('cursor', params.cursor);
   if (params.limit) searchParams.set('limit', params.limit.toString());
 
@@ -1,6 +1,6 @@
 "use client";
 
-import { useQuery } from '@tanstack/react-query';
+import { keepPreviousData, useQuery } from '@tanstack/react-query';
 import { api } from '@/lib/api-client';
 
 export interface UsageRecord {
@@ -19,15 +19,33 @@ export interface UsageHistoryParams {
   type?: string;
   range?: string;
   q?: string;
-  page?: number;
+  cursor?: string | null;
   pageSize?: number;
+  bucket?: 'hour' | 'day';
+}
+
+export interface UsageAnalytics {
+  totalOperations: number;
+  totalCredits: number;
+  uniqueUsers: number;
+  byOperation: Array<{ operation: string; operations: number; credits: number }>;
+  buckets: {
+    granularity: 'hour' | 'day';
+    series: Array<{ bucket: string; operations: number; credits: number }>;
+  };
 }
 
 export interface UsageHistoryResponse {
   data: UsageRecord[];
+  pageInfo: {
+    pageSize: number;
+    nextCursor: string | null;
+    hasMore: boolean;
+  };
+  nextCursor: string | null;
   total: number;
-  page: number;
   pageSize: number;
+  analytics: UsageAnalytics;
 }
 
 export function useUsageHistory(params: UsageHistoryParams = {}) {
@@ -36,13 +54,15 @@ export function useUsageHistory(params: UsageHistoryParams = {}) {
   if (params.type) searchParams.set('type', params.type);
   if (params.range) searchParams.set('range', params.range);
   if (params.q) searchParams.set('q', params.q);
-  if (params.page) searchParams.set('page', params.page.toString());
+  if (params.cursor) searchParams.set('cursor', params.cursor);
   if (params.pageSize) searchParams.set('pageSize', params.pageSize.toString());
+  if (params.bucket) searchParams.set('bucket', params.bucket);
 
   return useQuery<UsageHistoryResponse>({
     queryKey: ['admin-usage-history', params],
     queryFn: () => api.get(`/api/admin/usage?${searchParams.toString()}`),
+    placeholderData: keepPreviousData,
     staleTime: 60_000, // 1 minute
     gcTime: 5 * 60_000, // 5 minutes
   });
-}
\ No newline at end of file
+}
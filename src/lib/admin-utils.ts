@@ -1,4 +1,7 @@
-import { currentUser } from "@clerk/nextjs/server";
+import { NextResponse } from "next/server";
+import type { User } from "@clerk/backend";
+import { currentUser } from "@/lib/clerk/session";
+import { cache, getCacheKey } from "@/lib/cache";
 
 const parseListEnv = (value?: string | null) =>
   value
@@ -6,20 +9,67 @@ const parseListEnv = (value?: string | null) =>
     .map(entry => entry.trim())
     .filter(Boolean) || [];
 
-const getAdminEmails = () => parseListEnv(process.env.ADMIN_EMAILS);
-const getAdminUserIds = () => parseListEnv(process.env.ADMIN_USER_IDS);
+// Parsed once at startup; changing the allowlists requires a restart anyway.
+const ADMIN_USER_IDS = new Set(parseListEnv(process.env.ADMIN_USER_IDS));
+const ADMIN_EMAILS = new Set(parseListEnv(process.env.ADMIN_EMAILS).map(email => email.toLowerCase()));
 
+// Only positive decisions are cached: granting admin takes effect right away,
+// while a revoked email stays admin for at most this long.
+const ADMIN_DECISION_TTL_SECONDS = 60;
+
+type AdminCandidate = Pick<User, "id" | "emailAddresses" | "primaryEmailAddressId">;
+
+function primaryEmail(user: AdminCandidate) {
+  const primary = user.emailAddresses.find(email => email.id === user.primaryEmailAddressId)
+    ?? user.emailAddresses[0];
+  return primary?.emailAddress.toLowerCase();
+}
+
+/** Checks an already-resolved user against the allowlists without any lookups. */
+export function isAdminUser(user: AdminCandidate): boolean {
+  if (ADMIN_USER_IDS.has(user.id)) return true;
+  const email = primaryEmail(user);
+  return !!email && ADMIN_EMAILS.has(email);
+}
+
+/**
+ * Admin check for callers that only have a user id (e.g. `auth()` in a layout).
+ * The email allowlist needs the signed-in user, resolved through the
+ * request-memoized `currentUser()`.
+ */
 export async function isAdmin(userId: string): Promise<boolean> {
   try {
-    if (getAdminUserIds().includes(userId)) return true;
+    if (ADMIN_USER_IDS.has(userId)) return true;
+    if (ADMIN_EMAILS.size === 0) return false;
 
-    const user = await currentUser();
-    if (!user) return false;
+    const cacheKey = getCacheKey("is-admin", userId);
+    if (cache.get<boolean>(cacheKey)) return true;
 
-    const userEmail = user.emailAddresses[0]?.emailAddress;
-    return !!userEmail && getAdminEmails().includes(userEmail);
+    const user = await currentUser();
+    const admin = !!user && user.id === userId && isAdminUser(user);
+    if (admin) cache.set(cacheKey, true, ADMIN_DECISION_TTL_SECONDS);
+    return admin;
   } catch (error) {
     console.error("Admin check error:", error);
     return false;
   }
 }
+
+export type AdminGuard =
+  | { user: User; response: null }
+  | { user: null; response: NextResponse };
+
+/**
+ * Shared guard for admin API routes: resolves the signed-in user once and
+ * returns either that user or the 401 response to send.
+ *
+ *     const { response } = await requireAdmin();
+ *     if (response) return response;
+ */
+export async function requireAdmin(): Promise<AdminGuard> {
+  const user = await currentUser();
+  if (!user || !isAdminUser(user)) {
+    return { user: null, response: new NextResponse("Unauthorized", { status: 401 }) };
+  }
+  return { user, response: null };
+}
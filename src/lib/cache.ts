@@ -1,77 +1,259 @@
 interface CacheEntry<T> {
   data: T;
-  timestamp: number;
-  ttl: number;
+  expiresAt: number;
+  size: number;
+  tags: string[];
 }
 
-class SimpleCache {
+interface InflightEntry {
+  promise: Promise<unknown>;
+  tags: string[];
+  generation: number;
+}
+
+export interface CacheOptions {
+  /** Maximum number of entries before the least recently used is evicted. */
+  maxEntries?: number;
+  /** Optional byte budget; entry sizes are estimated from their JSON encoding. */
+  maxBytes?: number;
+  defaultTtlSeconds?: number;
+}
+
+export interface SetOptions<T> {
+  tags?: string[] | ((data: T) => string[]);
+  /** Entry size in bytes, skips the JSON estimate when known. */
+  size?: number;
+}
+
+export interface CacheStats {
+  entries: number;
+  bytes: number;
+  hits: number;
+  misses: number;
+  evictions: number;
+  expirations: number;
+  coalesced: number;
+  hitRate: number;
+}
+
+/**
+ * In-process LRU cache with per-entry TTL.
+ *
+ * Recency is tracked by Map insertion order: a hit re-inserts the entry, so
+ * the first key is always the least recently used and get/set/evict are O(1).
+ * Expired entries are dropped lazily when read or when they reach the LRU end.
+ * Cached values are shared by reference and must not be mutated by callers.
+ */
+export class LRUCache {
   private cache = new Map<string, CacheEntry<unknown>>();
-  private maxSize: number;
+  private tagIndex = new Map<string, Set<string>>();
+  private inflight = new Map<string, InflightEntry>();
+  private bytes = 0;
+  // Bumped by invalidateTag; guards values whose tags are only known once computed.
+  private tagGeneration = 0;
+  private readonly maxEntries: number;
+  private readonly maxBytes: number | null;
+  private readonly defaultTtlSeconds: number;
+  private counters = { hits: 0, misses: 0, evictions: 0, expirations: 0, coalesced: 0 };
 
-  constructor(maxSize = 1000) {
-    this.maxSize = maxSize;
+  constructor({ maxEntries = 1000, maxBytes, defaultTtlSeconds = 300 }: CacheOptions = {}) {
+    this.maxEntries = maxEntries;
+    this.maxBytes = maxBytes ?? null;
+    this.defaultTtlSeconds = defaultTtlSeconds;
   }
 
-  set<T>(key: string, data: T, ttlSeconds = 300): void {
-    // Remove oldest entries if cache is full
-    if (this.cache.size >= this.maxSize) {
-      const oldestKey = this.cache.keys().next().value;
-      if (oldestKey) {
-        this.cache.delete(oldestKey);
+  set<T>(key: string, data: T, ttlSeconds = this.defaultTtlSeconds, options: SetOptions<T> = {}): void {
+    this.delete(key, { keepInflight: true });
+
+    const tags = typeof options.tags === 'function' ? options.tags(data) : options.tags ?? [];
+    const size = options.size ?? (this.maxBytes !== null ? estimateSize(key, data) : 0);
+    if (this.maxBytes !== null && size > this.maxBytes) return;
+
+    this.cache.set(key, { data, expiresAt: Date.now() + ttlSeconds * 1000, size, tags });
+    this.bytes += size;
+    for (const tag of tags) {
+      let keys = this.tagIndex.get(tag);
+      if (!keys) {
+        keys = new Set();
+        this.tagIndex.set(tag, keys);
       }
+      keys.add(key);
     }
 
-    this.cache.set(key, {
-      data,
-      timestamp: Date.now(),
-      ttl: ttlSeconds * 1000,
-    });
+    this.evictOverflow();
   }
 
   get<T>(key: string): T | null {
     const entry = this.cache.get(key);
 
     if (!entry) {
+      this.counters.misses++;
       return null;
     }
 
-    // Check if entry has expired
-    if (Date.now() - entry.timestamp > entry.ttl) {
-      this.cache.delete(key);
+    if (entry.expiresAt <= Date.now()) {
+      this.remove(key, entry);
+      this.counters.expirations++;
+      this.counters.misses++;
       return null;
     }
 
+    // Move to the most recently used end.
+    this.cache.delete(key);
+    this.cache.set(key, entry);
+    this.counters.hits++;
     return entry.data as T;
   }
 
-  delete(key: string): boolean {
-    return this.cache.delete(key);
+  has(key: string): boolean {
+    const entry = this.cache.get(key);
+    return !!entry && entry.expiresAt > Date.now();
+  }
+
+  /**
+   * Returns the cached value or computes it once: concurrent callers that miss
+   * on the same key share a single `compute` call. `null`/`undefined` results
+   * are returned but not stored. A value whose key or tags are invalidated
+   * while it is being computed is not stored either.
+   */
+  async getOrCompute<T>(
+    key: string,
+    compute: () => Promise<T>,
+    ttlSeconds = this.defaultTtlSeconds,
+    options: SetOptions<T> = {}
+  ): Promise<T> {
+    const cached = this.get<T>(key);
+    if (cached !== null) return cached;
+
+    const pending = this.inflight.get(key);
+    if (pending) {
+      this.counters.coalesced++;
+      return pending.promise as Promise<T>;
+    }
+
+    const record: InflightEntry = {
+      promise: Promise.resolve(),
+      tags: Array.isArray(options.tags) ? options.tags : [],
+      generation: this.tagGeneration,
+    };
+    const tagsKnownUpfront = typeof options.tags !== 'function';
+    this.inflight.set(key, record);
+    const promise = (async () => {
+      try {
+        const data = await compute();
+        const invalidated = this.inflight.get(key) !== record ||
+          (!tagsKnownUpfront && record.generation !== this.tagGeneration);
+        if (data !== null && data !== undefined && !invalidated) {
+          this.set(key, data, ttlSeconds, options);
+        }
+        return data;
+      } finally {
+        if (this.inflight.get(key) === record) this.inflight.delete(key);
+      }
+    })();
+    record.promise = promise;
+    return promise;
+  }
+
+  delete(key: string, { keepInflight = false } = {}): boolean {
+    if (!keepInflight) this.inflight.delete(key);
+    const entry = this.cache.get(key);
+    if (!entry) return false;
+    this.remove(key, entry);
+    return true;
+  }
+
+  /** Drops every entry (and in-flight computation) carrying the tag. */
+  invalidateTag(tag: string): number {
+    this.tagGeneration++;
+    for (const [key, record] of this.inflight) {
+      if (record.tags.includes(tag)) this.inflight.delete(key);
+    }
+
+    const keys = this.tagIndex.get(tag);
+    if (!keys) return 0;
+    let removed = 0;
+    for (const key of [...keys]) {
+      if (this.delete(key)) removed++;
+    }
+    this.tagIndex.delete(tag);
+    return removed;
   }
 
   clear(): void {
     this.cache.clear();
+    this.tagIndex.clear();
+    this.inflight.clear();
+    this.bytes = 0;
   }
 
   // Clean up expired entries
   cleanup(): void {
     const now = Date.now();
-    for (const [key, entry] of this.cache.entries()) {
-      if (now - entry.timestamp > entry.ttl) {
-        this.cache.delete(key);
+    for (const [key, entry] of this.cache) {
+      if (entry.expiresAt <= now) {
+        this.remove(key, entry);
+        this.counters.expirations++;
+      }
+    }
+  }
+
+  stats(): CacheStats {
+    const lookups = this.counters.hits + this.counters.misses;
+    return {
+      entries: this.cache.size,
+      bytes: this.bytes,
+      ...this.counters,
+      hitRate: lookups > 0 ? this.counters.hits / lookups : 0,
+    };
+  }
+
+  resetStats(): void {
+    this.counters = { hits: 0, misses: 0, evictions: 0, expirations: 0, coalesced: 0 };
+  }
+
+  private remove(key: string, entry: CacheEntry<unknown>) {
+    this.cache.delete(key);
+    this.bytes -= entry.size;
+    for (const tag of entry.tags) {
+      const keys = this.tagIndex.get(tag);
+      keys?.delete(key);
+      if (keys?.size === 0) this.tagIndex.delete(tag);
+    }
+  }
+
+  private evictOverflow() {
+    while (
+      this.cache.size > this.maxEntries ||
+      (this.maxBytes !== null && this.bytes > this.maxBytes)
+    ) {
+      const [oldestKey, oldest] = this.cache.entries().next().value as [string, CacheEntry<unknown>];
+      this.remove(oldestKey, oldest);
+      if (oldest.expiresAt <= Date.now()) {
+        this.counters.expirations++;
+      } else {
+        this.counters.evictions++;
       }
     }
   }
 }
 
+function estimateSize(key: string, data: unknown): number {
+  try {
+    // UTF-16 code units, close enough to the V8 string footprint.
+    return (key.length + (JSON.stringify(data)?.length ?? 0)) * 2;
+  } catch {
+    return key.length * 2;
+  }
+}
+
 // Global cache instance
-export const cache = new SimpleCache();
+export const cache = new LRUCache({
+  maxEntries: 1000,
+  maxBytes: 16 * 1024 * 1024,
+});
 
 // Helper function for cache keys
 export function getCacheKey(prefix: string, ...parts: (string | number)[]): string {
   return `${prefix}:${parts.join(':')}`;
 }
-
-// Cleanup expired entries every 5 minutes
-setInterval(() => {
-  cache.cleanup();
-}, 5 * 60 * 1000);
@@ -0,0 +1,43 @@
+import { createClerkClient } from "@clerk/backend";
+import { timePhase } from "@/lib/logging/metrics";
+
+// When CLERK_STUB_URL is set (local benchmarks / offline QA) every Backend API
+// call goes to the stand-in server from testsprite_tests/clerk_stub.py instead
+// of api.clerk.com. Sessions are then trusted from the stub, so it is refused
+// outright in production.
+export const CLERK_STUB_URL = process.env.CLERK_STUB_URL?.replace(/\/$/, "") || null;
+
+if (CLERK_STUB_URL && process.env.NODE_ENV === "production") {
+    throw new Error("CLERK_STUB_URL is set in production; the Clerk stub disables authentication");
+}
+
+export function isClerkStubEnabled() {
+    return CLERK_STUB_URL !== null;
+}
+
+/**
+ * Times every async Backend API call (`clerkClient.<api>.<method>()`) into
+ * the request's `external` phase; see src/lib/logging/metrics.ts.
+ */
+function withExternalTiming<T extends object>(target: T, depth = 0): T {
+    return new Proxy(target, {
+        get(obj, key, receiver) {
+            const value = Reflect.get(obj, key, receiver);
+            if (typeof value === "function") {
+                return (...args: unknown[]) => {
+                    const result = value.apply(obj, args);
+                    return result instanceof Promise ? timePhase("external", () => result) : result;
+                };
+            }
+            if (depth === 0 && value && typeof value === "object") {
+                return withExternalTiming(value, depth + 1);
+            }
+            return value;
+        },
+    });
+}
+
+export const clerkClient = withExternalTiming(createClerkClient({
+    secretKey: process.env.CLERK_SECRET_KEY || (CLERK_STUB_URL ? "sk_test_stub" : undefined),
+    ...(CLERK_STUB_URL && { apiUrl: CLERK_STUB_URL }),
+}));
@@ -0,0 +1,40 @@
+import { headers } from "next/headers";
+import { currentUser as clerkCurrentUser } from "@clerk/nextjs/server";
+import type { User } from "@clerk/backend";
+import { CLERK_STUB_URL, clerkClient } from "@/lib/clerk/client";
+import { timePhase } from "@/lib/logging/metrics";
+import { requestMemo } from "@/lib/request-context";
+
+const CURRENT_USER = Symbol("currentUser");
+
+/**
+ * Resolves the signed-in user for API routes.
+ *
+ * In stub mode the session comes from an `Authorization: Bearer <token>`
+ * header issued by the local Clerk stand-in; otherwise this is Clerk's own
+ * `currentUser()`. Resolved at most once per request (see
+ * @/lib/request-context) and timed as the request's `auth` phase.
+ */
+export async function currentUser(): Promise<User | null> {
+    return requestMemo(CURRENT_USER, () => timePhase("auth", resolveCurrentUser));
+}
+
+async function resolveCurrentUser(): Promise<User | null> {
+    if (!CLERK_STUB_URL) {
+        return clerkCurrentUser();
+    }
+
+    const authorization = (await headers()).get("authorization");
+    const token = authorization?.startsWith("Bearer ") ? authorization.slice(7).trim() : null;
+    if (!token) return null;
+
+    const response = await timePhase("external", () =>
+        fetch(`${CLERK_STUB_URL}/stub/sessions/${encodeURIComponent(token)}`, { cache: "no-store" })
+    );
+    if (!response.ok) return null;
+
+    const { user_id: userId } = (await response.json()) as { user_id?: string };
+    if (!userId) return null;
+
+    return clerkClient.users.getUser(userId);
+}
@@ -0,0 +1,212 @@
+import { randomUUID } from "node:crypto";
+import type { User as ClerkUser } from "@clerk/backend";
+import { clerkClient } from "@/lib/clerk/client";
+import { prisma } from "@/lib/db";
+
+export type UserSyncPageTiming = {
+    page: number;
+    offset: number;
+    fetched: number;
+    created: number;
+    updated: number;
+    failed: number;
+    fetchMs: number;
+    writeMs: number;
+};
+
+export type UserSyncResult = {
+    processed: number;
+    createdUsers: number;
+    updatedUsers: number;
+    failedUsers: number;
+    pagesProcessed: number;
+    nextCursor: string | null;
+    durationMs: number;
+    pages: UserSyncPageTiming[];
+};
+
+export type UserSyncOptions = {
+    pageSize?: number;
+    maxPages?: number;
+    cursor?: string | null;
+    onPage?: (page: UserSyncPageTiming, totals: Omit<UserSyncResult, "pages" | "durationMs">) => Promise<void> | void;
+};
+
+type UserRow = {
+    clerkId: string;
+    email: string | null;
+    name: string | null;
+};
+
+const MAX_PAGE_SIZE = 500;
+
+function toUserRow(clerkUser: ClerkUser): UserRow {
+    return {
+        clerkId: clerkUser.id,
+        email: clerkUser.emailAddresses[0]?.emailAddress || null,
+        name: clerkUser.firstName && clerkUser.lastName
+            ? `${clerkUser.firstName} ${clerkUser.lastName}`.trim()
+            : clerkUser.firstName || clerkUser.lastName || null,
+    };
+}
+
+function parseCursor(cursor?: string | null) {
+    const offset = Number.parseInt(cursor ?? "", 10);
+    return Number.isFinite(offset) && offset > 0 ? offset : 0;
+}
+
+async function fetchPage(offset: number, limit: number) {
+    const startedAt = performance.now();
+    // Oldest first: users who sign up mid-sync land after the cursor instead of
+    // shifting every later page, so an interrupted sync can resume by offset.
+    const response = await clerkClient.users.getUserList({
+        limit,
+        offset,
+        orderBy: "+created_at",
+    });
+    return { users: response.data, fetchMs: performance.now() - startedAt };
+}
+
+/**
+ * Writes one page with a single INSERT ... ON CONFLICT ("clerkId") statement.
+ * `xmax = 0` is only true for freshly inserted rows, which splits the
+ * created/updated counters without a prior lookup.
+ */
+async function bulkUpsert(rows: UserRow[]) {
+    const result = await prisma.$queryRaw<{ inserted: boolean }[]>`
+        INSERT INTO "User" ("id", "clerkId", "email", "name", "isActive", "createdAt", "updatedAt")
+        SELECT t.id, t.clerk_id, t.email, t.name, true, NOW(), NOW()
+        FROM UNNEST(
+            ${rows.map(() => randomUUID())}::text[],
+            ${rows.map((row) => row.clerkId)}::text[],
+            ${rows.map((row) => row.email)}::text[],
+            ${rows.map((row) => row.name)}::text[]
+        ) AS t(id, clerk_id, email, name)
+        ON CONFLICT ("clerkId") DO UPDATE SET
+            "email" = EXCLUDED."email",
+            "name" = EXCLUDED."name",
+            "isActive" = true,
+            "updatedAt" = NOW()
+        RETURNING (xmax = 0) AS inserted
+    `;
+    const created = result.filter((row) => row.inserted).length;
+    return { created, updated: result.length - created, failed: 0 };
+}
+
+/**
+ * Row-by-row fallback used when the bulk statement is rejected (typically an
+ * email already owned by a different clerkId), so one bad row does not sink
+ * the whole page.
+ */
+async function upsertIndividually(rows: UserRow[]) {
+    let created = 0;
+    let updated = 0;
+    let failed = 0;
+
+    for (const row of rows) {
+        try {
+            const existing = await prisma.user.findUnique({
+                where: { clerkId: row.clerkId },
+                select: { id: true },
+            });
+            const data = { email: row.email, name: row.name, isActive: true };
+
+            if (existing) {
+                await prisma.user.update({ where: { id: existing.id }, data });
+                updated++;
+            } else {
+                await prisma.user.create({ data: { clerkId: row.clerkId, ...data } });
+                created++;
+            }
+        } catch (error) {
+            console.error(`Error syncing user ${row.clerkId}:`, error);
+            failed++;
+        }
+    }
+
+    return { created, updated, failed };
+}
+
+async function writePage(clerkUsers: ClerkUser[]) {
+    const startedAt = performance.now();
+    const byClerkId = new Map(clerkUsers.map((clerkUser) => [clerkUser.id, toUserRow(clerkUser)]));
+    const rows = [...byClerkId.values()];
+
+    let counts = { created: 0, updated: 0, failed: 0 };
+    if (rows.length > 0) {
+        try {
+            counts = await bulkUpsert(rows);
+        } catch (error) {
+            console.error("[USER_SYNC] Bulk upsert failed, retrying page row by row:", error);
+            counts = await upsertIndividually(rows);
+        }
+    }
+
+    return { ...counts, writeMs: performance.now() - startedAt };
+}
+
+/**
+ * Mirrors Clerk users into the User table page by page.
+ *
+ * Each page is written with one bulk upsert while the next page is already
+ * being fetched from Clerk. `cursor` is the Clerk offset to start from; the
+ * result's `nextCursor` resumes an interrupted or `maxPages`-bounded run.
+ */
+export async function syncClerkUsers(options: UserSyncOptions = {}): Promise<UserSyncResult> {
+    const pageSize = Math.min(Math.max(1, options.pageSize ?? 100), MAX_PAGE_SIZE);
+    const maxPages = Math.max(1, options.maxPages ?? 50);
+    const startedAt = performance.now();
+
+    const pages: UserSyncPageTiming[] = [];
+    const totals = {
+        processed: 0,
+        createdUsers: 0,
+        updatedUsers: 0,
+        failedUsers: 0,
+        pagesProcessed: 0,
+        nextCursor: null as string | null,
+    };
+
+    let offset = parseCursor(options.cursor);
+    let pending: ReturnType<typeof fetchPage> | null = fetchPage(offset, pageSize);
+
+    while (pending) {
+        const { users, fetchMs } = await pending;
+        const hasMore = users.length === pageSize;
+        const nextOffset = offset + users.length;
+
+        // Overlap the next Clerk round-trip with this page's database write.
+        pending = hasMore && pages.length + 1 < maxPages ? fetchPage(nextOffset, pageSize) : null;
+        pending?.catch(() => undefined);
+
+        const written = await writePage(users);
+
+        const page: UserSyncPageTiming = {
+            page: pages.length + 1,
+            offset,
+            fetched: users.length,
+            created: written.created,
+            updated: written.updated,
+            failed: written.failed,
+            fetchMs: Math.round(fetchMs),
+            writeMs: Math.round(written.writeMs),
+        };
+        pages.push(page);
+
+        totals.processed += written.created + written.updated;
+        totals.createdUsers += written.created;
+        totals.updatedUsers += written.updated;
+        totals.failedUsers += written.failed;
+        totals.pagesProcessed = pages.length;
+        totals.nextCursor = hasMore ? String(nextOffset) : null;
+        offset = nextOffset;
+
+        await options.onPage?.(page, { ...totals });
+    }
+
+    return {
+        ...totals,
+        durationMs: Math.round(performance.now() - startedAt),
+        pages,
+    };
+}
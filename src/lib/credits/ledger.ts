@@ -0,0 +1,180 @@
+import { randomUUID } from "node:crypto";
+import { Prisma } from "@prisma/client";
+import { prisma } from "@/lib/db";
+import { getFeatureCost } from "@/lib/credits/settings";
+
+/**
+ * Credit accounting on CreditBalance. Every balance change is a single SQL
+ * statement: the balance is updated in place (never read, changed in JS and
+ * written back) and the matching UsageHistory rows are inserted by the same
+ * statement, so they commit or roll back together. Concurrent debits for one
+ * user queue on the balance row lock for the duration of that one statement;
+ * the `creditsRemaining >= total` guard is re-evaluated against the latest
+ * row version, so the balance can never go negative.
+ */
+
+export type CreditCharge = {
+    /** Recorded as UsageHistory.operation, e.g. a feature key. */
+    operation: string;
+    /** Non-negative whole credits. */
+    amount: number;
+    details?: Prisma.InputJsonValue;
+};
+
+export type DebitResult = {
+    /** Balance after the call; null when the user has no CreditBalance row. */
+    creditsRemaining: number | null;
+    /** True when nothing was debited because the balance was too low. */
+    insufficient: boolean;
+};
+
+function validate(charges: CreditCharge[]) {
+    if (charges.length === 0) {
+        throw new Error("At least one credit charge is required");
+    }
+    for (const { amount } of charges) {
+        if (!Number.isInteger(amount) || amount < 0) {
+            throw new Error(`Invalid credit amount: ${amount}`);
+        }
+    }
+    return charges.reduce((total, { amount }) => total + amount, 0);
+}
+
+/** Parallel arrays for UNNEST; `sign` is -1 for refunds. */
+function usageColumns(charges: CreditCharge[], sign: 1 | -1) {
+    return {
+        ids: charges.map(() => randomUUID()),
+        operations: charges.map((charge) => charge.operation),
+        credits: charges.map((charge) => sign * charge.amount),
+        details: charges.map((charge) => (charge.details === undefined ? null : JSON.stringify(charge.details))),
+    };
+}
+
+async function currentBalance(userId: string) {
+    const balance = await prisma.creditBalance.findUnique({
+        where: { userId },
+        select: { creditsRemaining: true },
+    });
+    return balance?.creditsRemaining ?? null;
+}
+
+/**
+ * Debits the sum of `charges` from the user's balance in one statement and
+ * records one UsageHistory row per charge. All or nothing: when the balance
+ * does not cover the total, nothing is written and `insufficient` is true.
+ * Use it to settle many small charges for a user in one round trip.
+ */
+export async function debitCreditsBatch(userId: string, charges: CreditCharge[]): Promise<DebitResult> {
+    const total = validate(charges);
+    const usage = usageColumns(charges, 1);
+
+    const [row] = await prisma.$queryRaw<{ creditsRemaining: number }[]>`
+        WITH debit AS (
+            UPDATE "CreditBalance"
+            SET "creditsRemaining" = "creditsRemaining" - ${total}, "updatedAt" = NOW()
+            WHERE "userId" = ${userId} AND "creditsRemaining" >= ${total}
+            RETURNING "userId", "clerkUserId", "creditsRemaining"
+        ), usage AS (
+            INSERT INTO "UsageHistory" ("id", "userId", "clerkUserId", "operation", "creditsUsed", "details", "createdAt", "updatedAt")
+            SELECT c.id, d."userId", d."clerkUserId", c.operation, c.credits, c.details::jsonb, NOW(), NOW()
+            FROM debit d
+            CROSS JOIN UNNEST(
+                ${usage.ids}::text[],
+                ${usage.operations}::text[],
+                ${usage.credits}::int[],
+                ${usage.details}::text[]
+            ) AS c(id, operation, credits, details)
+        )
+        SELECT "creditsRemaining" FROM debit
+    `;
+
+    if (row) return { creditsRemaining: row.creditsRemaining, insufficient: false };
+    // Only the failure path reads the balance, to tell "too low" from "no row".
+    const creditsRemaining = await currentBalance(userId);
+    return { creditsRemaining, insufficient: creditsRemaining !== null };
+}
+
+/** Debits a single charge; see debitCreditsBatch. */
+export async function debitCredits(userId: string, charge: CreditCharge): Promise<DebitResult> {
+    return debitCreditsBatch(userId, [charge]);
+}
+
+/**
+ * Debits `quantity` uses of a feature at its configured cost (see
+ * getFeatureCost), recorded under the feature key.
+ */
+export async function debitFeature(
+    userId: string,
+    feature: string,
+    quantity = 1,
+    details?: Prisma.InputJsonValue
+): Promise<DebitResult> {
+    const cost = await getFeatureCost(feature);
+    return debitCredits(userId, { operation: feature, amount: cost * quantity, details });
+}
+
+/**
+ * Adds credits back (a failed operation, an admin grant) and records them as
+ * UsageHistory rows with negative `creditsUsed`, so usage sums stay net.
+ * Creates the balance row when the user has none yet; returns null only when
+ * the user does not exist.
+ */
+export async function refundCreditsBatch(userId: string, charges: CreditCharge[]): Promise<number | null> {
+    const total = validate(charges);
+    const usage = usageColumns(charges, -1);
+
+    const [row] = await prisma.$queryRaw<{ creditsRemaining: number }[]>`
+        WITH refund AS (
+            INSERT INTO "CreditBalance" ("id", "userId", "clerkUserId", "creditsRemaining", "createdAt", "updatedAt")
+            SELECT ${randomUUID()}, u."id", u."clerkId", ${total}, NOW(), NOW()
+            FROM "User" u
+            WHERE u."id" = ${userId}
+            ON CONFLICT ("userId") DO UPDATE SET
+                "creditsRemaining" = "CreditBalance"."creditsRemaining" + EXCLUDED."creditsRemaining",
+                "updatedAt" = NOW()
+            RETURNING "userId", "clerkUserId", "creditsRemaining"
+        ), usage AS (
+            INSERT INTO "UsageHistory" ("id", "userId", "clerkUserId", "operation", "creditsUsed", "details", "createdAt", "updatedAt")
+            SELECT c.id, r."userId", r."clerkUserId", c.operation, c.credits, c.details::jsonb, NOW(), NOW()
+            FROM refund r
+            CROSS JOIN UNNEST(
+                ${usage.ids}::text[],
+                ${usage.operations}::text[],
+                ${usage.credits}::int[],
+                ${usage.details}::text[]
+            ) AS c(id, operation, credits, details)
+        )
+        SELECT "creditsRemaining" FROM refund
+    `;
+
+    return row?.creditsRemaining ?? null;
+}
+
+/** Refunds a single charge; see refundCreditsBatch. */
+export async function refundCredits(userId: string, charge: CreditCharge): Promise<number | null> {
+    return refundCreditsBatch(userId, [charge]);
+}
+
+/**
+ * Overwrites the balance (admin correction, plan reset). Not recorded in
+ * UsageHistory, like the Clerk user webhook's absolute `creditsRemaining`.
+ */
+export async function setCredits(userId: string, creditsRemaining: number): Promise<number | null> {
+    if (!Number.isInteger(creditsRemaining) || creditsRemaining < 0) {
+        throw new Error(`Invalid credit balance: ${creditsRemaining}`);
+    }
+
+    const [row] = await prisma.$queryRaw<{ creditsRemaining: number }[]>`
+        INSERT INTO "CreditBalance" ("id", "userId", "clerkUserId", "creditsRemaining", "lastSyncedAt", "createdAt", "updatedAt")
+        SELECT ${randomUUID()}, u."id", u."clerkId", ${creditsRemaining}, NOW(), NOW(), NOW()
+        FROM "User" u
+        WHERE u."id" = ${userId}
+        ON CONFLICT ("userId") DO UPDATE SET
+            "creditsRemaining" = EXCLUDED."creditsRemaining",
+            "lastSyncedAt" = NOW(),
+            "updatedAt" = NOW()
+        RETURNING "creditsRemaining"
+    `;
+
+    return row?.creditsRemaining ?? null;
+}
@@ -1,9 +1,148 @@
+import { z } from 'zod';
+import { prisma } from '@/lib/db';
 import { SUBSCRIPTION_PLANS } from '@/lib/clerk/subscription-utils';
 
+const SETTINGS_KEY = 'credits';
+
+// How long an instance serves its snapshot before comparing the stored
+// version again, i.e. how long other instances may lag behind a PUT.
+const VERSION_CHECK_INTERVAL_MS = 5_000;
+
+const DEFAULT_FEATURE_COSTS: Record<string, number> = {
+    ai_text_chat: 1,
+    ai_image_generation: 5,
+};
+
+const costMap = z.record(z.string().min(1).max(64), z.number().int().nonnegative());
+
+export const creditSettingsSchema = z.object({
+    featureCosts: costMap,
+    planCredits: costMap,
+});
+
+export type CreditSettings = z.infer<typeof creditSettingsSchema>;
+
+export type VersionedCreditSettings = {
+    version: number;
+    settings: CreditSettings;
+    updatedAt: Date;
+};
+
+type Snapshot = VersionedCreditSettings & { checkedAt: number };
+
+let snapshot: Snapshot | null = null;
+let refreshing: Promise<Snapshot> | null = null;
+
+function defaultSettings(): CreditSettings {
+    return {
+        featureCosts: { ...DEFAULT_FEATURE_COSTS },
+        planCredits: Object.fromEntries(Object.values(SUBSCRIPTION_PLANS).map((plan) => [plan.id, plan.credits])),
+    };
+}
+
+async function loadSettings(): Promise<VersionedCreditSettings> {
+    let row = await prisma.adminSetting.findUnique({ where: { key: SETTINGS_KEY } });
+    if (!row) {
+        // First read anywhere: store the defaults as version 1. Concurrent
+        // instances racing here all end up reading the same row.
+        await prisma.adminSetting.createMany({
+            data: [{ key: SETTINGS_KEY, data: defaultSettings() }],
+            skipDuplicates: true,
+        });
+        row = await prisma.adminSetting.findUniqueOrThrow({ where: { key: SETTINGS_KEY } });
+    }
+
+    const parsed = creditSettingsSchema.safeParse(row.data);
+    return {
+        version: row.version,
+        settings: parsed.success ? parsed.data : defaultSettings(),
+        updatedAt: row.updatedAt,
+    };
+}
+
+function store(next: VersionedCreditSettings): Snapshot {
+    // A slow refresh must not replace a newer snapshot written meanwhile.
+    if (!snapshot || next.version >= snapshot.version) {
+        snapshot = { ...next, checkedAt: Date.now() };
+    }
+    return snapshot;
+}
+
+async function refresh(): Promise<Snapshot> {
+    const current = snapshot;
+    if (current) {
+        const row = await prisma.adminSetting.findUnique({
+            where: { key: SETTINGS_KEY },
+            select: { version: true },
+        });
+        if (row?.version === current.version) {
+            current.checkedAt = Date.now();
+            return current;
+        }
+    }
+    return store(await loadSettings());
+}
+
+function refreshOnce() {
+    refreshing ??= refresh().finally(() => {
+        refreshing = null;
+    });
+    return refreshing;
+}
+
+/**
+ * Credit settings from this instance's in-memory snapshot. Reads never wait
+ * on the database once the snapshot exists: when it is older than
+ * VERSION_CHECK_INTERVAL_MS, a background check compares the stored version
+ * and reloads only if another instance wrote since. Pass `fresh` to await
+ * that check (the admin settings page does, before editing).
+ */
+export async function getCreditSettings({ fresh = false } = {}): Promise<VersionedCreditSettings> {
+    if (!snapshot || fresh) return refreshOnce();
+
+    if (Date.now() - snapshot.checkedAt >= VERSION_CHECK_INTERVAL_MS) {
+        refreshOnce().catch((error) => console.error('[CREDIT_SETTINGS_REFRESH]', error));
+    }
+    return snapshot;
+}
+
+/**
+ * Conditional write: applies only if the stored version still equals
+ * `expectedVersion`, then bumps it. On a mismatch nothing is written and
+ * `conflict` is true, with the current settings returned instead.
+ */
+export async function updateCreditSettings(
+    settings: CreditSettings,
+    expectedVersion: number,
+    updatedBy?: string
+): Promise<{ settings: VersionedCreditSettings; conflict: boolean }> {
+    const { count } = await prisma.adminSetting.updateMany({
+        where: { key: SETTINGS_KEY, version: expectedVersion },
+        data: { data: settings, version: { increment: 1 }, updatedBy },
+    });
+
+    return { settings: store(await loadSettings()), conflict: count === 0 };
+}
+
+/**
+ * Credits charged for a feature, read on every credit-consuming operation.
+ * Served from the settings snapshot (see getCreditSettings).
+ */
+export async function getFeatureCost(feature: string): Promise<number> {
+    const { settings } = await getCreditSettings();
+    const cost = settings.featureCosts[feature] ?? DEFAULT_FEATURE_COSTS[feature];
+
+    if (cost === undefined) {
+        throw new Error(`Unknown feature: ${feature}`);
+    }
+
+    return cost;
+}
+
 /**
  * Get credits for a specific plan
  * @param planId - The plan ID (free, starter, professional, enterprise)
- * @returns The number of credits for the plan
+ * @returns The number of credits for the plan, as overridden in the admin settings
  */
 export async function getPlanCredits(planId: string): Promise<number> {
     const plan = SUBSCRIPTION_PLANS[planId];
@@ -12,5 +151,6 @@ export async function getPlanCredits(planId: string): Promise<number> {
         throw new Error(`Invalid plan ID: ${planId}`);
     }
 
-    return plan.credits;
+    const { settings } = await getCreditSettings();
+    return settings.planCredits[planId] ?? plan.credits;
 }
@@ -0,0 +1,6 @@
+import { Prisma } from "@prisma/client";
+
+/** A unique constraint rejected the write, e.g. a concurrent insert won the race. */
+export function isUniqueViolation(error: unknown) {
+    return error instanceof Prisma.PrismaClientKnownRequestError && error.code === "P2002";
+}
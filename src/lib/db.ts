@@ -1,10 +1,21 @@
 import { PrismaClient } from "@prisma/client";
+import { timePhase } from "@/lib/logging/metrics";
 
 const globalForPrisma = globalThis as unknown as {
   prisma: PrismaClient | undefined
 }
 
-export const db = globalForPrisma.prisma ?? new PrismaClient()
+const baseClient = globalForPrisma.prisma ?? new PrismaClient()
+
+// Every query (model operations and raw SQL) is timed into the current
+// request's `db` phase for Server-Timing and the route metrics.
+export const db = baseClient.$extends({
+  query: {
+    $allOperations({ args, query }) {
+      return timePhase("db", () => query(args))
+    },
+  },
+})
 export const prisma = db;
 
-if (process.env.NODE_ENV !== 'production') globalForPrisma.prisma = db
+if (process.env.NODE_ENV !== 'production') globalForPrisma.prisma = baseClient
@@ -0,0 +1,184 @@
+import { ExpenseType, Prisma, type MonthlyRollup } from "@prisma/client";
+import { prisma } from "@/lib/db";
+import type { FinancialTotals } from "@/lib/finance-utils";
+
+/**
+ * Per (user, year, month, category) sums of the financial items, kept in the
+ * MonthlyRollup table so dashboards and admin BI never scan the raw item
+ * tables. Every write path applies a delta in the same transaction as the
+ * item write; `rebuildRollups` recomputes from scratch and `checkRollups`
+ * reports drift.
+ */
+export const ROLLUP_CATEGORY = {
+    INCOME: "INCOME",
+    INVESTMENT: "INVESTMENT",
+    MISC: "MISC",
+    TITHE_PAID: "TITHE_PAID",
+} as const;
+
+export type RollupCategory =
+    | (typeof ROLLUP_CATEGORY)[keyof typeof ROLLUP_CATEGORY]
+    | `EXPENSE_${ExpenseType}`;
+
+export function expenseCategory(type: ExpenseType): RollupCategory {
+    return `EXPENSE_${type}`;
+}
+
+export type RollupDelta = {
+    category: RollupCategory;
+    amount: Prisma.Decimal.Value;
+    count?: number;
+};
+
+type DbClient = Prisma.TransactionClient | typeof prisma;
+
+/**
+ * Adds the deltas to the month's rollup rows, creating them on first use.
+ * One statement regardless of how many categories change.
+ */
+export async function applyRollupDeltas(db: DbClient, monthId: string, deltas: RollupDelta[]) {
+    const changes = deltas.filter((delta) => !new Prisma.Decimal(delta.amount).isZero() || delta.count);
+    if (changes.length === 0) return;
+
+    await db.$executeRaw`
+        INSERT INTO "MonthlyRollup" ("userId", "year", "month", "category", "monthId", "amount", "itemCount", "updatedAt")
+        SELECT m."userId", m."year", m."month", d.category, m."id", d.amount, d.item_count, NOW()
+        FROM "Month" m
+        CROSS JOIN UNNEST(
+            ${changes.map((delta) => delta.category)}::text[],
+            ${changes.map((delta) => new Prisma.Decimal(delta.amount).toString())}::numeric[],
+            ${changes.map((delta) => delta.count ?? 0)}::int[]
+        ) AS d(category, amount, item_count)
+        WHERE m."id" = ${monthId}
+        ON CONFLICT ("userId", "year", "month", "category") DO UPDATE SET
+            "amount" = "MonthlyRollup"."amount" + EXCLUDED."amount",
+            "itemCount" = "MonthlyRollup"."itemCount" + EXCLUDED."itemCount",
+            "updatedAt" = NOW()
+    `;
+}
+
+function scopeFilter(scope: RollupScope) {
+    if (scope.monthId) return Prisma.sql`WHERE m."id" = ${scope.monthId}`;
+    if (scope.monthIds) return Prisma.sql`WHERE m."id" = ANY(${scope.monthIds}::text[])`;
+    if (scope.userId) return Prisma.sql`WHERE m."userId" = ${scope.userId}`;
+    return Prisma.empty;
+}
+
+/** What the rollup rows should contain, computed from the raw item tables. */
+function expectedRollupsSql(scope: RollupScope) {
+    return Prisma.sql`
+        SELECT m."userId", m."year", m."month", s.category, m."id" AS "monthId", s.amount, s.item_count
+        FROM "Month" m
+        CROSS JOIN LATERAL (
+            SELECT 'INCOME' AS category, COALESCE(SUM(i."amount"), 0) AS amount, COUNT(*)::int AS item_count
+            FROM "Income" i WHERE i."monthId" = m."id"
+            UNION ALL
+            SELECT 'EXPENSE_' || e."type"::text, SUM(e."totalAmount"), COUNT(*)::int
+            FROM "Expense" e WHERE e."monthId" = m."id" GROUP BY e."type"
+            UNION ALL
+            SELECT 'INVESTMENT', COALESCE(SUM(v."amount"), 0), COUNT(*)::int
+            FROM "Investment" v WHERE v."monthId" = m."id"
+            UNION ALL
+            SELECT 'MISC', COALESCE(SUM(x."amount"), 0), COUNT(*)::int
+            FROM "MiscExpense" x WHERE x."monthId" = m."id"
+            UNION ALL
+            SELECT 'TITHE_PAID', m."tithePaidAmount", CASE WHEN m."isTithePaid" THEN 1 ELSE 0 END
+        ) s
+        ${scopeFilter(scope)}
+    `;
+}
+
+export type RollupScope = { userId?: string; monthId?: string; monthIds?: string[] };
+
+/**
+ * Recomputes the rollup rows in scope (everything by default) from the item
+ * tables. Pass `tx` to run inside the caller's transaction.
+ */
+export async function rebuildRollups(scope: RollupScope = {}, tx?: Prisma.TransactionClient) {
+    const rebuild = async (tx: Prisma.TransactionClient) => {
+        if (scope.monthId) {
+            await tx.$executeRaw`DELETE FROM "MonthlyRollup" WHERE "monthId" = ${scope.monthId}`;
+        } else if (scope.monthIds) {
+            await tx.$executeRaw`DELETE FROM "MonthlyRollup" WHERE "monthId" = ANY(${scope.monthIds}::text[])`;
+        } else if (scope.userId) {
+            await tx.$executeRaw`DELETE FROM "MonthlyRollup" WHERE "userId" = ${scope.userId}`;
+        } else {
+            await tx.$executeRaw`DELETE FROM "MonthlyRollup"`;
+        }
+
+        return tx.$executeRaw`
+            INSERT INTO "MonthlyRollup" ("userId", "year", "month", "category", "monthId", "amount", "itemCount", "updatedAt")
+            SELECT "userId", "year", "month", category, "monthId", amount, item_count, NOW()
+            FROM (${expectedRollupsSql(scope)}) expected
+            WHERE item_count > 0 OR amount <> 0
+        `;
+    };
+
+    return tx ? rebuild(tx) : prisma.$transaction(rebuild);
+}
+
+export type RollupMismatch = {
+    userId: string;
+    year: number;
+    month: number;
+    category: string;
+    expectedAmount: string;
+    actualAmount: string;
+    expectedCount: number;
+    actualCount: number;
+};
+
+/** Lists rollup rows that disagree with the item tables; empty means consistent. */
+export async function checkRollups(scope: RollupScope = {}): Promise<RollupMismatch[]> {
+    const actualFilter = scope.monthId
+        ? Prisma.sql`WHERE r."monthId" = ${scope.monthId}`
+        : scope.monthIds
+            ? Prisma.sql`WHERE r."monthId" = ANY(${scope.monthIds}::text[])`
+            : scope.userId
+                ? Prisma.sql`WHERE r."userId" = ${scope.userId}`
+                : Prisma.empty;
+
+    return prisma.$queryRaw<RollupMismatch[]>`
+        WITH expected AS (${expectedRollupsSql(scope)}),
+        actual AS (SELECT * FROM "MonthlyRollup" r ${actualFilter})
+        SELECT
+            COALESCE(e."userId", a."userId") AS "userId",
+            COALESCE(e."year", a."year") AS "year",
+            COALESCE(e."month", a."month") AS "month",
+            COALESCE(e.category, a."category") AS "category",
+            COALESCE(e.amount, 0)::text AS "expectedAmount",
+            COALESCE(a."amount", 0)::text AS "actualAmount",
+            COALESCE(e.item_count, 0) AS "expectedCount",
+            COALESCE(a."itemCount", 0) AS "actualCount"
+        FROM expected e
+        FULL OUTER JOIN actual a
+            ON a."userId" = e."userId" AND a."year" = e."year"
+            AND a."month" = e."month" AND a."category" = e.category
+        WHERE COALESCE(e.amount, 0) <> COALESCE(a."amount", 0)
+            OR COALESCE(e.item_count, 0) <> COALESCE(a."itemCount", 0)
+        ORDER BY 1, 2, 3, 4
+    `;
+}
+
+/** Same figures as `calculateTotals`, derived from a month's rollup rows. */
+export function totalsFromRollups(rows: Pick<MonthlyRollup, "category" | "amount">[]): FinancialTotals {
+    const sum = (...categories: string[]) => rows
+        .filter((row) => categories.includes(row.category))
+        .reduce((acc, row) => acc + Number(row.amount), 0);
+
+    const totalIncome = sum(ROLLUP_CATEGORY.INCOME);
+    const totalInvestment = sum(ROLLUP_CATEGORY.INVESTMENT);
+    const totalMisc = sum(ROLLUP_CATEGORY.MISC);
+    const standardAndTitheExpenses = sum(expenseCategory("STANDARD"), expenseCategory("TITHE"));
+    const titheAmount = totalIncome * 0.1;
+    const totalExpense = standardAndTitheExpenses + totalInvestment + totalMisc + titheAmount;
+
+    return {
+        totalIncome,
+        totalExpense,
+        totalInvestment,
+        totalMisc,
+        balance: totalIncome - totalExpense,
+        titheAmount,
+    };
+}
@@ -0,0 +1,154 @@
+import { Prisma, type BackgroundJob } from "@prisma/client";
+import { prisma } from "@/lib/db";
+import { isUniqueViolation } from "@/lib/db-errors";
+
+export type BackgroundJobType = "users.sync" | "plans.refresh-pricing" | "months.rollover";
+
+export type BackgroundJobStatus = "queued" | "running" | "succeeded" | "failed";
+
+export type JobProgress = {
+    processed?: number;
+    created?: number;
+    updated?: number;
+    failed?: number;
+    cursor?: string | null;
+};
+
+export type JobContext = {
+    job: BackgroundJob;
+    /** Adds to the job counters and refreshes its heartbeat. */
+    progress: (delta: JobProgress) => Promise<void>;
+};
+
+// A running job that has not reported progress for this long is assumed dead
+// (the invocation was killed) and its lock may be taken over.
+const STALE_AFTER_MS = 5 * 60 * 1000;
+
+function isStale(job: BackgroundJob, now = Date.now()) {
+    const lastSeen = job.heartbeatAt ?? job.updatedAt;
+    return now - lastSeen.getTime() > STALE_AFTER_MS;
+}
+
+/**
+ * Queues a job of the given type. `lockKey` is unique and set to the job type
+ * while a job is queued or running, so the database guarantees at most one
+ * active job per type.
+ *
+ * Returns `{ job, conflict: true }` with the active job when one is already
+ * in flight. A stale job is marked failed and replaced; its last cursor is
+ * handed back as `resumeFrom`.
+ */
+export async function enqueueJob(
+    type: BackgroundJobType,
+    params: Prisma.InputJsonValue = {},
+    requestedBy?: string,
+): Promise<{ job: BackgroundJob; conflict: boolean; resumeFrom: string | null }> {
+    let resumeFrom: string | null = null;
+
+    for (let attempt = 0; attempt < 2; attempt++) {
+        try {
+            const job = await prisma.backgroundJob.create({
+                data: { type, status: "queued", lockKey: type, params, requestedBy, cursor: resumeFrom },
+            });
+            return { job, conflict: false, resumeFrom };
+        } catch (error) {
+            if (!isUniqueViolation(error)) throw error;
+        }
+
+        const active = await prisma.backgroundJob.findUnique({ where: { lockKey: type } });
+        if (!active) continue;
+        if (!isStale(active)) return { job: active, conflict: true, resumeFrom: null };
+
+        // Only release the lock if nobody else has touched the stale job meanwhile.
+        const released = await prisma.backgroundJob.updateMany({
+            where: { id: active.id, lockKey: type, updatedAt: active.updatedAt },
+            data: {
+                status: "failed",
+                lockKey: null,
+                error: "Abandoned: no heartbeat received",
+                finishedAt: new Date(),
+            },
+        });
+        if (released.count > 0) resumeFrom = active.cursor;
+    }
+
+    const active = await prisma.backgroundJob.findUnique({ where: { lockKey: type } });
+    if (active) return { job: active, conflict: true, resumeFrom: null };
+    throw new Error(`Could not acquire the ${type} job lock`);
+}
+
+/**
+ * Executes a queued job, keeping its counters and heartbeat current, and
+ * releases the type lock when it settles. Never throws: failures are recorded
+ * on the job row.
+ */
+export async function runJob<T extends Prisma.InputJsonValue>(
+    jobId: string,
+    handler: (context: JobContext) => Promise<T>,
+) {
+    try {
+        const job = await prisma.backgroundJob.update({
+            where: { id: jobId },
+            data: { status: "running", startedAt: new Date(), heartbeatAt: new Date() },
+        });
+
+        const progress = async (delta: JobProgress) => {
+            await prisma.backgroundJob.update({
+                where: { id: jobId },
+                data: {
+                    processed: { increment: delta.processed ?? 0 },
+                    created: { increment: delta.created ?? 0 },
+                    updated: { increment: delta.updated ?? 0 },
+                    failed: { increment: delta.failed ?? 0 },
+                    ...(delta.cursor !== undefined && { cursor: delta.cursor }),
+                    heartbeatAt: new Date(),
+                },
+            });
+        };
+
+        const result = await handler({ job, progress });
+
+        await prisma.backgroundJob.update({
+            where: { id: jobId },
+            data: { status: "succeeded", result, lockKey: null, finishedAt: new Date() },
+        });
+    } catch (error) {
+        console.error(`[BACKGROUND_JOB] ${jobId} failed:`, error);
+        await prisma.backgroundJob.update({
+            where: { id: jobId },
+            data: {
+                status: "failed",
+                error: error instanceof Error ? error.message : String(error),
+                lockKey: null,
+                finishedAt: new Date(),
+            },
+        }).catch((updateError) => {
+            console.error(`[BACKGROUND_JOB] ${jobId} could not be marked failed:`, updateError);
+        });
+    }
+}
+
+/** Public shape of a job, with throughput in processed items per second. */
+export function serializeJob(job: BackgroundJob) {
+    const startedAt = job.startedAt?.getTime();
+    const endedAt = job.finishedAt?.getTime() ?? Date.now();
+    const elapsedMs = startedAt ? Math.max(0, endedAt - startedAt) : 0;
+
+    return {
+        id: job.id,
+        type: job.type,
+        status: job.status as BackgroundJobStatus,
+        processed: job.processed,
+        created: job.created,
+        updated: job.updated,
+        failed: job.failed,
+        cursor: job.cursor,
+        elapsedMs,
+        throughputPerSecond: elapsedMs > 0 ? Math.round((job.processed / elapsedMs) * 1000 * 100) / 100 : 0,
+        result: job.result,
+        error: job.error,
+        createdAt: job.createdAt,
+        startedAt: job.startedAt,
+        finishedAt: job.finishedAt,
+    };
+}
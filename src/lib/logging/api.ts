@@ -1,5 +1,7 @@
 import type { NextRequest } from 'next/server'
 import { getApiLogMinimumStatus, isApiLoggingEnabled, logDebug, logError, logWarn } from '@/lib/logger'
+import { recordRequest, runWithPhases, serverTimingHeader } from '@/lib/logging/metrics'
+import { runInRequestContext } from '@/lib/request-context'
 
 type RouteParams = Record<string, string | string[]>
 
@@ -8,11 +10,6 @@ type RouteContext<TParams extends RouteParams = RouteParams> = {
   [key: string]: unknown
 }
 
-type RouteHandler<TParams extends RouteParams = RouteParams> = (
-  request: NextRequest,
-  context: RouteContext<TParams>
-) => Promise<Response> | Response
-
 interface LoggingOptions {
   route?: string
   method?: string
@@ -58,6 +55,12 @@ function normalizeParams(params?: RouteParams) {
   return Object.keys(normalized).length > 0 ? normalized : undefined
 }
 
+function createRequestId() {
+  return typeof globalThis.crypto?.randomUUID === 'function'
+    ? globalThis.crypto.randomUUID()
+    : `${Date.now()}-${Math.random()}`
+}
+
 function serializeError(error: unknown) {
   if (error instanceof Error) {
     return {
@@ -73,69 +76,85 @@ function serializeError(error: unknown) {
   }
 }
 
-export function withApiLogging<TParams extends RouteParams = RouteParams>(
-  handler: RouteHandler<TParams>,
+function attachServerTiming(response: Response, value: string) {
+  try {
+    response.headers.set('Server-Timing', value)
+  } catch {
+    // Immutable headers (e.g. a proxied fetch response); skip the header.
+  }
+}
+
+/**
+ * Wraps a route handler with error/slow-status logging and request metrics:
+ * per-route latency and phase histograms (see ./metrics) plus a
+ * `Server-Timing` header on the response. Pass `route` as the route template
+ * (`/api/admin/users/[id]`) so ids do not fan out into separate series.
+ * Handlers also run in a request context (see @/lib/request-context), so
+ * `currentUser()` resolves the session at most once per request.
+ */
+export function withApiLogging<TArgs extends unknown[]>(
+  handler: (...args: TArgs) => Promise<Response> | Response,
   options: LoggingOptions = {}
 ) {
-  return async function wrappedHandler(
-    request: NextRequest,
-    context: RouteContext<TParams> = {}
-  ) {
-    if (!isApiLoggingEnabled()) {
-      return handler(request, context)
-    }
-
+  return async function wrappedHandler(...args: TArgs): Promise<Response> {
+    const [request, context] = args as unknown as [NextRequest | undefined, RouteContext | undefined]
     const route = options.route || resolvePath(request)
     const method = options.method || request?.method || 'UNKNOWN'
-    const requestId =
-      typeof globalThis.crypto?.randomUUID === 'function'
-        ? globalThis.crypto.randomUUID()
-        : `${Date.now()}-${Math.random()}`
-    const startedAt = Date.now()
+    const startedAt = performance.now()
+    const { phases, result } = runWithPhases(() => runInRequestContext(async () => handler(...args)))
 
+    let response: Response
     try {
-      const response = await handler(request, context)
-      if (!response) {
-        return response
-      }
-
-      const status = response.status
-      const durationMs = Date.now() - startedAt
-      if (shouldLogStatus(status)) {
-        const level = status >= 500 ? logError : logWarn
-        level('API response emitted non-success status', {
-          status,
-          method,
-          route,
-          durationMs,
-          requestId,
-          feature: options.feature,
-          params: normalizeParams(context?.params as RouteParams),
-          query: resolveSearchParams(request),
-        })
-      } else if (DEBUG_ENABLED()) {
-        logDebug('API response', {
-          status,
+      response = await result
+    } catch (error) {
+      const durationMs = performance.now() - startedAt
+      recordRequest(route, method, 500, durationMs, phases)
+      if (isApiLoggingEnabled()) {
+        logError('API handler threw an error', {
           method,
           route,
-          durationMs,
-          requestId,
+          durationMs: Math.round(durationMs),
+          requestId: createRequestId(),
           feature: options.feature,
+          error: serializeError(error),
         })
       }
+      throw error
+    }
 
+    if (!response) {
       return response
-    } catch (error) {
-      const durationMs = Date.now() - startedAt
-      logError('API handler threw an error', {
+    }
+
+    const durationMs = performance.now() - startedAt
+    const status = response.status
+    recordRequest(route, method, status, durationMs, phases)
+    attachServerTiming(response, serverTimingHeader(phases, durationMs))
+
+    if (shouldLogStatus(status)) {
+      const level = status >= 500 ? logError : logWarn
+      level('API response emitted non-success status', {
+        status,
         method,
         route,
-        durationMs,
-        requestId,
+        durationMs: Math.round(durationMs),
+        requestId: createRequestId(),
         feature: options.feature,
-        error: serializeError(error),
+        params: normalizeParams(context?.params as RouteParams),
+        query: resolveSearchParams(request),
+      })
+    } else if (DEBUG_ENABLED()) {
+      logDebug('API response', {
+        status,
+        method,
+        route,
+        durationMs: Math.round(durationMs),
+        requestId: createRequestId(),
+        feature: options.feature,
+        phases,
       })
-      throw error
     }
+
+    return response
   }
 }
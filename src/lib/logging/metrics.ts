@@ -0,0 +1,193 @@
+import { AsyncLocalStorage } from 'node:async_hooks'
+
+/**
+ * In-process request metrics for API routes.
+ *
+ * `withApiLogging` runs each handler inside a request scope; code on the
+ * request path reports time spent in named phases through `timePhase` (the
+ * Prisma client extension in src/lib/db.ts does so for every query). Each
+ * request then feeds per-route latency histograms and phase counters, and its
+ * own phase totals are returned to the caller as a `Server-Timing` header.
+ *
+ * Phases may overlap (an auth check that calls Clerk counts as both `auth`
+ * and `external`), so they are not meant to add up to the total.
+ */
+
+export type Phase = 'auth' | 'db' | 'external'
+
+export type PhaseTotals = Partial<Record<Phase, { ms: number; calls: number }>>
+
+// Upper bounds in ms; the last bucket is open-ended.
+const BUCKETS_MS = [1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+export type HistogramSnapshot = {
+  count: number
+  sumMs: number
+  minMs: number | null
+  maxMs: number | null
+  meanMs: number | null
+  p50Ms: number | null
+  p95Ms: number | null
+  p99Ms: number | null
+  buckets: { le: number | '+Inf'; count: number }[]
+}
+
+export class Histogram {
+  private counts = new Array<number>(BUCKETS_MS.length + 1).fill(0)
+  private count = 0
+  private sum = 0
+  private min = Infinity
+  private max = -Infinity
+
+  observe(ms: number) {
+    let index = BUCKETS_MS.findIndex((bound) => ms <= bound)
+    if (index === -1) index = BUCKETS_MS.length
+    this.counts[index]++
+    this.count++
+    this.sum += ms
+    this.min = Math.min(this.min, ms)
+    this.max = Math.max(this.max, ms)
+  }
+
+  /** Estimated from the buckets, interpolating linearly inside one. */
+  percentile(pct: number): number | null {
+    if (this.count === 0) return null
+    const rank = (pct / 100) * this.count
+    let seen = 0
+    for (let i = 0; i < this.counts.length; i++) {
+      if (this.counts[i] === 0) continue
+      if (seen + this.counts[i] >= rank) {
+        const lower = i === 0 ? 0 : BUCKETS_MS[i - 1]
+        const upper = i < BUCKETS_MS.length ? BUCKETS_MS[i] : this.max
+        const estimate = lower + ((rank - seen) / this.counts[i]) * (upper - lower)
+        return round(Math.min(Math.max(estimate, this.min), this.max))
+      }
+      seen += this.counts[i]
+    }
+    return round(this.max)
+  }
+
+  snapshot(): HistogramSnapshot {
+    const empty = this.count === 0
+    return {
+      count: this.count,
+      sumMs: round(this.sum),
+      minMs: empty ? null : round(this.min),
+      maxMs: empty ? null : round(this.max),
+      meanMs: empty ? null : round(this.sum / this.count),
+      p50Ms: this.percentile(50),
+      p95Ms: this.percentile(95),
+      p99Ms: this.percentile(99),
+      buckets: this.counts.map((count, i) => ({ le: i < BUCKETS_MS.length ? BUCKETS_MS[i] : '+Inf', count })),
+    }
+  }
+}
+
+type RouteMetrics = {
+  route: string
+  method: string
+  requests: number
+  errors: number
+  statuses: Record<string, number>
+  latency: Histogram
+  phases: Partial<Record<Phase, { calls: number; requests: number; latency: Histogram }>>
+}
+
+const globalForMetrics = globalThis as unknown as {
+  apiRouteMetrics?: Map<string, RouteMetrics>
+  apiMetricsSince?: string
+}
+
+// Kept on globalThis so dev-mode module reloads do not reset the aggregates.
+const routes = (globalForMetrics.apiRouteMetrics ??= new Map<string, RouteMetrics>())
+globalForMetrics.apiMetricsSince ??= new Date().toISOString()
+
+const requestScope = new AsyncLocalStorage<PhaseTotals>()
+
+function round(value: number) {
+  return Math.round(value * 100) / 100
+}
+
+/** Runs `fn` with a fresh phase accumulator for the current request. */
+export function runWithPhases<T>(fn: () => T): { phases: PhaseTotals; result: T } {
+  const phases: PhaseTotals = {}
+  return { phases, result: requestScope.run(phases, fn) }
+}
+
+/** Times `fn` under `phase` when called within a request scope. */
+export async function timePhase<T>(phase: Phase, fn: () => Promise<T> | T): Promise<T> {
+  const phases = requestScope.getStore()
+  if (!phases) return fn()
+
+  const startedAt = performance.now()
+  try {
+    return await fn()
+  } finally {
+    const entry = (phases[phase] ??= { ms: 0, calls: 0 })
+    entry.ms += performance.now() - startedAt
+    entry.calls++
+  }
+}
+
+export function recordRequest(
+  route: string,
+  method: string,
+  status: number,
+  durationMs: number,
+  phases: PhaseTotals
+) {
+  const key = `${method} ${route}`
+  let metrics = routes.get(key)
+  if (!metrics) {
+    metrics = { route, method, requests: 0, errors: 0, statuses: {}, latency: new Histogram(), phases: {} }
+    routes.set(key, metrics)
+  }
+
+  metrics.requests++
+  if (status >= 500) metrics.errors++
+  metrics.statuses[status] = (metrics.statuses[status] ?? 0) + 1
+  metrics.latency.observe(durationMs)
+
+  for (const [phase, totals] of Object.entries(phases) as [Phase, { ms: number; calls: number }][]) {
+    const phaseMetrics = (metrics.phases[phase] ??= { calls: 0, requests: 0, latency: new Histogram() })
+    phaseMetrics.calls += totals.calls
+    phaseMetrics.requests++
+    phaseMetrics.latency.observe(totals.ms)
+  }
+}
+
+/** `Server-Timing` value for one request, e.g. `db;dur=4.2;desc="3 calls", total;dur=18.9`. */
+export function serverTimingHeader(phases: PhaseTotals, totalMs: number) {
+  const entries = (Object.entries(phases) as [Phase, { ms: number; calls: number }][]).map(
+    ([phase, { ms, calls }]) => `${phase};dur=${round(ms)};desc="${calls} call${calls === 1 ? '' : 's'}"`
+  )
+  entries.push(`total;dur=${round(totalMs)}`)
+  return entries.join(', ')
+}
+
+export function metricsSnapshot() {
+  return {
+    since: globalForMetrics.apiMetricsSince,
+    routes: [...routes.values()]
+      .map((metrics) => ({
+        route: metrics.route,
+        method: metrics.method,
+        requests: metrics.requests,
+        errors: metrics.errors,
+        statuses: metrics.statuses,
+        latency: metrics.latency.snapshot(),
+        phases: Object.fromEntries(
+          Object.entries(metrics.phases).map(([phase, p]) => [
+            phase,
+            { calls: p.calls, requests: p.requests, latency: p.latency.snapshot() },
+          ])
+        ),
+      }))
+      .sort((a, b) => b.latency.sumMs - a.latency.sumMs),
+  }
+}
+
+export function resetMetrics() {
+  routes.clear()
+  globalForMetrics.apiMetricsSince = new Date().toISOString()
+}
@@ -0,0 +1,203 @@
+import { Prisma } from "@prisma/client";
+import { prisma } from "@/lib/db";
+import { rebuildRollups } from "@/lib/finance-rollups";
+import { getNextMonth } from "@/lib/month-utils";
+import { invalidateAdminDashboardStats } from "@/lib/queries/admin-dashboard";
+import { invalidateMonthCache, invalidateUserMonthsCache } from "@/lib/queries/finance";
+
+/**
+ * "Roll over" a month: create the following month and copy the selected item
+ * lists into it. Set-based throughout, so rolling over one user or a page of
+ * hundreds costs the same handful of statements: one INSERT for the missing
+ * months, one INSERT ... SELECT per category and one rollup rebuild.
+ *
+ * Idempotent: a category is only copied into a target month that has none
+ * of those items yet, and target months are locked for the transaction, so
+ * reruns and concurrent runs never duplicate rows. An empty month created
+ * beforehand (POST /api/months/create-empty) is filled like a new one.
+ */
+
+export const ROLLOVER_CATEGORIES = ["incomes", "expenses", "investments", "miscExpenses"] as const;
+
+export type RolloverCategory = (typeof ROLLOVER_CATEGORIES)[number];
+
+// Misc expenses are one-off by nature, as in the "plan next month" alert.
+export const DEFAULT_ROLLOVER_CATEGORIES: RolloverCategory[] = ["incomes", "expenses", "investments"];
+
+// Columns carried over; status columns (received/paid, paidAmount) fall back
+// to their defaults in the new month. Only STANDARD expenses are copied: the
+// tithe and total rows are derived per month.
+const ITEM_TABLES: Record<RolloverCategory, { table: string; columns: string[]; filter?: string }> = {
+    incomes: { table: "Income", columns: ["description", "amount", "dayOfMonth", "order"] },
+    expenses: {
+        table: "Expense",
+        columns: ["description", "totalAmount", "dayOfMonth", "order", "type"],
+        filter: `"type" = 'STANDARD'`,
+    },
+    investments: { table: "Investment", columns: ["description", "amount", "dayOfMonth", "order"] },
+    miscExpenses: { table: "MiscExpense", columns: ["description", "amount", "dayOfMonth", "order"] },
+};
+
+// Large batches hold the target month locks longer than the default 5s allows.
+const TRANSACTION_TIMEOUT_MS = 60_000;
+
+export type YearMonth = { year: number; month: number };
+
+export type RolloverCounts = Record<RolloverCategory, number>;
+
+export type RolloverTarget = { userId: string; sourceId: string; targetId: string; created: boolean };
+
+export type RolloverResult = {
+    source: YearMonth;
+    target: YearMonth;
+    /** One entry per user whose source month exists. */
+    targets: RolloverTarget[];
+    createdMonths: number;
+    copied: RolloverCounts;
+};
+
+function copyItems(
+    tx: Prisma.TransactionClient,
+    category: RolloverCategory,
+    sourceIds: string[],
+    targetIds: string[],
+) {
+    const { table, columns, filter } = ITEM_TABLES[category];
+    // Identifiers come from the constant map above, never from input.
+    const tableSql = Prisma.raw(`"${table}"`);
+    const columnList = Prisma.raw(columns.map((column) => `"${column}"`).join(", "));
+    const sourceColumns = Prisma.raw(columns.map((column) => `i."${column}"`).join(", "));
+    const itemFilter = filter ? Prisma.raw(`AND i.${filter}`) : Prisma.empty;
+    const existingFilter = filter ? Prisma.raw(`AND x.${filter}`) : Prisma.empty;
+
+    return tx.$executeRaw`
+        INSERT INTO ${tableSql} ("id", "monthId", ${columnList}, "createdAt", "updatedAt")
+        SELECT gen_random_uuid()::text, p.target_id, ${sourceColumns}, NOW(), NOW()
+        FROM UNNEST(${sourceIds}::text[], ${targetIds}::text[]) AS p(source_id, target_id)
+        JOIN ${tableSql} i ON i."monthId" = p.source_id ${itemFilter}
+        WHERE NOT EXISTS (
+            SELECT 1 FROM ${tableSql} x WHERE x."monthId" = p.target_id ${existingFilter}
+        )
+    `;
+}
+
+/**
+ * Rolls `source` over into the following month for each of `userIds` that
+ * has a source month, in one transaction.
+ */
+export async function rolloverMonths(
+    source: YearMonth,
+    userIds: string[],
+    categories: RolloverCategory[] = DEFAULT_ROLLOVER_CATEGORIES,
+): Promise<RolloverResult> {
+    const target = getNextMonth(source.year, source.month);
+    const copied = Object.fromEntries(ROLLOVER_CATEGORIES.map((category) => [category, 0])) as RolloverCounts;
+
+    const targets = await prisma.$transaction(async (tx) => {
+        const created = await tx.$queryRaw<{ id: string }[]>`
+            INSERT INTO "Month" ("id", "userId", "month", "year", "createdAt", "updatedAt")
+            SELECT gen_random_uuid()::text, s."userId", ${target.month}, ${target.year}, NOW(), NOW()
+            FROM "Month" s
+            WHERE s."year" = ${source.year} AND s."month" = ${source.month}
+                AND s."userId" = ANY(${userIds}::text[])
+            ON CONFLICT ("userId", "month", "year") DO NOTHING
+            RETURNING "id"
+        `;
+        const createdIds = new Set(created.map((row) => row.id));
+
+        // Locked in id order so concurrent rollovers of overlapping users
+        // queue instead of deadlocking; the second sees the first's copies.
+        const pairs = await tx.$queryRaw<{ userId: string; sourceId: string; targetId: string }[]>`
+            SELECT s."userId", s."id" AS "sourceId", t."id" AS "targetId"
+            FROM "Month" s
+            JOIN "Month" t ON t."userId" = s."userId" AND t."year" = ${target.year} AND t."month" = ${target.month}
+            WHERE s."year" = ${source.year} AND s."month" = ${source.month}
+                AND s."userId" = ANY(${userIds}::text[])
+            ORDER BY t."id"
+            FOR UPDATE OF t
+        `;
+        if (pairs.length === 0) return [];
+
+        const sourceIds = pairs.map((pair) => pair.sourceId);
+        const targetIds = pairs.map((pair) => pair.targetId);
+        for (const category of categories) {
+            copied[category] = await copyItems(tx, category, sourceIds, targetIds);
+        }
+
+        if (Object.values(copied).some((count) => count > 0)) {
+            await rebuildRollups({ monthIds: targetIds }, tx);
+        }
+
+        return pairs.map((pair) => ({ ...pair, created: createdIds.has(pair.targetId) }));
+    }, { timeout: TRANSACTION_TIMEOUT_MS });
+
+    for (const { userId, targetId, created } of targets) {
+        invalidateMonthCache(targetId);
+        if (created) invalidateUserMonthsCache(userId);
+    }
+    if (targets.length > 0) invalidateAdminDashboardStats();
+
+    return {
+        source,
+        target,
+        targets,
+        createdMonths: targets.filter((entry) => entry.created).length,
+        copied,
+    };
+}
+
+export type RolloverBatchOptions = {
+    categories?: RolloverCategory[];
+    /** Users per transaction. */
+    batchSize?: number;
+    /** Resume after this userId (keyset over the source months). */
+    cursor?: string | null;
+    /** Stop starting new batches at this time (epoch ms); the result then has `done: false`. */
+    deadline?: number;
+    onBatch?: (result: RolloverResult, cursor: string) => Promise<void> | void;
+};
+
+/**
+ * Rolls `source` over for every user who has it, `batchSize` users per
+ * transaction, walking the source months in userId order so an interrupted
+ * run can resume from the last cursor. With a `deadline` it stops between
+ * batches once the time is up, so a serverless invocation can hand the rest
+ * to the next one. Meant for the scheduled job at the start of a month.
+ */
+export async function rolloverAllUsers(source: YearMonth, options: RolloverBatchOptions = {}) {
+    const { categories = DEFAULT_ROLLOVER_CATEGORIES, batchSize = 200, deadline, onBatch } = options;
+    let cursor = options.cursor ?? null;
+    let done = false;
+    const totals = { users: 0, createdMonths: 0, batches: 0, copied: {} as RolloverCounts };
+    for (const category of ROLLOVER_CATEGORIES) totals.copied[category] = 0;
+
+    for (;;) {
+        const page = await prisma.month.findMany({
+            where: { year: source.year, month: source.month, ...(cursor && { userId: { gt: cursor } }) },
+            select: { userId: true },
+            orderBy: { userId: "asc" },
+            take: batchSize,
+        });
+        if (page.length === 0) {
+            done = true;
+            break;
+        }
+
+        const result = await rolloverMonths(source, page.map((row) => row.userId), categories);
+        cursor = page[page.length - 1].userId;
+
+        totals.batches++;
+        totals.users += result.targets.length;
+        totals.createdMonths += result.createdMonths;
+        for (const category of ROLLOVER_CATEGORIES) totals.copied[category] += result.copied[category];
+        await onBatch?.(result, cursor);
+
+        if (page.length < batchSize) {
+            done = true;
+            break;
+        }
+        if (deadline !== undefined && Date.now() >= deadline) break;
+    }
+
+    return { ...totals, source, target: getNextMonth(source.year, source.month), cursor, done };
+}
@@ -0,0 +1,76 @@
+/**
+ * Keyset (cursor) pagination helpers for list endpoints.
+ *
+ * A cursor is the sort key of the last row on a page, `<ISO timestamp>|<id>`,
+ * encoded as base64url so it can be passed around as an opaque query param.
+ * Paging by key instead of OFFSET keeps every page an index range scan, and
+ * rows inserted while a client walks the list do not shift later pages.
+ */
+
+export interface KeysetCursor {
+    createdAt: Date;
+    id: string;
+}
+
+export interface PageInfo {
+    pageSize: number;
+    nextCursor: string | null;
+    hasMore: boolean;
+}
+
+export function encodeCursor({ createdAt, id }: KeysetCursor): string {
+    return Buffer.from(`${createdAt.toISOString()}|${id}`, "utf8").toString("base64url");
+}
+
+/** Returns null for a missing or malformed cursor. */
+export function decodeCursor(raw: string | null | undefined): KeysetCursor | null {
+    if (!raw) return null;
+    const decoded = Buffer.from(raw, "base64url").toString("utf8");
+    const separator = decoded.indexOf("|");
+    if (separator <= 0) return null;
+
+    const createdAt = new Date(decoded.slice(0, separator));
+    const id = decoded.slice(separator + 1);
+    if (Number.isNaN(createdAt.getTime()) || !id) return null;
+    return { createdAt, id };
+}
+
+export function parsePageSize(raw: string | null | undefined, fallback = 50, max = 200): number {
+    const value = Number.parseInt(raw ?? "", 10);
+    if (!Number.isFinite(value) || value < 1) return fallback;
+    return Math.min(value, max);
+}
+
+/**
+ * Prisma `where` fragment for rows strictly after `cursor` in
+ * `ORDER BY createdAt DESC, id DESC`. The outer `lte` bound lets Postgres
+ * range-scan the createdAt index; the OR only breaks ties within it.
+ */
+export function keysetWhere(cursor: KeysetCursor | null) {
+    if (!cursor) return {};
+    return {
+        createdAt: { lte: cursor.createdAt },
+        OR: [
+            { createdAt: { lt: cursor.createdAt } },
+            { createdAt: cursor.createdAt, id: { lt: cursor.id } },
+        ],
+    };
+}
+
+/**
+ * Trims the extra row fetched with `take: pageSize + 1` and derives the
+ * cursor for the following page.
+ */
+export function paginate<T extends KeysetCursor>(rows: T[], pageSize: number): { items: T[]; pageInfo: PageInfo } {
+    const hasMore = rows.length > pageSize;
+    const items = hasMore ? rows.slice(0, pageSize) : rows;
+    const last = items[items.length - 1];
+    return {
+        items,
+        pageInfo: {
+            pageSize,
+            nextCursor: hasMore && last ? encodeCursor(last) : null,
+            hasMore,
+        },
+    };
+}
@@ -0,0 +1,141 @@
+import { prisma } from "@/lib/db";
+import { cache, getCacheKey } from "@/lib/cache";
+
+const STATS_CACHE_KEY = getCacheKey("admin-dashboard", "stats");
+const STATS_TTL_SECONDS = 60;
+
+const SERIES_MONTHS = 6;
+const MONTH_LABELS = ["Jan", "Fev", "Mar", "Abr", "Mai", "Jun", "Jul", "Ago", "Set", "Out", "Nov", "Dez"];
+
+type SeriesPoint = { year: number; month: number; income: number; tithe: number };
+
+type AggregateRow = {
+    totalUsers: number;
+    activeUsers: number;
+    newUsersThisMonth: number;
+    totalTTV: number;
+    totalTitheVolume: number;
+    totalCredits: number;
+    usedCredits: number;
+    expenseDistribution: { name: string; value: number }[] | null;
+    series: SeriesPoint[] | null;
+};
+
+async function loadAggregates(firstDayOfMonth: Date, seriesFrom: number, seriesTo: number) {
+    // One round-trip for every count and sum on the admin dashboard. Money
+    // figures come from MonthlyRollup (src/lib/finance-rollups.ts), whose size
+    // tracks user-months rather than individual income/expense rows.
+    const [row] = await prisma.$queryRaw<AggregateRow[]>`
+        SELECT
+            (SELECT COUNT(*) FROM "User")::int AS "totalUsers",
+            (SELECT COUNT(*) FROM "User" WHERE "isActive")::int AS "activeUsers",
+            (SELECT COUNT(*) FROM "User" WHERE "createdAt" >= ${firstDayOfMonth})::int AS "newUsersThisMonth",
+            (SELECT COALESCE(SUM("amount"), 0) FROM "MonthlyRollup" WHERE "category" = 'INCOME')::float8 AS "totalTTV",
+            (SELECT COALESCE(SUM("amount"), 0) FROM "MonthlyRollup" WHERE "category" = 'TITHE_PAID')::float8 AS "totalTitheVolume",
+            (SELECT COALESCE(SUM("creditsRemaining"), 0) FROM "CreditBalance")::float8 AS "totalCredits",
+            -- Net of refunds, which are recorded with negative creditsUsed.
+            (SELECT COALESCE(SUM("creditsUsed"), 0) FROM "UsageHistory")::float8 AS "usedCredits",
+            (
+                SELECT json_agg(json_build_object('name', e."type", 'value', e."total"))
+                FROM (
+                    SELECT substring("category" FROM 9) AS "type", SUM("amount")::float8 AS "total"
+                    FROM "MonthlyRollup"
+                    WHERE starts_with("category", 'EXPENSE_')
+                    GROUP BY "category"
+                    HAVING SUM("itemCount") > 0
+                ) e
+            ) AS "expenseDistribution",
+            (
+                SELECT json_agg(json_build_object('year', t."year", 'month', t."month", 'income', t."income", 'tithe', t."tithe"))
+                FROM (
+                    SELECT
+                        "year",
+                        "month",
+                        COALESCE(SUM("amount") FILTER (WHERE "category" = 'INCOME'), 0)::float8 AS "income",
+                        COALESCE(SUM("amount") FILTER (WHERE "category" = 'TITHE_PAID'), 0)::float8 AS "tithe"
+                    FROM "MonthlyRollup"
+                    WHERE "year" * 12 + "month" BETWEEN ${seriesFrom} AND ${seriesTo}
+                    GROUP BY "year", "month"
+                ) t
+            ) AS "series"
+    `;
+    return row;
+}
+
+/** Last SERIES_MONTHS calendar months ending at `now`, zero-filled. */
+function buildSeries(points: SeriesPoint[], now: Date) {
+    const byKey = new Map(points.map((point) => [point.year * 12 + point.month, point]));
+    const ttvSeries: { label: string; value: number }[] = [];
+    const titheSeries: { label: string; value: number }[] = [];
+
+    for (let offset = SERIES_MONTHS - 1; offset >= 0; offset--) {
+        const date = new Date(now.getFullYear(), now.getMonth() - offset, 1);
+        const point = byKey.get(date.getFullYear() * 12 + date.getMonth() + 1);
+        const label = MONTH_LABELS[date.getMonth()];
+        ttvSeries.push({ label, value: point?.income ?? 0 });
+        titheSeries.push({ label, value: point?.tithe ?? 0 });
+    }
+
+    return { ttvSeries, titheSeries };
+}
+
+async function loadRecentFeedbacks() {
+    return prisma.feedback.findMany({
+        take: 5,
+        orderBy: { createdAt: "desc" },
+        include: {
+            user: {
+                select: {
+                    name: true,
+                    email: true
+                }
+            }
+        }
+    });
+}
+
+export type AdminDashboardStats = Awaited<ReturnType<typeof computeAdminDashboardStats>>;
+
+async function computeAdminDashboardStats() {
+    const now = new Date();
+    const firstDayOfMonth = new Date(now.getFullYear(), now.getMonth(), 1);
+
+    const seriesTo = now.getFullYear() * 12 + now.getMonth() + 1;
+    const seriesFrom = seriesTo - (SERIES_MONTHS - 1);
+
+    const [aggregates, recentFeedbacks] = await Promise.all([
+        loadAggregates(firstDayOfMonth, seriesFrom, seriesTo),
+        loadRecentFeedbacks(),
+    ]);
+
+    return {
+        totalUsers: aggregates.totalUsers,
+        activeUsers: aggregates.activeUsers,
+        newUsersThisMonth: aggregates.newUsersThisMonth,
+        totalTTV: Number(aggregates.totalTTV),
+        totalTitheVolume: Number(aggregates.totalTitheVolume),
+        totalCredits: Number(aggregates.totalCredits),
+        usedCredits: Number(aggregates.usedCredits),
+        expenseDistribution: aggregates.expenseDistribution ?? [],
+        recentFeedbacks,
+        ...buildSeries(aggregates.series ?? [], now),
+    };
+}
+
+/**
+ * Aggregate BI figures for /api/admin/dashboard, served from the in-process
+ * cache for up to a minute. Income/expense writes call
+ * `invalidateAdminDashboardStats` so admins see their effect immediately.
+ */
+export async function getAdminDashboardStats(): Promise<AdminDashboardStats> {
+    const cached = cache.get<AdminDashboardStats>(STATS_CACHE_KEY);
+    if (cached) return cached;
+
+    const stats = await computeAdminDashboardStats();
+    cache.set(STATS_CACHE_KEY, stats, STATS_TTL_SECONDS);
+    return stats;
+}
+
+export function invalidateAdminDashboardStats() {
+    cache.delete(STATS_CACHE_KEY);
+}
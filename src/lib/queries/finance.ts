@@ -1,4 +1,8 @@
+import { cache as requestMemo } from "react";
 import { prisma } from "@/lib/db";
+import { cache, getCacheKey } from "@/lib/cache";
+import { isUniqueViolation } from "@/lib/db-errors";
+import type { FinancialTotals } from "@/lib/finance-utils";
 import { Month, Income, Expense, Investment, MiscExpense } from "@prisma/client";
 
 export type MonthWithDetails = Month & {
@@ -8,24 +12,55 @@ export type MonthWithDetails = Month & {
     miscExpenses: MiscExpense[];
 };
 
-export async function getMonthByDate(userId: string, month: number, year: number) {
-    return await prisma.month.findUnique({
-        where: {
-            userId_month_year: {
-                userId,
-                month,
-                year,
-            },
-        },
-        include: {
-            incomes: { orderBy: { order: "asc" } },
-            expenses: { orderBy: { order: "asc" } },
-            investments: { orderBy: { order: "asc" } },
-            miscExpenses: { orderBy: { order: "asc" } },
-        },
+// Short TTL: writes in this process invalidate by tag, other instances only
+// see a change once their copy expires.
+const MONTH_CACHE_TTL_SECONDS = 15;
+
+const monthDetails = {
+    include: {
+        incomes: { orderBy: { order: "asc" } },
+        expenses: { orderBy: { order: "asc" } },
+        investments: { orderBy: { order: "asc" } },
+        miscExpenses: { orderBy: { order: "asc" } },
+    },
+    // Month and its four item lists in one statement (LATERAL joins) instead
+    // of one query per relation.
+    relationLoadStrategy: "join",
+} as const;
+
+function findMonth(userId: string, month: number, year: number) {
+    return prisma.month.findUnique({
+        where: { userId_month_year: { userId, month, year } },
+        ...monthDetails,
     });
 }
 
+/**
+ * Memoized per request (React `cache`), so a page and its components share
+ * one lookup; across requests the LRU cache below applies.
+ */
+export const getMonthByDate = requestMemo(async (userId: string, month: number, year: number) => {
+    return await cache.getOrCompute(
+        getCacheKey("month", userId, year, month),
+        () => findMonth(userId, month, year),
+        MONTH_CACHE_TTL_SECONDS,
+        { tags: (found) => (found ? [monthTag(found.id), userMonthsTag(userId)] : []) },
+    );
+});
+
+const monthTag = (monthId: string) => `month:${monthId}`;
+const userMonthsTag = (userId: string) => `user-months:${userId}`;
+
+/** Call after writing a month or any of its items. */
+export function invalidateMonthCache(monthId: string) {
+    cache.invalidateTag(monthTag(monthId));
+}
+
+/** Call after deleting or re-keying months of a user. */
+export function invalidateUserMonthsCache(userId: string) {
+    cache.invalidateTag(userMonthsTag(userId));
+}
+
 export async function getCurrentMonth(userId: string) {
     const now = new Date();
     return getMonthByDate(userId, now.getMonth() + 1, now.getFullYear());
@@ -38,13 +73,20 @@ export async function createMonth(userId: string, month: number, year: number) {
             month,
             year,
         },
-        include: {
-            incomes: true,
-            expenses: true,
-            investments: true,
-            miscExpenses: true,
-        },
+        ...monthDetails,
+    });
+}
+
+/**
+ * Inserts an empty month unless it already exists (ON CONFLICT DO NOTHING),
+ * without loading it back. Returns whether this call created it.
+ */
+export async function ensureMonth(userId: string, month: number, year: number) {
+    const { count } = await prisma.month.createMany({
+        data: [{ userId, month, year }],
+        skipDuplicates: true,
     });
+    return count > 0;
 }
 
 export async function getOrCreateCurrentMonth(userId: string) {
@@ -52,12 +94,29 @@ export async function getOrCreateCurrentMonth(userId: string) {
     return getOrCreateMonth(userId, now.getMonth() + 1, now.getFullYear());
 }
 
-export async function getOrCreateMonth(userId: string, month: number, year: number) {
+/**
+ * Safe under concurrent calls for the same month: the insert is an upsert on
+ * @@unique([userId, month, year]), and a writer that still loses the race
+ * reads the winner's row instead of surfacing the unique violation.
+ */
+export const getOrCreateMonth = requestMemo(async (userId: string, month: number, year: number): Promise<MonthWithDetails> => {
     const existing = await getMonthByDate(userId, month, year);
     if (existing) return existing;
 
-    return await createMonth(userId, month, year);
-}
+    try {
+        return await prisma.month.upsert({
+            where: { userId_month_year: { userId, month, year } },
+            create: { userId, month, year },
+            update: {},
+            ...monthDetails,
+        });
+    } catch (error) {
+        if (!isUniqueViolation(error)) throw error;
+        const winner = await findMonth(userId, month, year);
+        if (!winner) throw error;
+        return winner;
+    }
+});
 
 export async function getUserMonths(userId: string) {
     return await prisma.month.findMany({
@@ -72,3 +131,102 @@ export async function getUserMonths(userId: string) {
         ],
     });
 }
+
+export type MonthSummary = FinancialTotals & {
+    monthId: string;
+    month: number;
+    year: number;
+    tithePaid: number;
+};
+
+export type MonthSummaryRange = {
+    months: MonthSummary[];
+    /** The same figures summed over every month in the range. */
+    totals: FinancialTotals & { tithePaid: number };
+};
+
+/** Totals of a range with no months in it. */
+export function emptySummaryTotals(): MonthSummaryRange["totals"] {
+    return { totalIncome: 0, totalExpense: 0, totalInvestment: 0, totalMisc: 0, balance: 0, titheAmount: 0, tithePaid: 0 };
+}
+
+type SummaryRow = {
+    monthId: string | null;
+    year: number | null;
+    month: number | null;
+    totalIncome: string;
+    totalExpense: string;
+    totalInvestment: string;
+    totalMisc: string;
+    balance: string;
+    titheAmount: string;
+    tithePaid: string;
+};
+
+/**
+ * Per-month totals for every month of the user between two (year, month)
+ * points, inclusive, in one grouped query over MonthlyRollup. Figures match
+ * `calculateTotals`; sums stay `numeric` in SQL and are only converted to
+ * numbers once, per output field.
+ */
+export async function getMonthSummaries(
+    userId: string,
+    from: { year: number; month: number },
+    to: { year: number; month: number },
+): Promise<MonthSummaryRange> {
+    const rows = await prisma.$queryRaw<SummaryRow[]>`
+        WITH sums AS (
+            SELECT
+                m."id" AS "monthId",
+                m."year",
+                m."month",
+                COALESCE(SUM(r."amount") FILTER (WHERE r."category" = 'INCOME'), 0) AS income,
+                COALESCE(SUM(r."amount") FILTER (WHERE r."category" = 'INVESTMENT'), 0) AS investment,
+                COALESCE(SUM(r."amount") FILTER (WHERE r."category" = 'MISC'), 0) AS misc,
+                COALESCE(SUM(r."amount") FILTER (WHERE r."category" IN ('EXPENSE_STANDARD', 'EXPENSE_TITHE')), 0) AS expenses,
+                COALESCE(SUM(r."amount") FILTER (WHERE r."category" = 'TITHE_PAID'), 0) AS tithe_paid
+            FROM "Month" m
+            LEFT JOIN "MonthlyRollup" r ON r."monthId" = m."id"
+            WHERE m."userId" = ${userId}
+                AND m."year" * 12 + m."month" BETWEEN ${from.year * 12 + from.month} AND ${to.year * 12 + to.month}
+            GROUP BY GROUPING SETS ((m."id", m."year", m."month"), ())
+        )
+        SELECT
+            "monthId",
+            "year",
+            "month",
+            income::text AS "totalIncome",
+            (expenses + investment + misc + income * 0.1)::text AS "totalExpense",
+            investment::text AS "totalInvestment",
+            misc::text AS "totalMisc",
+            (income - (expenses + investment + misc + income * 0.1))::text AS "balance",
+            (income * 0.1)::text AS "titheAmount",
+            tithe_paid::text AS "tithePaid"
+        FROM sums
+        ORDER BY "year" NULLS LAST, "month"
+    `;
+
+    const figures = (row: SummaryRow) => ({
+        totalIncome: Number(row.totalIncome),
+        totalExpense: Number(row.totalExpense),
+        totalInvestment: Number(row.totalInvestment),
+        totalMisc: Number(row.totalMisc),
+        balance: Number(row.balance),
+        titheAmount: Number(row.titheAmount),
+        tithePaid: Number(row.tithePaid),
+    });
+
+    // The grand-total row (NULL month) of the grouping sets comes last.
+    const grandTotal = rows.find((row) => row.monthId === null);
+    return {
+        months: rows
+            .filter((row) => row.monthId !== null)
+            .map((row) => ({
+                monthId: row.monthId as string,
+                year: row.year as number,
+                month: row.month as number,
+                ...figures(row),
+            })),
+        totals: grandTotal ? figures(grandTotal) : emptySummaryTotals(),
+    };
+}
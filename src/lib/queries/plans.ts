@@ -0,0 +1,41 @@
+import { createHash } from "node:crypto";
+import { prisma } from "@/lib/db";
+import { cache, getCacheKey } from "@/lib/cache";
+
+const PLANS_TAG = "plans";
+const PUBLIC_PLANS_KEY = getCacheKey("plans", "public-snapshot");
+const PUBLIC_PLANS_TTL_SECONDS = 300;
+
+export type PublicPlansSnapshot = {
+    /** Serialized JSON body, identical for every request until plans change. */
+    body: string;
+    /** Strong validator derived from the body bytes. */
+    etag: string;
+    generatedAt: string;
+};
+
+async function buildSnapshot(): Promise<PublicPlansSnapshot> {
+    const plans = await prisma.plan.findMany({
+        where: { active: true },
+        orderBy: { priceMonthlyCents: "asc" },
+    });
+    const body = JSON.stringify(plans);
+    const etag = `"${createHash("sha1").update(body).digest("base64url")}"`;
+    return { body, etag, generatedAt: new Date().toISOString() };
+}
+
+/**
+ * Active plans for the public pricing page, serialized once and reused until
+ * an admin write calls `invalidatePlansCache` (or the TTL lapses, which bounds
+ * staleness on other server instances).
+ */
+export async function getPublicPlansSnapshot() {
+    return cache.getOrCompute(PUBLIC_PLANS_KEY, buildSnapshot, PUBLIC_PLANS_TTL_SECONDS, {
+        tags: [PLANS_TAG],
+    });
+}
+
+/** Call after any write to the Plan table. */
+export function invalidatePlansCache() {
+    cache.invalidateTag(PLANS_TAG);
+}
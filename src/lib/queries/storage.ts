@@ -0,0 +1,252 @@
+import { Prisma } from "@prisma/client";
+import { prisma } from "@/lib/db";
+import { cache, getCacheKey } from "@/lib/cache";
+import { paginate, type KeysetCursor, type PageInfo } from "@/lib/pagination";
+
+const STATS_TTL_SECONDS = 30;
+// Rows fetched per round trip while streaming; one batch is all that is held in memory.
+const STREAM_BATCH_SIZE = 500;
+// Heaviest users returned with the totals.
+export const STORAGE_TOP_USERS = 50;
+
+export type StorageFilters = {
+    from: Date | null;
+    to: Date | null;
+    contentType: string | null;
+    /** Database user id; matched through User.clerkId. */
+    userId: string | null;
+    clerkUserId: string | null;
+    /** Substring of the object's name, path, type or url, or of the uploader's name or email. */
+    q: string | null;
+};
+
+export type StorageItem = {
+    id: string;
+    name: string;
+    contentType: string | null;
+    size: number;
+    url: string;
+    pathname: string;
+    createdAt: string;
+    user: { id: string | null; clerkId: string; email: string | null; name: string | null };
+};
+
+export type StorageUserTotals = {
+    userId: string | null;
+    clerkUserId: string;
+    name: string | null;
+    email: string | null;
+    objects: number;
+    bytes: number;
+};
+
+export type StorageStats = {
+    totals: { objects: number; bytes: number; users: number };
+    byUser: StorageUserTotals[];
+};
+
+/**
+ * Reads `q`, `type`, `userId`, `clerkUserId` and an optional
+ * `startDate`/`endDate` pair. Returns null when a date does not parse.
+ */
+export function parseStorageFilters(searchParams: URLSearchParams): StorageFilters | null {
+    const startDate = searchParams.get("startDate");
+    const endDate = searchParams.get("endDate");
+    const from = startDate ? new Date(startDate) : null;
+    const to = endDate ? new Date(endDate) : null;
+    if ((from && Number.isNaN(from.getTime())) || (to && Number.isNaN(to.getTime()))) return null;
+
+    const type = searchParams.get("type");
+    return {
+        from,
+        to,
+        contentType: type && type !== "all" ? type : null,
+        userId: searchParams.get("userId") || null,
+        clerkUserId: searchParams.get("clerkUserId") || null,
+        q: searchParams.get("q")?.trim() || null,
+    };
+}
+
+function toConditions(filters: StorageFilters): Prisma.Sql[] {
+    const conditions: Prisma.Sql[] = [];
+    if (filters.from) conditions.push(Prisma.sql`s."createdAt" >= ${filters.from}`);
+    if (filters.to) conditions.push(Prisma.sql`s."createdAt" < ${filters.to}`);
+    if (filters.contentType) conditions.push(Prisma.sql`s."contentType" = ${filters.contentType}`);
+    if (filters.clerkUserId) conditions.push(Prisma.sql`s."clerkUserId" = ${filters.clerkUserId}`);
+    if (filters.userId) {
+        conditions.push(Prisma.sql`s."clerkUserId" = (SELECT "clerkId" FROM "User" WHERE "id" = ${filters.userId})`);
+    }
+    if (filters.q) {
+        const pattern = `%${filters.q.replace(/[\\%_]/g, "\\$&")}%`;
+        conditions.push(Prisma.sql`(
+            s."name" ILIKE ${pattern} OR s."pathname" ILIKE ${pattern}
+            OR s."contentType" ILIKE ${pattern} OR s."url" ILIKE ${pattern}
+            OR s."clerkUserId" IN (
+                SELECT "clerkId" FROM "User" WHERE "email" ILIKE ${pattern} OR "name" ILIKE ${pattern}
+            )
+        )`);
+    }
+    return conditions;
+}
+
+function toSql(conditions: Prisma.Sql[]): Prisma.Sql {
+    return conditions.length ? Prisma.sql`WHERE ${Prisma.join(conditions, " AND ")}` : Prisma.empty;
+}
+
+/** Same bounds as `keysetWhere`, for raw queries over `s`. */
+function keysetSql(cursor: KeysetCursor): Prisma.Sql {
+    return Prisma.sql`s."createdAt" <= ${cursor.createdAt}
+        AND (s."createdAt" < ${cursor.createdAt} OR s."id" < ${cursor.id})`;
+}
+
+type StorageRow = {
+    id: string;
+    name: string | null;
+    pathname: string;
+    url: string;
+    contentType: string | null;
+    size: number | null;
+    createdAt: Date;
+    clerkUserId: string;
+    userId: string | null;
+    userName: string | null;
+    userEmail: string | null;
+};
+
+function toItem(row: StorageRow): StorageItem {
+    return {
+        id: row.id,
+        name: row.name ?? row.pathname.split("/").pop() ?? row.pathname,
+        contentType: row.contentType,
+        size: row.size ?? 0,
+        url: row.url,
+        pathname: row.pathname,
+        createdAt: row.createdAt.toISOString(),
+        user: { id: row.userId, clerkId: row.clerkUserId, email: row.userEmail, name: row.userName },
+    };
+}
+
+// The uploader is joined per row on the unique User.clerkId, so a page costs
+// one index range scan plus `take` lookups whatever the table size.
+function fetchRows(filters: StorageFilters, cursor: KeysetCursor | null, take: number) {
+    const conditions = toConditions(filters);
+    if (cursor) conditions.push(keysetSql(cursor));
+
+    return prisma.$queryRaw<StorageRow[]>`
+        SELECT
+            s."id", s."name", s."pathname", s."url", s."contentType", s."size", s."createdAt", s."clerkUserId",
+            u."id" AS "userId", u."name" AS "userName", u."email" AS "userEmail"
+        FROM "StorageObject" s
+        LEFT JOIN "User" u ON u."clerkId" = s."clerkUserId"
+        ${toSql(conditions)}
+        ORDER BY s."createdAt" DESC, s."id" DESC
+        LIMIT ${take}
+    `;
+}
+
+export async function listStorage(filters: StorageFilters, cursor: KeysetCursor | null, pageSize: number) {
+    const { items, pageInfo } = paginate(await fetchRows(filters, cursor, pageSize + 1), pageSize);
+    return { items: items.map(toItem), pageInfo };
+}
+
+/**
+ * Walks up to `limit` matching objects newest first, `STREAM_BATCH_SIZE` rows
+ * per query, yielding each batch as it arrives. The last batch carries the
+ * page info to resume from.
+ */
+export async function* streamStorage(
+    filters: StorageFilters,
+    cursor: KeysetCursor | null,
+    limit: number,
+): AsyncGenerator<{ items: StorageItem[]; pageInfo: PageInfo | null }> {
+    let next = cursor;
+    let remaining = limit;
+
+    while (remaining > 0) {
+        const take = Math.min(STREAM_BATCH_SIZE, remaining);
+        const { items, pageInfo } = paginate(await fetchRows(filters, next, take + 1), take);
+        remaining -= items.length;
+
+        const last = items[items.length - 1];
+        const done = !pageInfo.hasMore || remaining === 0;
+        yield {
+            items: items.map(toItem),
+            pageInfo: done ? { pageSize: limit, nextCursor: pageInfo.nextCursor, hasMore: pageInfo.hasMore } : null,
+        };
+        if (done || !last) return;
+        next = { createdAt: last.createdAt, id: last.id };
+    }
+}
+
+type StatsRow = {
+    clerkUserId: string | null;
+    isTotal: boolean;
+    objects: number;
+    bytes: number;
+    users: number;
+    userId: string | null;
+    name: string | null;
+    email: string | null;
+};
+
+async function computeStats(filters: StorageFilters): Promise<StorageStats> {
+    // ROLLUP adds the grand total row to the per-user groups, so object
+    // counts and byte sums come from a single pass over the filtered rows.
+    // Bytes are summed as float8: a bigint would come back as a BigInt.
+    const rows = await prisma.$queryRaw<StatsRow[]>`
+        WITH grouped AS (
+            SELECT
+                s."clerkUserId",
+                GROUPING(s."clerkUserId") = 1 AS "isTotal",
+                COUNT(*)::int AS "objects",
+                COALESCE(SUM(s."size"), 0)::float8 AS "bytes"
+            FROM "StorageObject" s
+            ${toSql(toConditions(filters))}
+            GROUP BY ROLLUP (s."clerkUserId")
+        )
+        SELECT
+            g."clerkUserId", g."isTotal", g."objects", g."bytes",
+            (SELECT COUNT(*) FROM grouped WHERE NOT "isTotal")::int AS "users",
+            u."id" AS "userId", u."name", u."email"
+        FROM grouped g
+        LEFT JOIN "User" u ON u."clerkId" = g."clerkUserId" AND NOT g."isTotal"
+        ORDER BY g."isTotal" DESC, g."bytes" DESC, g."clerkUserId"
+        LIMIT ${STORAGE_TOP_USERS + 1}
+    `;
+
+    const totals = rows.find((row) => row.isTotal);
+    return {
+        totals: {
+            objects: totals?.objects ?? 0,
+            bytes: totals?.bytes ?? 0,
+            users: totals?.users ?? 0,
+        },
+        byUser: rows
+            .filter((row): row is StatsRow & { clerkUserId: string } => !row.isTotal && row.clerkUserId !== null)
+            .map(({ userId, clerkUserId, name, email, objects, bytes }) => ({
+                userId,
+                clerkUserId,
+                name,
+                email,
+                objects,
+                bytes,
+            })),
+    };
+}
+
+/**
+ * Object count and bytes for the filtered set, overall and for the
+ * `STORAGE_TOP_USERS` heaviest uploaders. Cached briefly per filter set.
+ */
+export async function getStorageStats(filters: StorageFilters) {
+    const key = getCacheKey(
+        "storage-stats",
+        filters.from?.getTime() ?? "",
+        filters.to?.getTime() ?? "",
+        filters.contentType ?? "",
+        filters.userId ?? "",
+        filters.clerkUserId ?? "",
+        filters.q ?? "",
+    );
+    return cache.getOrCompute(key, () => computeStats(filters), STATS_TTL_SECONDS);
+}
@@ -0,0 +1,221 @@
+import { Prisma } from "@prisma/client";
+import { prisma } from "@/lib/db";
+import { cache, getCacheKey } from "@/lib/cache";
+import { keysetWhere, paginate, type KeysetCursor } from "@/lib/pagination";
+
+const ANALYTICS_TTL_SECONDS = 30;
+// Zero-filling beyond this many buckets would ship mostly empty points.
+const MAX_FILLED_BUCKETS = 1000;
+
+const RANGE_HOURS: Record<string, number> = {
+    "24hours": 24,
+    "7days": 7 * 24,
+    "30days": 30 * 24,
+    "90days": 90 * 24,
+};
+
+export type UsageBucket = "hour" | "day";
+
+export type UsageFilters = {
+    from: Date | null;
+    to: Date | null;
+    operation: string | null;
+    /** Substring of the user's name or email. */
+    q: string | null;
+};
+
+export type UsageAnalytics = {
+    totalOperations: number;
+    totalCredits: number;
+    uniqueUsers: number;
+    byOperation: { operation: string; operations: number; credits: number }[];
+    buckets: {
+        granularity: UsageBucket;
+        series: { bucket: string; operations: number; credits: number }[];
+    };
+};
+
+/**
+ * Resolves `range` (24hours|7days|30days|90days|all) or an explicit
+ * `startDate`/`endDate` pair. Returns null when a date does not parse.
+ */
+export function parseUsageFilters(searchParams: URLSearchParams, now = new Date()): UsageFilters | null {
+    let from: Date | null = null;
+    let to: Date | null = null;
+
+    const startDate = searchParams.get("startDate");
+    const endDate = searchParams.get("endDate");
+    if (startDate || endDate) {
+        from = startDate ? new Date(startDate) : null;
+        to = endDate ? new Date(endDate) : null;
+        if ((from && Number.isNaN(from.getTime())) || (to && Number.isNaN(to.getTime()))) return null;
+    } else {
+        const hours = RANGE_HOURS[searchParams.get("range") ?? "7days"];
+        if (hours) from = new Date(now.getTime() - hours * 3600_000);
+    }
+
+    const type = searchParams.get("type");
+    return {
+        from,
+        to,
+        operation: type && type !== "all" ? type : null,
+        q: searchParams.get("q")?.trim() || null,
+    };
+}
+
+/** Hourly buckets up to two days, daily beyond that. */
+export function defaultBucket({ from, to }: UsageFilters, now = new Date()): UsageBucket {
+    if (!from) return "day";
+    return (to ?? now).getTime() - from.getTime() <= 48 * 3600_000 ? "hour" : "day";
+}
+
+function toWhere(filters: UsageFilters): Prisma.UsageHistoryWhereInput {
+    return {
+        createdAt: {
+            ...(filters.from ? { gte: filters.from } : {}),
+            ...(filters.to ? { lt: filters.to } : {}),
+        },
+        ...(filters.operation ? { operation: filters.operation } : {}),
+        ...(filters.q
+            ? {
+                user: {
+                    OR: [
+                        { email: { contains: filters.q, mode: "insensitive" } },
+                        { name: { contains: filters.q, mode: "insensitive" } },
+                    ],
+                },
+            }
+            : {}),
+    };
+}
+
+function toSql(filters: UsageFilters): Prisma.Sql {
+    const conditions: Prisma.Sql[] = [];
+    if (filters.from) conditions.push(Prisma.sql`u."createdAt" >= ${filters.from}`);
+    if (filters.to) conditions.push(Prisma.sql`u."createdAt" < ${filters.to}`);
+    if (filters.operation) conditions.push(Prisma.sql`u."operation" = ${filters.operation}`);
+    if (filters.q) {
+        const pattern = `%${filters.q.replace(/[\\%_]/g, "\\$&")}%`;
+        conditions.push(Prisma.sql`u."userId" IN (
+            SELECT "id" FROM "User" WHERE "email" ILIKE ${pattern} OR "name" ILIKE ${pattern}
+        )`);
+    }
+    return conditions.length ? Prisma.sql`WHERE ${Prisma.join(conditions, " AND ")}` : Prisma.empty;
+}
+
+export async function listUsage(filters: UsageFilters, cursor: KeysetCursor | null, pageSize: number) {
+    const rows = await prisma.usageHistory.findMany({
+        where: { AND: [toWhere(filters), keysetWhere(cursor)] },
+        select: {
+            id: true,
+            operation: true,
+            creditsUsed: true,
+            details: true,
+            createdAt: true,
+            user: { select: { name: true, email: true } },
+        },
+        orderBy: [{ createdAt: "desc" }, { id: "desc" }],
+        take: pageSize + 1,
+    });
+
+    const { items, pageInfo } = paginate(rows, pageSize);
+    return {
+        data: items.map((row) => ({
+            id: row.id,
+            user: { name: row.user.name, email: row.user.email },
+            operationType: row.operation,
+            creditsUsed: row.creditsUsed,
+            details: row.details,
+            timestamp: row.createdAt.toISOString(),
+        })),
+        pageInfo,
+    };
+}
+
+type OperationRow = { operation: string | null; operations: number; credits: number; users: number };
+type BucketRow = { bucket: Date; operations: number; credits: number };
+
+async function computeAnalytics(filters: UsageFilters, bucket: UsageBucket): Promise<UsageAnalytics> {
+    const where = toSql(filters);
+    const unit = bucket === "hour" ? Prisma.sql`'hour'` : Prisma.sql`'day'`;
+
+    // Both aggregates range-scan UsageHistory(createdAt, operation). The
+    // GROUPING SETS row with a NULL operation carries the overall totals,
+    // including a distinct user count that cannot be summed per operation.
+    const [operationRows, bucketRows] = await Promise.all([
+        prisma.$queryRaw<OperationRow[]>`
+            SELECT
+                u."operation",
+                COUNT(*)::int AS "operations",
+                COALESCE(SUM(u."creditsUsed"), 0)::int AS "credits",
+                COUNT(DISTINCT u."userId")::int AS "users"
+            FROM "UsageHistory" u
+            ${where}
+            GROUP BY GROUPING SETS ((u."operation"), ())
+        `,
+        prisma.$queryRaw<BucketRow[]>`
+            SELECT
+                date_trunc(${unit}, u."createdAt") AS "bucket",
+                COUNT(*)::int AS "operations",
+                COALESCE(SUM(u."creditsUsed"), 0)::int AS "credits"
+            FROM "UsageHistory" u
+            ${where}
+            GROUP BY 1
+            ORDER BY 1
+        `,
+    ]);
+
+    const totals = operationRows.find((row) => row.operation === null);
+    return {
+        totalOperations: totals?.operations ?? 0,
+        totalCredits: totals?.credits ?? 0,
+        uniqueUsers: totals?.users ?? 0,
+        byOperation: operationRows
+            .filter((row): row is OperationRow & { operation: string } => row.operation !== null)
+            .map(({ operation, operations, credits }) => ({ operation, operations, credits }))
+            .sort((a, b) => b.credits - a.credits),
+        buckets: { granularity: bucket, series: fillBuckets(bucketRows, bucket, filters) },
+    };
+}
+
+/** Adds zero points for empty buckets when the range is bounded. */
+function fillBuckets(rows: BucketRow[], bucket: UsageBucket, { from, to }: UsageFilters) {
+    const series = rows.map((row) => ({
+        bucket: row.bucket.toISOString(),
+        operations: row.operations,
+        credits: row.credits,
+    }));
+    if (!from) return series;
+
+    const step = bucket === "hour" ? 3600_000 : 24 * 3600_000;
+    const start = Math.floor(from.getTime() / step) * step;
+    const end = (to ?? new Date()).getTime();
+    if ((end - start) / step > MAX_FILLED_BUCKETS) return series;
+
+    const byBucket = new Map(series.map((point) => [point.bucket, point]));
+    const filled = [];
+    for (let t = start; t < end; t += step) {
+        const key = new Date(t).toISOString();
+        filled.push(byBucket.get(key) ?? { bucket: key, operations: 0, credits: 0 });
+    }
+    return filled;
+}
+
+/**
+ * Credits per operation and per time bucket for the filtered range. Results
+ * are cached briefly per filter set, which absorbs admins paging through the
+ * same range without re-aggregating on every page.
+ */
+export async function getUsageAnalytics(filters: UsageFilters, bucket: UsageBucket) {
+    // Relative ranges are rounded to the minute so the key stays stable across requests.
+    const minute = (d: Date | null) => (d ? Math.floor(d.getTime() / 60_000) : "");
+    const key = getCacheKey(
+        "usage-analytics",
+        bucket,
+        minute(filters.from),
+        minute(filters.to),
+        filters.operation ?? "",
+        filters.q ?? "",
+    );
+    return cache.getOrCompute(key, () => computeAnalytics(filters, bucket), ANALYTICS_TTL_SECONDS);
+}
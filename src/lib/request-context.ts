@@ -0,0 +1,29 @@
+import { AsyncLocalStorage } from 'node:async_hooks'
+
+/**
+ * Per-request memoization for API route handlers.
+ *
+ * React's `cache` only dedupes during a server component render, so route
+ * handlers get their own scope: `withApiLogging` runs every handler inside
+ * `runInRequestContext`, and `requestMemo` then resolves a given key at most
+ * once per request (e.g. the signed-in Clerk user). Outside a scope it simply
+ * calls `fn`.
+ */
+
+const requestContext = new AsyncLocalStorage<Map<unknown, Promise<unknown>>>()
+
+export function runInRequestContext<T>(fn: () => T): T {
+  return requestContext.run(new Map(), fn)
+}
+
+export function requestMemo<T>(key: unknown, fn: () => Promise<T>): Promise<T> {
+  const memo = requestContext.getStore()
+  if (!memo) return fn()
+
+  let pending = memo.get(key) as Promise<T> | undefined
+  if (!pending) {
+    pending = fn()
+    memo.set(key, pending)
+  }
+  return pending
+}
@@ -0,0 +1,200 @@
+import { randomUUID } from "node:crypto";
+import { prisma } from "@/lib/db";
+import { LRUCache } from "@/lib/cache";
+
+/** A Clerk user event reduced to the row change it implies. */
+export type ClerkUserChange =
+    | { kind: "upsert"; clerkId: string; email: string | null; name: string | null; occurredAt: number }
+    | { kind: "delete"; clerkId: string; occurredAt: number };
+
+type Pending = {
+    change: ClerkUserChange;
+    resolve: () => void;
+    reject: (error: unknown) => void;
+};
+
+export type ClerkQueueOptions = {
+    /** Flush as soon as this many changes are waiting. */
+    maxBatch?: number;
+    /** Otherwise flush this long after the first change of a batch arrives. */
+    maxDelayMs?: number;
+};
+
+export type ClerkQueueStats = {
+    enqueued: number;
+    batches: number;
+    written: number;
+    collapsed: number;
+    stale: number;
+    fallbacks: number;
+    pending: number;
+};
+
+// Svix retries a failed delivery for about a day, and Clerk may deliver the
+// same event more than once; ids are remembered at least that long.
+const SEEN_TTL_SECONDS = 26 * 3600;
+
+/**
+ * Micro-batching writer for Clerk user webhooks.
+ *
+ * Deliveries that arrive within `maxDelayMs` of each other are written
+ * together: changes are collapsed to the newest one per clerkId, upserts go
+ * out as one INSERT ... ON CONFLICT and deletes as one DELETE. Each caller's
+ * promise settles when its batch commits, so a delivery is only acknowledged
+ * to Clerk once it is durable and failures still trigger a Svix retry.
+ * Batches are flushed one at a time to keep per-user ordering.
+ */
+export class ClerkUserQueue {
+    private pending: Pending[] = [];
+    private timer: ReturnType<typeof setTimeout> | null = null;
+    private flushing: Promise<void> | null = null;
+    // Newest event time written per clerkId; older deliveries that arrive late
+    // (e.g. a retried user.updated after user.deleted) are dropped.
+    private applied = new LRUCache({ maxEntries: 50_000, defaultTtlSeconds: SEEN_TTL_SECONDS });
+    private readonly maxBatch: number;
+    private readonly maxDelayMs: number;
+    private counters = { enqueued: 0, batches: 0, written: 0, collapsed: 0, stale: 0, fallbacks: 0 };
+
+    constructor({ maxBatch = 200, maxDelayMs = 15 }: ClerkQueueOptions = {}) {
+        this.maxBatch = maxBatch;
+        this.maxDelayMs = maxDelayMs;
+    }
+
+    push(change: ClerkUserChange): Promise<void> {
+        this.counters.enqueued++;
+        return new Promise<void>((resolve, reject) => {
+            this.pending.push({ change, resolve, reject });
+            this.schedule();
+        });
+    }
+
+    stats(): ClerkQueueStats {
+        return { ...this.counters, pending: this.pending.length };
+    }
+
+    private schedule() {
+        if (this.flushing) return; // picked up when the running flush ends
+        if (this.pending.length >= this.maxBatch) {
+            this.startFlush();
+        } else if (!this.timer) {
+            this.timer = setTimeout(() => this.startFlush(), this.maxDelayMs);
+        }
+    }
+
+    private startFlush() {
+        if (this.timer) {
+            clearTimeout(this.timer);
+            this.timer = null;
+        }
+        const batch = this.pending.splice(0, this.maxBatch);
+        this.flushing = this.flush(batch).finally(() => {
+            this.flushing = null;
+            if (this.pending.length > 0) this.schedule();
+        });
+    }
+
+    private async flush(batch: Pending[]) {
+        this.counters.batches++;
+        const changes = this.collapse(batch.map((item) => item.change));
+
+        try {
+            await this.write(changes);
+        } catch (error) {
+            console.error("[CLERK_WEBHOOK_QUEUE] Batch write failed, retrying change by change:", error);
+            this.counters.fallbacks++;
+            await this.writeIndividually(batch);
+            return;
+        }
+
+        for (const change of changes) this.applied.set(change.clerkId, change.occurredAt);
+        this.counters.written += changes.length;
+        for (const item of batch) item.resolve();
+    }
+
+    /** Newest change per clerkId, minus those older than what is already written. */
+    private collapse(changes: ClerkUserChange[]) {
+        const latest = new Map<string, ClerkUserChange>();
+        for (const change of changes) {
+            const current = latest.get(change.clerkId);
+            if (!current || change.occurredAt >= current.occurredAt) latest.set(change.clerkId, change);
+        }
+        this.counters.collapsed += changes.length - latest.size;
+
+        return [...latest.values()].filter((change) => {
+            const appliedAt = this.applied.get<number>(change.clerkId);
+            const stale = appliedAt !== null && change.occurredAt < appliedAt;
+            if (stale) this.counters.stale++;
+            return !stale;
+        });
+    }
+
+    private async write(changes: ClerkUserChange[]) {
+        const upserts = changes.filter((change) => change.kind === "upsert");
+        const deletes = changes.filter((change) => change.kind === "delete").map((change) => change.clerkId);
+
+        await prisma.$transaction([
+            ...(upserts.length ? [prisma.$executeRaw`
+                INSERT INTO "User" ("id", "clerkId", "email", "name", "createdAt", "updatedAt")
+                SELECT t.id, t.clerk_id, t.email, t.name, NOW(), NOW()
+                FROM UNNEST(
+                    ${upserts.map(() => randomUUID())}::text[],
+                    ${upserts.map((change) => change.clerkId)}::text[],
+                    ${upserts.map((change) => change.email)}::text[],
+                    ${upserts.map((change) => change.name)}::text[]
+                ) AS t(id, clerk_id, email, name)
+                ON CONFLICT ("clerkId") DO UPDATE SET
+                    "email" = EXCLUDED."email",
+                    "name" = EXCLUDED."name",
+                    "updatedAt" = NOW()
+            `] : []),
+            ...(deletes.length ? [prisma.user.deleteMany({ where: { clerkId: { in: deletes } } })] : []),
+        ]);
+    }
+
+    /**
+     * Used when the batch statement is rejected (typically an email already
+     * owned by another clerkId), so one bad event only fails its own delivery.
+     */
+    private async writeIndividually(batch: Pending[]) {
+        for (const item of batch) {
+            const { change } = item;
+            try {
+                const appliedAt = this.applied.get<number>(change.clerkId);
+                if (appliedAt === null || change.occurredAt >= appliedAt) {
+                    if (change.kind === "delete") {
+                        await prisma.user.deleteMany({ where: { clerkId: change.clerkId } });
+                    } else {
+                        await prisma.user.upsert({
+                            where: { clerkId: change.clerkId },
+                            create: { clerkId: change.clerkId, email: change.email, name: change.name },
+                            update: { email: change.email, name: change.name },
+                        });
+                    }
+                    this.applied.set(change.clerkId, change.occurredAt);
+                    this.counters.written++;
+                }
+                item.resolve();
+            } catch (error) {
+                item.reject(error);
+            }
+        }
+    }
+}
+
+export const clerkUserQueue = new ClerkUserQueue();
+
+const seenDeliveries = new LRUCache({ maxEntries: 10_000, defaultTtlSeconds: SEEN_TTL_SECONDS });
+
+/**
+ * Runs `process` once per svix-id. Concurrent deliveries of the same id share
+ * one run; an id is only remembered once its run succeeded, so a failed
+ * delivery is processed again when Svix retries it.
+ */
+export async function processDeliveryOnce(svixId: string, process: () => Promise<void>) {
+    if (seenDeliveries.has(svixId)) return { duplicate: true };
+    await seenDeliveries.getOrCompute(svixId, async () => {
+        await process();
+        return true;
+    });
+    return { duplicate: false };
+}
@@ -25,7 +25,6 @@ test.describe('Admin Uso', () => {
       const url = new URL(route.request().url())
       const type = url.searchParams.get('type') || undefined
       const query = url.searchParams.get('q')?.toLowerCase() ?? ''
-      const pageParam = Number(url.searchParams.get('page') ?? '1')
       const pageSizeParam = Number(url.searchParams.get('pageSize') ?? '25')
 
       let filtered = usageRecords
@@ -40,17 +39,31 @@ test.describe('Admin Uso', () => {
         )
       }
 
-      const start = (pageParam - 1) * pageSizeParam
-      const data = filtered.slice(start, start + pageSizeParam)
+      const data = filtered.slice(0, pageSizeParam)
+      const byOperation = new Map<string, { operation: string; operations: number; credits: number }>()
+      for (const record of filtered) {
+        const entry = byOperation.get(record.operationType) ?? { operation: record.operationType, operations: 0, credits: 0 }
+        entry.operations += 1
+        entry.credits += record.creditsUsed
+        byOperation.set(record.operationType, entry)
+      }
 
       await route.fulfill({
         status: 200,
         contentType: 'application/json',
         body: JSON.stringify({
           data,
+          pageInfo: { pageSize: pageSizeParam, nextCursor: null, hasMore: false },
+          nextCursor: null,
           total: filtered.length,
-          page: pageParam,
           pageSize: pageSizeParam,
+          analytics: {
+            totalOperations: filtered.length,
+            totalCredits: filtered.reduce((sum, record) => sum + record.creditsUsed, 0),
+            uniqueUsers: new Set(filtered.map((record) => record.user.email)).size,
+            byOperation: [...byOperation.values()],
+            buckets: { granularity: 'day', series: [] },
+          },
         }),
       })
     })
@@ -50,12 +50,13 @@ test.describe('Admin Usuários', () => {
         contentType: 'application/json',
         body: JSON.stringify({
           users: filtered,
-          pagination: {
-            page: 1,
-            pageSize: filtered.length,
-            total: filtered.length,
-            pages: 1,
+          pageInfo: {
+            pageSize: Number(url.searchParams.get('pageSize') ?? '50'),
+            nextCursor: null,
+            hasMore: false,
           },
+          totalEstimate: filtered.length,
+          totalExact: Boolean(search),
         }),
       })
     })
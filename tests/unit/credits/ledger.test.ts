@@ -0,0 +1,94 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest'
+
+const prisma = vi.hoisted(() => ({
+  $queryRaw: vi.fn(),
+  creditBalance: { findUnique: vi.fn() },
+}))
+
+vi.mock('@/lib/db', () => ({ prisma, db: prisma }))
+
+vi.mock('@/lib/credits/settings', () => ({
+  getFeatureCost: vi.fn(async (feature: string) => ({ ai_text_chat: 1, ai_image_generation: 5 })[feature]),
+}))
+
+import { debitCredits, debitCreditsBatch, debitFeature, refundCredits } from '@/lib/credits/ledger'
+
+// $queryRaw is a tagged template: the SQL fragments come first, then the values.
+const lastQueryValues = () => prisma.$queryRaw.mock.calls.at(-1)!.slice(1)
+
+beforeEach(() => {
+  vi.clearAllMocks()
+})
+
+describe('debitCreditsBatch', () => {
+  it('debits the total in one statement and returns the new balance', async () => {
+    prisma.$queryRaw.mockResolvedValue([{ creditsRemaining: 93 }])
+
+    const result = await debitCreditsBatch('u1', [
+      { operation: 'ai_text_chat', amount: 2 },
+      { operation: 'ai_image_generation', amount: 5, details: { count: 1 } },
+    ])
+
+    expect(result).toEqual({ creditsRemaining: 93, insufficient: false })
+    expect(prisma.$queryRaw).toHaveBeenCalledTimes(1)
+    expect(prisma.creditBalance.findUnique).not.toHaveBeenCalled()
+
+    const values = lastQueryValues()
+    expect(values.slice(0, 3)).toEqual([7, 'u1', 7])
+    expect(values).toContainEqual(['ai_text_chat', 'ai_image_generation'])
+    expect(values).toContainEqual([2, 5])
+    expect(values).toContainEqual([null, '{"count":1}'])
+  })
+
+  it('reports insufficient credits without writing when the guard rejects the update', async () => {
+    prisma.$queryRaw.mockResolvedValue([])
+    prisma.creditBalance.findUnique.mockResolvedValue({ creditsRemaining: 3 })
+
+    await expect(debitCredits('u1', { operation: 'ai_text_chat', amount: 4 })).resolves.toEqual({
+      creditsRemaining: 3,
+      insufficient: true,
+    })
+  })
+
+  it('distinguishes a missing balance row from a low balance', async () => {
+    prisma.$queryRaw.mockResolvedValue([])
+    prisma.creditBalance.findUnique.mockResolvedValue(null)
+
+    await expect(debitCredits('u1', { operation: 'ai_text_chat', amount: 1 })).resolves.toEqual({
+      creditsRemaining: null,
+      insufficient: false,
+    })
+  })
+
+  it('rejects negative or fractional amounts before touching the database', async () => {
+    await expect(debitCredits('u1', { operation: 'x', amount: -1 })).rejects.toThrow('Invalid credit amount')
+    await expect(debitCredits('u1', { operation: 'x', amount: 1.5 })).rejects.toThrow('Invalid credit amount')
+    await expect(debitCreditsBatch('u1', [])).rejects.toThrow()
+    expect(prisma.$queryRaw).not.toHaveBeenCalled()
+  })
+})
+
+describe('debitFeature', () => {
+  it('charges the configured cost per use', async () => {
+    prisma.$queryRaw.mockResolvedValue([{ creditsRemaining: 10 }])
+
+    await debitFeature('u1', 'ai_image_generation', 3)
+
+    expect(lastQueryValues().slice(0, 3)).toEqual([15, 'u1', 15])
+  })
+})
+
+describe('refundCredits', () => {
+  it('records the refund as negative usage', async () => {
+    prisma.$queryRaw.mockResolvedValue([{ creditsRemaining: 12 }])
+
+    await expect(refundCredits('u1', { operation: 'ai_text_chat', amount: 2 })).resolves.toBe(12)
+    expect(lastQueryValues()).toContainEqual([-2])
+  })
+
+  it('returns null for an unknown user', async () => {
+    prisma.$queryRaw.mockResolvedValue([])
+
+    await expect(refundCredits('missing', { operation: 'ai_text_chat', amount: 2 })).resolves.toBeNull()
+  })
+})
@@ -0,0 +1,121 @@
+import { describe, it, expect, vi, beforeEach, afterEach } from 'vitest'
+
+const adminSetting = vi.hoisted(() => ({
+  findUnique: vi.fn(),
+  findUniqueOrThrow: vi.fn(),
+  createMany: vi.fn(),
+  updateMany: vi.fn(),
+}))
+
+vi.mock('@/lib/db', () => ({
+  prisma: { adminSetting },
+  db: { adminSetting },
+}))
+
+vi.mock('@/lib/clerk/subscription-utils', () => ({
+  SUBSCRIPTION_PLANS: { free: { id: 'free', credits: 100 }, starter: { id: 'starter', credits: 500 } },
+}))
+
+const row = (version: number, chatCost: number) => ({
+  key: 'credits',
+  version,
+  data: { featureCosts: { ai_text_chat: chatCost }, planCredits: { free: 100 } },
+  updatedAt: new Date('2025-01-01T00:00:00Z'),
+})
+
+// The snapshot lives at module level, so each test imports a fresh copy.
+async function loadSettings() {
+  vi.resetModules()
+  return import('@/lib/credits/settings')
+}
+
+beforeEach(() => {
+  vi.clearAllMocks()
+  vi.useFakeTimers()
+})
+
+afterEach(() => {
+  vi.useRealTimers()
+})
+
+describe('getCreditSettings', () => {
+  it('serves repeated reads from the snapshot without touching the database', async () => {
+    const { getFeatureCost } = await loadSettings()
+    adminSetting.findUnique.mockResolvedValue(row(3, 2))
+
+    expect(await getFeatureCost('ai_text_chat')).toBe(2)
+    expect(await getFeatureCost('ai_text_chat')).toBe(2)
+    expect(await getFeatureCost('ai_image_generation')).toBe(5)
+
+    expect(adminSetting.findUnique).toHaveBeenCalledTimes(1)
+  })
+
+  it('stores the defaults as version 1 on first read', async () => {
+    const { getCreditSettings } = await loadSettings()
+    adminSetting.findUnique.mockResolvedValue(null)
+    adminSetting.findUniqueOrThrow.mockResolvedValue(row(1, 1))
+
+    const { version } = await getCreditSettings()
+
+    expect(version).toBe(1)
+    expect(adminSetting.createMany).toHaveBeenCalledWith({
+      data: [{ key: 'credits', data: expect.objectContaining({ planCredits: { free: 100, starter: 500 } }) }],
+      skipDuplicates: true,
+    })
+  })
+
+  it('reloads once the stored version moves on', async () => {
+    const { getCreditSettings, getFeatureCost } = await loadSettings()
+    adminSetting.findUnique.mockResolvedValueOnce(row(3, 2))
+    await getCreditSettings()
+
+    // Another instance wrote version 4; the stale snapshot is still served
+    // while the version check runs in the background.
+    vi.advanceTimersByTime(5_000)
+    adminSetting.findUnique.mockResolvedValueOnce({ version: 4 }).mockResolvedValueOnce(row(4, 7))
+    expect(await getFeatureCost('ai_text_chat')).toBe(2)
+    await vi.waitFor(async () => expect(await getFeatureCost('ai_text_chat')).toBe(7))
+  })
+
+  it('keeps the snapshot when the version check finds no change', async () => {
+    const { getCreditSettings } = await loadSettings()
+    adminSetting.findUnique.mockResolvedValueOnce(row(3, 2)).mockResolvedValueOnce({ version: 3 })
+    const first = await getCreditSettings()
+
+    const checked = await getCreditSettings({ fresh: true })
+
+    expect(checked.settings).toBe(first.settings)
+    expect(adminSetting.findUnique).toHaveBeenLastCalledWith({ where: { key: 'credits' }, select: { version: true } })
+  })
+})
+
+describe('updateCreditSettings', () => {
+  const next = { featureCosts: { ai_text_chat: 9 }, planCredits: { free: 100 } }
+
+  it('writes only against the expected version and bumps it', async () => {
+    const { updateCreditSettings } = await loadSettings()
+    adminSetting.updateMany.mockResolvedValue({ count: 1 })
+    adminSetting.findUnique.mockResolvedValue(row(4, 9))
+
+    const result = await updateCreditSettings(next, 3, 'user_admin')
+
+    expect(result.conflict).toBe(false)
+    expect(result.settings.version).toBe(4)
+    expect(adminSetting.updateMany).toHaveBeenCalledWith({
+      where: { key: 'credits', version: 3 },
+      data: { data: next, version: { increment: 1 }, updatedBy: 'user_admin' },
+    })
+  })
+
+  it('reports a conflict and returns the current settings on a version mismatch', async () => {
+    const { updateCreditSettings } = await loadSettings()
+    adminSetting.updateMany.mockResolvedValue({ count: 0 })
+    adminSetting.findUnique.mockResolvedValue(row(5, 4))
+
+    const result = await updateCreditSettings(next, 3)
+
+    expect(result.conflict).toBe(true)
+    expect(result.settings.version).toBe(5)
+    expect(result.settings.settings.featureCosts.ai_text_chat).toBe(4)
+  })
+})
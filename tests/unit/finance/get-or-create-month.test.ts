@@ -0,0 +1,62 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest'
+import { Prisma } from '@prisma/client'
+
+const month = vi.hoisted(() => ({
+  findUnique: vi.fn(),
+  upsert: vi.fn(),
+}))
+
+vi.mock('@/lib/db', () => ({
+  prisma: { month },
+  db: { month },
+}))
+
+import { cache } from '@/lib/cache'
+import { getOrCreateMonth } from '@/lib/queries/finance'
+
+const row = { id: 'm1', userId: 'u1', month: 3, year: 2025, incomes: [], expenses: [], investments: [], miscExpenses: [] }
+
+const uniqueViolation = () =>
+  new Prisma.PrismaClientKnownRequestError('Unique constraint failed', { code: 'P2002', clientVersion: 'test' })
+
+beforeEach(() => {
+  cache.clear()
+  month.findUnique.mockReset()
+  month.upsert.mockReset()
+})
+
+describe('getOrCreateMonth', () => {
+  it('returns an existing month without writing', async () => {
+    month.findUnique.mockResolvedValue(row)
+
+    await expect(getOrCreateMonth('u1', 3, 2025)).resolves.toBe(row)
+    expect(month.upsert).not.toHaveBeenCalled()
+  })
+
+  it('upserts on the (userId, month, year) key when the month is missing', async () => {
+    month.findUnique.mockResolvedValue(null)
+    month.upsert.mockResolvedValue(row)
+
+    await expect(getOrCreateMonth('u1', 3, 2025)).resolves.toBe(row)
+    expect(month.upsert).toHaveBeenCalledWith(expect.objectContaining({
+      where: { userId_month_year: { userId: 'u1', month: 3, year: 2025 } },
+      create: { userId: 'u1', month: 3, year: 2025 },
+      update: {},
+    }))
+  })
+
+  it('reads the concurrent winner instead of throwing on a unique violation', async () => {
+    month.findUnique.mockResolvedValueOnce(null).mockResolvedValueOnce(row)
+    month.upsert.mockRejectedValue(uniqueViolation())
+
+    await expect(getOrCreateMonth('u1', 3, 2025)).resolves.toBe(row)
+    expect(month.findUnique).toHaveBeenCalledTimes(2)
+  })
+
+  it('rethrows other errors', async () => {
+    month.findUnique.mockResolvedValue(null)
+    month.upsert.mockRejectedValue(new Error('connection reset'))
+
+    await expect(getOrCreateMonth('u1', 3, 2025)).rejects.toThrow('connection reset')
+  })
+})
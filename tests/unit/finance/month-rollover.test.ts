@@ -0,0 +1,130 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest'
+
+const tx = vi.hoisted(() => ({
+  $queryRaw: vi.fn(),
+  $executeRaw: vi.fn(),
+}))
+
+const prisma = vi.hoisted(() => ({
+  $transaction: vi.fn(),
+  month: { findMany: vi.fn() },
+}))
+
+const rebuildRollups = vi.hoisted(() => vi.fn())
+const invalidateMonthCache = vi.hoisted(() => vi.fn())
+const invalidateUserMonthsCache = vi.hoisted(() => vi.fn())
+
+vi.mock('@/lib/db', () => ({ prisma, db: prisma }))
+vi.mock('@/lib/finance-rollups', () => ({ rebuildRollups }))
+vi.mock('@/lib/queries/finance', () => ({ invalidateMonthCache, invalidateUserMonthsCache }))
+vi.mock('@/lib/queries/admin-dashboard', () => ({ invalidateAdminDashboardStats: vi.fn() }))
+
+import { rolloverAllUsers, rolloverMonths } from '@/lib/month-rollover'
+
+// Tagged template calls: the SQL fragments come first, then the values.
+const sqlOf = (call: unknown[]) => (call[0] as TemplateStringsArray).join('?')
+
+beforeEach(() => {
+  vi.clearAllMocks()
+  prisma.$transaction.mockImplementation(async (fn: (client: typeof tx) => unknown) => fn(tx))
+})
+
+describe('rolloverMonths', () => {
+  it('creates the next month and bulk-copies each category once', async () => {
+    tx.$queryRaw
+      .mockResolvedValueOnce([{ id: 'm_feb' }])
+      .mockResolvedValueOnce([{ userId: 'u1', sourceId: 'm_jan', targetId: 'm_feb' }])
+    tx.$executeRaw.mockResolvedValueOnce(2).mockResolvedValueOnce(3).mockResolvedValueOnce(1)
+
+    const result = await rolloverMonths({ year: 2025, month: 1 }, ['u1'])
+
+    expect(result.target).toEqual({ year: 2025, month: 2 })
+    expect(result.targets).toEqual([{ userId: 'u1', sourceId: 'm_jan', targetId: 'm_feb', created: true }])
+    expect(result.copied).toEqual({ incomes: 2, expenses: 3, investments: 1, miscExpenses: 0 })
+
+    // One INSERT ... SELECT per default category, all for the same pairs.
+    expect(tx.$executeRaw).toHaveBeenCalledTimes(3)
+    for (const call of tx.$executeRaw.mock.calls) {
+      expect(call).toContainEqual(['m_jan'])
+      expect(call).toContainEqual(['m_feb'])
+    }
+    expect(rebuildRollups).toHaveBeenCalledWith({ monthIds: ['m_feb'] }, tx)
+    expect(invalidateMonthCache).toHaveBeenCalledWith('m_feb')
+    expect(invalidateUserMonthsCache).toHaveBeenCalledWith('u1')
+  })
+
+  it('rolls December into January of the next year', async () => {
+    tx.$queryRaw.mockResolvedValueOnce([]).mockResolvedValueOnce([])
+
+    const result = await rolloverMonths({ year: 2025, month: 12 }, ['u1'])
+
+    expect(result.target).toEqual({ year: 2026, month: 1 })
+    expect(tx.$queryRaw.mock.calls[0]).toEqual(expect.arrayContaining([1, 2026, 2025, 12]))
+  })
+
+  it('is a no-op on a repeat run: nothing copied, no rollup rebuild', async () => {
+    tx.$queryRaw
+      .mockResolvedValueOnce([])
+      .mockResolvedValueOnce([{ userId: 'u1', sourceId: 'm_jan', targetId: 'm_feb' }])
+    tx.$executeRaw.mockResolvedValue(0)
+
+    const result = await rolloverMonths({ year: 2025, month: 1 }, ['u1'], ['incomes'])
+
+    expect(result.createdMonths).toBe(0)
+    expect(result.targets[0].created).toBe(false)
+    expect(tx.$executeRaw).toHaveBeenCalledTimes(1)
+    expect(rebuildRollups).not.toHaveBeenCalled()
+    expect(invalidateUserMonthsCache).not.toHaveBeenCalled()
+  })
+
+  it('only copies standard expenses and guards every copy against existing rows', async () => {
+    tx.$queryRaw
+      .mockResolvedValueOnce([])
+      .mockResolvedValueOnce([{ userId: 'u1', sourceId: 'm_jan', targetId: 'm_feb' }])
+    tx.$executeRaw.mockResolvedValue(0)
+
+    await rolloverMonths({ year: 2025, month: 1 }, ['u1'], ['expenses'])
+
+    const sql = sqlOf(tx.$executeRaw.mock.calls[0])
+    expect(sql).toContain('NOT EXISTS')
+    expect(sql).toContain(`"type" = 'STANDARD'`)
+  })
+
+  it('returns no targets when the source month does not exist', async () => {
+    tx.$queryRaw.mockResolvedValueOnce([]).mockResolvedValueOnce([])
+
+    const result = await rolloverMonths({ year: 2025, month: 1 }, ['u1'])
+
+    expect(result.targets).toEqual([])
+    expect(tx.$executeRaw).not.toHaveBeenCalled()
+  })
+})
+
+describe('rolloverAllUsers', () => {
+  it('walks the source months in userId pages and resumes after the cursor', async () => {
+    prisma.month.findMany
+      .mockResolvedValueOnce([{ userId: 'u1' }, { userId: 'u2' }])
+      .mockResolvedValueOnce([{ userId: 'u3' }])
+    tx.$queryRaw.mockImplementation(async () => [])
+    const onBatch = vi.fn()
+
+    const totals = await rolloverAllUsers({ year: 2025, month: 1 }, { batchSize: 2, cursor: 'u0', onBatch })
+
+    expect(prisma.month.findMany.mock.calls[0][0].where).toEqual({ year: 2025, month: 1, userId: { gt: 'u0' } })
+    expect(prisma.month.findMany.mock.calls[1][0].where).toEqual({ year: 2025, month: 1, userId: { gt: 'u2' } })
+    expect(totals.batches).toBe(2)
+    expect(totals.cursor).toBe('u3')
+    expect(totals.done).toBe(true)
+    expect(onBatch).toHaveBeenLastCalledWith(expect.anything(), 'u3')
+  })
+
+  it('stops between batches at the deadline and reports where to resume', async () => {
+    prisma.month.findMany.mockResolvedValue([{ userId: 'u1' }, { userId: 'u2' }])
+    tx.$queryRaw.mockImplementation(async () => [])
+
+    const totals = await rolloverAllUsers({ year: 2025, month: 1 }, { batchSize: 2, deadline: Date.now() - 1 })
+
+    expect(prisma.month.findMany).toHaveBeenCalledTimes(1)
+    expect(totals).toMatchObject({ batches: 1, cursor: 'u2', done: false })
+  })
+})
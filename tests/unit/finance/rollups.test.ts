@@ -0,0 +1,44 @@
+import { describe, it, expect } from 'vitest'
+import { Prisma } from '@prisma/client'
+import { calculateTotals } from '@/lib/finance-utils'
+import { expenseCategory, ROLLUP_CATEGORY, totalsFromRollups } from '@/lib/finance-rollups'
+import type { MonthWithDetails } from '@/lib/queries/finance'
+
+const decimal = (value: number) => new Prisma.Decimal(value)
+
+describe('totalsFromRollups', () => {
+  it('matches calculateTotals for the same month', () => {
+    const month = {
+      incomes: [{ amount: decimal(3000) }, { amount: decimal(450.5) }],
+      expenses: [
+        { type: 'STANDARD', totalAmount: decimal(1200) },
+        { type: 'STANDARD', totalAmount: decimal(89.9) },
+        { type: 'TITHE', totalAmount: decimal(100) },
+        { type: 'INVESTMENT_TOTAL', totalAmount: decimal(999) },
+      ],
+      investments: [{ amount: decimal(500) }],
+      miscExpenses: [{ amount: decimal(42.1) }, { amount: decimal(7.9) }],
+    } as unknown as MonthWithDetails
+
+    const rollups = [
+      { category: ROLLUP_CATEGORY.INCOME, amount: decimal(3450.5) },
+      { category: expenseCategory('STANDARD'), amount: decimal(1289.9) },
+      { category: expenseCategory('TITHE'), amount: decimal(100) },
+      { category: expenseCategory('INVESTMENT_TOTAL'), amount: decimal(999) },
+      { category: ROLLUP_CATEGORY.INVESTMENT, amount: decimal(500) },
+      { category: ROLLUP_CATEGORY.MISC, amount: decimal(50) },
+      { category: ROLLUP_CATEGORY.TITHE_PAID, amount: decimal(345.05) },
+    ]
+
+    const expected = calculateTotals(month)
+    const actual = totalsFromRollups(rollups)
+
+    for (const key of Object.keys(expected) as (keyof typeof expected)[]) {
+      expect(actual[key]).toBeCloseTo(expected[key], 2)
+    }
+  })
+
+  it('returns zeros for a month without rollup rows', () => {
+    expect(totalsFromRollups([])).toEqual(calculateTotals(null))
+  })
+})
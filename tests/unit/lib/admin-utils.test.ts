@@ -0,0 +1,70 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest'
+
+const currentUser = vi.hoisted(() => vi.fn())
+
+vi.mock('@/lib/clerk/session', () => ({ currentUser }))
+
+const makeUser = (id: string, email: string) => ({
+  id,
+  primaryEmailAddressId: `idn_${id}`,
+  emailAddresses: [{ id: `idn_${id}`, emailAddress: email }],
+})
+
+// The allowlists are parsed at module load, so each test imports a fresh copy.
+async function loadAdminUtils(env: { ids?: string; emails?: string }) {
+  vi.resetModules()
+  vi.stubEnv('ADMIN_USER_IDS', env.ids ?? '')
+  vi.stubEnv('ADMIN_EMAILS', env.emails ?? '')
+  return import('@/lib/admin-utils')
+}
+
+beforeEach(() => {
+  vi.clearAllMocks()
+  vi.unstubAllEnvs()
+})
+
+describe('requireAdmin', () => {
+  it('resolves the session once and admits allowlisted emails case-insensitively', async () => {
+    const { requireAdmin } = await loadAdminUtils({ emails: ' Admin@Example.com , ops@example.com' })
+    currentUser.mockResolvedValue(makeUser('user_1', 'admin@example.com'))
+
+    const { user, response } = await requireAdmin()
+
+    expect(response).toBeNull()
+    expect(user?.id).toBe('user_1')
+    expect(currentUser).toHaveBeenCalledTimes(1)
+  })
+
+  it('returns a 401 for signed-out and non-admin users', async () => {
+    const { requireAdmin } = await loadAdminUtils({ ids: 'user_admin' })
+
+    currentUser.mockResolvedValueOnce(null)
+    expect((await requireAdmin()).response?.status).toBe(401)
+
+    currentUser.mockResolvedValueOnce(makeUser('user_2', 'someone@example.com'))
+    expect((await requireAdmin()).response?.status).toBe(401)
+  })
+})
+
+describe('isAdmin', () => {
+  it('answers from the id allowlist without resolving the session', async () => {
+    const { isAdmin } = await loadAdminUtils({ ids: 'user_admin', emails: 'admin@example.com' })
+
+    expect(await isAdmin('user_admin')).toBe(true)
+    expect(currentUser).not.toHaveBeenCalled()
+  })
+
+  it('caches positive email decisions but not negative ones', async () => {
+    const { isAdmin } = await loadAdminUtils({ emails: 'admin@example.com' })
+    currentUser.mockImplementation(async () => makeUser('user_email_admin', 'admin@example.com'))
+
+    expect(await isAdmin('user_email_admin')).toBe(true)
+    expect(await isAdmin('user_email_admin')).toBe(true)
+    expect(currentUser).toHaveBeenCalledTimes(1)
+
+    currentUser.mockImplementation(async () => makeUser('user_member', 'member@example.com'))
+    expect(await isAdmin('user_member')).toBe(false)
+    expect(await isAdmin('user_member')).toBe(false)
+    expect(currentUser).toHaveBeenCalledTimes(3)
+  })
+})
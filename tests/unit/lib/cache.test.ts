@@ -0,0 +1,92 @@
+import { describe, it, expect, vi, afterEach } from 'vitest'
+import { LRUCache } from '@/lib/cache'
+
+afterEach(() => {
+  vi.useRealTimers()
+})
+
+describe('LRUCache', () => {
+  it('evicts the least recently used entry, not the oldest inserted', () => {
+    const cache = new LRUCache({ maxEntries: 2 })
+    cache.set('a', 1)
+    cache.set('b', 2)
+    expect(cache.get('a')).toBe(1) // refreshes "a"
+    cache.set('c', 3)
+
+    expect(cache.get('b')).toBeNull()
+    expect(cache.get('a')).toBe(1)
+    expect(cache.get('c')).toBe(3)
+    expect(cache.stats().evictions).toBe(1)
+  })
+
+  it('expires entries per TTL without a sweep', () => {
+    vi.useFakeTimers()
+    const cache = new LRUCache()
+    cache.set('short', 'x', 1)
+    cache.set('long', 'y', 60)
+
+    vi.advanceTimersByTime(1500)
+
+    expect(cache.get('short')).toBeNull()
+    expect(cache.get('long')).toBe('y')
+    expect(cache.stats()).toMatchObject({ hits: 1, misses: 1, expirations: 1 })
+  })
+
+  it('keeps the byte budget', () => {
+    const cache = new LRUCache({ maxBytes: 100 })
+    cache.set('a', 'x'.repeat(20), 60, { size: 60 })
+    cache.set('b', 'y'.repeat(20), 60, { size: 60 })
+
+    expect(cache.get('a')).toBeNull()
+    expect(cache.stats()).toMatchObject({ entries: 1, bytes: 60 })
+  })
+
+  it('coalesces concurrent misses into one computation', async () => {
+    const cache = new LRUCache()
+    const compute = vi.fn(async () => {
+      await new Promise((resolve) => setTimeout(resolve, 5))
+      return { value: 42 }
+    })
+
+    const results = await Promise.all([
+      cache.getOrCompute('k', compute),
+      cache.getOrCompute('k', compute),
+      cache.getOrCompute('k', compute),
+    ])
+
+    expect(compute).toHaveBeenCalledTimes(1)
+    expect(results.every((r) => r === results[0])).toBe(true)
+    expect(cache.stats().coalesced).toBe(2)
+    expect(await cache.getOrCompute('k', compute)).toBe(results[0])
+  })
+
+  it('does not store null results or values invalidated mid-flight', async () => {
+    const cache = new LRUCache()
+    await cache.getOrCompute('missing', async () => null)
+    expect(cache.has('missing')).toBe(false)
+
+    let release!: () => void
+    const pending = cache.getOrCompute(
+      'month',
+      () => new Promise<{ id: string }>((resolve) => { release = () => resolve({ id: 'm1' }) }),
+      60,
+      { tags: (month) => [`month:${month.id}`] }
+    )
+    cache.invalidateTag('month:m1')
+    release()
+    await pending
+
+    expect(cache.has('month')).toBe(false)
+  })
+
+  it('drops tagged entries on invalidateTag', () => {
+    const cache = new LRUCache()
+    cache.set('p1', 1, 60, { tags: ['plans'] })
+    cache.set('p2', 2, 60, { tags: ['plans'] })
+    cache.set('u', 3)
+
+    expect(cache.invalidateTag('plans')).toBe(2)
+    expect(cache.get('p1')).toBeNull()
+    expect(cache.get('u')).toBe(3)
+  })
+})
@@ -0,0 +1,38 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest'
+
+vi.mock('@clerk/backend', () => ({ createClerkClient: vi.fn(() => ({ users: {} })) }))
+
+// The stub URL is read at module load, so each test imports a fresh copy.
+async function loadClient(env: { stubUrl: string; nodeEnv: string }) {
+  vi.resetModules()
+  vi.stubEnv('CLERK_STUB_URL', env.stubUrl)
+  vi.stubEnv('NODE_ENV', env.nodeEnv)
+  return import('@/lib/clerk/client')
+}
+
+beforeEach(() => {
+  vi.unstubAllEnvs()
+})
+
+describe('Clerk stub mode', () => {
+  it('points at the stub outside production', async () => {
+    const { CLERK_STUB_URL, isClerkStubEnabled } = await loadClient({
+      stubUrl: 'http://127.0.0.1:3999/',
+      nodeEnv: 'development',
+    })
+
+    expect(CLERK_STUB_URL).toBe('http://127.0.0.1:3999')
+    expect(isClerkStubEnabled()).toBe(true)
+  })
+
+  it('refuses to load in production', async () => {
+    await expect(loadClient({ stubUrl: 'http://127.0.0.1:3999', nodeEnv: 'production' }))
+      .rejects.toThrow(/CLERK_STUB_URL/)
+  })
+
+  it('stays off in production without a stub URL', async () => {
+    const { isClerkStubEnabled } = await loadClient({ stubUrl: '', nodeEnv: 'production' })
+
+    expect(isClerkStubEnabled()).toBe(false)
+  })
+})
@@ -0,0 +1,65 @@
+import { describe, it, expect, beforeEach } from 'vitest'
+import {
+  Histogram,
+  metricsSnapshot,
+  recordRequest,
+  resetMetrics,
+  runWithPhases,
+  serverTimingHeader,
+  timePhase,
+} from '@/lib/logging/metrics'
+
+beforeEach(() => {
+  resetMetrics()
+})
+
+describe('Histogram', () => {
+  it('tracks count, extremes and bucket-estimated percentiles', () => {
+    const histogram = new Histogram()
+    for (let ms = 1; ms <= 100; ms++) histogram.observe(ms)
+
+    const snapshot = histogram.snapshot()
+    expect(snapshot).toMatchObject({ count: 100, minMs: 1, maxMs: 100, meanMs: 50.5 })
+    expect(snapshot.p50Ms).toBeGreaterThanOrEqual(25)
+    expect(snapshot.p50Ms).toBeLessThanOrEqual(50)
+    expect(snapshot.p99Ms).toBeLessThanOrEqual(100)
+    expect(snapshot.buckets.reduce((sum, b) => sum + b.count, 0)).toBe(100)
+  })
+
+  it('reports nulls when empty', () => {
+    expect(new Histogram().snapshot()).toMatchObject({ count: 0, minMs: null, p95Ms: null })
+  })
+})
+
+describe('request phases', () => {
+  it('accumulates timePhase calls only inside a request scope', async () => {
+    await timePhase('db', async () => 'outside')
+
+    const { phases, result } = runWithPhases(async () => {
+      await timePhase('db', async () => 1)
+      await timePhase('db', async () => 2)
+      return timePhase('auth', () => 'user')
+    })
+
+    expect(await result).toBe('user')
+    expect(phases.db?.calls).toBe(2)
+    expect(phases.auth?.calls).toBe(1)
+    expect(phases.external).toBeUndefined()
+  })
+
+  it('formats a Server-Timing header with a total entry', () => {
+    const header = serverTimingHeader({ db: { ms: 4.234, calls: 3 }, auth: { ms: 1, calls: 1 } }, 18.9)
+    expect(header).toBe('db;dur=4.23;desc="3 calls", auth;dur=1;desc="1 call", total;dur=18.9')
+  })
+
+  it('aggregates per route and method', () => {
+    recordRequest('/api/admin/users/[id]', 'PUT', 200, 12, { db: { ms: 5, calls: 2 } })
+    recordRequest('/api/admin/users/[id]', 'PUT', 500, 30, {})
+    recordRequest('/api/admin/users/[id]', 'DELETE', 200, 8, {})
+
+    const [put] = metricsSnapshot().routes.filter((r) => r.method === 'PUT')
+    expect(put).toMatchObject({ requests: 2, errors: 1, statuses: { 200: 1, 500: 1 } })
+    expect(put.phases.db).toMatchObject({ calls: 2, requests: 1 })
+    expect(metricsSnapshot().routes).toHaveLength(2)
+  })
+})
@@ -0,0 +1,125 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest'
+
+const prisma = vi.hoisted(() => ({
+  $queryRaw: vi.fn(),
+}))
+
+vi.mock('@/lib/db', () => ({ prisma, db: prisma }))
+
+import { getStorageStats, parseStorageFilters, streamStorage, type StorageFilters } from '@/lib/queries/storage'
+import { decodeCursor } from '@/lib/pagination'
+
+const noFilters: StorageFilters = { from: null, to: null, contentType: null, userId: null, clerkUserId: null, q: null }
+
+// Newest first, as the query orders them.
+const rows = (count: number, offset = 0) =>
+  Array.from({ length: count }, (_, i) => ({
+    id: `obj${String(100000 - offset - i).padStart(6, '0')}`,
+    name: null,
+    pathname: `uploads/user_1/file-${offset + i}.png`,
+    url: `https://blob.example/file-${offset + i}.png`,
+    contentType: 'image/png',
+    size: i % 2 ? 2048 : null,
+    createdAt: new Date(Date.UTC(2025, 0, 1) - (offset + i) * 1000),
+    clerkUserId: 'user_1',
+    userId: 'u1',
+    userName: 'Ana',
+    userEmail: 'ana@example.com',
+  }))
+
+const collect = async (filters: StorageFilters, limit: number) => {
+  const batches = []
+  for await (const batch of streamStorage(filters, null, limit)) batches.push(batch)
+  return batches
+}
+
+beforeEach(() => {
+  vi.clearAllMocks()
+})
+
+describe('parseStorageFilters', () => {
+  it('filters nothing by default and ignores type=all', () => {
+    expect(parseStorageFilters(new URLSearchParams('type=all&q=%20%20'))).toEqual(noFilters)
+  })
+
+  it('reads the user and date range and rejects unparsable dates', () => {
+    const filters = parseStorageFilters(
+      new URLSearchParams('userId=u1&startDate=2025-01-01&endDate=2025-02-01&type=image/png&q=%20nota%20'),
+    )
+    expect(filters).toMatchObject({ userId: 'u1', contentType: 'image/png', q: 'nota' })
+    expect(filters?.from?.toISOString()).toBe('2025-01-01T00:00:00.000Z')
+    expect(filters?.to?.toISOString()).toBe('2025-02-01T00:00:00.000Z')
+
+    expect(parseStorageFilters(new URLSearchParams('endDate=soon'))).toBeNull()
+  })
+})
+
+describe('streamStorage', () => {
+  it('reads in batches, resuming each query after the last row of the previous one', async () => {
+    const first = rows(501)
+    prisma.$queryRaw.mockResolvedValueOnce(first).mockResolvedValueOnce(rows(2, 500))
+
+    const batches = await collect(noFilters, 10_000)
+
+    expect(batches.map((b) => b.items.length)).toEqual([500, 2])
+    expect(batches[0].pageInfo).toBeNull()
+    expect(batches[1].pageInfo).toEqual({ pageSize: 10_000, nextCursor: null, hasMore: false })
+
+    // The second query is bounded by the 500th row's (createdAt, id).
+    const [, where] = prisma.$queryRaw.mock.calls[1]
+    expect(where.values).toEqual(expect.arrayContaining([first[499].createdAt, first[499].id]))
+  })
+
+  it('stops at the limit and hands back a cursor to resume from', async () => {
+    const page = rows(4)
+    prisma.$queryRaw.mockResolvedValueOnce(page)
+
+    const [batch, ...rest] = await collect(noFilters, 3)
+
+    expect(rest).toEqual([])
+    expect(prisma.$queryRaw).toHaveBeenCalledTimes(1)
+    expect(batch.items).toHaveLength(3)
+    expect(batch.pageInfo?.hasMore).toBe(true)
+    expect(decodeCursor(batch.pageInfo?.nextCursor)).toEqual({ createdAt: page[2].createdAt, id: page[2].id })
+  })
+
+  it('falls back to the file name and a zero size', async () => {
+    prisma.$queryRaw.mockResolvedValueOnce(rows(1))
+
+    const [{ items }] = await collect(noFilters, 1)
+
+    expect(items[0]).toMatchObject({
+      name: 'file-0.png',
+      size: 0,
+      createdAt: '2025-01-01T00:00:00.000Z',
+      user: { id: 'u1', clerkId: 'user_1', email: 'ana@example.com', name: 'Ana' },
+    })
+  })
+})
+
+describe('getStorageStats', () => {
+  it('splits the rollup total from the per-user rows of the same query', async () => {
+    prisma.$queryRaw.mockResolvedValueOnce([
+      { clerkUserId: null, isTotal: true, objects: 5, bytes: 7000, users: 2, userId: null, name: null, email: null },
+      { clerkUserId: 'user_1', isTotal: false, objects: 3, bytes: 6000, users: 2, userId: 'u1', name: 'Ana', email: 'ana@example.com' },
+      { clerkUserId: 'user_2', isTotal: false, objects: 2, bytes: 1000, users: 2, userId: null, name: null, email: null },
+    ])
+
+    const stats = await getStorageStats({ ...noFilters, contentType: 'image/png' })
+
+    expect(prisma.$queryRaw).toHaveBeenCalledTimes(1)
+    expect(stats.totals).toEqual({ objects: 5, bytes: 7000, users: 2 })
+    expect(stats.byUser).toEqual([
+      { userId: 'u1', clerkUserId: 'user_1', name: 'Ana', email: 'ana@example.com', objects: 3, bytes: 6000 },
+      { userId: null, clerkUserId: 'user_2', name: null, email: null, objects: 2, bytes: 1000 },
+    ])
+  })
+
+  it('reports zeros for an empty set', async () => {
+    prisma.$queryRaw.mockResolvedValueOnce([])
+
+    const stats = await getStorageStats({ ...noFilters, q: 'nothing-matches' })
+
+    expect(stats).toEqual({ totals: { objects: 0, bytes: 0, users: 0 }, byUser: [] })
+  })
+})
@@ -0,0 +1,61 @@
+import { describe, it, expect } from 'vitest'
+import { defaultBucket, parseUsageFilters } from '@/lib/queries/usage'
+import { decodeCursor, encodeCursor, paginate } from '@/lib/pagination'
+
+const now = new Date('2025-03-10T12:00:00Z')
+
+describe('parseUsageFilters', () => {
+  it('defaults to the last 7 days for every operation', () => {
+    const filters = parseUsageFilters(new URLSearchParams(), now)
+    expect(filters).toEqual({
+      from: new Date('2025-03-03T12:00:00Z'),
+      to: null,
+      operation: null,
+      q: null,
+    })
+  })
+
+  it('leaves the range open for range=all and ignores type=all', () => {
+    const filters = parseUsageFilters(new URLSearchParams('range=all&type=all&q=%20ana%20'), now)
+    expect(filters).toMatchObject({ from: null, to: null, operation: null, q: 'ana' })
+  })
+
+  it('prefers explicit dates over range and rejects unparsable ones', () => {
+    const filters = parseUsageFilters(
+      new URLSearchParams('range=24hours&startDate=2025-01-01&endDate=2025-02-01&type=AI_TEXT_CHAT'),
+      now,
+    )
+    expect(filters?.from?.toISOString()).toBe('2025-01-01T00:00:00.000Z')
+    expect(filters?.to?.toISOString()).toBe('2025-02-01T00:00:00.000Z')
+    expect(filters?.operation).toBe('AI_TEXT_CHAT')
+
+    expect(parseUsageFilters(new URLSearchParams('startDate=yesterday'), now)).toBeNull()
+  })
+})
+
+describe('defaultBucket', () => {
+  it('uses hourly buckets up to two days and daily ones beyond', () => {
+    expect(defaultBucket(parseUsageFilters(new URLSearchParams('range=24hours'), now)!, now)).toBe('hour')
+    expect(defaultBucket(parseUsageFilters(new URLSearchParams('range=30days'), now)!, now)).toBe('day')
+    expect(defaultBucket(parseUsageFilters(new URLSearchParams('range=all'), now)!, now)).toBe('day')
+  })
+})
+
+describe('keyset cursors', () => {
+  it('round-trips and rejects garbage', () => {
+    const key = { createdAt: new Date('2025-03-01T08:30:00.123Z'), id: 'ckabc|123' }
+    expect(decodeCursor(encodeCursor(key))).toEqual(key)
+    expect(decodeCursor('not-a-cursor')).toBeNull()
+    expect(decodeCursor(null)).toBeNull()
+  })
+
+  it('trims the lookahead row and points the cursor at the last item kept', () => {
+    const rows = [3, 2, 1].map((n) => ({ id: `u${n}`, createdAt: new Date(Date.UTC(2025, 0, n)) }))
+    const { items, pageInfo } = paginate(rows, 2)
+    expect(items.map((r) => r.id)).toEqual(['u3', 'u2'])
+    expect(pageInfo.hasMore).toBe(true)
+    expect(decodeCursor(pageInfo.nextCursor)).toEqual(rows[1])
+
+    expect(paginate(rows, 3).pageInfo).toEqual({ pageSize: 3, nextCursor: null, hasMore: false })
+  })
+})
@@ -0,0 +1,68 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest'
+
+const prisma = vi.hoisted(() => ({
+  $transaction: vi.fn(),
+  $executeRaw: vi.fn(),
+  user: { deleteMany: vi.fn(), upsert: vi.fn() },
+}))
+
+vi.mock('@/lib/db', () => ({ prisma, db: prisma }))
+
+import { ClerkUserQueue, type ClerkUserChange } from '@/lib/webhooks/clerk-queue'
+
+const upsert = (clerkId: string, name: string, occurredAt: number): ClerkUserChange =>
+  ({ kind: 'upsert', clerkId, email: `${clerkId}@example.com`, name, occurredAt })
+
+// Values interpolated into the tagged INSERT, in order: ids, clerkIds, emails, names.
+const upsertedNames = () => prisma.$executeRaw.mock.calls.map((call) => call[4])
+
+beforeEach(() => {
+  vi.clearAllMocks()
+  prisma.$transaction.mockResolvedValue([])
+  prisma.$executeRaw.mockReturnValue('insert')
+  prisma.user.deleteMany.mockReturnValue('delete')
+})
+
+describe('ClerkUserQueue', () => {
+  it('writes concurrent deliveries in one transaction, newest change per user', async () => {
+    const queue = new ClerkUserQueue({ maxBatch: 10, maxDelayMs: 5 })
+
+    await Promise.all([
+      queue.push(upsert('user_a', 'old', 1)),
+      queue.push(upsert('user_a', 'new', 2)),
+      queue.push({ kind: 'delete', clerkId: 'user_b', occurredAt: 1 }),
+    ])
+
+    expect(prisma.$transaction).toHaveBeenCalledTimes(1)
+    expect(prisma.$transaction).toHaveBeenCalledWith(['insert', 'delete'])
+    expect(upsertedNames()).toEqual([['new']])
+    expect(prisma.user.deleteMany).toHaveBeenCalledWith({ where: { clerkId: { in: ['user_b'] } } })
+    expect(queue.stats()).toMatchObject({ batches: 1, written: 2, collapsed: 1, pending: 0 })
+  })
+
+  it('drops a late delivery older than what was already written', async () => {
+    const queue = new ClerkUserQueue({ maxBatch: 1 })
+
+    await queue.push({ kind: 'delete', clerkId: 'user_a', occurredAt: 10 })
+    await queue.push(upsert('user_a', 'resurrected', 5))
+
+    expect(upsertedNames()).toEqual([])
+    expect(queue.stats().stale).toBe(1)
+  })
+
+  it('falls back to per-change writes and only fails the offending delivery', async () => {
+    const queue = new ClerkUserQueue({ maxBatch: 2 })
+    prisma.$transaction.mockRejectedValueOnce(new Error('Unique constraint failed on email'))
+    prisma.user.upsert
+      .mockRejectedValueOnce(new Error('Unique constraint failed on email'))
+      .mockResolvedValueOnce({})
+
+    const results = await Promise.allSettled([
+      queue.push(upsert('user_a', 'a', 1)),
+      queue.push(upsert('user_b', 'b', 1)),
+    ])
+
+    expect(results.map((r) => r.status)).toEqual(['rejected', 'fulfilled'])
+    expect(queue.stats().fallbacks).toBe(1)
+  })
+})
@@ -1,13 +1,19 @@
+import statistics
+import time
+
 import requests
 
+import client
+
+PLANS_ENDPOINT = "/api/public/plans"
+LATENCY_SAMPLES = 10
+
 def test_get_public_plans_should_return_list_of_public_plans():
-    base_url = "http://localhost:3000"
-    url = f"{base_url}/api/public/plans"
     headers = {
         "Accept": "application/json"
     }
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        response = client.get("/api/public/plans", headers=headers)
         response.raise_for_status()
     except requests.RequestException as e:
         assert False, f"Request to GET /api/public/plans failed: {e}"
@@ -30,4 +36,48 @@ def test_get_public_plans_should_return_list_of_public_plans():
     assert isinstance(plans_list, list), "Plans is not a list"
 
 
-test_get_public_plans_should_return_list_of_public_plans()
\ No newline at end of file
+def _timed_get(headers):
+    started = time.perf_counter()
+    response = client.get(PLANS_ENDPOINT, headers=headers)
+    _ = response.content
+    return response, (time.perf_counter() - started) * 1000
+
+
+def test_get_public_plans_should_support_conditional_get():
+    response = client.get(PLANS_ENDPOINT, headers={"Accept": "application/json"})
+    assert response.status_code == 200, f"Expected 200 but got {response.status_code}"
+
+    etag = response.headers.get("ETag")
+    assert etag, "Response should carry an ETag"
+    assert not etag.startswith("W/"), f"Expected a strong ETag, got {etag}"
+    assert "max-age" in response.headers.get("Cache-Control", ""), "Response should carry Cache-Control"
+
+    # Unchanged plans: If-None-Match answers 304 with no body and the same validator
+    conditional, _ = _timed_get({"Accept": "application/json", "If-None-Match": etag})
+    assert conditional.status_code == 304, f"Expected 304 but got {conditional.status_code}"
+    assert conditional.headers.get("ETag") == etag, "304 should repeat the ETag"
+    assert not conditional.content, "304 must not carry a body"
+
+    # Weak form of the same validator also matches (weak comparison)
+    weak, _ = _timed_get({"Accept": "application/json", "If-None-Match": f"W/{etag}"})
+    assert weak.status_code == 304, f"Expected 304 for weak validator but got {weak.status_code}"
+
+    # A stale validator gets the full payload again
+    stale, _ = _timed_get({"Accept": "application/json", "If-None-Match": '"stale"'})
+    assert stale.status_code == 200, f"Expected 200 for stale ETag but got {stale.status_code}"
+    assert stale.headers.get("ETag") == etag, "Snapshot ETag should be stable between requests"
+
+    full_ms = [_timed_get({"Accept": "application/json"})[1] for _ in range(LATENCY_SAMPLES)]
+    cached_ms = [
+        _timed_get({"Accept": "application/json", "If-None-Match": etag})[1] for _ in range(LATENCY_SAMPLES)
+    ]
+    print(
+        f"{PLANS_ENDPOINT}: full 200 median {statistics.median(full_ms):.1f} ms, "
+        f"conditional 304 median {statistics.median(cached_ms):.1f} ms "
+        f"({len(response.content)} byte payload, {LATENCY_SAMPLES} samples each)"
+    )
+
+
+if __name__ == "__main__":
+    test_get_public_plans_should_return_list_of_public_plans()
+    test_get_public_plans_should_support_conditional_get()
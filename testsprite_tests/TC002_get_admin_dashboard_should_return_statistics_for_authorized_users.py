@@ -1,37 +1,28 @@
-import requests
+import client
+import config
 
-BASE_URL = "http://localhost:3000"
 ADMIN_DASHBOARD_ENDPOINT = "/api/admin/dashboard"
-TIMEOUT = 30
-
-# Placeholder token for an authenticated user with ADMIN role
-# Replace with a valid token for actual tests
-ADMIN_AUTH_TOKEN = "Bearer eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.ADMIN_ROLE_VALID_TOKEN"
 
 def test_get_admin_dashboard_should_return_statistics_for_authorized_users():
-    headers_auth = {
-        "Authorization": ADMIN_AUTH_TOKEN,
-        "Accept": "application/json"
-    }
+    # Admin token comes from the suite config (TESTSPRITE_ADMIN_TOKEN)
+    headers_auth = config.admin_headers()
 
     headers_no_auth = {
         "Accept": "application/json"
     }
     # Test unauthorized access returns 401
-    response_unauth = requests.get(
-        f"{BASE_URL}{ADMIN_DASHBOARD_ENDPOINT}",
+    response_unauth = client.get(
+        ADMIN_DASHBOARD_ENDPOINT,
         headers=headers_no_auth,
-        timeout=TIMEOUT
     )
     assert response_unauth.status_code == 401, (
         f"Expected status code 401 for unauthorized access, got {response_unauth.status_code}"
     )
 
     # Test authorized access returns 200 and dashboard stats
-    response_auth = requests.get(
-        f"{BASE_URL}{ADMIN_DASHBOARD_ENDPOINT}",
+    response_auth = client.get(
+        ADMIN_DASHBOARD_ENDPOINT,
         headers=headers_auth,
-        timeout=TIMEOUT
     )
     assert response_auth.status_code == 200, (
         f"Expected status code 200 for authorized access, got {response_auth.status_code}"
@@ -69,4 +60,5 @@ def test_get_admin_dashboard_should_return_statistics_for_authorized_users():
         assert "message" in feedback, "Each feedback should have a 'message'"
         assert "createdAt" in feedback, "Each feedback should have 'createdAt' timestamp"
 
-test_get_admin_dashboard_should_return_statistics_for_authorized_users()
\ No newline at end of file
+if __name__ == "__main__":
+    test_get_admin_dashboard_should_return_statistics_for_authorized_users()
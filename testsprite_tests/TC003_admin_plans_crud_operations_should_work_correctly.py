@@ -1,22 +1,17 @@
 import requests
 import uuid
 
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
+import client
+import config
 
-# Authentication token: replace with valid token for the admin user with proper permissions
-ADMIN_AUTH_TOKEN = "your_admin_auth_token_here"
+# Creates, updates and deletes a plan, which changes the public plans snapshot.
+EXCLUSIVE = True
 
-HEADERS = {
-    "Authorization": f"Bearer {ADMIN_AUTH_TOKEN}",
-    "Content-Type": "application/json",
-    "Accept": "application/json"
-}
-
-def admin_plans_crud_operations_should_work_correctly():
-    plan_id = None
+def test_admin_plans_crud_operations_should_work_correctly():
+    # Authentication token for the admin user comes from the suite config
+    HEADERS = config.admin_headers(**{"Content-Type": "application/json"})
     created_plan_id = None
-    url_plans = f"{BASE_URL}/api/admin/plans"
+    url_plans = "/api/admin/plans"
 
     # Sample new plan data for creation
     new_plan_data = {
@@ -44,21 +39,21 @@ def admin_plans_crud_operations_should_work_correctly():
 
     try:
         # 1. Create a new plan via POST
-        resp_create = requests.post(url_plans, json=new_plan_data, headers=HEADERS, timeout=TIMEOUT)
+        resp_create = client.post(url_plans, json=new_plan_data, headers=HEADERS)
         assert resp_create.status_code == 201 or resp_create.status_code == 200, f"Create plan failed with status {resp_create.status_code}"
         create_json = resp_create.json()
         assert "id" in create_json, "Response missing 'id' in create plan"
         created_plan_id = create_json["id"]
 
         # 2. Retrieve the list of all plans via GET, confirm created plan exists
-        resp_list = requests.get(url_plans, headers=HEADERS, timeout=TIMEOUT)
+        resp_list = client.get(url_plans, headers=HEADERS)
         assert resp_list.status_code == 200, f"List plans failed with status {resp_list.status_code}"
         plans_list = resp_list.json()
         assert any(p.get("id") == created_plan_id for p in plans_list), "Created plan not found in plans list"
 
         # 3. Update the created plan via PUT
         url_plan_id = f"{url_plans}/{created_plan_id}"
-        resp_update = requests.put(url_plan_id, json=updated_plan_data, headers=HEADERS, timeout=TIMEOUT)
+        resp_update = client.put(url_plan_id, json=updated_plan_data, headers=HEADERS)
         assert resp_update.status_code == 200, f"Update plan failed with status {resp_update.status_code}"
         updated_json = resp_update.json()
         # Check updated values
@@ -69,11 +64,11 @@ def admin_plans_crud_operations_should_work_correctly():
         assert updated_json.get("active") == updated_plan_data["active"], "Plan active flag not updated correctly"
 
         # 4. Delete the created plan via DELETE
-        resp_delete = requests.delete(url_plan_id, headers=HEADERS, timeout=TIMEOUT)
+        resp_delete = client.delete(url_plan_id, headers=HEADERS)
         assert resp_delete.status_code == 204 or resp_delete.status_code == 200, f"Delete plan failed with status {resp_delete.status_code}"
 
         # 5. Verify the plan was deleted: GET the list and confirm absence
-        resp_list_after_delete = requests.get(url_plans, headers=HEADERS, timeout=TIMEOUT)
+        resp_list_after_delete = client.get(url_plans, headers=HEADERS)
         assert resp_list_after_delete.status_code == 200, f"List plans after delete failed with status {resp_list_after_delete.status_code}"
         plans_list_after_delete = resp_list_after_delete.json()
         assert all(p.get("id") != created_plan_id for p in plans_list_after_delete), "Deleted plan still present in plans list"
@@ -85,10 +80,11 @@ def admin_plans_crud_operations_should_work_correctly():
         # If the created plan still exists during a failure, attempt to delete to clean up
         if created_plan_id:
             try:
-                requests.delete(f"{url_plans}/{created_plan_id}", headers=HEADERS, timeout=TIMEOUT)
+                client.delete(f"{url_plans}/{created_plan_id}", headers=HEADERS)
             except Exception:
                 pass
         raise
 
-# call the test function
-admin_plans_crud_operations_should_work_correctly()
+if __name__ == "__main__":
+    test_admin_plans_crud_operations_should_work_correctly()
+
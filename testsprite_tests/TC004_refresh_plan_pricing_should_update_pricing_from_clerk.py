@@ -1,39 +1,27 @@
-import requests
+import config
+import jobs
 
-BASE_URL = "http://localhost:3000"
-REFRESH_PRICING_ENDPOINT = "/api/admin/plans/refresh-pricing"
-TIMEOUT = 30
+# Rewrites plan prices, which changes the public plans snapshot.
+EXCLUSIVE = True
 
-# This token should be an authenticated admin user's Clerk token
-# Replace the value below with a valid token for actual testing
-ADMIN_AUTH_TOKEN = "Bearer YOUR_ADMIN_AUTH_TOKEN"
+REFRESH_PRICING_ENDPOINT = "/api/admin/plans/refresh-pricing"
 
 def test_refresh_plan_pricing_should_update_pricing_from_clerk():
-    url = BASE_URL + REFRESH_PRICING_ENDPOINT
-    headers = {
-        "Authorization": ADMIN_AUTH_TOKEN,
-        "Content-Type": "application/json",
-        "Accept": "application/json"
-    }
-
-    try:
-        response = requests.post(url, headers=headers, timeout=TIMEOUT)
-    except requests.RequestException as e:
-        assert False, f"Request to refresh plan pricing failed with exception: {e}"
+    # The admin user's Clerk token comes from the suite config
+    headers = config.admin_headers(**{"Content-Type": "application/json"})
 
-    # The API should return success status for authenticated admin users
-    assert response.status_code == 200, (
-        f"Expected status code 200, got {response.status_code}. Response text: {response.text}"
-    )
+    # The refresh is queued as a background job: 202 with a job id, or 409
+    # with the id of the refresh that is already running
+    job_id = jobs.start(REFRESH_PRICING_ENDPOINT, headers)
 
-    # Optional: Further validate response content if known, e.g. JSON success flag
-    try:
-        json_data = response.json()
-    except ValueError:
-        assert False, "Response is not valid JSON"
+    job = jobs.wait(job_id, headers)
+    assert job["status"] == "succeeded", f"Pricing refresh job failed: {job.get('error')}"
+    for key in ("processed", "updated", "throughputPerSecond"):
+        assert key in job, f"Job status missing '{key}'"
 
-    # Assuming the response includes success indication (e.g., a 'success' boolean or similar)
-    assert "success" in json_data, "Response JSON does not contain 'success' field"
-    assert json_data["success"] is True, f"Expected 'success' to be True, got {json_data['success']}"
+    result = job["result"]
+    assert isinstance(result, dict), "Finished job should carry the refresh result"
+    assert result.get("success") is True, f"Expected 'success' to be True, got {result.get('success')}"
 
-test_refresh_plan_pricing_should_update_pricing_from_clerk()
+if __name__ == "__main__":
+    test_refresh_plan_pricing_should_update_pricing_from_clerk()
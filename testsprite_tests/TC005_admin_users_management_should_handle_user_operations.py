@@ -1,52 +1,101 @@
-import requests
 import uuid
 
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
+import client
+import config
+import jobs
 
-# Replace with valid admin Bearer token from Clerk authentication
-AUTH_TOKEN = "Bearer YOUR_ADMIN_AUTH_TOKEN"
+# Invites and deletes users, which the user and dashboard listings count.
+EXCLUSIVE = True
 
-HEADERS = {
-    "Authorization": AUTH_TOKEN,
-    "Content-Type": "application/json",
-    "Accept": "application/json",
-}
-
-def admin_users_management_should_handle_user_operations():
-    created_user_id = None
+def test_admin_users_management_should_handle_user_operations():
+    # Admin Bearer token from Clerk authentication comes from the suite config
+    HEADERS = config.admin_headers(**{"Content-Type": "application/json"})
     invited_user_email = f"testuser_{uuid.uuid4().hex[:8]}@example.com"
     invited_user_id = None
 
     try:
-        # 1. List users GET /api/admin/users
-        resp = requests.get(f"{BASE_URL}/api/admin/users", headers=HEADERS, timeout=TIMEOUT)
-        assert resp.status_code == 200, f"List users failed: {resp.text}"
-        users_list = resp.json()
-        assert isinstance(users_list, list), "Users list should be an array"
+        # 1. List users GET /api/admin/users, walking every page by cursor
+        users_list = []
+        seen_ids = set()
+        cursor = None
+        pages = 0
+        while True:
+            path = "/api/admin/users?pageSize=2" + (f"&cursor={cursor}" if cursor else "")
+            resp = client.get(path, headers=HEADERS)
+            assert resp.status_code == 200, f"List users failed: {resp.text}"
+            page = resp.json()
+            assert isinstance(page.get("users"), list), "Users page should carry a users array"
+            assert len(page["users"]) <= 2, "pageSize was not honoured"
+            if pages == 0:
+                assert isinstance(page.get("totalEstimate"), int), "First page should report a total estimate"
+            for u in page["users"]:
+                assert u["id"] not in seen_ids, f"User {u['id']} returned on more than one page"
+                seen_ids.add(u["id"])
+            users_list.extend(page["users"])
+            pages += 1
+            cursor = page["pageInfo"]["nextCursor"]
+            assert bool(cursor) == page["pageInfo"]["hasMore"], "nextCursor and hasMore disagree"
+            if not cursor or pages >= 50:
+                break
+        created = [u["createdAt"] for u in users_list]
+        assert created == sorted(created, reverse=True), "Users should be ordered newest first across pages"
+
+        resp = client.get("/api/admin/users?cursor=not-a-cursor", headers=HEADERS)
+        assert resp.status_code == 400, "A malformed cursor should be rejected"
+
+        # 1b. Filters run server-side
+        resp = client.get("/api/admin/users?isActive=true&pageSize=200", headers=HEADERS)
+        assert resp.status_code == 200, f"Filtered list failed: {resp.text}"
+        filtered = resp.json()
+        assert filtered["totalExact"] is True, "Filtered first page should carry an exact count"
+        assert all(u["isActive"] for u in filtered["users"]), "isActive filter not applied"
+        email = next((u["email"] for u in users_list if u.get("email")), None)
+        if email:
+            # A prefix, then a case-flipped fragment from the middle of the address
+            local = email.split("@")[0]
+            terms = [email[:4]] + ([local[1:].upper()] if len(local) > 3 else [])
+            for term in terms:
+                resp = client.get("/api/admin/users", headers=HEADERS, params={"search": term, "pageSize": 200})
+                assert resp.status_code == 200, f"Search failed: {resp.text}"
+                assert any(u["email"] == email for u in resp.json()["users"]), f"Search for {term!r} missed the user"
 
         # 2. Invite new user POST /api/admin/users/invite
         invite_payload = {
             "email": invited_user_email,
             "permissionLevel": "USER"
         }
-        resp = requests.post(f"{BASE_URL}/api/admin/users/invite", headers=HEADERS, json=invite_payload, timeout=TIMEOUT)
+        resp = client.post("/api/admin/users/invite", headers=HEADERS, json=invite_payload)
         assert resp.status_code == 200 or resp.status_code == 201, f"Invite user failed: {resp.text}"
         invited_response = resp.json()
         invited_user_id = invited_response.get("id")
         assert invited_user_id, "Invited user id should be present"
 
-        # 3. Sync users with Clerk POST /api/admin/users/sync
-        resp = requests.post(f"{BASE_URL}/api/admin/users/sync", headers=HEADERS, timeout=TIMEOUT)
-        assert resp.status_code == 200, f"Sync users failed: {resp.text}"
-        sync_resp = resp.json()
-        assert isinstance(sync_resp, dict), "Sync response should be a dict"
+        # 3. Sync users with Clerk POST /api/admin/users/sync (background job)
+        job_id = jobs.start("/api/admin/users/sync", HEADERS)
+        job = jobs.wait(job_id, HEADERS)
+        assert job["status"] == "succeeded", f"Sync users failed: {job.get('error')}"
+        for key in ("processed", "created", "updated", "throughputPerSecond"):
+            assert key in job, f"Sync job status missing '{key}'"
+        sync_resp = job["result"]
+        assert isinstance(sync_resp, dict), "Sync result should be a dict"
+        assert isinstance(sync_resp.get("pages"), list), "Sync result should report per-page timings"
+
+        # 3b. A bounded sync hands back a cursor that resumes where it stopped
+        job = jobs.wait(jobs.start("/api/admin/users/sync", HEADERS, json={"pageSize": 1, "maxPages": 1}), HEADERS)
+        assert job["status"] == "succeeded", f"Bounded sync failed: {job.get('error')}"
+        partial = job["result"]
+        assert len(partial["pages"]) <= 1, "maxPages should bound the number of pages"
+        if partial.get("nextCursor"):
+            body = {"pageSize": 1, "maxPages": 1, "cursor": partial["nextCursor"]}
+            job = jobs.wait(jobs.start("/api/admin/users/sync", HEADERS, json=body), HEADERS)
+            assert job["status"] == "succeeded", f"Resumed sync failed: {job.get('error')}"
+            assert job["result"]["pages"][0]["offset"] == int(partial["nextCursor"]), "Sync did not resume at the cursor"
 
         # 4. Get user details GET /api/admin/users/{id}
         # Use an existing user id from users list or fallback to invited user id
         target_user_id = users_list[0].get("id") if users_list else invited_user_id
         assert target_user_id, "No user available for detail fetch"
-        resp = requests.get(f"{BASE_URL}/api/admin/users/{target_user_id}", headers=HEADERS, timeout=TIMEOUT)
+        resp = client.get(f"/api/admin/users/{target_user_id}", headers=HEADERS)
         assert resp.status_code == 200, f"Get user details failed: {resp.text}"
         user_details = resp.json()
 
@@ -61,20 +110,21 @@ def admin_users_management_should_handle_user_operations():
             update_payload = {}
 
         if update_payload:
-            resp = requests.patch(f"{BASE_URL}/api/admin/users/{target_user_id}", headers=HEADERS, json=update_payload, timeout=TIMEOUT)
+            resp = client.patch(f"/api/admin/users/{target_user_id}", headers=HEADERS, json=update_payload)
             assert resp.status_code == 200, f"Update user failed: {resp.text}"
             updated_user = resp.json()
             for k, v in update_payload.items():
                 assert updated_user.get(k) == v, f"User {k} not updated"
 
         # 6. Activate user POST /api/admin/users/{id}/activate
-        resp = requests.post(f"{BASE_URL}/api/admin/users/{target_user_id}/activate", headers=HEADERS, timeout=TIMEOUT)
+        resp = client.post(f"/api/admin/users/{target_user_id}/activate", headers=HEADERS)
         # Activation may succeed (200) or be idempotent; accept 200 or 204
         assert resp.status_code in (200, 204), f"Activate user failed: {resp.text}"
 
     finally:
         # Clean up: delete invited user if created
         if invited_user_id:
-            requests.delete(f"{BASE_URL}/api/admin/users/{invited_user_id}", headers=HEADERS, timeout=TIMEOUT)
+            client.delete(f"/api/admin/users/{invited_user_id}", headers=HEADERS)
 
-admin_users_management_should_handle_user_operations()
\ No newline at end of file
+if __name__ == "__main__":
+    test_admin_users_management_should_handle_user_operations()
@@ -1,60 +1,80 @@
-import requests
+import client
+import config
 
-BASE_URL = "http://localhost:3000"
-API_PATH = "/api/admin/settings"
-FULL_URL = BASE_URL + API_PATH
-TIMEOUT = 30
+# Updates the shared settings other scenarios read.
+EXCLUSIVE = True
 
-# Replace this with a valid admin auth token for Clerk authentication
-ADMIN_AUTH_TOKEN = "YOUR_ADMIN_AUTH_TOKEN"
+API_PATH = "/api/admin/settings"
 
-headers = {
-    "Authorization": f"Bearer {ADMIN_AUTH_TOKEN}",
-    "Content-Type": "application/json",
-    "Accept": "application/json"
-}
+def test_admin_settings_should_get_and_update_settings():
+    # Admin auth token for Clerk authentication comes from the suite config
+    headers = config.admin_headers(**{"Content-Type": "application/json"})
 
-def admin_settings_should_get_and_update_settings():
-    # Step 1: GET current settings
-    response_get = requests.get(FULL_URL, headers=headers, timeout=TIMEOUT)
+    # Step 1: GET current settings; the ETag carries the settings version
+    response_get = client.get(API_PATH, headers=headers)
     assert response_get.status_code == 200, f"GET /api/admin/settings failed with status {response_get.status_code}"
     try:
         settings = response_get.json()
     except Exception:
         assert False, "GET /api/admin/settings did not return valid JSON"
 
-    # Validate key exists in settings object, could be empty or contain keys
     assert isinstance(settings, dict), "Settings response is not a JSON object"
+    for key in ("featureCosts", "planCredits"):
+        assert isinstance(settings.get(key), dict), f"Settings missing '{key}' map"
+    version = settings.get("version")
+    assert isinstance(version, int), "Settings should report their version"
+    etag = response_get.headers.get("ETag")
+    assert etag == f'"{version}"', f"ETag {etag!r} does not match version {version}"
 
-    # Prepare update payload: Toggle or add a test property "testUpdateFlag"
-    # If property exists and is a boolean, toggle it, else set to True
-    test_flag = settings.get("testUpdateFlag", False)
-    new_flag_value = not test_flag if isinstance(test_flag, bool) else True
+    # Prepare update payload: bump the chat cost so the change is observable
+    feature_costs = dict(settings["featureCosts"])
+    feature_costs["ai_text_chat"] = feature_costs.get("ai_text_chat", 1) + 1
+    updated_settings = {"featureCosts": feature_costs, "planCredits": settings["planCredits"]}
 
-    updated_settings = dict(settings)
-    updated_settings["testUpdateFlag"] = new_flag_value
+    # Step 2: a PUT without If-Match is refused rather than risking a lost update
+    response_unconditional = client.put(API_PATH, headers=headers, json=updated_settings)
+    assert response_unconditional.status_code == 428, (
+        f"PUT without If-Match should return 428, got {response_unconditional.status_code}"
+    )
 
-    # Step 2: PUT update settings
-    response_put = requests.put(FULL_URL, headers=headers, json=updated_settings, timeout=TIMEOUT)
+    # Step 3: conditional PUT against the version just read
+    response_put = client.put(API_PATH, headers={**headers, "If-Match": etag}, json=updated_settings)
     assert response_put.status_code == 200, f"PUT /api/admin/settings failed with status {response_put.status_code}"
     try:
         updated_response = response_put.json()
     except Exception:
         assert False, "PUT /api/admin/settings did not return valid JSON"
 
-    # Validate the updated value matches what was sent
     assert isinstance(updated_response, dict), "Updated settings response is not a JSON object"
-    assert updated_response.get("testUpdateFlag") == new_flag_value, "Updated setting value does not match expected"
+    assert updated_response.get("featureCosts") == feature_costs, "Updated setting value does not match expected"
+    new_version = updated_response.get("version")
+    assert new_version == version + 1, f"Version should advance to {version + 1}, got {new_version}"
+    assert response_put.headers.get("ETag") == f'"{new_version}"', "PUT should return the new ETag"
 
-    # Step 3: GET settings again to verify update persisted
-    response_get_after = requests.get(FULL_URL, headers=headers, timeout=TIMEOUT)
+    # Step 4: GET settings again to verify update persisted
+    response_get_after = client.get(API_PATH, headers=headers)
     assert response_get_after.status_code == 200, f"GET after update failed with status {response_get_after.status_code}"
     try:
         settings_after = response_get_after.json()
     except Exception:
         assert False, "GET after update did not return valid JSON"
 
-    assert settings_after.get("testUpdateFlag") == new_flag_value, "Persisted setting value does not match updated value"
+    assert settings_after.get("featureCosts") == feature_costs, "Persisted setting value does not match updated value"
+    assert settings_after.get("version") == new_version, "Persisted version does not match the PUT response"
+
+    # Step 5: writing again with the stale ETag must not overwrite the newer version
+    response_stale = client.put(API_PATH, headers={**headers, "If-Match": etag}, json=settings)
+    assert response_stale.status_code == 412, f"Stale If-Match should return 412, got {response_stale.status_code}"
+    assert response_stale.json().get("featureCosts") == feature_costs, "412 should carry the current settings"
+
+    # Restore the original costs so reruns start from the same values
+    response_restore = client.put(
+        API_PATH,
+        headers={**headers, "If-Match": f'"{new_version}"'},
+        json={"featureCosts": settings["featureCosts"], "planCredits": settings["planCredits"]},
+    )
+    assert response_restore.status_code == 200, f"Restoring settings failed with status {response_restore.status_code}"
 
 
-admin_settings_should_get_and_update_settings()
+if __name__ == "__main__":
+    test_admin_settings_should_get_and_update_settings()
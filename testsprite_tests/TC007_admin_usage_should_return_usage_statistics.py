@@ -1,22 +1,18 @@
 import requests
 
-BASE_URL = "http://localhost:3000"
-ADMIN_USAGE_ENDPOINT = "/api/admin/usage"
-TIMEOUT = 30
+import client
+import config
 
-# Replace this with a valid token for an authenticated admin user.
-ADMIN_AUTH_TOKEN = "REPLACE_WITH_VALID_ADMIN_JWT_TOKEN_OR_BEARER_TOKEN"
+ADMIN_USAGE_ENDPOINT = "/api/admin/usage"
 
 def test_admin_usage_should_return_usage_statistics():
-    headers = {
-        "Authorization": f"Bearer {ADMIN_AUTH_TOKEN}",
-        "Accept": "application/json"
-    }
-    url = BASE_URL + ADMIN_USAGE_ENDPOINT
+    # Token for an authenticated admin user comes from the suite config
+    headers = config.admin_headers()
+    url = ADMIN_USAGE_ENDPOINT
 
     # Test successful access by authenticated admin user
     try:
-        response = requests.get(url, headers=headers, timeout=TIMEOUT)
+        response = client.get(url, headers=headers)
     except requests.RequestException as e:
         assert False, f"Request to {url} failed with exception: {e}"
 
@@ -31,24 +27,60 @@ def test_admin_usage_should_return_usage_statistics():
     expected_keys = ["usageStatistics", "analytics", "metrics"]
     assert any(key in data for key in expected_keys), f"Response JSON does not contain any expected keys: {expected_keys}"
 
+    # Aggregates are computed server-side over the whole filtered range
+    analytics = data["analytics"]
+    assert isinstance(data["data"], list), "Usage rows should be a list"
+    assert analytics["totalOperations"] == data["total"], "total should match the aggregate operation count"
+    by_operation = analytics["byOperation"]
+    assert sum(op["credits"] for op in by_operation) == analytics["totalCredits"], "Per-operation credits should add up"
+    assert sum(op["operations"] for op in by_operation) == analytics["totalOperations"], "Per-operation counts should add up"
+    series = analytics["buckets"]["series"]
+    assert analytics["buckets"]["granularity"] == "day", "A 7-day range should bucket by day"
+    assert sum(point["operations"] for point in series) == analytics["totalOperations"], "Buckets should cover every row"
+
+    resp = client.get(url, headers=headers, params={"range": "24hours"})
+    assert resp.status_code == 200, f"24h range failed: {resp.text}"
+    assert resp.json()["analytics"]["buckets"]["granularity"] == "hour", "A 24h range should bucket by hour"
+
+    # Walk the 30-day range by cursor; rows must not repeat and must stay ordered
+    seen = set()
+    timestamps = []
+    cursor = None
+    for _ in range(50):
+        params = {"range": "30days", "pageSize": 10}
+        if cursor:
+            params["cursor"] = cursor
+        resp = client.get(url, headers=headers, params=params)
+        assert resp.status_code == 200, f"Usage page failed: {resp.text}"
+        page = resp.json()
+        for row in page["data"]:
+            assert row["id"] not in seen, f"Usage row {row['id']} returned twice"
+            seen.add(row["id"])
+            timestamps.append(row["timestamp"])
+        cursor = page["nextCursor"]
+        if not cursor:
+            break
+    assert timestamps == sorted(timestamps, reverse=True), "Usage rows should be newest first across pages"
+
+    for bad in ({"cursor": "not-a-cursor"}, {"startDate": "yesterday"}, {"bucket": "week"}):
+        resp = client.get(url, headers=headers, params=bad)
+        assert resp.status_code == 400, f"Expected 400 for {bad}, got {resp.status_code}"
+
     # Test access denied for unauthenticated user (no auth header)
     try:
-        resp_no_auth = requests.get(url, timeout=TIMEOUT)
+        resp_no_auth = client.get(url)
     except requests.RequestException as e:
         assert False, f"Request without auth to {url} failed with exception: {e}"
 
     assert resp_no_auth.status_code in (401, 403), f"Expected 401 or 403 without auth, got {resp_no_auth.status_code}"
 
     # Test access denied for authenticated non-admin user
-    NON_ADMIN_AUTH_TOKEN = "REPLACE_WITH_VALID_NON_ADMIN_JWT_TOKEN_OR_BEARER_TOKEN"
-    headers_non_admin = {
-        "Authorization": f"Bearer {NON_ADMIN_AUTH_TOKEN}",
-        "Accept": "application/json"
-    }
+    headers_non_admin = config.non_admin_headers()
     try:
-        resp_non_admin = requests.get(url, headers=headers_non_admin, timeout=TIMEOUT)
+        resp_non_admin = client.get(url, headers=headers_non_admin)
     except requests.RequestException as e:
         assert False, f"Request with non-admin auth to {url} failed with exception: {e}"
     assert resp_non_admin.status_code in (401, 403), f"Expected 401 or 403 for non-admin user, got {resp_non_admin.status_code}"
 
-test_admin_usage_should_return_usage_statistics()
+if __name__ == "__main__":
+    test_admin_usage_should_return_usage_statistics()
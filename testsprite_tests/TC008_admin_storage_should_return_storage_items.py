@@ -1,31 +1,125 @@
-import requests
+import json
+
+import client
+import config
 
-BASE_URL = "http://localhost:3000"
 ADMIN_STORAGE_ENDPOINT = "/api/admin/storage"
-TIMEOUT = 30
+PAGE_SIZE = 2
+# Stop walking big inventories after this many pages; totals are then only
+# checked for consistency, not against the walk.
+MAX_PAGES = 100
 
-# Provide a valid admin authentication token here
-ADMIN_AUTH_TOKEN = "your_admin_auth_token_here"  
 
-def admin_storage_should_return_storage_items():
-    headers = {
-        "Authorization": f"Bearer {ADMIN_AUTH_TOKEN}",
-        "Accept": "application/json"
-    }
-    url = f"{BASE_URL}{ADMIN_STORAGE_ENDPOINT}"
+def _sort_key(item):
+    return item["createdAt"], item["id"]
+
+
+def walk(headers, params):
+    """Follows nextCursor page by page; returns (first page, items, complete)."""
+    first = None
+    items = []
+    cursor = None
+    for _ in range(MAX_PAGES):
+        query = dict(params, limit=PAGE_SIZE, **({"cursor": cursor} if cursor else {}))
+        resp = client.get(ADMIN_STORAGE_ENDPOINT, headers=headers, params=query)
+        assert resp.status_code == 200, f"Expected 200, got {resp.status_code} {resp.text}"
+        page = resp.json()
+
+        assert len(page["items"]) <= PAGE_SIZE, "Page is larger than the requested limit"
+        assert page["pageInfo"]["hasMore"] == bool(page["nextCursor"]), "hasMore disagrees with nextCursor"
+        if first is None:
+            first = page
+            assert "stats" in page, "First page should carry the totals"
+        else:
+            assert "stats" not in page, "Continuation pages should skip the totals"
+
+        items.extend(page["items"])
+        cursor = page["nextCursor"]
+        if not cursor:
+            return first, items, True
+    return first, items, False
+
+
+def stream(headers, params):
+    resp = client.get(
+        ADMIN_STORAGE_ENDPOINT,
+        headers=dict(headers, Accept="application/x-ndjson"),
+        params=params,
+        stream=True,
+    )
+    assert resp.status_code == 200, f"Expected 200 for the NDJSON stream, got {resp.status_code}"
+    assert resp.headers["Content-Type"].startswith("application/x-ndjson"), "Stream should be NDJSON"
+    return [json.loads(line) for line in resp.iter_lines() if line]
 
-    # Test authorized access (authenticated admin user)
-    response = requests.get(url, headers=headers, timeout=TIMEOUT)
-    assert response.status_code == 200, f"Expected status 200, got {response.status_code}"
-    json_data = response.json()
-    assert isinstance(json_data, (list, dict)), "Response JSON should be a list or dict representing storage items"
-    # Optional: More specific assertions can be added here if schema is known
+
+def test_admin_storage_should_return_storage_items():
+    headers = config.admin_headers()
+
+    # Multi-page walk: no duplicates, newest first, cursor chain ends cleanly
+    first, items, complete = walk(headers, {})
+    ids = [item["id"] for item in items]
+    assert len(ids) == len(set(ids)), "An object appeared on two pages"
+    keys = [_sort_key(item) for item in items]
+    assert keys == sorted(keys, reverse=True), "Items are not ordered newest first"
+
+    # Aggregates come from one grouped query: totals cover the per-user rows
+    stats = first["stats"]
+    totals = stats["totals"]
+    by_user = stats["byUser"]
+    assert sum(u["objects"] for u in by_user) <= totals["objects"], "Per-user counts exceed the total"
+    assert sum(u["bytes"] for u in by_user) <= totals["bytes"], "Per-user bytes exceed the total"
+    if totals["users"] == len(by_user):
+        assert sum(u["objects"] for u in by_user) == totals["objects"], "Per-user counts do not add up"
+        assert sum(u["bytes"] for u in by_user) == totals["bytes"], "Per-user bytes do not add up"
+    if complete:
+        assert totals["objects"] == len(items), f"Totals report {totals['objects']} objects, walked {len(items)}"
+        assert totals["bytes"] == sum(item["size"] for item in items), "Total bytes differ from the walked sizes"
+        assert totals["users"] == len({item["user"]["clerkId"] for item in items}), "User count differs from the walk"
+
+    # The NDJSON stream returns the same rows in the same order
+    lines = stream(headers, {"limit": len(items) or 1})
+    assert lines[0]["type"] == "stats", "Stream should open with the totals"
+    assert lines[0]["totals"] == totals, "Streamed totals differ from the JSON ones"
+    assert lines[-1]["type"] == "end", "Stream should close with an end line"
+    streamed = [line["id"] for line in lines if line["type"] == "item"]
+    assert streamed == ids[:len(streamed)], "Streamed objects differ from the paged walk"
+    assert lines[-1]["count"] == len(streamed), "End line count is wrong"
+    if complete:
+        assert len(streamed) == len(ids), "Stream returned a different number of objects"
+
+    # Filtering by user happens in the database and scopes the totals too
+    if by_user:
+        top = by_user[0]
+        scoped, scoped_items, scoped_complete = walk(headers, {"clerkUserId": top["clerkUserId"]})
+        assert scoped["stats"]["totals"]["objects"] == top["objects"], "Filtered total differs from the user's row"
+        assert scoped["stats"]["totals"]["bytes"] == top["bytes"], "Filtered bytes differ from the user's row"
+        assert all(i["user"]["clerkId"] == top["clerkUserId"] for i in scoped_items), "Filter leaked other users"
+        if scoped_complete:
+            assert len(scoped_items) == top["objects"], "Filtered walk differs from the user's object count"
+
+    # An empty date range matches nothing
+    resp = client.get(
+        ADMIN_STORAGE_ENDPOINT,
+        headers=headers,
+        params={"startDate": "2000-01-01", "endDate": "2000-01-02"},
+    )
+    assert resp.status_code == 200, f"Expected 200 for a date range, got {resp.status_code}"
+    assert resp.json()["items"] == [], "Objects returned outside the date range"
+    assert resp.json()["stats"]["totals"]["objects"] == 0, "Totals ignore the date range"
+
+    # Bad input
+    resp = client.get(ADMIN_STORAGE_ENDPOINT, headers=headers, params={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400, f"Expected 400 for a malformed cursor, got {resp.status_code}"
+    resp = client.get(ADMIN_STORAGE_ENDPOINT, headers=headers, params={"startDate": "yesterday"})
+    assert resp.status_code == 400, f"Expected 400 for a malformed date, got {resp.status_code}"
 
     # Test unauthorized access (no or invalid token)
     unauthorized_headers = {
         "Accept": "application/json"
     }
-    response_unauth = requests.get(url, headers=unauthorized_headers, timeout=TIMEOUT)
-    assert response_unauth.status_code in [401,403], f"Expected 401/403 for unauthorized access, got {response_unauth.status_code}"
+    response_unauth = client.get(ADMIN_STORAGE_ENDPOINT, headers=unauthorized_headers)
+    assert response_unauth.status_code in [401, 403], f"Expected 401/403 for unauthorized access, got {response_unauth.status_code}"
+
 
-admin_storage_should_return_storage_items()
+if __name__ == "__main__":
+    test_admin_storage_should_return_storage_items()
@@ -1,23 +1,17 @@
 import requests
 
-BASE_URL = "http://localhost:3000"
-API_PATH = "/api/admin/clerk/plans"
-TIMEOUT = 30
+import client
+import config
 
-# NOTE: Replace 'YOUR_AUTH_TOKEN' below with a valid Clerk admin user token for authentication.
-AUTH_TOKEN = "YOUR_AUTH_TOKEN"
+API_PATH = "/api/admin/clerk/plans"
 
 
 def test_clerk_plans_should_return_subscription_plans():
-    headers = {
-        "Authorization": f"Bearer {AUTH_TOKEN}",
-        "Accept": "application/json",
-    }
-
-    url = f"{BASE_URL}{API_PATH}"
+    # NOTE: the Clerk admin user token comes from the suite config (TESTSPRITE_ADMIN_TOKEN).
+    headers = config.admin_headers()
 
     try:
-        response = requests.get(url, headers=headers, timeout=TIMEOUT)
+        response = client.get(API_PATH, headers=headers)
     except requests.RequestException as e:
         assert False, f"Request failed: {e}"
 
@@ -43,4 +37,5 @@ def test_clerk_plans_should_return_subscription_plans():
     # No cleanup needed as this is a GET read operation
 
 
-test_clerk_plans_should_return_subscription_plans()
+if __name__ == "__main__":
+    test_clerk_plans_should_return_subscription_plans()
@@ -1,64 +1,75 @@
+import uuid
+
 import requests
 
-BASE_URL = "http://localhost:3000"
-WEBHOOK_ENDPOINT = f"{BASE_URL}/api/webhooks/clerk"
-TIMEOUT = 30
-HEADERS = {"Content-Type": "application/json"}
+import client
+import config
+import webhooks
+
+# Replays user webhooks, which create and delete users.
+EXCLUSIVE = True
+
+WEBHOOK_ENDPOINT = webhooks.WEBHOOK_ENDPOINT
+REPLAY_EVENTS = 300
+
 
 def test_clerk_webhook_should_handle_authentication_events():
-    # Define valid payloads for user creation, update, and deletion events.
+    secret = config.get("webhookSecret")
+    assert secret, "Set webhookSecret (or CLERK_WEBHOOK_SECRET) to the app's Clerk webhook secret"
+
+    user_id = f"user_tc010_{uuid.uuid4().hex[:10]}"
+    email = f"{user_id}@example.com"
+
+    # Deliveries for one user; user.created is sent twice (different svix ids)
+    # to check it upserts instead of failing on the existing clerkId.
     events = [
-        {
-            "type": "user.created",
-            "data": {
-                "id": "user_123",
-                "email_addresses": ["testuser_create@example.com"],
-                "first_name": "Test",
-                "last_name": "Create"
-            }
-        },
-        {
-            "type": "user.updated",
-            "data": {
-                "id": "user_123",
-                "email_addresses": ["testuser_update@example.com"],
-                "first_name": "TestUpdated",
-                "last_name": "Update"
-            }
-        },
-        {
-            "type": "user.deleted",
-            "data": {
-                "id": "user_123"
-            }
-        }
+        webhooks.user_event("user.created", user_id, email=email, first_name="Test", last_name="Create"),
+        webhooks.user_event("user.created", user_id, email=email, first_name="Test", last_name="Create"),
+        webhooks.user_event("user.updated", user_id, email=email, first_name="TestUpdated", last_name="Update"),
+        webhooks.user_event("user.deleted", user_id),
     ]
 
     for event in events:
         try:
-            response = requests.post(
-                WEBHOOK_ENDPOINT,
-                json=event,
-                headers=HEADERS,
-                timeout=TIMEOUT,
-            )
+            response = webhooks.post(event, secret)
         except requests.RequestException as e:
             assert False, f"Request failed: {e}"
 
-        # The expected behavior is a 200 status for successful handling of the event
-        assert response.status_code == 200, f"Unexpected status code: {response.status_code} for event type {event['type']}"
-
-        # The response content may be empty or contain some acknowledgement; accept 2xx and JSON or empty response
-        content_type = response.headers.get("Content-Type", "")
-        if content_type.startswith("application/json"):
-            try:
-                json_resp = response.json()
-                # Optionally check for presence of keys if known, else just confirm it's a dict
-                assert isinstance(json_resp, dict), "Response JSON is not a dictionary"
-            except ValueError:
-                assert False, "Response indicated JSON but failed to parse"
-        else:
-            # Allow empty or no content
-            assert response.text.strip() == "" or response.text, "Unexpected non-JSON non-empty response"
-
-test_clerk_webhook_should_handle_authentication_events()
+        assert response.status_code == 200, (
+            f"Unexpected status code: {response.status_code} for event type {event['type']}: {response.text}"
+        )
+        assert response.json().get("duplicate") is False, "A fresh svix id was treated as a duplicate"
+
+    # A retried delivery (same svix id) is acknowledged without reprocessing
+    event = webhooks.user_event("user.updated", user_id, email=email, first_name="Retry")
+    msg_id = f"msg_tc010_{uuid.uuid4().hex}"
+    first = webhooks.post(event, secret, msg_id=msg_id)
+    again = webhooks.post(event, secret, msg_id=msg_id)
+    assert first.status_code == 200 and again.status_code == 200, "Retried delivery should be acknowledged"
+    assert again.json().get("duplicate") is True, "Retried svix id should be reported as a duplicate"
+    webhooks.post(webhooks.user_event("user.deleted", user_id), secret)
+
+    # The signature covers the raw bytes: any change to the body must be rejected
+    body, headers = webhooks.signed_request(events[0], secret)
+    tampered = body.replace(b'"Test"', b'"Evil"')
+    response = client.post(WEBHOOK_ENDPOINT, data=tampered, headers=headers)
+    assert response.status_code == 400, f"Tampered body should fail verification, got {response.status_code}"
+
+    response = client.post(WEBHOOK_ENDPOINT, json=events[0], headers={"Content-Type": "application/json"})
+    assert response.status_code == 400, f"Unsigned delivery should be rejected, got {response.status_code}"
+
+    # Short sustained burst; use webhooks.py directly for larger replays
+    prefix = f"user_tc010_replay_{uuid.uuid4().hex[:6]}"
+    deliveries = list(webhooks.generate(REPLAY_EVENTS, users=50, duplicates=0.05, prefix=prefix))
+    summary = webhooks.replay(deliveries, secret, concurrency=16)
+    print(f"TC010 webhook replay: {summary['eventsPerSecond']} events/s, p95 {summary['latencyMs']['p95']} ms")
+    assert summary["errors"] == 0, f"Replay had failed deliveries: {summary['statusCounts']}"
+    assert summary["duplicatesAcknowledged"] > 0, "Replayed svix ids were not recognised as duplicates"
+
+    # Leave no replay users behind
+    for user in {event["data"]["id"] for _, event in deliveries}:
+        webhooks.post(webhooks.user_event("user.deleted", user), secret)
+
+
+if __name__ == "__main__":
+    test_clerk_webhook_should_handle_authentication_events()
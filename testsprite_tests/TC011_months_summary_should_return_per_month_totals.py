@@ -0,0 +1,52 @@
+import math
+
+import client
+import config
+
+SUMMARY_ENDPOINT = "/api/months/summary"
+FIGURES = ("totalIncome", "totalExpense", "totalInvestment", "totalMisc", "balance", "titheAmount", "tithePaid")
+
+
+def test_months_summary_should_return_per_month_totals():
+    headers = config.non_admin_headers()
+
+    # Default range: the last 12 months, one row per existing month
+    resp = client.get(SUMMARY_ENDPOINT, headers=headers)
+    assert resp.status_code == 200, f"Summary failed: {resp.text}"
+    data = resp.json()
+    assert isinstance(data.get("months"), list), "Summary should list months"
+    keys = [(m["year"], m["month"]) for m in data["months"]]
+    assert keys == sorted(keys), "Months should be in chronological order"
+    assert len(keys) == len(set(keys)), "A month appeared twice"
+    assert len(keys) <= 12, "Default range should cover at most 12 months"
+
+    for m in data["months"]:
+        for key in FIGURES:
+            assert isinstance(m[key], (int, float)), f"{key} should be numeric"
+        assert math.isclose(m["titheAmount"], m["totalIncome"] * 0.1, abs_tol=0.01), "Tithe should be 10% of income"
+        assert math.isclose(m["balance"], m["totalIncome"] - m["totalExpense"], abs_tol=0.01), "Balance mismatch"
+
+    if data["totals"]:
+        for key in FIGURES:
+            expected = sum(m[key] for m in data["months"])
+            assert math.isclose(data["totals"][key], expected, abs_tol=0.05), f"Range total for {key} does not add up"
+
+    # Explicit ranges
+    resp = client.get(SUMMARY_ENDPOINT, headers=headers, params={"year": 2025})
+    assert resp.status_code == 200, f"Yearly summary failed: {resp.text}"
+    assert all(m["year"] == 2025 for m in resp.json()["months"]), "Yearly summary leaked other years"
+
+    resp = client.get(SUMMARY_ENDPOINT, headers=headers, params={"from": "2024-01", "to": "2025-12"})
+    assert resp.status_code == 200, f"Range summary failed: {resp.text}"
+
+    for bad in ({"from": "2025-06", "to": "2025-01"}, {"from": "2025-13", "to": "2025-14"}, {"months": 0}, {"months": 500}):
+        resp = client.get(SUMMARY_ENDPOINT, headers=headers, params=bad)
+        assert resp.status_code == 400, f"Expected 400 for {bad}, got {resp.status_code}"
+
+    # Unauthenticated access is refused
+    resp = client.get(SUMMARY_ENDPOINT)
+    assert resp.status_code in (401, 403), f"Expected 401/403 without auth, got {resp.status_code}"
+
+
+if __name__ == "__main__":
+    test_months_summary_should_return_per_month_totals()
@@ -0,0 +1,67 @@
+import client
+import config
+import jobs
+
+# Rolls month items over and starts a background job.
+EXCLUSIVE = True
+
+ROLLOVER_ENDPOINT = "/api/months/rollover"
+ADMIN_ROLLOVER_ENDPOINT = "/api/admin/months/rollover"
+SUMMARY_ENDPOINT = "/api/months/summary"
+CATEGORIES = ("incomes", "expenses", "investments", "miscExpenses")
+
+
+def test_months_rollover_should_copy_items_idempotently():
+    headers = config.non_admin_headers(**{"Content-Type": "application/json"})
+
+    # Validation and auth come before any write
+    resp = client.post(ROLLOVER_ENDPOINT, headers=headers, json={"year": 2025, "month": 13})
+    assert resp.status_code == 400, f"Expected 400 for month 13, got {resp.status_code}"
+    resp = client.post(ROLLOVER_ENDPOINT, headers=headers, json={"year": 2025, "month": 1, "categories": ["tithes"]})
+    assert resp.status_code == 400, f"Expected 400 for an unknown category, got {resp.status_code}"
+    resp = client.post(ROLLOVER_ENDPOINT, json={"year": 2025, "month": 1})
+    assert resp.status_code in (401, 403), f"Expected 401/403 without auth, got {resp.status_code}"
+
+    # A month the user never had cannot be rolled over
+    resp = client.post(ROLLOVER_ENDPOINT, headers=headers, json={"year": 2000, "month": 1})
+    assert resp.status_code == 404, f"Expected 404 for a missing source month, got {resp.status_code}"
+
+    # Roll the user's latest month over twice: the second run must not copy anything
+    summary = client.get(SUMMARY_ENDPOINT, headers=headers, params={"months": 120})
+    assert summary.status_code == 200, f"Summary failed: {summary.text}"
+    months = summary.json()["months"]
+    if months:
+        latest = months[-1]
+        body = {"year": latest["year"], "month": latest["month"]}
+
+        first = client.post(ROLLOVER_ENDPOINT, headers=headers, json=body)
+        assert first.status_code in (200, 201), f"Rollover failed: {first.status_code} {first.text}"
+        data = first.json()
+        expected_target = (latest["year"] + 1, 1) if latest["month"] == 12 else (latest["year"], latest["month"] + 1)
+        assert (data["target"]["year"], data["target"]["month"]) == expected_target, "Wrong target month"
+        assert set(data["copied"]) == set(CATEGORIES), "Copied counts should cover every category"
+
+        second = client.post(ROLLOVER_ENDPOINT, headers=headers, json=body)
+        assert second.status_code == 200, f"Repeated rollover failed: {second.status_code} {second.text}"
+        again = second.json()
+        assert again["created"] is False, "Repeated rollover should not create the month again"
+        assert again["target"]["id"] == data["target"]["id"], "Repeated rollover targeted another month"
+        assert all(count == 0 for count in again["copied"].values()), f"Repeated rollover copied rows: {again['copied']}"
+
+    # The scheduled batch runs as a background job and is admin-only
+    resp = client.post(ADMIN_ROLLOVER_ENDPOINT, headers=headers, json={})
+    assert resp.status_code == 401, f"Non-admin batch rollover should be 401, got {resp.status_code}"
+
+    admin_headers = config.admin_headers(**{"Content-Type": "application/json"})
+    for _ in range(2):
+        job_id = jobs.start(ADMIN_ROLLOVER_ENDPOINT, admin_headers, json={"year": 2000, "month": 1, "batchSize": 50})
+        job = jobs.wait(job_id, admin_headers)
+        assert job["status"] == "succeeded", f"Rollover job failed: {job.get('error')}"
+        result = job["result"]
+        assert result["source"] == {"year": 2000, "month": 1}, "Job rolled over the wrong month"
+        assert result["target"] == {"year": 2000, "month": 2}, "Job targeted the wrong month"
+        assert result["done"] is True, "A month nobody has should finish in one invocation"
+
+
+if __name__ == "__main__":
+    test_months_rollover_should_copy_items_idempotently()
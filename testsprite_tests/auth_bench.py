@@ -0,0 +1,188 @@
+"""Per-request auth overhead on the admin API routes.
+
+Sends sequential requests to a cheap admin endpoint as an admin and as a
+non-admin and reports, per case, client latency, the server's ``auth`` and
+``total`` phases from ``Server-Timing`` and how many Clerk calls (session
+lookups, ``users.getUser``) each request cost, counted by the Clerk stub.
+
+Run it against the tree before and after a change to compare:
+
+    CLERK_STUB_URL=http://127.0.0.1:3999 ADMIN_EMAILS=admin@stub.local npm run dev
+    python auth_bench.py --clerk-stub --requests 500 --output tmp/auth-before.json
+    # ...switch to the new tree and restart the server...
+    python auth_bench.py --clerk-stub --requests 500 --baseline tmp/auth-before.json
+
+Configure the server with ``ADMIN_EMAILS`` rather than ``ADMIN_USER_IDS`` to
+exercise the email allowlist, which is the path that needs the Clerk user.
+Use ``--stub-url`` instead of ``--clerk-stub`` when the stub runs separately.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import requests
+
+import clerk_stub
+import client
+import config
+from loadtest import percentile
+
+DEFAULT_PATH = "/api/admin/settings"
+
+CASES = [
+    {"name": "admin", "token": "adminToken", "expect": 200},
+    {"name": "non-admin", "token": "nonAdminToken", "expect": 401},
+]
+
+
+def _rounded(value):
+    return round(value, 2) if value is not None else None
+
+
+def _distribution(values):
+    ordered = sorted(values)
+    return {
+        "mean": _rounded(sum(ordered) / len(ordered)) if ordered else None,
+        "p50": _rounded(percentile(ordered, 50)),
+        "p95": _rounded(percentile(ordered, 95)),
+    }
+
+
+class StubCalls:
+    """Reads the Clerk stub's call counters, in-process or over HTTP."""
+
+    def __init__(self, stub=None, url=None):
+        self.stub = stub
+        self.url = url.rstrip("/") if url else None
+
+    @property
+    def available(self):
+        return self.stub is not None or self.url is not None
+
+    def take(self):
+        """Counts since the previous call, resetting them."""
+        if self.stub is not None:
+            return self.stub.state.call_counts(reset=True)
+        if self.url:
+            response = requests.get(f"{self.url}/stub/calls", params={"reset": "1"}, timeout=config.timeout())
+            response.raise_for_status()
+            return response.json()
+        return {}
+
+
+def run_case(case, path, count, warmup, stub_calls):
+    headers = {}
+    token = config.bearer(config.get(case["token"]))
+    if token:
+        headers["Authorization"] = token
+
+    for _ in range(warmup):
+        client.get(path, headers=headers).content
+    stub_calls.take()
+
+    client_ms, auth_ms, total_ms = [], [], []
+    unexpected = 0
+    for _ in range(count):
+        started = time.perf_counter()
+        response = client.get(path, headers=headers)
+        _ = response.content
+        client_ms.append((time.perf_counter() - started) * 1000)
+        if response.status_code != case["expect"]:
+            unexpected += 1
+        timing = client.parse_server_timing(response.headers.get("Server-Timing"))
+        # A request that never resolved the session has no auth entry.
+        auth_ms.append((timing.get("auth") or {}).get("dur") or 0.0)
+        if timing.get("total", {}).get("dur") is not None:
+            total_ms.append(timing["total"]["dur"])
+
+    calls = stub_calls.take() if stub_calls.available else None
+    return {
+        "case": case["name"],
+        "path": path,
+        "requests": count,
+        "unexpectedStatus": unexpected,
+        "clientMs": _distribution(client_ms),
+        "serverAuthMs": _distribution(auth_ms),
+        "serverTotalMs": _distribution(total_ms),
+        "clerkCallsPerRequest": (
+            {kind: round(n / count, 3) for kind, n in sorted(calls.items())} if calls is not None else None
+        ),
+    }
+
+
+def compare(current, baseline):
+    """Markdown table of before/after means per case."""
+    before = {r["case"]: r for r in baseline["results"]}
+    lines = [
+        "| case | metric | before | after | change |",
+        "| --- | --- | ---: | ---: | ---: |",
+    ]
+    for result in current["results"]:
+        old = before.get(result["case"])
+        if not old:
+            continue
+        rows = [
+            (f"{key} mean", old[key]["mean"], result[key]["mean"])
+            for key in ("clientMs", "serverAuthMs", "serverTotalMs")
+        ]
+        kinds = sorted(set(old.get("clerkCallsPerRequest") or {}) | set(result.get("clerkCallsPerRequest") or {}))
+        rows += [
+            (
+                f"clerk {kind}/req",
+                (old.get("clerkCallsPerRequest") or {}).get(kind, 0),
+                (result.get("clerkCallsPerRequest") or {}).get(kind, 0),
+            )
+            for kind in kinds
+        ]
+        for metric, was, now in rows:
+            if was is None or now is None:
+                change = "n/a"
+            elif was:
+                change = f"{(now - was) / was * 100:+.1f}%"
+            else:
+                change = f"{now - was:+.3g}"
+            lines.append(f"| {result['case']} | {metric} | {was} | {now} | {change} |")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure per-request auth overhead on admin routes.")
+    parser.add_argument("--config", default=None, help="JSON config file (see config.py)")
+    parser.add_argument("--path", default=DEFAULT_PATH, help=f"Admin endpoint to hit (default {DEFAULT_PATH})")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per case")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per case first")
+    parser.add_argument("--stub-url", default=None, help="Read Clerk call counts from an already running stub")
+    clerk_stub.add_arguments(parser)
+    parser.add_argument("--baseline", default=None, help="Earlier --output file to compare against")
+    parser.add_argument("--output", default=None, help="Write the JSON results to this path")
+    args = parser.parse_args(argv)
+
+    config.load(args.config)
+    stub = clerk_stub.start_from_args(args, config)
+    stub_calls = StubCalls(stub=stub, url=args.stub_url)
+
+    try:
+        results = [run_case(case, args.path, args.requests, args.warmup, stub_calls) for case in CASES]
+    finally:
+        if stub:
+            stub.stop()
+
+    report = {"baseUrl": config.base_url(), "results": results}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            print(compare(report, json.load(fh)))
+
+    return 0 if all(r["unexpectedStatus"] == 0 for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
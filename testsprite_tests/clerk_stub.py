@@ -0,0 +1,364 @@
+"""Local Clerk stand-in so auth-gated scenarios and benchmarks run offline.
+
+Implements the slice of the Clerk Backend API the app uses (users, user count,
+invitations) plus stub-only session endpoints and ``GET /stub/calls`` (Clerk
+calls received per kind; ``?reset=1`` zeroes them). Point the Next.js server at
+it with:
+
+    CLERK_STUB_URL=http://127.0.0.1:3999 ADMIN_USER_IDS=user_stub_admin npm run dev
+
+API routes then accept ``Authorization: Bearer <token>`` for the tokens issued
+here (see src/lib/clerk/session.ts) and ``clerkClient.users.getUserList`` pages
+through the synthetic users below.
+
+Run standalone:
+    python clerk_stub.py --port 3999 --users 5000 --page-size 100 --latency-ms 40
+
+Or from Python:
+    with clerk_stub.start(users=500) as stub:
+        config.override(adminToken=stub.admin_token, nonAdminToken=stub.member_token)
+
+runner.py and loadtest.py do this for you with ``--clerk-stub``.
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ADMIN_USER_ID = "user_stub_admin"
+MEMBER_USER_ID = "user_stub_member"
+ADMIN_TOKEN = "stub_admin_token"
+MEMBER_TOKEN = "stub_member_token"
+DEFAULT_PORT = 3999
+
+# Fixed epoch so generated users (and their ordering) are identical across runs.
+BASE_TIMESTAMP_MS = 1735689600000
+
+
+def _email_address(user_id, email):
+    return {
+        "object": "email_address",
+        "id": f"idn_{user_id}",
+        "email_address": email,
+        "reserved": False,
+        "verification": {
+            "object": "verification_email_code",
+            "status": "verified",
+            "strategy": "email_code",
+            "attempts": None,
+            "expire_at": None,
+            "nonce": None,
+            "external_verification_redirect_url": None,
+        },
+        "linked_to": [],
+        "created_at": BASE_TIMESTAMP_MS,
+        "updated_at": BASE_TIMESTAMP_MS,
+    }
+
+
+def make_user(user_id, email, first_name, last_name, created_at):
+    return {
+        "object": "user",
+        "id": user_id,
+        "username": None,
+        "first_name": first_name,
+        "last_name": last_name,
+        "image_url": "",
+        "has_image": False,
+        "primary_email_address_id": f"idn_{user_id}",
+        "primary_phone_number_id": None,
+        "primary_web3_wallet_id": None,
+        "password_enabled": False,
+        "two_factor_enabled": False,
+        "totp_enabled": False,
+        "backup_code_enabled": False,
+        "email_addresses": [_email_address(user_id, email)],
+        "phone_numbers": [],
+        "web3_wallets": [],
+        "external_accounts": [],
+        "saml_accounts": [],
+        "enterprise_accounts": [],
+        "passkeys": [],
+        "public_metadata": {},
+        "private_metadata": {},
+        "unsafe_metadata": {},
+        "external_id": None,
+        "last_sign_in_at": None,
+        "banned": False,
+        "locked": False,
+        "lockout_expires_in_seconds": None,
+        "verification_attempts_remaining": None,
+        "create_organization_enabled": True,
+        "create_organizations_limit": None,
+        "delete_self_enabled": True,
+        "legal_accepted_at": None,
+        "last_active_at": None,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+def generate_users(count):
+    """Synthetic directory: the admin and member session users plus ``count`` others."""
+    users = [
+        make_user(ADMIN_USER_ID, "admin@stub.local", "Stub", "Admin", BASE_TIMESTAMP_MS),
+        make_user(MEMBER_USER_ID, "member@stub.local", "Stub", "Member", BASE_TIMESTAMP_MS + 1),
+    ]
+    for i in range(count):
+        users.append(make_user(
+            f"user_stub_{i:06d}",
+            f"user{i:06d}@stub.local",
+            "User",
+            f"{i:06d}",
+            BASE_TIMESTAMP_MS + 1000 * (i + 2),
+        ))
+    # Clerk lists newest first by default (order_by=-created_at).
+    users.reverse()
+    return users
+
+
+class StubState:
+    def __init__(self, users=100, page_size=100, latency_ms=0):
+        self.users = generate_users(users)
+        self.users_by_id = {u["id"]: u for u in self.users}
+        self.page_size = page_size
+        self.latency_ms = latency_ms
+        self.sessions = {ADMIN_TOKEN: ADMIN_USER_ID, MEMBER_TOKEN: MEMBER_USER_ID}
+        self.invitations = {}
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def count(self, kind):
+        with self.lock:
+            self.calls[kind] = self.calls.get(kind, 0) + 1
+
+    def call_counts(self, reset=False):
+        with self.lock:
+            counts = dict(self.calls)
+            if reset:
+                self.calls.clear()
+        return counts
+
+    def issue_session(self, role):
+        token = f"stub_{role}_{uuid.uuid4().hex}"
+        with self.lock:
+            self.sessions[token] = ADMIN_USER_ID if role == "admin" else MEMBER_USER_ID
+        return token
+
+    def create_invitation(self, email):
+        now = int(time.time() * 1000)
+        invitation = {
+            "object": "invitation",
+            "id": f"inv_{uuid.uuid4().hex[:24]}",
+            "email_address": email,
+            "public_metadata": {},
+            "revoked": False,
+            "status": "pending",
+            "url": None,
+            "expires_at": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        with self.lock:
+            self.invitations[invitation["id"]] = invitation
+        return invitation
+
+
+def _not_found(message):
+    return 404, {"errors": [{"code": "resource_not_found", "message": message, "long_message": message}]}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "ClerkStub/1.0"
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return {}
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        path = parsed.path
+
+        if path == "/stub/calls":
+            return self._send(200, self.state.call_counts(reset=query.get("reset") == "1"))
+
+        match = re.fullmatch(r"/stub/sessions/([^/]+)", path)
+        if match:
+            self.state.count("session")
+            user_id = self.state.sessions.get(match.group(1))
+            if not user_id:
+                return self._send(401, {"errors": [{"code": "session_invalid", "message": "Unknown token"}]})
+            return self._send(200, {"user_id": user_id})
+
+        if path == "/v1/users":
+            self.state.count("getUserList")
+            limit = min(int(query.get("limit", 10)), self.state.page_size)
+            offset = int(query.get("offset", 0))
+            users = self.state.users
+            if query.get("order_by") == "+created_at":
+                users = users[::-1]
+            if self.state.latency_ms:
+                time.sleep(self.state.latency_ms / 1000.0)
+            return self._send(200, users[offset:offset + limit])
+
+        if path == "/v1/users/count":
+            return self._send(200, {"object": "total_count", "total_count": len(self.state.users)})
+
+        match = re.fullmatch(r"/v1/users/([^/]+)", path)
+        if match:
+            self.state.count("getUser")
+            user = self.state.users_by_id.get(match.group(1))
+            return self._send(200, user) if user else self._send(*_not_found("User not found"))
+
+        if path == "/v1/invitations":
+            status = query.get("status")
+            invitations = [
+                inv for inv in self.state.invitations.values() if not status or inv["status"] == status
+            ]
+            return self._send(200, {"data": invitations, "total_count": len(invitations)})
+
+        return self._send(*_not_found(f"No stub route for GET {path}"))
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        body = self._read_json()
+
+        if path == "/stub/sessions":
+            role = "admin" if body.get("role") == "admin" else "member"
+            token = self.state.issue_session(role)
+            return self._send(200, {"token": token, "user_id": self.state.sessions[token]})
+
+        if path == "/v1/invitations":
+            email = body.get("email_address")
+            if not email:
+                return self._send(422, {"errors": [{"code": "form_param_missing", "message": "email_address is required"}]})
+            return self._send(200, self.state.create_invitation(email))
+
+        match = re.fullmatch(r"/v1/invitations/([^/]+)/revoke", path)
+        if match:
+            invitation = self.state.invitations.get(match.group(1))
+            if not invitation:
+                return self._send(*_not_found("Invitation not found"))
+            invitation.update({"status": "revoked", "revoked": True, "updated_at": int(time.time() * 1000)})
+            return self._send(200, invitation)
+
+        return self._send(*_not_found(f"No stub route for POST {path}"))
+
+
+class StubServer:
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, users=100, page_size=100, latency_ms=0):
+        self.state = StubState(users=users, page_size=page_size, latency_ms=latency_ms)
+        self.httpd = ThreadingHTTPServer((host, port), StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = self.state
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def admin_token(self):
+        return ADMIN_TOKEN
+
+    @property
+    def member_token(self):
+        return MEMBER_TOKEN
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def start(**kwargs):
+    """Start a stub server on a background thread and return it."""
+    return StubServer(**kwargs).start()
+
+
+def add_arguments(parser):
+    """Shared --clerk-stub* options for runner.py and loadtest.py."""
+    parser.add_argument("--clerk-stub", action="store_true",
+                        help="Start the local Clerk stand-in and use its admin/non-admin tokens")
+    parser.add_argument("--clerk-stub-port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--clerk-stub-users", type=int, default=100)
+    parser.add_argument("--clerk-stub-page-size", type=int, default=100,
+                        help="Maximum users returned per getUserList page")
+    parser.add_argument("--clerk-stub-latency-ms", type=float, default=0)
+
+
+def start_from_args(args, config):
+    """Start the stub if --clerk-stub was given and point the suite config at its tokens."""
+    if not args.clerk_stub:
+        return None
+    server = start(
+        port=args.clerk_stub_port,
+        users=args.clerk_stub_users,
+        page_size=args.clerk_stub_page_size,
+        latency_ms=args.clerk_stub_latency_ms,
+    )
+    config.override(adminToken=server.admin_token, nonAdminToken=server.member_token)
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the local Clerk stand-in server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--users", type=int, default=100, help="Synthetic users besides the admin/member accounts")
+    parser.add_argument("--page-size", type=int, default=100, help="Maximum users returned per getUserList page")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Artificial delay per getUserList page")
+    args = parser.parse_args(argv)
+
+    server = StubServer(args.host, args.port, args.users, args.page_size, args.latency_ms)
+    print(f"Clerk stub listening on {server.url}")
+    print(f"  admin token:     {ADMIN_TOKEN} ({ADMIN_USER_ID})")
+    print(f"  non-admin token: {MEMBER_TOKEN} ({MEMBER_USER_ID})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
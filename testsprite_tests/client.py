@@ -0,0 +1,170 @@
+"""Keep-alive HTTP session shared by every TestSprite scenario.
+
+All scenarios go through one ``requests.Session`` so repeated calls reuse
+pooled TCP connections instead of paying a new handshake per request. The
+pool is sized for the parallel runner; ``configure`` resizes it.
+
+Every response's ``Server-Timing`` header (auth/db/external/total phases,
+see src/lib/logging/metrics.ts) is folded into per-scenario totals, so a run
+also reports where the time went on the server. The runner names the
+scenario each worker thread is executing through ``scenario``.
+"""
+
+import contextlib
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import config
+
+DEFAULT_POOL_SIZE = 32
+
+_session = None
+_lock = threading.Lock()
+_current = threading.local()
+
+
+def parse_server_timing(header):
+    """Parse a ``Server-Timing`` value into ``{name: {"dur": ms, "desc": str}}``.
+
+    ``dur`` and ``desc`` are None when the metric omits them.
+    """
+    metrics = {}
+    for entry in (header or "").split(","):
+        parts = [p.strip() for p in entry.split(";")]
+        if not parts[0]:
+            continue
+        metric = {"dur": None, "desc": None}
+        for param in parts[1:]:
+            key, _, value = param.partition("=")
+            key = key.strip().lower()
+            value = value.strip().strip('"')
+            if key == "dur":
+                try:
+                    metric["dur"] = float(value)
+                except ValueError:
+                    pass
+            elif key == "desc":
+                metric["desc"] = value
+        metrics[parts[0]] = metric
+    return metrics
+
+
+class ServerTimingStats:
+    """Thread-safe per-scenario sums of the server-side phase durations."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scenarios = {}
+
+    def record(self, scenario_id, metrics):
+        with self._lock:
+            entry = self._scenarios.setdefault(scenario_id, {"responses": 0, "phases": {}})
+            entry["responses"] += 1
+            for name, metric in metrics.items():
+                if metric["dur"] is None:
+                    continue
+                phase = entry["phases"].setdefault(name, {"responses": 0, "totalMs": 0.0})
+                phase["responses"] += 1
+                phase["totalMs"] += metric["dur"]
+
+    def summary(self):
+        with self._lock:
+            return {
+                scenario_id: {
+                    "responses": entry["responses"],
+                    "phases": {
+                        name: {
+                            "responses": phase["responses"],
+                            "totalMs": round(phase["totalMs"], 2),
+                            "meanMs": round(phase["totalMs"] / phase["responses"], 2),
+                        }
+                        for name, phase in entry["phases"].items()
+                    },
+                }
+                for scenario_id, entry in self._scenarios.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._scenarios.clear()
+
+
+server_timing = ServerTimingStats()
+
+
+@contextlib.contextmanager
+def scenario(scenario_id):
+    """Attribute responses received on this thread to ``scenario_id``."""
+    previous = getattr(_current, "scenario", None)
+    _current.scenario = scenario_id
+    try:
+        yield
+    finally:
+        _current.scenario = previous
+
+
+def _record_server_timing(response, *args, **kwargs):
+    header = response.headers.get("Server-Timing")
+    scenario_id = getattr(_current, "scenario", None)
+    if header and scenario_id:
+        server_timing.record(scenario_id, parse_server_timing(header))
+
+
+def _build(pool_size):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Accept": "application/json"})
+    session.hooks["response"].append(_record_server_timing)
+    return session
+
+
+def configure(pool_size=DEFAULT_POOL_SIZE):
+    """Replace the shared session with one holding ``pool_size`` connections."""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = _build(pool_size)
+        return _session
+
+
+def session():
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build(DEFAULT_POOL_SIZE)
+    return _session
+
+
+def url(path):
+    return f"{config.base_url()}{path}"
+
+
+def request(method, path, **kwargs):
+    kwargs.setdefault("timeout", config.timeout())
+    return session().request(method, url(path), **kwargs)
+
+
+def get(path, **kwargs):
+    return request("GET", path, **kwargs)
+
+
+def post(path, **kwargs):
+    return request("POST", path, **kwargs)
+
+
+def put(path, **kwargs):
+    return request("PUT", path, **kwargs)
+
+
+def patch(path, **kwargs):
+    return request("PATCH", path, **kwargs)
+
+
+def delete(path, **kwargs):
+    return request("DELETE", path, **kwargs)
@@ -0,0 +1,98 @@
+"""Shared configuration for the TestSprite API suite.
+
+Values come from environment variables, optionally overridden by a JSON file
+pointed to by TESTSPRITE_CONFIG (or passed to ``load``):
+
+    {
+      "baseUrl": "http://localhost:3000",
+      "adminToken": "...",
+      "nonAdminToken": "...",
+      "webhookSecret": "whsec_...",
+      "timeout": 30
+    }
+"""
+
+import json
+import os
+
+DEFAULTS = {
+    "baseUrl": "http://localhost:3000",
+    "adminToken": "",
+    "nonAdminToken": "",
+    "webhookSecret": "",
+    "timeout": 30,
+}
+
+ENV_VARS = {
+    "baseUrl": "TESTSPRITE_BASE_URL",
+    "adminToken": "TESTSPRITE_ADMIN_TOKEN",
+    "nonAdminToken": "TESTSPRITE_NON_ADMIN_TOKEN",
+    "webhookSecret": "CLERK_WEBHOOK_SECRET",
+    "timeout": "TESTSPRITE_TIMEOUT",
+}
+
+_settings = None
+
+
+def load(path=None):
+    """(Re)load settings: defaults < environment < JSON file."""
+    global _settings
+    settings = dict(DEFAULTS)
+    for key, env_name in ENV_VARS.items():
+        if os.environ.get(env_name):
+            settings[key] = os.environ[env_name]
+
+    path = path or os.environ.get("TESTSPRITE_CONFIG")
+    if path:
+        with open(path, encoding="utf-8") as fh:
+            settings.update(json.load(fh))
+
+    settings["baseUrl"] = settings["baseUrl"].rstrip("/")
+    settings["timeout"] = float(settings["timeout"])
+    _settings = settings
+    return settings
+
+
+def override(**values):
+    """Set values on top of the loaded settings (e.g. tokens issued by clerk_stub)."""
+    if _settings is None:
+        load()
+    _settings.update(values)
+
+
+def get(key):
+    if _settings is None:
+        load()
+    return _settings[key]
+
+
+def base_url():
+    return get("baseUrl")
+
+
+def timeout():
+    return get("timeout")
+
+
+def bearer(token):
+    if not token:
+        return None
+    return token if token.startswith("Bearer ") else f"Bearer {token}"
+
+
+def admin_headers(**extra):
+    headers = {"Accept": "application/json"}
+    token = bearer(get("adminToken"))
+    if token:
+        headers["Authorization"] = token
+    headers.update(extra)
+    return headers
+
+
+def non_admin_headers(**extra):
+    headers = {"Accept": "application/json"}
+    token = bearer(get("nonAdminToken"))
+    if token:
+        headers["Authorization"] = token
+    headers.update(extra)
+    return headers
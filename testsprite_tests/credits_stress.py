@@ -0,0 +1,180 @@
+"""Concurrency stress test for the credit debit path.
+
+Sets one user's balance to a known value, then fires many concurrent debits
+at ``/api/admin/users/<id>/credits`` and checks the ledger stayed exact:
+
+* exactly ``min(requests, balance // cost)`` debits succeed, the rest get 409;
+* every successful debit reports a different remaining balance (no two
+  requests observed the same balance, i.e. no lost update);
+* the final balance equals the starting one minus what was debited and
+  never goes negative.
+
+The ``single`` phase sends one one-credit charge per request, the ``batch``
+phase ``--batch-size`` of them. Every charge is recorded under the
+``stress_test`` operation. Afterwards the user's original balance is restored
+and the ``stress_test`` usage rows created since the run started are deleted
+again.
+
+It writes to a real balance, so the user must be named explicitly and must
+already have one (the script will not leave a new balance row behind). Use a
+throwaway account:
+
+    python credits_stress.py --user-id <db user id> --requests 400 --concurrency 100 --balance 250
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import client
+import config
+from loadtest import percentile
+
+OPERATION = "stress_test"
+
+
+def _credits_path(user_id):
+    return f"/api/admin/users/{user_id}/credits"
+
+
+def read_balance(user_id, headers):
+    response = client.get(_credits_path(user_id), headers=headers)
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return response.json()["creditsRemaining"]
+
+
+def server_now(user_id, headers):
+    """The server's clock (from the Date header), so the purge cutoff ignores local skew."""
+    response = client.get(_credits_path(user_id), headers=headers)
+    date = response.headers.get("Date")
+    now = parsedate_to_datetime(date) if date else datetime.now(timezone.utc)
+    return now.isoformat()
+
+
+def set_balance(user_id, credits, headers):
+    response = client.put(_credits_path(user_id), headers=headers, json={"creditsRemaining": credits})
+    response.raise_for_status()
+    return response.json()["creditsRemaining"]
+
+
+def purge_usage(user_id, since, headers):
+    """Delete the usage rows this run's charges recorded (created at or after ``since``)."""
+    params = {"operation": OPERATION, "since": since}
+    response = client.delete(_credits_path(user_id), headers=headers, params=params)
+    response.raise_for_status()
+    return response.json()["deleted"]
+
+
+def run_phase(name, user_id, headers, balance, requests_count, concurrency, batch_size):
+    set_balance(user_id, balance, headers)
+    body = {"charges": [{"operation": OPERATION, "amount": 1} for _ in range(batch_size)]}
+
+    def debit(_):
+        started = time.perf_counter()
+        response = client.post(_credits_path(user_id), headers=headers, json=body)
+        elapsed = (time.perf_counter() - started) * 1000
+        remaining = response.json().get("creditsRemaining") if response.status_code in (200, 409) else None
+        timing = client.parse_server_timing(response.headers.get("Server-Timing"))
+        return response.status_code, remaining, elapsed, (timing.get("db") or {}).get("dur")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(debit, range(requests_count)))
+    wall_s = time.perf_counter() - started
+
+    succeeded = [remaining for status, remaining, _, _ in outcomes if status == 200]
+    rejected = sum(1 for status, *_ in outcomes if status == 409)
+    unexpected = sorted({status for status, *_ in outcomes if status not in (200, 409)})
+    latencies = sorted(elapsed for _, _, elapsed, _ in outcomes)
+    db_ms = sorted(dur for *_, dur in outcomes if dur is not None)
+
+    final = read_balance(user_id, headers)
+    expected_successes = min(requests_count, balance // batch_size)
+    failures = []
+    if unexpected:
+        failures.append(f"unexpected statuses {unexpected}")
+    if len(succeeded) != expected_successes:
+        failures.append(f"{len(succeeded)} debits succeeded, expected {expected_successes}")
+    if len(set(succeeded)) != len(succeeded):
+        failures.append("two successful debits reported the same remaining balance")
+    if final != balance - len(succeeded) * batch_size:
+        failures.append(f"final balance {final}, expected {balance - len(succeeded) * batch_size}")
+    if final is not None and final < 0:
+        failures.append(f"balance went negative ({final})")
+
+    return {
+        "phase": name,
+        "requests": requests_count,
+        "concurrency": concurrency,
+        "chargesPerRequest": batch_size,
+        "startingBalance": balance,
+        "succeeded": len(succeeded),
+        "rejected": rejected,
+        "finalBalance": final,
+        "throughputRps": round(requests_count / wall_s, 1) if wall_s else None,
+        "latencyMs": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+        },
+        "serverDbMsP95": round(percentile(db_ms, 95), 2) if db_ms else None,
+        "failures": failures,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hammer one user's credit balance with concurrent debits.")
+    parser.add_argument("--config", default=None, help="JSON config file (see config.py)")
+    parser.add_argument("--user-id", required=True,
+                        help="Database user id of a throwaway account; its balance is overwritten during the run")
+    parser.add_argument("--balance", type=int, default=250, help="Starting balance for each phase")
+    parser.add_argument("--requests", type=int, default=400, help="Debit requests per phase")
+    parser.add_argument("--concurrency", type=int, default=100, help="Requests in flight at once")
+    parser.add_argument("--batch-size", type=int, default=5, help="Charges per request in the batch phase")
+    parser.add_argument("--output", default=None, help="Write the JSON results to this path")
+    args = parser.parse_args(argv)
+
+    config.load(args.config)
+    client.configure(pool_size=args.concurrency)
+    headers = config.admin_headers(**{"Content-Type": "application/json"})
+
+    user_id = args.user_id
+    original = read_balance(user_id, headers)
+    if original is None:
+        print(f"User {user_id} has no credit balance; pick a throwaway account that has one", file=sys.stderr)
+        return 2
+
+    started_at = server_now(user_id, headers)
+    try:
+        results = [
+            run_phase("single", user_id, headers, args.balance, args.requests, args.concurrency, 1),
+            run_phase("batch", user_id, headers, args.balance, args.requests, args.concurrency, args.batch_size),
+        ]
+    finally:
+        try:
+            set_balance(user_id, original, headers)
+        finally:
+            purged = purge_usage(user_id, started_at, headers)
+
+    report = {"baseUrl": config.base_url(), "userId": user_id, "startedAt": started_at, "purgedUsageRows": purged, "results": results}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+    for result in results:
+        for failure in result["failures"]:
+            print(f"FAIL [{result['phase']}] {failure}", file=sys.stderr)
+    return 0 if all(not r["failures"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
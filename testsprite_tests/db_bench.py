@@ -0,0 +1,388 @@
+"""Database benchmark for the hot finance and admin queries.
+
+For each scale tier, loads deterministic synthetic data through
+scripts/synthetic-data.ts (createMany batches; larger tiers only add the
+users the smaller ones lack), runs ANALYZE, then times every query below
+with rotating parameters taken from the synthetic users and records one
+``EXPLAIN (ANALYZE, BUFFERS)`` plan per query. The SQL mirrors what the app
+sends (Prisma with relationJoins for the month lookup, the raw SQL of
+getMonthSummaries and the admin dashboard aggregates), so index or query
+changes can be judged on the numbers before and after.
+
+Needs a Postgres driver: ``pip install "psycopg[binary]"`` (or psycopg2).
+Point it at a disposable database; the synthetic rows are removed with
+``npm run db:synthetic -- --purge --prefix bench``.
+
+Examples:
+    python db_bench.py --tiers small,medium --output tmp/db-bench.json
+    python db_bench.py --tiers large --skip-load --only month_by_date,month_summary_12
+    python db_bench.py --dsn postgresql://localhost/bench --plans-dir tmp/plans
+"""
+
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from loadtest import percentile
+
+try:
+    import psycopg
+except ImportError:  # pragma: no cover - depends on the local environment
+    psycopg = None
+    try:
+        import psycopg2
+    except ImportError:
+        psycopg2 = None
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Items per user-month average ~13 at density 1 (2 incomes, 8 expenses, 1
+# investment, 2 misc), so "large" holds ~10M Income/Expense rows and
+# "xlarge" ~25M.
+TIERS = {
+    "small": {"users": 1_000, "months": 24},
+    "medium": {"users": 10_000, "months": 24},
+    "large": {"users": 40_000, "months": 24},
+    "xlarge": {"users": 100_000, "months": 24},
+}
+
+TABLES = ["User", "Month", "Income", "Expense", "Investment", "MiscExpense", "MonthlyRollup"]
+
+# Prisma's relationJoins strategy: the month plus one LATERAL json aggregate
+# per relation, ordered by "order".
+ITEMS_LATERAL = """
+    LEFT JOIN LATERAL (
+        SELECT COALESCE(JSONB_AGG(t ORDER BY t."order"), '[]') AS items
+        FROM "{table}" t WHERE t."monthId" = m."id"
+    ) AS {alias} ON true
+"""
+
+QUERIES = {
+    "month_by_date": {
+        "description": "getMonthByDate: month with its four item lists",
+        "sql": (
+            'SELECT m.*, incomes.items AS incomes, expenses.items AS expenses, '
+            'investments.items AS investments, misc.items AS "miscExpenses" FROM "Month" m'
+            + ITEMS_LATERAL.format(table="Income", alias="incomes")
+            + ITEMS_LATERAL.format(table="Expense", alias="expenses")
+            + ITEMS_LATERAL.format(table="Investment", alias="investments")
+            + ITEMS_LATERAL.format(table="MiscExpense", alias="misc")
+            + 'WHERE m."userId" = %(user_id)s AND m."month" = %(month)s AND m."year" = %(year)s LIMIT 1'
+        ),
+    },
+    "month_summary_12": {
+        "description": "getMonthSummaries over the last 12 months",
+        "sql": """
+            WITH sums AS (
+                SELECT m."id" AS "monthId", m."year", m."month",
+                    COALESCE(SUM(r."amount") FILTER (WHERE r."category" = 'INCOME'), 0) AS income,
+                    COALESCE(SUM(r."amount") FILTER (WHERE r."category" = 'INVESTMENT'), 0) AS investment,
+                    COALESCE(SUM(r."amount") FILTER (WHERE r."category" = 'MISC'), 0) AS misc,
+                    COALESCE(SUM(r."amount") FILTER (WHERE r."category" IN ('EXPENSE_STANDARD', 'EXPENSE_TITHE')), 0) AS expenses,
+                    COALESCE(SUM(r."amount") FILTER (WHERE r."category" = 'TITHE_PAID'), 0) AS tithe_paid
+                FROM "Month" m
+                LEFT JOIN "MonthlyRollup" r ON r."monthId" = m."id"
+                WHERE m."userId" = %(user_id)s
+                    AND m."year" * 12 + m."month" BETWEEN %(period_from)s AND %(period_to)s
+                GROUP BY GROUPING SETS ((m."id", m."year", m."month"), ())
+            )
+            SELECT * FROM sums ORDER BY "year" NULLS LAST, "month"
+        """,
+    },
+    "dashboard_aggregates": {
+        "description": "admin dashboard counts and MonthlyRollup sums",
+        "sql": """
+            SELECT
+                (SELECT COUNT(*) FROM "User")::int AS "totalUsers",
+                (SELECT COUNT(*) FROM "User" WHERE "isActive")::int AS "activeUsers",
+                (SELECT COUNT(*) FROM "User" WHERE "createdAt" >= %(first_day)s)::int AS "newUsersThisMonth",
+                (SELECT COALESCE(SUM("amount"), 0) FROM "MonthlyRollup" WHERE "category" = 'INCOME')::float8 AS "totalTTV",
+                (SELECT COALESCE(SUM("amount"), 0) FROM "MonthlyRollup" WHERE "category" = 'TITHE_PAID')::float8 AS "totalTitheVolume",
+                (
+                    SELECT json_agg(json_build_object('name', e."type", 'value', e."total"))
+                    FROM (
+                        SELECT substring("category" FROM 9) AS "type", SUM("amount")::float8 AS "total"
+                        FROM "MonthlyRollup" WHERE starts_with("category", 'EXPENSE_')
+                        GROUP BY "category" HAVING SUM("itemCount") > 0
+                    ) e
+                ) AS "expenseDistribution",
+                (
+                    SELECT json_agg(json_build_object('year', t."year", 'month', t."month", 'income', t."income"))
+                    FROM (
+                        SELECT "year", "month",
+                            COALESCE(SUM("amount") FILTER (WHERE "category" = 'INCOME'), 0)::float8 AS "income"
+                        FROM "MonthlyRollup"
+                        WHERE "year" * 12 + "month" BETWEEN %(series_from)s AND %(series_to)s
+                        GROUP BY "year", "month"
+                    ) t
+                ) AS "series"
+        """,
+    },
+    "admin_users_first_page": {
+        "description": "/api/admin/users first page",
+        "sql": """
+            SELECT "id", "clerkId", "email", "name", "isActive", "createdAt", "updatedAt"
+            FROM "User" ORDER BY "createdAt" DESC, "id" DESC LIMIT 51
+        """,
+    },
+    "admin_users_keyset_page": {
+        "description": "/api/admin/users page after a cursor",
+        "sql": """
+            SELECT "id", "clerkId", "email", "name", "isActive", "createdAt", "updatedAt"
+            FROM "User"
+            WHERE "createdAt" <= %(cursor_at)s
+                AND ("createdAt" < %(cursor_at)s OR ("createdAt" = %(cursor_at)s AND "id" < %(cursor_id)s))
+            ORDER BY "createdAt" DESC, "id" DESC LIMIT 51
+        """,
+    },
+    "admin_users_search": {
+        "description": "/api/admin/users?search= substring match on email or name (trigram indexes)",
+        "sql": """
+            SELECT "id", "clerkId", "email", "name", "isActive", "createdAt", "updatedAt"
+            FROM "User"
+            WHERE "email" ILIKE %(email_term)s OR "name" ILIKE %(name_term)s
+            ORDER BY "createdAt" DESC, "id" DESC LIMIT 51
+        """,
+    },
+}
+
+
+def _dsn(raw):
+    """Drop the Prisma-only query params (schema, connection_limit, ...) libpq rejects."""
+    parts = urlsplit(raw)
+    prisma_only = {"schema", "connection_limit", "pool_timeout", "pgbouncer", "socket_timeout", "statement_cache_size"}
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k not in prisma_only]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def connect(dsn):
+    if psycopg is not None:
+        return psycopg.connect(dsn, autocommit=True)
+    if psycopg2 is not None:
+        conn = psycopg2.connect(dsn)
+        conn.autocommit = True
+        return conn
+    raise SystemExit('db_bench.py needs a Postgres driver: pip install "psycopg[binary]" (or psycopg2)')
+
+
+def _like_escape(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _like_prefix(value):
+    return f"{_like_escape(value)}%"
+
+
+def _like_contains(value):
+    return f"%{_like_escape(value)}%"
+
+
+def load_tier(tier, seed, prefix, anchor, density):
+    command = [
+        "npx", "tsx", "scripts/synthetic-data.ts",
+        "--users", str(tier["users"]),
+        "--months", str(tier["months"]),
+        "--seed", str(seed),
+        "--prefix", prefix,
+        "--anchor", anchor,
+        "--density", str(density),
+    ]
+    print(f"$ {' '.join(command)}", file=sys.stderr)
+    started = time.perf_counter()
+    subprocess.run(command, cwd=REPO_ROOT, check=True)
+    return round(time.perf_counter() - started, 1)
+
+
+def row_counts(cur):
+    cur.execute(
+        "SELECT relname, reltuples::bigint FROM pg_class WHERE relkind = 'r' AND relname = ANY(%(tables)s)",
+        {"tables": TABLES},
+    )
+    return dict(cur.fetchall())
+
+
+def sample_params(cur, prefix, anchor_period, count):
+    """Deterministic parameter sets drawn from the synthetic months and users."""
+    cur.execute(
+        """
+        SELECT m."userId", m."year", m."month", u."createdAt", u."id", u."email", u."name"
+        FROM "Month" m JOIN "User" u ON u."id" = m."userId"
+        WHERE u."clerkId" LIKE %(pattern)s
+        ORDER BY md5(m."id") LIMIT %(count)s
+        """,
+        {"pattern": _like_prefix(f"{prefix}_clerk_"), "count": count},
+    )
+    anchor_year, anchor_month = divmod(anchor_period - 1, 12)
+    first_day = datetime.datetime(anchor_year, anchor_month + 1, 1)
+    return [
+        {
+            "user_id": user_id,
+            "year": year,
+            "month": month,
+            "period_from": anchor_period - 11,
+            "period_to": anchor_period,
+            "first_day": first_day,
+            "series_from": anchor_period - 5,
+            "series_to": anchor_period,
+            "cursor_at": created_at,
+            "cursor_id": cursor_id,
+            "email_term": _like_contains(email[: len(prefix) + 4]),
+            "name_term": _like_contains(name.split(" ")[0][:4]),
+        }
+        for user_id, year, month, created_at, cursor_id, email, name in cur.fetchall()
+    ]
+
+
+def summarize_plan(explain):
+    """Timing, buffers, index use and sequential scans from EXPLAIN JSON."""
+    root = explain[0]
+    nodes, index_names, seq_scans = [], set(), set()
+
+    def walk(node):
+        nodes.append(node["Node Type"])
+        if node.get("Index Name"):
+            index_names.add(node["Index Name"])
+        if node["Node Type"] == "Seq Scan":
+            seq_scans.add(node.get("Relation Name"))
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(root["Plan"])
+    return {
+        "planningMs": root.get("Planning Time"),
+        "executionMs": root.get("Execution Time"),
+        "rootNode": root["Plan"]["Node Type"],
+        "totalCost": root["Plan"].get("Total Cost"),
+        "sharedHitBlocks": root["Plan"].get("Shared Hit Blocks"),
+        "sharedReadBlocks": root["Plan"].get("Shared Read Blocks"),
+        "indexes": sorted(index_names),
+        "seqScans": sorted(s for s in seq_scans if s),
+        "nodeCount": len(nodes),
+    }
+
+
+def bench_query(cur, name, spec, params, iterations, plans_dir=None, tier_name=None):
+    latencies = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        cur.execute(spec["sql"], params[i % len(params)])
+        cur.fetchall()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + spec["sql"], params[0])
+    explain = cur.fetchone()[0]
+    if isinstance(explain, str):
+        explain = json.loads(explain)
+    if plans_dir:
+        os.makedirs(plans_dir, exist_ok=True)
+        with open(os.path.join(plans_dir, f"{tier_name}.{name}.json"), "w", encoding="utf-8") as fh:
+            json.dump(explain, fh, indent=2)
+
+    ordered = sorted(latencies)
+    return {
+        "description": spec["description"],
+        "iterations": iterations,
+        "latencyMs": {
+            "mean": round(sum(ordered) / len(ordered), 3),
+            "p50": round(percentile(ordered, 50), 3),
+            "p95": round(percentile(ordered, 95), 3),
+            "p99": round(percentile(ordered, 99), 3),
+            "max": round(ordered[-1], 3),
+        },
+        "plan": summarize_plan(explain),
+    }
+
+
+def print_summary(report):
+    print(f"{'tier':8} {'query':26} {'p50 ms':>9} {'p95 ms':>9} {'exec ms':>9}  plan", file=sys.stderr)
+    for tier in report["tiers"]:
+        for name, result in tier["queries"].items():
+            plan = result["plan"]
+            access = ", ".join(plan["indexes"]) or "-"
+            if plan["seqScans"]:
+                access += f"; seq: {', '.join(plan['seqScans'])}"
+            print(
+                f"{tier['tier']:8} {name:26} {result['latencyMs']['p50']:9.2f} {result['latencyMs']['p95']:9.2f} "
+                f"{plan['executionMs'] or 0:9.2f}  {access}",
+                file=sys.stderr,
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark hot queries against synthetic data at several scales.")
+    parser.add_argument("--dsn", default=os.environ.get("DATABASE_URL"), help="Postgres URL (default: DATABASE_URL)")
+    parser.add_argument("--tiers", default="small,medium", help=f"Comma-separated tiers: {', '.join(TIERS)}")
+    parser.add_argument("--only", default=None, help="Comma-separated query names")
+    parser.add_argument("--iterations", type=int, default=50, help="Timed executions per query")
+    parser.add_argument("--samples", type=int, default=200, help="Distinct parameter sets to rotate through")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--prefix", default="bench", help="Synthetic id prefix (see scripts/synthetic-data.ts)")
+    parser.add_argument("--anchor", default=None, help="Last generated month, YYYY-MM (default: current month)")
+    parser.add_argument("--density", type=float, default=1.0, help="Item count multiplier per month")
+    parser.add_argument("--skip-load", action="store_true", help="Benchmark the data already in the database")
+    parser.add_argument("--plans-dir", default=None, help="Write each full EXPLAIN plan as JSON here")
+    parser.add_argument("--output", default=None, help="Write the JSON report to this path instead of stdout")
+    args = parser.parse_args(argv)
+
+    if not args.dsn:
+        parser.error("--dsn or DATABASE_URL is required")
+    tier_names = [t.strip() for t in args.tiers.split(",") if t.strip()]
+    unknown = [t for t in tier_names if t not in TIERS]
+    if unknown:
+        parser.error(f"Unknown tier(s): {', '.join(unknown)}")
+    queries = {k: v for k, v in QUERIES.items() if not args.only or k in args.only.split(",")}
+
+    today = datetime.date.today()
+    anchor = args.anchor or f"{today.year}-{today.month:02d}"
+    anchor_year, anchor_month = (int(part) for part in anchor.split("-"))
+    anchor_period = anchor_year * 12 + anchor_month
+
+    conn = connect(_dsn(args.dsn))
+    report = {"seed": args.seed, "prefix": args.prefix, "anchor": anchor, "density": args.density, "tiers": []}
+    with conn.cursor() as cur:
+        cur.execute("SHOW server_version")
+        report["serverVersion"] = cur.fetchone()[0]
+
+        # Ascending so each load only adds the users the previous tier lacked.
+        for tier_name in sorted(tier_names, key=lambda t: TIERS[t]["users"]):
+            tier = TIERS[tier_name]
+            load_seconds = None
+            if not args.skip_load:
+                load_seconds = load_tier(tier, args.seed, args.prefix, anchor, args.density)
+                cur.execute("ANALYZE")
+
+            params = sample_params(cur, args.prefix, anchor_period, args.samples)
+            if not params:
+                raise SystemExit(f"No synthetic rows with prefix '{args.prefix}' found; drop --skip-load")
+
+            results = {}
+            for name, spec in queries.items():
+                print(f"[{tier_name}] {name}", file=sys.stderr)
+                results[name] = bench_query(cur, name, spec, params, args.iterations, args.plans_dir, tier_name)
+
+            report["tiers"].append({
+                "tier": tier_name,
+                **tier,
+                "loadSeconds": load_seconds,
+                "rowEstimates": row_counts(cur),
+                "queries": results,
+            })
+    conn.close()
+
+    print_summary(report)
+    text = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""Helpers for admin endpoints that run as background jobs.
+
+``POST /api/admin/users/sync`` and ``POST /api/admin/plans/refresh-pricing``
+answer 202 with a job id (or 409 with the id of the run already in flight);
+progress is read from ``GET /api/admin/jobs/{id}``.
+"""
+
+import time
+
+import client
+
+FINISHED = ("succeeded", "failed")
+
+
+def start(path, headers, json=None):
+    """Queue a job and return its id, joining the active run on 409."""
+    resp = client.post(path, headers=headers, json=json)
+    assert resp.status_code in (202, 409), f"Starting job at {path} failed: {resp.status_code} {resp.text}"
+    job_id = resp.json().get("jobId")
+    assert job_id, f"No jobId in response from {path}: {resp.text}"
+    return job_id
+
+
+def status(job_id, headers):
+    resp = client.get(f"/api/admin/jobs/{job_id}", headers=headers)
+    assert resp.status_code == 200, f"Job status failed: {resp.status_code} {resp.text}"
+    return resp.json()
+
+
+def wait(job_id, headers, timeout=120, interval=0.5):
+    """Poll the status endpoint until the job settles and return its final state."""
+    deadline = time.monotonic() + timeout
+    while True:
+        job = status(job_id, headers)
+        if job["status"] in FINISHED:
+            return job
+        assert time.monotonic() < deadline, f"Job {job_id} still {job['status']} after {timeout}s"
+        time.sleep(interval)
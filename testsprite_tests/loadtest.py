@@ -0,0 +1,315 @@
+"""Concurrent load mode for the TestSprite API scenarios.
+
+Replays the endpoints exercised by TC001-TC010 as weighted workloads through a
+pooled HTTP client and reports latency percentiles, throughput and error rate
+per endpoint as JSON.
+
+Examples:
+    python loadtest.py --concurrency 20 --duration 30
+    python loadtest.py --rps 50 --duration 60 --scenarios TC001,TC002
+    python loadtest.py --concurrency 10 --requests 2000 --weight TC001=20 --output tmp/load.json
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import clerk_stub
+import client
+import config
+
+# Read-only requests taken from the TC scenarios. Weights approximate real
+# traffic: the public plans endpoint is hit by every landing-page visitor,
+# admin pages only by staff.
+WORKLOADS = [
+    {"scenario": "TC001", "method": "GET", "path": "/api/public/plans", "weight": 10, "auth": False},
+    {"scenario": "TC002", "method": "GET", "path": "/api/admin/dashboard", "weight": 3, "auth": True},
+    {"scenario": "TC003", "method": "GET", "path": "/api/admin/plans", "weight": 2, "auth": True},
+    {"scenario": "TC005", "method": "GET", "path": "/api/admin/users", "weight": 3, "auth": True},
+    {"scenario": "TC006", "method": "GET", "path": "/api/admin/settings", "weight": 1, "auth": True},
+    {"scenario": "TC007", "method": "GET", "path": "/api/admin/usage", "weight": 1, "auth": True},
+    {"scenario": "TC008", "method": "GET", "path": "/api/admin/storage", "weight": 1, "auth": True},
+    {"scenario": "TC009", "method": "GET", "path": "/api/admin/clerk/plans", "weight": 1, "auth": True},
+    {"scenario": "TC011", "method": "GET", "path": "/api/months/summary?months=24", "weight": 2, "auth": True},
+]
+
+# Requests with side effects are only replayed when --include-writes is given.
+# The pricing refresh is a background job: concurrent starts get 409 with the
+# id of the run in flight, which is the expected answer, not an error.
+WRITE_WORKLOADS = [
+    {"scenario": "TC004", "method": "POST", "path": "/api/admin/plans/refresh-pricing", "weight": 1, "auth": True,
+     "okStatuses": [409]},
+]
+
+
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (len(sorted_values) - 1) * (pct / 100.0)
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    fraction = rank - low
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * fraction
+
+
+class EndpointStats:
+    def __init__(self, workload):
+        self.workload = workload
+        self.latencies_ms = []
+        self.errors = 0
+        self.status_counts = {}
+        self.server_ms = {}
+        self.lock = threading.Lock()
+
+    def record(self, latency_ms, status, ok, server_timing=None):
+        with self.lock:
+            self.latencies_ms.append(latency_ms)
+            for name, metric in (server_timing or {}).items():
+                if metric["dur"] is not None:
+                    self.server_ms.setdefault(name, []).append(metric["dur"])
+            key = str(status)
+            self.status_counts[key] = self.status_counts.get(key, 0) + 1
+            if not ok:
+                self.errors += 1
+
+    def summary(self, elapsed_s):
+        latencies = sorted(self.latencies_ms)
+        count = len(latencies)
+
+        def rounded(value):
+            return round(value, 2) if value is not None else None
+
+        return {
+            "scenario": self.workload["scenario"],
+            "method": self.workload["method"],
+            "path": self.workload["path"],
+            "requests": count,
+            "errors": self.errors,
+            "errorRate": round(self.errors / count, 4) if count else 0.0,
+            "throughputRps": round(count / elapsed_s, 2) if elapsed_s > 0 else 0.0,
+            "latencyMs": {
+                "min": rounded(latencies[0] if latencies else None),
+                "mean": rounded(sum(latencies) / count if count else None),
+                "p50": rounded(percentile(latencies, 50)),
+                "p95": rounded(percentile(latencies, 95)),
+                "p99": rounded(percentile(latencies, 99)),
+                "max": rounded(latencies[-1] if latencies else None),
+            },
+            "statusCounts": self.status_counts,
+            "serverTimingMs": {
+                name: {
+                    "responses": len(values),
+                    "mean": rounded(sum(values) / len(values)),
+                    "p95": rounded(percentile(sorted(values), 95)),
+                }
+                for name, values in self.server_ms.items()
+            },
+        }
+
+
+def select_workloads(scenarios=None, weights=None, include_writes=False):
+    pool = list(WORKLOADS) + (list(WRITE_WORKLOADS) if include_writes else [])
+    selected = []
+    for workload in pool:
+        if scenarios and workload["scenario"] not in scenarios:
+            continue
+        workload = dict(workload)
+        if weights and workload["scenario"] in weights:
+            workload["weight"] = weights[workload["scenario"]]
+        if workload["weight"] > 0:
+            selected.append(workload)
+    if not selected:
+        raise ValueError("No workloads selected")
+    return selected
+
+
+class LoadRunner:
+    def __init__(self, workloads, base_url=None, token=None, concurrency=10,
+                 rps=None, duration=None, total_requests=None, timeout=None, seed=None, session=None):
+        if duration is None and total_requests is None:
+            raise ValueError("Either duration or total_requests must be set")
+        self.workloads = workloads
+        self.base_url = (base_url or config.base_url()).rstrip("/")
+        self.token = config.bearer(token if token is not None else config.get("adminToken"))
+        self.concurrency = max(1, concurrency)
+        self.rps = rps
+        self.duration = duration
+        self.total_requests = total_requests
+        self.timeout = timeout or config.timeout()
+        self.session = session or client.configure(pool_size=self.concurrency)
+        self.stats = {self._key(w): EndpointStats(w) for w in workloads}
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.issued = 0
+        self.issued_lock = threading.Lock()
+
+    @staticmethod
+    def _key(workload):
+        return f"{workload['method']} {workload['path']}"
+
+    def _pick(self):
+        with self.rng_lock:
+            return self.rng.choices(self.workloads, weights=[w["weight"] for w in self.workloads])[0]
+
+    def _claim(self):
+        """Reserve one request slot; returns False once the request budget is spent."""
+        with self.issued_lock:
+            if self.total_requests is not None and self.issued >= self.total_requests:
+                return False
+            self.issued += 1
+            return True
+
+    def _fire(self, workload):
+        headers = {}
+        if workload["auth"] and self.token:
+            headers["Authorization"] = self.token
+        started = time.perf_counter()
+        server_timing = None
+        try:
+            response = self.session.request(
+                workload["method"],
+                f"{self.base_url}{workload['path']}",
+                headers=headers,
+                json=workload.get("json"),
+                timeout=self.timeout,
+            )
+            # Drain the body so latency covers the full response, not just headers.
+            _ = response.content
+            status = response.status_code
+            server_timing = client.parse_server_timing(response.headers.get("Server-Timing"))
+            ok = status < 400 or status in workload.get("okStatuses", ())
+        except requests.RequestException as e:
+            status = type(e).__name__
+            ok = False
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.stats[self._key(workload)].record(latency_ms, status, ok, server_timing)
+
+    def _closed_loop_worker(self, deadline):
+        while (deadline is None or time.perf_counter() < deadline) and self._claim():
+            self._fire(self._pick())
+
+    def _run_closed_loop(self, deadline):
+        threads = [
+            threading.Thread(target=self._closed_loop_worker, args=(deadline,), daemon=True)
+            for _ in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _run_open_loop(self, deadline):
+        interval = 1.0 / self.rps
+        next_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while (deadline is None or time.perf_counter() < deadline) and self._claim():
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(self._fire, self._pick())
+                next_at += interval
+
+    def run(self):
+        started = time.perf_counter()
+        deadline = started + self.duration if self.duration else None
+        if self.rps:
+            self._run_open_loop(deadline)
+        else:
+            self._run_closed_loop(deadline)
+        elapsed = time.perf_counter() - started
+        return self.report(elapsed)
+
+    def report(self, elapsed_s):
+        endpoints = [s.summary(elapsed_s) for s in self.stats.values() if s.latencies_ms]
+        total = sum(e["requests"] for e in endpoints)
+        errors = sum(e["errors"] for e in endpoints)
+        return {
+            "baseUrl": self.base_url,
+            "mode": "rps" if self.rps else "concurrency",
+            "concurrency": self.concurrency,
+            "targetRps": self.rps,
+            "elapsedSeconds": round(elapsed_s, 3),
+            "totals": {
+                "requests": total,
+                "errors": errors,
+                "errorRate": round(errors / total, 4) if total else 0.0,
+                "throughputRps": round(total / elapsed_s, 2) if elapsed_s > 0 else 0.0,
+            },
+            "endpoints": endpoints,
+        }
+
+
+def parse_weights(values):
+    weights = {}
+    for value in values or []:
+        scenario, _, weight = value.partition("=")
+        if not weight:
+            raise argparse.ArgumentTypeError(f"Invalid weight '{value}', expected TC001=5")
+        weights[scenario.strip()] = float(weight)
+    return weights
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay TestSprite scenarios as a concurrent load test.")
+    parser.add_argument("--config", default=None, help="JSON config file (see config.py)")
+    parser.add_argument("--base-url", default=None, help="Overrides the configured base URL")
+    parser.add_argument("--token", default=None, help="Overrides the configured admin bearer token")
+    parser.add_argument("--concurrency", type=int, default=10, help="Worker threads / pooled connections")
+    parser.add_argument("--rps", type=float, default=None, help="Target request rate (open loop); omit for closed loop")
+    parser.add_argument("--duration", type=float, default=None, help="Run time in seconds")
+    parser.add_argument("--requests", type=int, default=None, help="Total number of requests to send")
+    parser.add_argument("--scenarios", default=None, help="Comma-separated scenario ids, e.g. TC001,TC002")
+    parser.add_argument("--weight", action="append", help="Override a scenario weight, e.g. TC001=20")
+    parser.add_argument("--include-writes", action="store_true", help="Also replay requests with side effects")
+    parser.add_argument("--timeout", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the weighted scenario picker")
+    clerk_stub.add_arguments(parser)
+    parser.add_argument("--output", default=None, help="Write the JSON report to this path instead of stdout")
+    args = parser.parse_args(argv)
+
+    config.load(args.config)
+    stub = clerk_stub.start_from_args(args, config)
+    if args.duration is None and args.requests is None:
+        args.duration = 30.0
+
+    scenarios = {s.strip() for s in args.scenarios.split(",")} if args.scenarios else None
+    workloads = select_workloads(scenarios, parse_weights(args.weight), args.include_writes)
+
+    runner = LoadRunner(
+        workloads,
+        base_url=args.base_url,
+        token=args.token,
+        concurrency=args.concurrency,
+        rps=args.rps,
+        duration=args.duration,
+        total_requests=args.requests,
+        timeout=args.timeout,
+        seed=args.seed,
+    )
+    try:
+        report = runner.run()
+    finally:
+        if stub:
+            stub.stop()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+    return 1 if report["totals"]["requests"] == 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,365 @@
+"""Performance baselines and regression gate for the TestSprite API suite.
+
+``record`` runs the load test (see loadtest.py) and stores a versioned results
+file with per-endpoint latency samples, percentiles, throughput, error rate
+and server-side phase timings. ``compare`` checks a run against a stored
+baseline: an endpoint regresses when its latencies are significantly higher
+(one-sided Mann-Whitney U test) *and* the median moved by more than the
+practical threshold, or when throughput or error rate got worse by more than
+the threshold. It writes a Markdown report in the layout of
+tmp/raw_report.md and exits 1 on any regression, so performance gates a run
+the same way a failing scenario does.
+
+Examples:
+    python perf_baseline.py record --clerk-stub --requests 3000 --as-baseline
+    python perf_baseline.py compare --clerk-stub --requests 3000
+    python perf_baseline.py compare --current tmp/perf/run.json --results tmp/run.json
+"""
+
+import argparse
+import datetime
+import json
+import math
+import os
+import subprocess
+import sys
+
+import clerk_stub
+import config
+from loadtest import LoadRunner, parse_weights, percentile, select_workloads
+
+SCHEMA_VERSION = 1
+HERE = os.path.dirname(os.path.abspath(__file__))
+PERF_DIR = os.path.join(HERE, "tmp", "perf")
+DEFAULT_BASELINE = os.path.join(PERF_DIR, "baseline.json")
+DEFAULT_REPORT = os.path.join(PERF_DIR, "perf_report.md")
+
+# Latency samples kept per endpoint; longer runs are reduced to evenly spaced
+# quantiles, which preserves the distribution the rank test sees.
+MAX_SAMPLES = 5000
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _reduce(samples, limit=MAX_SAMPLES):
+    ordered = sorted(samples)
+    if len(ordered) <= limit:
+        return [round(v, 3) for v in ordered]
+    step = (len(ordered) - 1) / (limit - 1)
+    return [round(ordered[round(i * step)], 3) for i in range(limit)]
+
+
+def build_results(runner, report):
+    """Versioned results document from a finished LoadRunner."""
+    endpoints = {}
+    for summary in report["endpoints"]:
+        key = f"{summary['method']} {summary['path']}"
+        stats = runner.stats[key]
+        endpoints[key] = {**summary, "samplesMs": _reduce(stats.latencies_ms)}
+    return {
+        "schemaVersion": SCHEMA_VERSION,
+        "recordedAt": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "baseUrl": report["baseUrl"],
+        "load": {
+            "mode": report["mode"],
+            "concurrency": report["concurrency"],
+            "targetRps": report["targetRps"],
+            "elapsedSeconds": report["elapsedSeconds"],
+        },
+        "totals": report["totals"],
+        "endpoints": endpoints,
+    }
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as fh:
+        results = json.load(fh)
+    version = results.get("schemaVersion")
+    if version != SCHEMA_VERSION:
+        raise SystemExit(f"{path}: unsupported schemaVersion {version!r} (expected {SCHEMA_VERSION})")
+    return results
+
+
+def save_results(results, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(results, fh, indent=2)
+        fh.write("\n")
+
+
+def mann_whitney_greater(current, baseline):
+    """One-sided Mann-Whitney U test that ``current`` tends to exceed ``baseline``.
+
+    Returns ``(p_value, effect)`` where effect is P(current > baseline) with
+    ties counted half. Normal approximation with tie and continuity
+    correction, which is accurate for the sample sizes a load run produces.
+    """
+    n1, n2 = len(current), len(baseline)
+    if n1 == 0 or n2 == 0:
+        return None, None
+
+    combined = sorted([(v, 0) for v in current] + [(v, 1) for v in baseline])
+    ranks = [0.0] * len(combined)
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        average = (i + j) / 2 + 1
+        for k in range(i, j + 1):
+            ranks[k] = average
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        i = j + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    effect = u / (n1 * n2)
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))) if n > 1 else 0
+    if variance <= 0:
+        return 1.0, effect
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2)), effect
+
+
+def compare_endpoint(current, baseline, alpha, threshold, min_delta_ms):
+    """Verdict and figures for one endpoint present in both runs."""
+    cur_samples, base_samples = current["samplesMs"], baseline["samplesMs"]
+    cur_p50 = percentile(cur_samples, 50)
+    base_p50 = percentile(base_samples, 50)
+    p_value, effect = mann_whitney_greater(cur_samples, base_samples)
+
+    reasons = []
+    if (
+        p_value is not None
+        and p_value < alpha
+        and base_p50
+        and cur_p50 > base_p50 * (1 + threshold)
+        and cur_p50 - base_p50 >= min_delta_ms
+    ):
+        reasons.append(f"median latency {base_p50:.1f} → {cur_p50:.1f} ms (p={p_value:.2g})")
+
+    base_rps, cur_rps = baseline["throughputRps"], current["throughputRps"]
+    if base_rps and cur_rps < base_rps * (1 - threshold):
+        reasons.append(f"throughput {base_rps:.1f} → {cur_rps:.1f} req/s")
+
+    base_err, cur_err = baseline["errorRate"], current["errorRate"]
+    if cur_err > base_err + max(threshold * base_err, 0.01):
+        reasons.append(f"error rate {base_err:.2%} → {cur_err:.2%}")
+
+    return {
+        "status": "regressed" if reasons else "ok",
+        "reasons": reasons,
+        "p50": (base_p50, cur_p50),
+        "p95": (baseline["latencyMs"]["p95"], current["latencyMs"]["p95"]),
+        "throughputRps": (base_rps, cur_rps),
+        "errorRate": (base_err, cur_err),
+        "pValue": p_value,
+        "effect": effect,
+    }
+
+
+def compare(current, baseline, alpha=0.01, threshold=0.10, min_delta_ms=1.0):
+    verdicts = {}
+    for key, endpoint in current["endpoints"].items():
+        if key in baseline["endpoints"]:
+            verdicts[key] = compare_endpoint(endpoint, baseline["endpoints"][key], alpha, threshold, min_delta_ms)
+        else:
+            verdicts[key] = {"status": "new", "reasons": []}
+    for key in baseline["endpoints"]:
+        if key not in current["endpoints"]:
+            verdicts[key] = {"status": "missing", "reasons": []}
+    return verdicts
+
+
+def _fmt(value, pattern="{:.1f}"):
+    return "n/a" if value is None else pattern.format(value)
+
+
+def render_report(current, baseline, verdicts, settings, scenario_results=None):
+    """Markdown in the section layout of tmp/raw_report.md."""
+    status_label = {
+        "ok": "✅ Passed",
+        "regressed": "❌ Regressed",
+        "new": "➕ New (no baseline)",
+        "missing": "⚠️ Missing from this run",
+    }
+    lines = [
+        "",
+        "# TestSprite Performance Report",
+        "",
+        "---",
+        "",
+        "## 1️⃣ Document Metadata",
+        "- **Project Name:** SANTODINHIERO",
+        f"- **Date:** {current['recordedAt'][:10]}",
+        f"- **Baseline:** {baseline.get('commit') or 'unknown'} ({baseline['recordedAt']})",
+        f"- **Current:** {current.get('commit') or 'unknown'} ({current['recordedAt']})",
+        f"- **Load:** {current['load']['mode']} mode, concurrency {current['load']['concurrency']}, "
+        f"{current['totals']['requests']} requests in {current['load']['elapsedSeconds']} s",
+        f"- **Gate:** Mann-Whitney U p < {settings['alpha']}, median +{settings['threshold']:.0%} "
+        f"and ≥ {settings['minDeltaMs']} ms; throughput -{settings['threshold']:.0%}; error rate",
+        "",
+        "---",
+        "",
+        "## 2️⃣ Requirement Validation Summary",
+        "",
+    ]
+
+    for key in sorted(verdicts):
+        verdict = verdicts[key]
+        endpoint = current["endpoints"].get(key) or baseline["endpoints"][key]
+        lines += [
+            f"#### {endpoint['scenario']} {key}",
+            f"- **Status:** {status_label[verdict['status']]}",
+        ]
+        if verdict["status"] in ("ok", "regressed"):
+            lines += [
+                f"- **p50 (ms):** {_fmt(verdict['p50'][0])} → {_fmt(verdict['p50'][1])}",
+                f"- **p95 (ms):** {_fmt(verdict['p95'][0])} → {_fmt(verdict['p95'][1])}",
+                f"- **Throughput (req/s):** {_fmt(verdict['throughputRps'][0])} → {_fmt(verdict['throughputRps'][1])}",
+                f"- **Error rate:** {_fmt(verdict['errorRate'][0], '{:.2%}')} → {_fmt(verdict['errorRate'][1], '{:.2%}')}",
+                f"- **Mann-Whitney:** p={_fmt(verdict['pValue'], '{:.3g}')}, "
+                f"P(current > baseline)={_fmt(verdict['effect'], '{:.2f}')}",
+            ]
+        if verdict["reasons"]:
+            lines.append(f"- **Analysis / Findings:** {'; '.join(verdict['reasons'])}.")
+        lines += ["---", ""]
+
+    counts = {status: sum(1 for v in verdicts.values() if v["status"] == status) for status in status_label}
+    compared = counts["ok"] + counts["regressed"]
+    lines += [
+        "",
+        "## 3️⃣ Coverage & Matching Metrics",
+        "",
+        f"- **{(counts['ok'] / compared * 100) if compared else 0:.2f}%** of compared endpoints within baseline",
+        "",
+        "| Requirement        | Total Tests | ✅ Passed | ❌ Failed  |",
+        "|--------------------|-------------|-----------|------------|",
+        f"| Performance        | {compared:<11} | {counts['ok']:<9} | {counts['regressed']:<10} |",
+    ]
+    if scenario_results:
+        passed = scenario_results["passed"]
+        failed = scenario_results["failed"]
+        lines.append(f"| Correctness        | {passed + failed:<11} | {passed:<9} | {failed:<10} |")
+    lines += ["---", "", "", "## 4️⃣ Key Gaps / Risks"]
+
+    risks = [f"- {key}: {'; '.join(v['reasons'])}" for key, v in sorted(verdicts.items()) if v["reasons"]]
+    risks += [f"- {key}: in the baseline but not exercised by this run" for key, v in verdicts.items() if v["status"] == "missing"]
+    if scenario_results:
+        risks += [
+            f"- {r['id']} {r['name']}: {r['status']}" for r in scenario_results["results"] if r["status"] != "passed"
+        ]
+    lines += risks or ["- None"]
+    lines += ["---", ""]
+    return "\n".join(lines)
+
+
+def run_load(args):
+    config.load(args.config)
+    stub = clerk_stub.start_from_args(args, config)
+    if args.duration is None and args.requests is None:
+        args.duration = 30.0
+    scenarios = {s.strip() for s in args.scenarios.split(",")} if args.scenarios else None
+    runner = LoadRunner(
+        select_workloads(scenarios, parse_weights(args.weight), args.include_writes),
+        base_url=args.base_url,
+        concurrency=args.concurrency,
+        rps=args.rps,
+        duration=args.duration,
+        total_requests=args.requests,
+        seed=args.seed,
+    )
+    try:
+        report = runner.run()
+    finally:
+        if stub:
+            stub.stop()
+    return build_results(runner, report)
+
+
+def _add_load_arguments(parser):
+    parser.add_argument("--config", default=None, help="JSON config file (see config.py)")
+    parser.add_argument("--base-url", default=None, help="Overrides the configured base URL")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--rps", type=float, default=None, help="Target request rate (open loop)")
+    parser.add_argument("--duration", type=float, default=None, help="Run time in seconds (default 30)")
+    parser.add_argument("--requests", type=int, default=None, help="Total number of requests to send")
+    parser.add_argument("--scenarios", default=None, help="Comma-separated scenario ids")
+    parser.add_argument("--weight", action="append", help="Override a scenario weight, e.g. TC001=20")
+    parser.add_argument("--include-writes", action="store_true")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the weighted scenario picker")
+    clerk_stub.add_arguments(parser)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record performance baselines and gate runs against them.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Run the load test and store a results file")
+    _add_load_arguments(record)
+    record.add_argument("--output", default=None, help="Results path (default tmp/perf/<timestamp>-<commit>.json)")
+    record.add_argument("--as-baseline", action="store_true", help="Also store the results as the baseline")
+    record.add_argument("--baseline", default=DEFAULT_BASELINE)
+
+    check = commands.add_parser("compare", help="Compare a run against the baseline")
+    _add_load_arguments(check)
+    check.add_argument("--baseline", default=DEFAULT_BASELINE)
+    check.add_argument("--current", default=None, help="Existing results file instead of running the load test")
+    check.add_argument("--results", default=None, help="runner.py --output file to include correctness results")
+    check.add_argument("--alpha", type=float, default=0.01, help="Significance level (default 0.01)")
+    check.add_argument("--threshold", type=float, default=0.10, help="Relative change that matters (default 0.10)")
+    check.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore median shifts below this")
+    check.add_argument("--report", default=DEFAULT_REPORT, help="Markdown report path")
+    check.add_argument("--save", default=None, help="Also store the current results at this path")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        results = run_load(args)
+        stamp = results["recordedAt"].replace(":", "").replace("-", "")[:15]
+        output = args.output or os.path.join(PERF_DIR, f"{stamp}-{results['commit'] or 'nogit'}.json")
+        save_results(results, output)
+        print(f"Results written to {output}")
+        if args.as_baseline:
+            save_results(results, args.baseline)
+            print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    baseline = load_results(args.baseline)
+    current = load_results(args.current) if args.current else run_load(args)
+    if args.save:
+        save_results(current, args.save)
+
+    scenario_results = None
+    if args.results:
+        with open(args.results, encoding="utf-8") as fh:
+            scenario_results = json.load(fh)
+
+    settings = {"alpha": args.alpha, "threshold": args.threshold, "minDeltaMs": args.min_delta_ms}
+    verdicts = compare(current, baseline, args.alpha, args.threshold, args.min_delta_ms)
+    report = render_report(current, baseline, verdicts, settings, scenario_results)
+    os.makedirs(os.path.dirname(os.path.abspath(args.report)), exist_ok=True)
+    with open(args.report, "w", encoding="utf-8") as fh:
+        fh.write(report)
+
+    regressed = [key for key, v in verdicts.items() if v["status"] == "regressed"]
+    failed = scenario_results["failed"] if scenario_results else 0
+    for key in regressed:
+        print(f"REGRESSED {key}: {'; '.join(verdicts[key]['reasons'])}")
+    print(f"{len(regressed)} regression(s) across {len(verdicts)} endpoint(s); report: {args.report}")
+    return 1 if regressed or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
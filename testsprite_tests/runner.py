@@ -0,0 +1,197 @@
+"""Parallel runner for the TestSprite API scenarios.
+
+Discovers the ``test_*`` functions in the TC*.py modules without executing
+them at import, then runs them across a bounded pool of worker threads that
+share one pooled keep-alive session (see client.py). Each scenario's line also
+shows the server-side auth/db/external/total time read from the responses'
+``Server-Timing`` headers.
+
+Scenarios that change state other scenarios read (plans, settings, users,
+month data) set ``EXCLUSIVE = True`` at module level. They run one at a time
+after the parallel ones, with nothing else in flight; ``--serial`` adds more.
+
+Examples:
+    python runner.py
+    python runner.py --workers 8 --only TC001,TC002
+    python runner.py --serial TC008
+    python runner.py -k dashboard --config tmp/local.json --output tmp/run.json
+"""
+
+import argparse
+import glob
+import importlib
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+import clerk_stub  # noqa: E402
+import client  # noqa: E402
+import config  # noqa: E402
+
+DEFAULT_WORKERS = 4
+
+
+class Scenario:
+    def __init__(self, scenario_id, module_name, func, exclusive=False):
+        self.id = scenario_id
+        self.module_name = module_name
+        self.func = func
+        self.name = func.__name__
+        self.exclusive = exclusive
+
+    def matches(self, keyword):
+        keyword = keyword.lower()
+        return keyword in self.id.lower() or keyword in self.module_name.lower()
+
+
+def discover(directory=HERE):
+    """Import every TC*.py module and collect its test functions."""
+    scenarios = []
+    for path in sorted(glob.glob(os.path.join(directory, "TC*.py"))):
+        module_name = os.path.splitext(os.path.basename(path))[0]
+        module = importlib.import_module(module_name)
+        scenario_id = module_name.split("_", 1)[0]
+        exclusive = bool(getattr(module, "EXCLUSIVE", False))
+        for attr in sorted(dir(module)):
+            func = getattr(module, attr)
+            if attr.startswith("test_") and callable(func) and getattr(func, "__module__", None) == module_name:
+                scenarios.append(Scenario(scenario_id, module_name, func, exclusive))
+    return scenarios
+
+
+def run_scenario(scenario):
+    started = time.perf_counter()
+    status = "passed"
+    error = None
+    try:
+        with client.scenario(scenario.id):
+            scenario.func()
+    except AssertionError as e:
+        status = "failed"
+        error = str(e) or traceback.format_exc(limit=3)
+    except Exception:
+        status = "error"
+        error = traceback.format_exc(limit=3)
+    duration_ms = (time.perf_counter() - started) * 1000
+    return {
+        "id": scenario.id,
+        "name": scenario.name,
+        "status": status,
+        "durationMs": round(duration_ms, 2),
+        "error": error,
+    }
+
+
+def run(scenarios, workers):
+    """Run the shared-state-safe scenarios in parallel, then the exclusive ones alone."""
+    client.server_timing.reset()
+    parallel = [s for s in scenarios if not s.exclusive]
+    exclusive = [s for s in scenarios if s.exclusive]
+    started = time.perf_counter()
+    by_scenario = {}
+    if parallel:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(parallel)))) as executor:
+            by_scenario.update(zip(parallel, executor.map(run_scenario, parallel)))
+    for scenario in exclusive:
+        by_scenario[scenario] = run_scenario(scenario)
+    results = [by_scenario[s] for s in scenarios]
+    wall_ms = (time.perf_counter() - started) * 1000
+    # Scenarios sharing an id (several test_* in one module) share a breakdown.
+    timings = client.server_timing.summary()
+    for result in results:
+        result["serverTiming"] = timings.get(result["id"])
+    return {
+        "baseUrl": config.base_url(),
+        "workers": workers,
+        "exclusive": sorted({s.id for s in exclusive}),
+        "wallClockMs": round(wall_ms, 2),
+        "sumOfDurationsMs": round(sum(r["durationMs"] for r in results), 2),
+        "passed": sum(1 for r in results if r["status"] == "passed"),
+        "failed": sum(1 for r in results if r["status"] != "passed"),
+        "results": results,
+    }
+
+
+def format_server_timing(timing):
+    """One-line summary such as ``12 responses, total 85 ms (auth 9, db 41, external 0)``."""
+    if not timing:
+        return None
+    phases = timing["phases"]
+    total = phases.get("total", {}).get("totalMs", 0.0)
+    parts = ", ".join(
+        f"{name} {phases[name]['totalMs']:.0f}" for name in ("auth", "db", "external") if name in phases
+    )
+    text = f"{timing['responses']} responses, total {total:.0f} ms"
+    return f"{text} ({parts})" if parts else text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the TestSprite API scenarios in parallel.")
+    parser.add_argument("--config", default=None, help="JSON config file (see config.py)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Parallel workers (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--serial", default=None,
+                        help="Comma-separated scenario ids to run alone, on top of those marked EXCLUSIVE")
+    parser.add_argument("--only", default=None, help="Comma-separated scenario ids, e.g. TC001,TC005")
+    parser.add_argument("-k", dest="keyword", default=None, help="Only run scenarios whose id or module contains this text")
+    clerk_stub.add_arguments(parser)
+    parser.add_argument("--output", default=None, help="Write the JSON results to this path")
+    args = parser.parse_args(argv)
+
+    config.load(args.config)
+    stub = clerk_stub.start_from_args(args, config)
+
+    scenarios = discover()
+    if args.only:
+        wanted = {s.strip() for s in args.only.split(",")}
+        scenarios = [s for s in scenarios if s.id in wanted]
+    if args.keyword:
+        scenarios = [s for s in scenarios if s.matches(args.keyword)]
+    if not scenarios:
+        print("No scenarios selected", file=sys.stderr)
+        return 2
+
+    if args.serial:
+        serial = {s.strip() for s in args.serial.split(",")}
+        for scenario in scenarios:
+            scenario.exclusive = scenario.exclusive or scenario.id in serial
+
+    workers = max(1, args.workers)
+    client.configure(pool_size=max(client.DEFAULT_POOL_SIZE, workers * 2))
+
+    try:
+        summary = run(scenarios, workers)
+    finally:
+        if stub:
+            stub.stop()
+
+    for result in summary["results"]:
+        marker = "PASS" if result["status"] == "passed" else result["status"].upper()
+        print(f"{marker:6} {result['id']} {result['name']} ({result['durationMs']:.0f} ms)")
+        breakdown = format_server_timing(result["serverTiming"])
+        if breakdown:
+            print(f"       server: {breakdown}")
+        if result["error"]:
+            print("       " + result["error"].strip().replace("\n", "\n       "))
+    print(
+        f"\n{summary['passed']} passed, {summary['failed']} failed in {summary['wallClockMs']:.0f} ms "
+        f"(sequential sum {summary['sumOfDurationsMs']:.0f} ms, {workers} workers)"
+    )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(summary, fh, indent=2)
+            fh.write("\n")
+
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
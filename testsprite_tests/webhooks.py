@@ -0,0 +1,206 @@
+"""Svix-signed Clerk webhook payloads and a replay driver for TC010.
+
+Deliveries are signed exactly like Svix does (HMAC-SHA256 over
+``{svix-id}.{svix-timestamp}.{body}`` with the base64 part of the
+``whsec_`` secret), so they pass the real verification in
+/api/webhooks/clerk. ``generate`` yields a deterministic stream of
+user.created / user.updated / user.deleted events; ``replay`` fires it
+concurrently and reports sustained throughput and latency.
+
+Examples:
+    python webhooks.py --events 5000 --concurrency 32
+    python webhooks.py --events 20000 --users 2000 --duplicates 0.05 --output tmp/webhooks.json
+"""
+
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import client
+import config
+from loadtest import percentile
+
+WEBHOOK_ENDPOINT = "/api/webhooks/clerk"
+
+
+def sign(secret, msg_id, timestamp, body):
+    """``svix-signature`` header value for ``body`` (bytes)."""
+    key = secret[len("whsec_"):] if secret.startswith("whsec_") else secret
+    signed = f"{msg_id}.{timestamp}.".encode() + body
+    digest = hmac.new(base64.b64decode(key), signed, hashlib.sha256).digest()
+    return "v1," + base64.b64encode(digest).decode()
+
+
+def signed_request(event, secret, msg_id=None, timestamp=None):
+    """Serialized body plus the three svix headers for one delivery."""
+    msg_id = msg_id or f"msg_{uuid.uuid4().hex}"
+    timestamp = str(int(timestamp if timestamp is not None else time.time()))
+    body = json.dumps(event, separators=(",", ":")).encode()
+    headers = {
+        "Content-Type": "application/json",
+        "svix-id": msg_id,
+        "svix-timestamp": timestamp,
+        "svix-signature": sign(secret, msg_id, timestamp, body),
+    }
+    return body, headers
+
+
+def user_event(event_type, user_id, email=None, first_name=None, last_name=None, timestamp_ms=None):
+    """A Clerk-shaped user event (only the fields the handler reads)."""
+    timestamp_ms = timestamp_ms if timestamp_ms is not None else int(time.time() * 1000)
+    if event_type == "user.deleted":
+        data = {"id": user_id, "object": "user", "deleted": True}
+    else:
+        email_id = f"idn_{user_id}"
+        data = {
+            "id": user_id,
+            "object": "user",
+            "first_name": first_name,
+            "last_name": last_name,
+            "primary_email_address_id": email_id if email else None,
+            "email_addresses": [{"id": email_id, "email_address": email}] if email else [],
+        }
+    return {"type": event_type, "object": "event", "timestamp": timestamp_ms, "data": data}
+
+
+def generate(count, users=500, duplicates=0.0, seed=42, prefix="user_replay", run_id=None):
+    """Yield ``(msg_id, event)`` pairs: each user is created, updated a few
+    times and eventually deleted. A ``duplicates`` fraction of deliveries
+    re-sends an earlier msg_id, as Svix retries do.
+
+    The event sequence depends only on ``seed``; msg ids and timestamps are
+    fresh per ``run_id`` so a second run is not swallowed by deduplication.
+    """
+    rng = random.Random(seed)
+    run_id = run_id or uuid.uuid4().hex[:8]
+    base_ms = int(time.time() * 1000)
+    state = {}
+    sent = []
+    for i in range(count):
+        if sent and rng.random() < duplicates:
+            yield rng.choice(sent)
+            continue
+        user_id = f"{prefix}_{rng.randrange(users):05d}"
+        timestamp_ms = base_ms + i
+        version = state.get(user_id)
+        if version is None:
+            event_type, state[user_id] = "user.created", 0
+        elif rng.random() < 0.1:
+            event_type = "user.deleted"
+            del state[user_id]
+        else:
+            event_type, state[user_id] = "user.updated", version + 1
+        event = user_event(
+            event_type,
+            user_id,
+            email=f"{user_id}@replay.example.com",
+            first_name="Replay",
+            last_name=f"v{state.get(user_id, 0)}",
+            timestamp_ms=timestamp_ms,
+        )
+        delivery = (f"msg_{run_id}_{i:07d}", event)
+        sent.append(delivery)
+        yield delivery
+
+
+def post(event, secret, msg_id=None, session=None):
+    body, headers = signed_request(event, secret, msg_id=msg_id)
+    if session is None:
+        return client.post(WEBHOOK_ENDPOINT, data=body, headers=headers)
+    return session.post(client.url(WEBHOOK_ENDPOINT), data=body, headers=headers, timeout=config.timeout())
+
+
+def replay(deliveries, secret, concurrency=16):
+    """Fire ``deliveries`` with ``concurrency`` workers; returns a summary dict."""
+    # A dedicated pool: the shared client session may be serving other scenarios.
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=concurrency))
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=concurrency))
+    latencies = []
+    statuses = {}
+    duplicates = 0
+    lock = threading.Lock()
+
+    def fire(delivery):
+        nonlocal duplicates
+        msg_id, event = delivery
+        started = time.perf_counter()
+        try:
+            response = post(event, secret, msg_id=msg_id, session=session)
+            status = response.status_code
+            duplicate = status == 200 and response.json().get("duplicate") is True
+        except requests.RequestException as e:
+            status, duplicate = type(e).__name__, False
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed_ms)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+            duplicates += duplicate
+
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(fire, deliveries))
+    finally:
+        session.close()
+    elapsed_s = time.perf_counter() - started
+
+    latencies.sort()
+    count = len(latencies)
+    return {
+        "events": count,
+        "concurrency": concurrency,
+        "elapsedSeconds": round(elapsed_s, 3),
+        "eventsPerSecond": round(count / elapsed_s, 2) if elapsed_s > 0 else 0.0,
+        "duplicatesAcknowledged": duplicates,
+        "errors": sum(n for status, n in statuses.items() if status != "200"),
+        "statusCounts": statuses,
+        "latencyMs": {
+            "p50": round(percentile(latencies, 50) or 0, 2),
+            "p95": round(percentile(latencies, 95) or 0, 2),
+            "p99": round(percentile(latencies, 99) or 0, 2),
+            "max": round(latencies[-1], 2) if latencies else None,
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay signed Clerk webhooks against the app.")
+    parser.add_argument("--config", default=None, help="JSON config file (see config.py)")
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=500, help="Distinct Clerk user ids in the stream")
+    parser.add_argument("--duplicates", type=float, default=0.0, help="Fraction of re-sent svix ids (0-1)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Write the JSON summary to this path")
+    args = parser.parse_args(argv)
+
+    config.load(args.config)
+    secret = config.get("webhookSecret")
+    if not secret:
+        print("webhookSecret / CLERK_WEBHOOK_SECRET is not set", file=sys.stderr)
+        return 2
+
+    deliveries = generate(args.events, users=args.users, duplicates=args.duplicates, seed=args.seed)
+    summary = replay(deliveries, secret, concurrency=args.concurrency)
+    text = json.dumps(summary, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text)
+    return 0 if summary["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())